@@ -13,15 +13,17 @@ import requests
 
 from adpulse.ai.anomaly import find_recent_anomalies
 from adpulse.ai.openai_client import generate_completion
+from adpulse.api.headers import SNAPSHOT_HEADER
 
 API_BASE_URL = os.getenv("ADPULSE_API_BASE_URL", "http://127.0.0.1:8000").rstrip("/")
 
 
-def _call_api(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+def _call_api(path: str, params: Optional[Dict[str, Any]] = None, snapshot_id: Optional[str] = None) -> Any:
     url = f"{API_BASE_URL}{path}"
     response = requests.get(
         url,
         params=_clean_params(params or {}),
+        headers={SNAPSHOT_HEADER: snapshot_id} if snapshot_id else None,
         timeout=20,
     )
     response.raise_for_status()
@@ -48,10 +50,13 @@ def _split_period(values: Sequence[float]) -> tuple[list[float], list[float]]:
     return previous, recent
 
 
-def get_roas_drop_explanation(platform: str, start_date: date, end_date: date) -> str:
+def get_roas_drop_explanation(
+    platform: str, start_date: date, end_date: date, snapshot_id: Optional[str] = None
+) -> str:
     timeseries = _call_api(
         "/timeseries/daily",
         params={"platform": platform, "start_date": start_date, "end_date": end_date},
+        snapshot_id=snapshot_id,
     )
     if not timeseries:
         return "No time series data was available for this platform in the selected window."
@@ -103,10 +108,11 @@ Keep it concise and actionable.
     return generate_completion(prompt)
 
 
-def get_account_health_summary(start_date: date, end_date: date) -> str:
+def get_account_health_summary(start_date: date, end_date: date, snapshot_id: Optional[str] = None) -> str:
     platforms = _call_api(
         "/summary/platforms",
         params={"start_date": start_date, "end_date": end_date},
+        snapshot_id=snapshot_id,
     )
     if not platforms:
         return "No platform data found for the requested window."
@@ -3,16 +3,101 @@ Shared FastAPI dependencies.
 """
 from __future__ import annotations
 
-from typing import Generator
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import Generator, MutableMapping, Optional
 
+from fastapi import Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from adpulse.database import SessionLocal
+from adpulse.api.headers import DATA_VERSION_HEADER, SNAPSHOT_HEADER
+from adpulse.api.metrics import OrmMetricsReader, TieredMetricsReader, archived_partitions
+from adpulse.api.snapshots import SnapshotRegistry, UnknownSnapshot
+from adpulse.config import load_settings
+from adpulse.database import ReadSessionLocal
+from adpulse.ingestion.jobs import IngestJobManager
+from adpulse.storage.backend import MetricsReader, StorageBackend, open_backend
 
 
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
+@lru_cache(maxsize=1)
+def get_snapshots() -> SnapshotRegistry:
+    """Process-wide registry of pinned read snapshots on the read-only pool."""
+    settings = load_settings()
+    return SnapshotRegistry(ReadSessionLocal, ttl_seconds=settings.snapshot_ttl, max_open=settings.snapshot_max_open)
+
+
+def get_db(
+    response: Response,
+    snapshot_id: Optional[str] = Header(None, alias=SNAPSHOT_HEADER),
+    snapshots: SnapshotRegistry = Depends(get_snapshots),
+) -> Generator[Session, None, None]:
+    """
+    A session on the read-only pool, inside one read transaction.
+
+    All of a route's queries see one committed state, and its data version
+    goes back in the `X-AdPulse-Data-Version` header. With an
+    `X-AdPulse-Snapshot` header the session is that snapshot's pinned one
+    instead (see `adpulse.api.snapshots`). Routes only query, so they never
+    wait on an ingest's write lock.
+    """
+    with ExitStack() as stack:
+        yield open_read_session(stack, snapshots, snapshot_id, response.headers)
+
+
+def open_read_session(
+    stack: ExitStack, snapshots: SnapshotRegistry, snapshot_id: Optional[str], headers: MutableMapping[str, str]
+) -> Session:
+    """Enter `snapshots.reading(snapshot_id)` on `stack` and put its data version in `headers`; 404 for unknown ids."""
     try:
-        yield db
-    finally:
-        db.close()
+        db, version = stack.enter_context(snapshots.reading(snapshot_id))
+    except UnknownSnapshot as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
+    headers[DATA_VERSION_HEADER] = str(version)
+    return db
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    """Process-wide storage backend (`ADPULSE_STORAGE_BACKEND`), shared by uploads and reads."""
+    return open_backend(load_settings())
+
+
+def get_metrics(response: Response, db: Session = Depends(get_db)) -> MetricsReader:
+    """
+    What the read routes aggregate from.
+
+    A backend that answers the queries itself (DuckDB) is used directly;
+    SQLite is read through the request's read-only ORM session, together with
+    its Parquet archive once months have been archived.
+    """
+    storage = get_storage()
+    if isinstance(storage, MetricsReader):
+        # Data versions and snapshots track the SQLite database, not this backend's copy.
+        if DATA_VERSION_HEADER in response.headers:
+            del response.headers[DATA_VERSION_HEADER]
+        return storage
+    archive = archived_partitions(db)
+    return OrmMetricsReader(db) if archive is None else TieredMetricsReader(db, archive)
+
+
+@lru_cache(maxsize=1)
+def get_ingest_jobs() -> IngestJobManager:
+    """Process-wide job manager for API uploads, built from the settings on first use."""
+    from adpulse.connectors.registry import build_default_registry
+    from adpulse.ingestion.data_ingestor import DataIngestor
+
+    settings = load_settings()
+    ingestor = DataIngestor(
+        build_default_registry(),
+        get_storage(),
+        batch_size=settings.ingest_batch_size,
+        mode=settings.ingest_mode,
+        # Uploads are spooled to throwaway paths, so there is nothing to skip or resume.
+        track_manifest=False,
+    )
+    return IngestJobManager(
+        ingestor,
+        settings.ingest_spool_dir,
+        max_workers=settings.ingest_workers,
+        max_pending=settings.ingest_max_pending,
+    )
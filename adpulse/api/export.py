@@ -0,0 +1,238 @@
+"""
+Bulk exports: the facts or their daily/campaign totals as CSV, NDJSON or Arrow IPC.
+
+`export_rows` yields lists of at most `chunk_rows` tuples, in the column order
+of `EXPORT_COLUMNS[grain]`, and `encode` turns each list into one piece of the
+response body. Nothing holds more than one chunk.
+
+- `raw` rows are the stored facts (campaign and day, or a compacted bucket
+  with the number of days it folds in `row_count`). The hot tier is fetched
+  from a cursor `chunk_rows` rows at a time, in storage order, with no sort,
+  so the first chunk goes out as soon as SQLite produces it; archived months
+  follow, read from Parquet one batch at a time.
+- `daily` and `campaign` rows come from the same `MetricsReader` queries as
+  `/timeseries/daily` and `/campaigns/summary`, so their totals match. They
+  hold one row per platform and day, or one per campaign, not per fact.
+
+Arrow output and archived months need pyarrow. `export_rows` and `encode`
+check for it when called, before the first chunk, so a route can still
+answer with an error status.
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from adpulse.api.metrics import OrmMetricsReader, TieredMetricsReader, archived_partitions
+from adpulse.api.utils import apply_date_filters, session_schema_version
+from adpulse.models import DailyCampaignRollup
+from adpulse.storage.archive import ColdArchive
+from adpulse.storage.dimensions import iso_date
+from adpulse.storage.migrations import STAR_SCHEMA_VERSION
+from adpulse.storage.rollups import METRIC_COLUMNS
+from adpulse.utils import chunked, require_optional
+
+EXPORT_CHUNK_ROWS = 10_000
+
+EXPORT_GRAINS = ("raw", "daily", "campaign")
+
+# Media type and file extension per format.
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+EXPORT_COLUMNS = {
+    "raw": ("platform", "campaign_id", "campaign_name", "date", *METRIC_COLUMNS, "row_count"),
+    "daily": ("platform", "date", *METRIC_COLUMNS),
+    "campaign": ("platform", "campaign_id", "campaign_name", *METRIC_COLUMNS),
+}
+
+# pyarrow type factory per column; dates travel as ISO strings until then.
+_ARROW_TYPES = {
+    "platform": "string",
+    "campaign_id": "string",
+    "campaign_name": "string",
+    "date": "date32",
+    "impressions": "int64",
+    "clicks": "int64",
+    "spend": "float64",
+    "conversions": "int64",
+    "revenue": "float64",
+    "row_count": "int64",
+}
+
+
+def export_rows(
+    db: Session,
+    grain: str,
+    platform: Optional[str] = None,
+    campaign_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+) -> Iterator[List[tuple]]:
+    """
+    A lazy iterator over `grain` rows matching the filters, at most `chunk_rows` per list, all read through `db`.
+
+    The archive manifest is read up front. A RuntimeError for archived months
+    without pyarrow therefore comes from this call, before any row is read.
+    """
+    if grain not in EXPORT_COLUMNS:
+        raise ValueError(f"Unsupported export grain '{grain}'; expected one of {', '.join(EXPORT_GRAINS)}")
+    archive = archived_partitions(db)
+    if archive is not None:
+        require_optional("pyarrow.parquet", feature="Exporting archived months", install="'adpulse[arrow]'")
+    return _export_rows(db, archive, grain, platform, campaign_id, start_date, end_date, chunk_rows)
+
+
+def _export_rows(
+    db: Session,
+    archive: Optional[ColdArchive],
+    grain: str,
+    platform: Optional[str],
+    campaign_id: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    chunk_rows: int,
+) -> Iterator[List[tuple]]:
+    if grain == "raw":
+        yield from _hot_facts(db, platform, campaign_id, start_date, end_date, chunk_rows)
+        if archive is not None:
+            # Archived rows are single days; compacted buckets never leave the hot tier.
+            for rows in archive.iter_rows(platform, campaign_id, start_date, end_date, batch_size=chunk_rows):
+                yield [(*row[:3], iso_date(row[3]), *row[4:], 1) for row in rows]
+        return
+    reader = OrmMetricsReader(db) if archive is None else TieredMetricsReader(db, archive)
+    if grain == "daily":
+        rows = (
+            (row.platform, row.event_date.isoformat(), *(getattr(row, column) for column in METRIC_COLUMNS))
+            for row in reader.daily_totals(platform, campaign_id, start_date, end_date)
+        )
+    else:
+        rows = (
+            (row.platform, row.campaign_id, row.campaign_name, *(getattr(row, column) for column in METRIC_COLUMNS))
+            for row in reader.campaign_totals(platform, start_date, end_date)
+            if campaign_id is None or row.campaign_id == campaign_id
+        )
+    yield from chunked(rows, chunk_rows)
+
+
+def _hot_facts(
+    db: Session,
+    platform: Optional[str],
+    campaign_id: Optional[str],
+    start_date: Optional[date],
+    end_date: Optional[date],
+    chunk_rows: int,
+) -> Iterator[List[tuple]]:
+    rollup = DailyCampaignRollup
+    query = select(
+        rollup.platform,
+        rollup.campaign_id,
+        rollup.campaign_name,
+        rollup.event_date,
+        *(getattr(rollup, column) for column in METRIC_COLUMNS),
+        rollup.row_count,
+    )
+    if platform:
+        query = query.filter(rollup.platform == platform)
+    if campaign_id:
+        query = query.filter(rollup.campaign_id == campaign_id)
+    by_day = session_schema_version(db) >= STAR_SCHEMA_VERSION
+    query = apply_date_filters(query, start_date, end_date, model=rollup, by_day=by_day)
+    result = db.execute(query, execution_options={"yield_per": chunk_rows})
+    try:
+        for rows in result.partitions():
+            yield [tuple(row) for row in rows]
+    finally:
+        result.close()
+
+
+def encode(chunks: Iterable[List[tuple]], columns: Sequence[str], fmt: str) -> Iterator[bytes]:
+    """
+    The body of a `fmt` export of `chunks`, one piece per chunk.
+
+    Raises ValueError for unknown formats and RuntimeError when Arrow output
+    is asked for without pyarrow, before anything is read.
+    """
+    if fmt == "csv":
+        return _csv(chunks, columns)
+    if fmt == "ndjson":
+        return _ndjson(chunks, columns)
+    if fmt == "arrow":
+        pa = require_optional("pyarrow", feature="Arrow export", install="'adpulse[arrow]'")
+        return _arrow(pa, chunks, columns)
+    raise ValueError(f"Unsupported export format '{fmt}'; expected one of {', '.join(EXPORT_FORMATS)}")
+
+
+def _csv(chunks: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    # The header goes out before the first query runs.
+    yield buffer.getvalue().encode()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+def _ndjson(chunks: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(json.dumps(dict(zip(columns, row)), separators=(",", ":")) + "\n" for row in rows).encode()
+
+
+class _ChunkSink:
+    """A write-only file for pyarrow's IPC writer that hands back what was written since the last `drain`."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self._size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._size
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow(pa, chunks: Iterable[List[tuple]], columns: Sequence[str]) -> Iterator[bytes]:
+    schema = pa.schema([(column, getattr(pa, _ARROW_TYPES[column])()) for column in columns])
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for rows in chunks:
+        arrays = []
+        for field, values in zip(schema, zip(*rows)):
+            if field.type == pa.date32():
+                arrays.append(pa.array(values, type=pa.string()).cast(field.type))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        writer.write_batch(pa.record_batch(arrays, schema=schema))
+        yield sink.drain()
+    # An empty export is still a valid stream: the schema and the end marker.
+    writer.close()
+    yield sink.drain()
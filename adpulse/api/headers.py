@@ -0,0 +1,9 @@
+"""
+HTTP headers of the read-snapshot protocol, shared by the API and its clients.
+
+Kept free of imports so the report and insights clients can name them
+without loading the API's database stack.
+"""
+
+SNAPSHOT_HEADER = "X-AdPulse-Snapshot"
+DATA_VERSION_HEADER = "X-AdPulse-Data-Version"
@@ -12,6 +12,9 @@ from adpulse.api.routers import (
     timeseries_router,
     insights_router,
     reports_router,
+    ingest_router,
+    snapshots_router,
+    export_router,
 )
 from adpulse.database import init_db
 
@@ -25,6 +28,9 @@ app.include_router(campaigns_router)
 app.include_router(timeseries_router)
 app.include_router(insights_router)
 app.include_router(reports_router)
+app.include_router(ingest_router)
+app.include_router(snapshots_router)
+app.include_router(export_router)
 
 
 @app.get("/")
@@ -0,0 +1,272 @@
+"""
+SQLite implementations of `MetricsReader`, querying the rollup views through the request's ORM session.
+
+`TieredMetricsReader` adds the months archived to Parquet (see
+`adpulse.storage.archive`). The manifest is read in the same session, so the
+hot and cold tiers come from one snapshot even while a month is archived.
+"""
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, func, text
+from sqlalchemy.orm import Session
+
+from adpulse.api.utils import apply_date_filters, parse_event_date, session_schema_version
+from adpulse.models import DailyCampaignRollup, DailyPlatformRollup
+from adpulse.storage.archive import PARTITIONS_SQL, ColdArchive, Metrics, load_partitions
+from adpulse.storage.backend import DailyMetrics, MetricsReader, MetricTotals
+from adpulse.storage.dimensions import iso_date
+from adpulse.storage.migrations import ARCHIVE_SCHEMA_VERSION, STAR_SCHEMA_VERSION
+from adpulse.storage.rollups import METRIC_COLUMNS
+
+_CAMPAIGN_NAMES_SQL = text(
+    """
+    SELECT p.name, c.campaign_id, c.campaign_name
+    FROM dim_campaigns c JOIN dim_platforms p ON p.platform_key = c.platform_key
+    WHERE c.campaign_id IN :campaign_ids
+    """
+).bindparams(bindparam("campaign_ids", expanding=True))
+
+
+def _sums(model: type) -> list:
+    return [
+        func.sum(model.impressions).label("impressions"),
+        func.sum(model.clicks).label("clicks"),
+        func.sum(model.spend).label("spend"),
+        func.sum(model.conversions).label("conversions"),
+        func.sum(model.revenue).label("revenue"),
+    ]
+
+
+def _totals(row, **fields) -> MetricTotals:
+    return MetricTotals(
+        impressions=row.impressions,
+        clicks=row.clicks,
+        spend=row.spend,
+        conversions=row.conversions,
+        revenue=row.revenue,
+        **fields,
+    )
+
+
+def _day(row, platform: Optional[str]) -> DailyMetrics:
+    return DailyMetrics(
+        event_date=parse_event_date(row.event_date),
+        impressions=row.impressions,
+        clicks=row.clicks,
+        spend=row.spend,
+        conversions=row.conversions,
+        revenue=row.revenue,
+        platform=platform,
+    )
+
+
+class OrmMetricsReader(MetricsReader):
+    """Reads the daily rollups (see `adpulse.storage.rollups`), never the fact rows directly."""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        # Until `adpulse dedupe` lets the star schema migration run, the rollups are the v3 tables.
+        self.by_day = session_schema_version(db) >= STAR_SCHEMA_VERSION
+
+    def platform_totals(self, start_date: Optional[date], end_date: Optional[date]) -> List[MetricTotals]:
+        query = (
+            self.db.query(DailyPlatformRollup.platform, *_sums(DailyPlatformRollup))
+            .group_by(DailyPlatformRollup.platform)
+            .order_by(DailyPlatformRollup.platform)
+        )
+        query = apply_date_filters(query, start_date, end_date, model=DailyPlatformRollup, by_day=self.by_day)
+        return [_totals(row, platform=row.platform) for row in query.all()]
+
+    def campaign_totals(
+        self, platform: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> List[MetricTotals]:
+        query = (
+            self.db.query(
+                DailyCampaignRollup.campaign_id,
+                DailyCampaignRollup.campaign_name,
+                DailyCampaignRollup.platform,
+                *_sums(DailyCampaignRollup),
+            )
+            .group_by(
+                DailyCampaignRollup.campaign_id,
+                DailyCampaignRollup.campaign_name,
+                DailyCampaignRollup.platform,
+            )
+            .order_by(DailyCampaignRollup.platform, DailyCampaignRollup.campaign_name, DailyCampaignRollup.campaign_id)
+        )
+        query = apply_date_filters(query, start_date, end_date, model=DailyCampaignRollup, by_day=self.by_day)
+        if platform:
+            query = query.filter(DailyCampaignRollup.platform == platform)
+        return [
+            _totals(row, platform=row.platform, campaign_id=row.campaign_id, campaign_name=row.campaign_name)
+            for row in query.all()
+        ]
+
+    def campaign(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> Optional[MetricTotals]:
+        first = self.db.query(DailyCampaignRollup.platform, DailyCampaignRollup.campaign_name).filter(
+            DailyCampaignRollup.campaign_id == campaign_id
+        )
+        first = apply_date_filters(first, start_date, end_date, model=DailyCampaignRollup, by_day=self.by_day)
+        campaign_row = first.order_by(DailyCampaignRollup.platform).first()
+        if not campaign_row:
+            return None
+        metrics = self.db.query(*_sums(DailyCampaignRollup)).filter(DailyCampaignRollup.campaign_id == campaign_id)
+        metrics = apply_date_filters(metrics, start_date, end_date, model=DailyCampaignRollup, by_day=self.by_day)
+        return _totals(
+            metrics.one(),
+            platform=campaign_row.platform,
+            campaign_id=campaign_id,
+            campaign_name=campaign_row.campaign_name,
+        )
+
+    def campaign_days(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[DailyMetrics]:
+        query = (
+            self.db.query(DailyCampaignRollup.event_date, *_sums(DailyCampaignRollup))
+            .filter(DailyCampaignRollup.campaign_id == campaign_id)
+            .group_by(DailyCampaignRollup.event_date)
+            .order_by(DailyCampaignRollup.event_date)
+        )
+        query = apply_date_filters(query, start_date, end_date, model=DailyCampaignRollup, by_day=self.by_day)
+        return [_day(row, None) for row in query.all()]
+
+    def daily_totals(
+        self,
+        platform: Optional[str],
+        campaign_id: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[DailyMetrics]:
+        # Campaign filters need per-campaign rows; otherwise the much smaller platform rollup answers.
+        rollup = DailyCampaignRollup if campaign_id else DailyPlatformRollup
+        group_fields = [rollup.event_date]
+        select_fields = [rollup.event_date, *_sums(rollup)]
+        if not platform:
+            select_fields.append(rollup.platform)
+            group_fields.append(rollup.platform)
+
+        query = self.db.query(*select_fields)
+        if platform:
+            query = query.filter(rollup.platform == platform)
+        if campaign_id:
+            query = query.filter(DailyCampaignRollup.campaign_id == campaign_id)
+
+        query = apply_date_filters(query, start_date, end_date, model=rollup, by_day=self.by_day)
+        query = query.group_by(*group_fields).order_by(*group_fields)
+        return [_day(row, platform or row.platform) for row in query.all()]
+
+
+def archived_partitions(db: Session) -> Optional[ColdArchive]:
+    """The archive visible to `db`'s snapshot, or None when nothing is archived."""
+    if session_schema_version(db) < ARCHIVE_SCHEMA_VERSION:
+        # The manifest's migration is waiting for `adpulse dedupe`, so nothing can have been archived.
+        return None
+    rows = db.execute(text(PARTITIONS_SQL)).all()
+    if not rows:
+        return None
+    base_dir = Path(db.execute(text("PRAGMA database_list")).first()[2]).parent
+    return ColdArchive(load_partitions(rows, base_dir))
+
+
+def _metrics(totals) -> Metrics:
+    return tuple(getattr(totals, column) for column in METRIC_COLUMNS)
+
+
+def _add(into: Dict, key, metrics: Metrics) -> None:
+    current = into.get(key)
+    into[key] = metrics if current is None else tuple(a + b for a, b in zip(current, metrics))
+
+
+def _from_metrics(metrics: Metrics, **fields) -> dict:
+    return dict(zip(METRIC_COLUMNS, metrics), **fields)
+
+
+class TieredMetricsReader(OrmMetricsReader):
+    """The hot rollups plus the archived partitions that overlap each query, summed per key."""
+
+    def __init__(self, db: Session, archive: ColdArchive) -> None:
+        super().__init__(db)
+        self.archive = archive
+
+    def _campaign_names(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], str]:
+        wanted = set(keys)
+        if not wanted:
+            return {}
+        rows = self.db.execute(_CAMPAIGN_NAMES_SQL, {"campaign_ids": sorted({key[1] for key in wanted})})
+        return {(row[0], row[1]): row[2] for row in rows if (row[0], row[1]) in wanted}
+
+    def platform_totals(self, start_date: Optional[date], end_date: Optional[date]) -> List[MetricTotals]:
+        merged: Dict[str, Metrics] = {}
+        for row in super().platform_totals(start_date, end_date):
+            _add(merged, row.platform, _metrics(row))
+        for platform, _, metrics in self.archive.aggregate(start_date=start_date, end_date=end_date):
+            _add(merged, platform, metrics)
+        return [MetricTotals(**_from_metrics(merged[platform], platform=platform)) for platform in sorted(merged)]
+
+    def campaign_totals(
+        self, platform: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> List[MetricTotals]:
+        merged: Dict[Tuple[str, str], Metrics] = {}
+        names: Dict[Tuple[str, str], str] = {}
+        for row in super().campaign_totals(platform, start_date, end_date):
+            key = (row.platform, row.campaign_id)
+            names[key] = row.campaign_name
+            _add(merged, key, _metrics(row))
+        cold = self.archive.aggregate(("campaign_id",), platform=platform, start_date=start_date, end_date=end_date)
+        for platform_name, (campaign_id,), metrics in cold:
+            _add(merged, (platform_name, campaign_id), metrics)
+        names.update(self._campaign_names(key for key in merged if key not in names))
+        order = sorted(merged, key=lambda key: (key[0], names[key], key[1]))
+        return [
+            MetricTotals(**_from_metrics(merged[key], platform=key[0], campaign_id=key[1], campaign_name=names[key]))
+            for key in order
+        ]
+
+    def campaign(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> Optional[MetricTotals]:
+        hot = super().campaign(campaign_id, start_date, end_date)
+        cold = self.archive.aggregate(campaign_id=campaign_id, start_date=start_date, end_date=end_date)
+        if not cold:
+            return hot
+        platforms = {platform for platform, _, _ in cold}
+        if hot is not None:
+            platforms.add(hot.platform)
+        # Like the hot query: the first platform the campaign id has rows on names it.
+        platform = min(platforms)
+        if hot is not None and hot.platform == platform:
+            name = hot.campaign_name
+        else:
+            name = self._campaign_names([(platform, campaign_id)])[(platform, campaign_id)]
+        parts = [metrics for _, _, metrics in cold] + ([_metrics(hot)] if hot is not None else [])
+        summed = tuple(sum(values) for values in zip(*parts))
+        return MetricTotals(**_from_metrics(summed, platform=platform, campaign_id=campaign_id, campaign_name=name))
+
+    def campaign_days(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[DailyMetrics]:
+        merged: Dict[date, Metrics] = {}
+        for row in super().campaign_days(campaign_id, start_date, end_date):
+            _add(merged, row.event_date, _metrics(row))
+        cold = self.archive.aggregate(("day",), campaign_id=campaign_id, start_date=start_date, end_date=end_date)
+        for _, (day,), metrics in cold:
+            _add(merged, parse_event_date(iso_date(day)), metrics)
+        return [DailyMetrics(**_from_metrics(merged[day], event_date=day)) for day in sorted(merged)]
+
+    def daily_totals(
+        self,
+        platform: Optional[str],
+        campaign_id: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[DailyMetrics]:
+        merged: Dict[Tuple[date, str], Metrics] = {}
+        for row in super().daily_totals(platform, campaign_id, start_date, end_date):
+            _add(merged, (row.event_date, row.platform), _metrics(row))
+        cold = self.archive.aggregate(
+            ("day",), platform=platform, campaign_id=campaign_id, start_date=start_date, end_date=end_date
+        )
+        for platform_name, (day,), metrics in cold:
+            _add(merged, (parse_event_date(iso_date(day)), platform_name), metrics)
+        return [
+            DailyMetrics(**_from_metrics(merged[key], event_date=key[0], platform=key[1])) for key in sorted(merged)
+        ]
@@ -6,6 +6,9 @@ from .campaigns import router as campaigns_router
 from .timeseries import router as timeseries_router
 from .insights import router as insights_router
 from .reports import router as reports_router
+from .ingest import router as ingest_router
+from .snapshots import router as snapshots_router
+from .export import router as export_router
 
 __all__ = [
     "health_router",
@@ -14,4 +17,7 @@ __all__ = [
     "timeseries_router",
     "insights_router",
     "reports_router",
+    "ingest_router",
+    "snapshots_router",
+    "export_router",
 ]
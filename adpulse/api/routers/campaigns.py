@@ -7,63 +7,29 @@ from datetime import date
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Query, Session
 
-from adpulse.api.dependencies import get_db
-from adpulse.api.utils import apply_date_filters, calc_ctr, calc_rate, parse_event_date
-from adpulse.models import AdPerformance
+from adpulse.api.dependencies import get_metrics
+from adpulse.api.utils import calc_ctr, calc_rate
 from adpulse.schemas import CampaignDetail, CampaignSummary, DailyTimeseriesPoint
+from adpulse.storage.backend import MetricsReader
 
 router = APIRouter(prefix="/campaigns", tags=["campaigns"])
 
 
-def _filtered_campaign_query(
-    db: Session,
-    campaign_id: str,
-    start_date: Optional[date],
-    end_date: Optional[date],
-) -> Query:
-    query = db.query(AdPerformance).filter(AdPerformance.campaign_id == campaign_id)
-    return apply_date_filters(query, start_date, end_date)
-
-
 @router.get("/summary", response_model=List[CampaignSummary])
 def campaign_summary(
     platform: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    metrics: MetricsReader = Depends(get_metrics),
 ) -> List[CampaignSummary]:
-    query = (
-        db.query(
-            AdPerformance.campaign_id,
-            AdPerformance.campaign_name,
-            AdPerformance.platform,
-            func.sum(AdPerformance.spend).label("total_spend"),
-            func.sum(AdPerformance.clicks).label("total_clicks"),
-            func.sum(AdPerformance.impressions).label("total_impressions"),
-            func.sum(AdPerformance.conversions).label("total_conversions"),
-            func.sum(AdPerformance.revenue).label("total_revenue"),
-        )
-        .group_by(
-            AdPerformance.campaign_id,
-            AdPerformance.campaign_name,
-            AdPerformance.platform,
-        )
-        .order_by(AdPerformance.platform, AdPerformance.campaign_name)
-    )
-    query = apply_date_filters(query, start_date, end_date)
-    if platform:
-        query = query.filter(AdPerformance.platform == platform)
-    rows = query.all()
     summaries: List[CampaignSummary] = []
-    for row in rows:
-        spend = row.total_spend or 0.0
-        clicks = row.total_clicks or 0
-        impressions = row.total_impressions or 0
-        conversions = row.total_conversions or 0
-        revenue = row.total_revenue or 0.0
+    for row in metrics.campaign_totals(platform, start_date, end_date):
+        spend = row.spend or 0.0
+        clicks = row.clicks or 0
+        impressions = row.impressions or 0
+        conversions = row.conversions or 0
+        revenue = row.revenue or 0.0
         summaries.append(
             CampaignSummary(
                 campaign_id=row.campaign_id,
@@ -88,54 +54,26 @@ def campaign_detail(
     campaign_id: str,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    metrics: MetricsReader = Depends(get_metrics),
 ) -> CampaignDetail:
-    base_query = _filtered_campaign_query(db, campaign_id, start_date, end_date)
-    campaign_row = base_query.first()
-    if not campaign_row:
+    campaign = metrics.campaign(campaign_id, start_date, end_date)
+    if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
-    metrics_query = (
-        db.query(
-            func.sum(AdPerformance.spend).label("total_spend"),
-            func.sum(AdPerformance.clicks).label("total_clicks"),
-            func.sum(AdPerformance.impressions).label("total_impressions"),
-            func.sum(AdPerformance.conversions).label("total_conversions"),
-            func.sum(AdPerformance.revenue).label("total_revenue"),
-        )
-        .filter(AdPerformance.campaign_id == campaign_id)
-    )
-    metrics_query = apply_date_filters(metrics_query, start_date, end_date)
-    metrics = metrics_query.one()
-    spend = metrics.total_spend or 0.0
-    clicks = metrics.total_clicks or 0
-    impressions = metrics.total_impressions or 0
-    conversions = metrics.total_conversions or 0
-    revenue = metrics.total_revenue or 0.0
+    spend = campaign.spend or 0.0
+    clicks = campaign.clicks or 0
+    impressions = campaign.impressions or 0
+    conversions = campaign.conversions or 0
+    revenue = campaign.revenue or 0.0
 
-    ts_query = (
-        db.query(
-            AdPerformance.event_date,
-            func.sum(AdPerformance.spend).label("spend"),
-            func.sum(AdPerformance.clicks).label("clicks"),
-            func.sum(AdPerformance.impressions).label("impressions"),
-            func.sum(AdPerformance.conversions).label("conversions"),
-            func.sum(AdPerformance.revenue).label("revenue"),
-        )
-        .filter(AdPerformance.campaign_id == campaign_id)
-        .group_by(AdPerformance.event_date)
-        .order_by(AdPerformance.event_date)
-    )
-    ts_query = apply_date_filters(ts_query, start_date, end_date)
-    ts_rows = ts_query.all()
     timeseries: List[DailyTimeseriesPoint] = []
-    for row in ts_rows:
+    for row in metrics.campaign_days(campaign_id, start_date, end_date):
         spend_row = row.spend or 0.0
         revenue_row = row.revenue or 0.0
         timeseries.append(
             DailyTimeseriesPoint(
-                date=parse_event_date(row.event_date),
-                platform=campaign_row.platform,
+                date=row.event_date,
+                platform=campaign.platform,
                 campaign_id=campaign_id,
                 spend=spend_row,
                 clicks=row.clicks or 0,
@@ -148,8 +86,8 @@ def campaign_detail(
 
     return CampaignDetail(
         campaign_id=campaign_id,
-        campaign_name=campaign_row.campaign_name,
-        platform=campaign_row.platform,
+        campaign_name=campaign.campaign_name,
+        platform=campaign.platform,
         total_spend=spend,
         total_clicks=clicks,
         total_impressions=impressions,
@@ -0,0 +1,71 @@
+"""
+Bulk export endpoint.
+
+`GET /export` streams the facts (`grain=raw`) or their per platform and day
+(`daily`) or per campaign (`campaign`) totals as CSV, NDJSON or an Arrow IPC
+stream, chunk by chunk, instead of one JSON document; see
+`adpulse.api.export`. The same filters as the summary routes apply, and an
+`X-AdPulse-Snapshot` header exports that snapshot's data version.
+
+The response owns its read session until the last chunk is sent: FastAPI
+closes dependencies before a streamed body is produced, so this route opens
+the session itself rather than through `get_db`.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack
+from datetime import date
+from typing import Iterator, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from adpulse.api.dependencies import get_snapshots, get_storage, open_read_session
+from adpulse.api.export import EXPORT_COLUMNS, EXPORT_FORMATS, EXPORT_GRAINS, encode, export_rows
+from adpulse.api.headers import SNAPSHOT_HEADER
+from adpulse.api.snapshots import SnapshotRegistry
+from adpulse.storage.backend import MetricsReader
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+def _closing(body: Iterator[bytes], stack: ExitStack) -> Iterator[bytes]:
+    # Also runs when the client disconnects and the generator is closed early.
+    with stack:
+        yield from body
+
+
+@router.get("")
+def export(
+    grain: str = Query("raw", description=f"One of: {', '.join(EXPORT_GRAINS)}"),
+    fmt: str = Query("csv", alias="format", description=f"One of: {', '.join(EXPORT_FORMATS)}"),
+    platform: Optional[str] = None,
+    campaign_id: Optional[str] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    snapshot_id: Optional[str] = Header(None, alias=SNAPSHOT_HEADER),
+    snapshots: SnapshotRegistry = Depends(get_snapshots),
+) -> StreamingResponse:
+    if grain not in EXPORT_GRAINS:
+        raise HTTPException(
+            status_code=422, detail=f"Unsupported grain '{grain}'; expected one of {', '.join(EXPORT_GRAINS)}"
+        )
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=422, detail=f"Unsupported format '{fmt}'; expected one of {', '.join(EXPORT_FORMATS)}"
+        )
+    if isinstance(get_storage(), MetricsReader):
+        raise HTTPException(status_code=501, detail="Exports need the SQLite storage backend")
+
+    media_type, extension = EXPORT_FORMATS[fmt]
+    headers = {"Content-Disposition": f'attachment; filename="adpulse_{grain}.{extension}"'}
+    stack = ExitStack()
+    db = open_read_session(stack, snapshots, snapshot_id, headers)
+    try:
+        # Both check for pyarrow before returning; rows are only read while the body is sent.
+        rows = export_rows(db, grain, platform, campaign_id, start_date, end_date)
+        body = encode(rows, EXPORT_COLUMNS[grain], fmt)
+    except RuntimeError as exc:
+        stack.close()
+        raise HTTPException(status_code=501, detail=str(exc)) from exc
+    return StreamingResponse(_closing(body, stack), media_type=media_type, headers=headers)
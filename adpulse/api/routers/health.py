@@ -16,7 +16,7 @@ router = APIRouter(prefix="/health", tags=["health"])
 @router.get("", summary="Health status")
 def health_check(db: Session = Depends(get_db)) -> dict[str, str]:
     try:
-        db.query(func.count(AdPerformance.id)).scalar()
+        db.query(func.count()).select_from(AdPerformance).scalar()
         status = "ok"
         db_status = "ok"
     except Exception:
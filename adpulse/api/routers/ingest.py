@@ -0,0 +1,111 @@
+"""
+Asynchronous ingestion endpoints.
+
+`POST /ingest/{platform}` streams the request body to a spool file in chunks,
+queues a background job and answers 202 with the job id; the load itself runs
+on the job manager's thread pool, never on an API worker. Poll
+`GET /ingest/jobs/{job_id}` for progress.
+
+The body is either the raw export (`curl --data-binary @export.csv.gz`) or a
+multipart form with a `file` field (`curl -F file=@export.csv`). CSV (plain
+or compressed), Parquet and Arrow files are accepted, as with `adpulse load`.
+"""
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+
+from adpulse.api.dependencies import get_ingest_jobs
+from adpulse.ingestion.jobs import IngestJob, IngestJobManager, JobQueueFull
+from adpulse.schemas import IngestJobStatus
+
+router = APIRouter(prefix="/ingest", tags=["ingest"])
+
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _status(job: IngestJob) -> IngestJobStatus:
+    return IngestJobStatus(
+        job_id=job.job_id,
+        platform=job.platform,
+        filename=job.filename,
+        status=job.status,
+        bytes_received=job.bytes_received,
+        rows_processed=job.rows_processed,
+        rows_per_second=round(job.rows_per_second, 1),
+        elapsed_seconds=round(job.elapsed_seconds, 3),
+        action=job.action,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _spool_body(request: Request, path: Path) -> int:
+    """Write the raw request body to `path` chunk by chunk; returns the byte count."""
+    size = 0
+    handle = await run_in_threadpool(path.open, "wb")
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(handle.write, chunk)
+                size += len(chunk)
+    finally:
+        await run_in_threadpool(handle.close)
+    return size
+
+
+def _copy_upload(source: BinaryIO, path: Path) -> int:
+    with path.open("wb") as handle:
+        shutil.copyfileobj(source, handle, COPY_BUFFER_SIZE)
+        return handle.tell()
+
+
+@router.post("/{platform}", status_code=202, response_model=IngestJobStatus)
+async def submit_ingest(
+    platform: str,
+    request: Request,
+    response: Response,
+    filename: Optional[str] = Query(None, description="Original file name, for the job report"),
+    jobs: IngestJobManager = Depends(get_ingest_jobs),
+) -> IngestJobStatus:
+    if not jobs.supports(platform):
+        raise HTTPException(status_code=404, detail=f"Unsupported platform '{platform}'")
+
+    path = jobs.new_spool_path()
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if not isinstance(upload, UploadFile):
+                raise HTTPException(status_code=400, detail="Multipart uploads need a 'file' field")
+            filename = filename or upload.filename
+            size = await run_in_threadpool(_copy_upload, upload.file, path)
+        else:
+            size = await _spool_body(request, path)
+        if not size:
+            raise HTTPException(status_code=400, detail="Upload is empty")
+        job = jobs.submit(platform, path, filename or "upload", size)
+    except JobQueueFull as exc:
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    response.headers["Location"] = f"{router.prefix}/jobs/{job.job_id}"
+    return _status(job)
+
+
+@router.get("/jobs/{job_id}", response_model=IngestJobStatus)
+def get_ingest_job(job_id: str, jobs: IngestJobManager = Depends(get_ingest_jobs)) -> IngestJobStatus:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ingest job '{job_id}'")
+    return _status(job)
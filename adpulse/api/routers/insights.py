@@ -4,10 +4,12 @@ AI insights endpoints.
 from __future__ import annotations
 
 from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
 
 from adpulse.ai import get_account_health_summary, get_roas_drop_explanation
+from adpulse.api.headers import SNAPSHOT_HEADER
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
@@ -17,9 +19,10 @@ def roas_drop(
     platform: str = Query(..., description="Platform name as stored in the DB (e.g., 'Google Ads')"),
     start_date: date = Query(...),
     end_date: date = Query(...),
+    snapshot_id: Optional[str] = Header(None, alias=SNAPSHOT_HEADER),
 ) -> dict:
     try:
-        analysis = get_roas_drop_explanation(platform, start_date, end_date)
+        analysis = get_roas_drop_explanation(platform, start_date, end_date, snapshot_id=snapshot_id)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover - defensive
@@ -36,9 +39,10 @@ def roas_drop(
 def account_health(
     start_date: date = Query(...),
     end_date: date = Query(...),
+    snapshot_id: Optional[str] = Header(None, alias=SNAPSHOT_HEADER),
 ) -> dict:
     try:
-        analysis = get_account_health_summary(start_date, end_date)
+        analysis = get_account_health_summary(start_date, end_date, snapshot_id=snapshot_id)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
     except Exception as exc:  # pragma: no cover
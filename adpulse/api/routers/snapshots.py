@@ -0,0 +1,56 @@
+"""
+Read snapshot endpoints.
+
+`POST /snapshots` pins the data version committed right now and answers with
+its id. Send the id as the `X-AdPulse-Snapshot` header and every read route
+answers from that version, however many loads commit in between. Call
+`DELETE /snapshots/{snapshot_id}` when done; otherwise the snapshot expires
+after `ADPULSE_SNAPSHOT_TTL` seconds. See `adpulse.api.snapshots`.
+"""
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from adpulse.api.dependencies import get_snapshots, get_storage
+from adpulse.api.headers import DATA_VERSION_HEADER
+from adpulse.api.snapshots import Snapshot, SnapshotLimitReached, SnapshotRegistry
+from adpulse.schemas import SnapshotStatus
+from adpulse.storage.backend import MetricsReader
+
+router = APIRouter(prefix="/snapshots", tags=["snapshots"])
+
+
+def _status(snapshot: Snapshot) -> SnapshotStatus:
+    return SnapshotStatus(
+        snapshot_id=snapshot.snapshot_id,
+        data_version=snapshot.data_version,
+        created_at=snapshot.created_at,
+        expires_at=snapshot.expires_at,
+    )
+
+
+@router.post("", status_code=201, response_model=SnapshotStatus)
+def open_snapshot(response: Response, snapshots: SnapshotRegistry = Depends(get_snapshots)) -> SnapshotStatus:
+    if isinstance(get_storage(), MetricsReader):
+        raise HTTPException(status_code=501, detail="Read snapshots need the SQLite storage backend")
+    try:
+        snapshot = snapshots.open()
+    except SnapshotLimitReached as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"}) from exc
+    response.headers[DATA_VERSION_HEADER] = str(snapshot.data_version)
+    return _status(snapshot)
+
+
+@router.get("/{snapshot_id}", response_model=SnapshotStatus)
+def get_snapshot(snapshot_id: str, snapshots: SnapshotRegistry = Depends(get_snapshots)) -> SnapshotStatus:
+    snapshot = snapshots.get(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired snapshot '{snapshot_id}'")
+    return _status(snapshot)
+
+
+@router.delete("/{snapshot_id}", status_code=204)
+def close_snapshot(snapshot_id: str, snapshots: SnapshotRegistry = Depends(get_snapshots)) -> Response:
+    if not snapshots.close(snapshot_id):
+        raise HTTPException(status_code=404, detail=f"Unknown or expired snapshot '{snapshot_id}'")
+    return Response(status_code=204)
@@ -7,13 +7,11 @@ from datetime import date
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
 
-from adpulse.api.dependencies import get_db
-from adpulse.api.utils import apply_date_filters, calc_ctr, calc_rate
-from adpulse.models import AdPerformance
+from adpulse.api.dependencies import get_metrics
+from adpulse.api.utils import calc_ctr, calc_rate
 from adpulse.schemas import PlatformSummary
+from adpulse.storage.backend import MetricsReader
 
 router = APIRouter(prefix="/summary", tags=["summary"])
 
@@ -22,29 +20,15 @@ router = APIRouter(prefix="/summary", tags=["summary"])
 def platform_summary(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    metrics: MetricsReader = Depends(get_metrics),
 ) -> List[PlatformSummary]:
-    query = (
-        db.query(
-            AdPerformance.platform.label("platform"),
-            func.sum(AdPerformance.spend).label("total_spend"),
-            func.sum(AdPerformance.clicks).label("total_clicks"),
-            func.sum(AdPerformance.impressions).label("total_impressions"),
-            func.sum(AdPerformance.conversions).label("total_conversions"),
-            func.sum(AdPerformance.revenue).label("total_revenue"),
-        )
-        .group_by(AdPerformance.platform)
-        .order_by(AdPerformance.platform)
-    )
-    query = apply_date_filters(query, start_date, end_date)
-    results = query.all()
     summaries: List[PlatformSummary] = []
-    for row in results:
-        spend = row.total_spend or 0.0
-        clicks = row.total_clicks or 0
-        impressions = row.total_impressions or 0
-        conversions = row.total_conversions or 0
-        revenue = row.total_revenue or 0.0
+    for row in metrics.platform_totals(start_date, end_date):
+        spend = row.spend or 0.0
+        clicks = row.clicks or 0
+        impressions = row.impressions or 0
+        conversions = row.conversions or 0
+        revenue = row.revenue or 0.0
         summaries.append(
             PlatformSummary(
                 platform=row.platform,
@@ -7,13 +7,11 @@ from datetime import date
 from typing import List, Optional
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
-from sqlalchemy.orm import Session
 
-from adpulse.api.dependencies import get_db
-from adpulse.api.utils import apply_date_filters, calc_rate, parse_event_date
-from adpulse.models import AdPerformance
+from adpulse.api.dependencies import get_metrics
+from adpulse.api.utils import calc_rate
 from adpulse.schemas import DailyTimeseriesPoint
+from adpulse.storage.backend import MetricsReader
 
 router = APIRouter(prefix="/timeseries", tags=["timeseries"])
 
@@ -24,39 +22,16 @@ def daily_timeseries(
     campaign_id: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    metrics: MetricsReader = Depends(get_metrics),
 ) -> List[DailyTimeseriesPoint]:
-    group_fields = [AdPerformance.event_date]
-    select_fields = [
-        AdPerformance.event_date,
-        func.sum(AdPerformance.spend).label("spend"),
-        func.sum(AdPerformance.clicks).label("clicks"),
-        func.sum(AdPerformance.impressions).label("impressions"),
-        func.sum(AdPerformance.conversions).label("conversions"),
-        func.sum(AdPerformance.revenue).label("revenue"),
-    ]
-    if not platform:
-        select_fields.append(AdPerformance.platform)
-        group_fields.append(AdPerformance.platform)
-
-    query = db.query(*select_fields)
-    if platform:
-        query = query.filter(AdPerformance.platform == platform)
-    if campaign_id:
-        query = query.filter(AdPerformance.campaign_id == campaign_id)
-
-    query = apply_date_filters(query, start_date, end_date)
-    query = query.group_by(*group_fields).order_by(AdPerformance.event_date)
-    rows = query.all()
     points: List[DailyTimeseriesPoint] = []
-    for row in rows:
+    for row in metrics.daily_totals(platform, campaign_id, start_date, end_date):
         spend = row.spend or 0.0
         revenue = row.revenue or 0.0
-        platform_value = platform or getattr(row, "platform", None)
         points.append(
             DailyTimeseriesPoint(
-                date=parse_event_date(row.event_date),
-                platform=platform_value,
+                date=row.event_date,
+                platform=row.platform,
                 campaign_id=campaign_id,
                 spend=spend,
                 clicks=row.clicks or 0,
@@ -0,0 +1,182 @@
+"""
+Pinned read snapshots for reports and other multi-request reads.
+
+Every API request already reads one committed state: its read-only session
+is a single transaction (see `adpulse.database.create_sqlite_engine`), whose
+data version comes back in the `X-AdPulse-Data-Version` header.
+
+A snapshot keeps such a session open across requests. `POST /snapshots`
+begins a read transaction on a connection of its own and returns an id.
+Requests that send the id in the `X-AdPulse-Snapshot` header then read
+through that session. In WAL mode it keeps seeing the database as of that
+moment, whatever commits later, and it never blocks the writer. The cost is
+that checkpoints cannot recycle the WAL past an open snapshot, so snapshots
+expire after `ttl_seconds` and at most `max_open` exist at once.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from adpulse.api.utils import session_schema_version
+from adpulse.storage.migrations import DATA_VERSION_SCHEMA_VERSION
+from adpulse.storage.versions import DATA_VERSION_SQL
+
+class SnapshotLimitReached(RuntimeError):
+    """Raised when `max_open` snapshots are already open."""
+
+
+class UnknownSnapshot(LookupError):
+    """Raised when a snapshot id is unknown, closed or expired."""
+
+
+def read_data_version(session: Session) -> int:
+    """
+    The data version `session` reads; its first query also starts the read transaction.
+
+    Databases whose migrations wait for `adpulse dedupe` have no counter yet.
+    Nothing can be written to them until then, so they stay at version 0.
+    """
+    if session_schema_version(session) < DATA_VERSION_SCHEMA_VERSION:
+        return 0
+    return int(session.execute(text(DATA_VERSION_SQL)).scalar_one())
+
+
+@dataclass
+class Snapshot:
+    snapshot_id: str
+    data_version: int
+    session: Session
+    created_at: datetime
+    expires_at: datetime
+    # Held while a request reads through the session; sessions are not thread-safe.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def expired(self) -> bool:
+        return datetime.now(timezone.utc) >= self.expires_at
+
+
+class SnapshotRegistry:
+    """
+    Open snapshots of one database, on sessions from `session_factory`.
+
+    Expired snapshots are closed lazily, whenever the registry is used, unless
+    a request is still reading through them.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], ttl_seconds: float = 300.0, max_open: int = 16) -> None:
+        if ttl_seconds <= 0 or max_open < 1:
+            raise ValueError("ttl_seconds and max_open must be positive")
+        self.session_factory = session_factory
+        self.ttl_seconds = ttl_seconds
+        self.max_open = max_open
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def open(self) -> Snapshot:
+        """Pin the latest committed state and return its snapshot."""
+        self.expire()
+        with self._lock:
+            if len(self._snapshots) >= self.max_open:
+                raise SnapshotLimitReached(f"{len(self._snapshots)} snapshots are already open; retry later")
+            session = self.session_factory()
+            try:
+                version = read_data_version(session)
+            except BaseException:
+                session.close()
+                raise
+            now = datetime.now(timezone.utc)
+            snapshot = Snapshot(uuid.uuid4().hex, version, session, now, now + timedelta(seconds=self.ttl_seconds))
+            self._snapshots[snapshot.snapshot_id] = snapshot
+        return snapshot
+
+    def get(self, snapshot_id: str) -> Optional[Snapshot]:
+        """The open snapshot `snapshot_id`, or None when it is unknown, closed or expired."""
+        self.expire()
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    def acquire(self, snapshot_id: str) -> Optional[Snapshot]:
+        """Like `get`, but holds the snapshot for one request until `release`."""
+        snapshot = self.get(snapshot_id)
+        if snapshot is None:
+            return None
+        snapshot.lock.acquire()
+        with self._lock:
+            if self._snapshots.get(snapshot_id) is snapshot:
+                return snapshot
+        # Closed or expired while this request waited for it.
+        snapshot.lock.release()
+        return None
+
+    def release(self, snapshot: Snapshot) -> None:
+        snapshot.lock.release()
+
+    @contextmanager
+    def reading(self, snapshot_id: Optional[str] = None) -> Iterator[Tuple[Session, int]]:
+        """
+        A session inside one read transaction, with the data version it reads.
+
+        That is the pinned session of `snapshot_id`, held for the duration, or
+        else a new one from `session_factory`, closed afterwards. Raises
+        `UnknownSnapshot` for an id that is not open.
+        """
+        if snapshot_id:
+            snapshot = self.acquire(snapshot_id)
+            if snapshot is None:
+                raise UnknownSnapshot(f"Unknown or expired snapshot '{snapshot_id}'")
+            try:
+                yield snapshot.session, snapshot.data_version
+            finally:
+                self.release(snapshot)
+                if not snapshot.session.in_transaction():
+                    # Something ended the pinned transaction; later reads must not drift to newer data.
+                    self.close(snapshot_id)
+            return
+        session = self.session_factory()
+        try:
+            yield session, read_data_version(session)
+        finally:
+            session.close()
+
+    def close(self, snapshot_id: str) -> bool:
+        """End the snapshot's read transaction; False when it was not open."""
+        with self._lock:
+            snapshot = self._snapshots.pop(snapshot_id, None)
+        if snapshot is None:
+            return False
+        with snapshot.lock:
+            snapshot.session.close()
+        return True
+
+    def expire(self) -> None:
+        with self._lock:
+            # Snapshots a request is reading through stay until it is done.
+            expired = [
+                snapshot
+                for snapshot in self._snapshots.values()
+                if snapshot.expired and snapshot.lock.acquire(blocking=False)
+            ]
+            for snapshot in expired:
+                del self._snapshots[snapshot.snapshot_id]
+        for snapshot in expired:
+            snapshot.session.close()
+            snapshot.lock.release()
+
+    def close_all(self) -> None:
+        with self._lock:
+            snapshot_ids = list(self._snapshots)
+        for snapshot_id in snapshot_ids:
+            self.close(snapshot_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._snapshots)
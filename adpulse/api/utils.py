@@ -6,23 +6,51 @@ from __future__ import annotations
 from datetime import date
 from typing import Optional
 
-from sqlalchemy.orm import Query
+from sqlalchemy import text
+from sqlalchemy.orm import Query, Session
 
 from adpulse.models import AdPerformance
+from adpulse.storage.dimensions import day_key
 
 
 def apply_date_filters(
     query: Query,
     start_date: Optional[date],
     end_date: Optional[date],
+    model: type = AdPerformance,
+    by_day: bool = True,
 ) -> Query:
+    """
+    Restrict `query` to event dates in [start_date, end_date] on `model` (raw rows or a daily rollup).
+
+    Filters go on the integer `day` key, which the views expose straight from
+    the indexed tables; `event_date` is computed there and would force a scan.
+    Before the star schema (`by_day=False`) the rollups are plain tables
+    without `day`, keyed by their ISO `event_date` text instead.
+    """
+    if not by_day:
+        if start_date:
+            query = query.filter(model.event_date >= start_date.isoformat())
+        if end_date:
+            query = query.filter(model.event_date <= end_date.isoformat())
+        return query
     if start_date:
-        query = query.filter(AdPerformance.event_date >= start_date.isoformat())
+        query = query.filter(model.day >= day_key(start_date.isoformat()))
     if end_date:
-        query = query.filter(AdPerformance.event_date <= end_date.isoformat())
+        query = query.filter(model.day <= day_key(end_date.isoformat()))
     return query
 
 
+def session_schema_version(db: Session) -> int:
+    """
+    The schema version `db` reads (see `adpulse.storage.migrations`).
+
+    Migrations from the star schema on wait for `adpulse dedupe` when the
+    legacy table holds duplicate keys, so readers check before using them.
+    """
+    return int(db.execute(text("PRAGMA user_version")).scalar_one())
+
+
 def calc_ctr(clicks: int, impressions: int) -> float:
     return round(clicks / impressions, 4) if impressions else 0.0
 
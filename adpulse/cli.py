@@ -3,43 +3,226 @@ Typer-based CLI for AdPulse operations.
 """
 from __future__ import annotations
 
+import time
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional
 
+import click
 import typer
 from tabulate import tabulate
 
 from adpulse.config import Settings, load_settings
 from adpulse.connectors.registry import build_default_registry
 from adpulse.ingestion.data_ingestor import DataIngestor
-from adpulse.reporting import build_weekly_report, send_report_via_email
+from adpulse.storage.backend import WRITE_MODES, open_backend
 from adpulse.storage.database import DatabaseManager
 
 app = typer.Typer(help="AdPulse CLI (ingestion, reporting)")
 
+# Rejects unknown --mode values with a usage error instead of a traceback from the writer.
+MODE_CHOICE = click.Choice(WRITE_MODES)
 
-def _build_ingestor(settings: Settings | None = None) -> DataIngestor:
+
+def _build_ingestor(
+    settings: Settings | None = None,
+    batch_size: int | None = None,
+    commit_per_batch: bool = True,
+    columnar: bool = False,
+    mode: str | None = None,
+    bulk: bool = False,
+) -> DataIngestor:
     settings = settings or load_settings()
     registry = build_default_registry()
-    database = DatabaseManager(settings.db_path)
-    return DataIngestor(registry, database)
+    database = open_backend(settings, bulk_load=bulk)
+    return DataIngestor(
+        registry,
+        database,
+        batch_size=batch_size or settings.ingest_batch_size,
+        commit_per_batch=commit_per_batch,
+        columnar=columnar,
+        mode=mode or settings.ingest_mode,
+    )
+
+
+def _sqlite_database(settings: Settings, command: str) -> DatabaseManager:
+    """The SQLite database for maintenance commands that only the SQLite backend implements."""
+    if settings.storage_backend != "sqlite":
+        typer.secho(
+            f"`adpulse {command}` requires the SQLite backend (ADPULSE_STORAGE_BACKEND is "
+            f"'{settings.storage_backend}')",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=2)
+    return DatabaseManager(settings.db_path)
 
 
 @app.command()
 def load(
     platform: str = typer.Argument(..., help="Platform slug (google, meta, tiktok)"),
     csv_path: Path = typer.Argument(..., exists=True, readable=True),
+    batch_size: Optional[int] = typer.Option(
+        None, min=1, help="Rows per insert chunk (defaults to ADPULSE_INGEST_BATCH_SIZE or 5000)"
+    ),
+    commit_per_batch: bool = typer.Option(
+        True,
+        "--commit-per-batch/--commit-per-file",
+        help="Commit after every chunk, or wrap the whole file in one transaction",
+    ),
+    columnar: bool = typer.Option(False, help="Normalize whole column chunks with pandas (faster on large files)"),
+    mode: Optional[str] = typer.Option(
+        None, click_type=MODE_CHOICE, help="Upsert semantics for existing rows: replace (default) or accumulate"
+    ),
+    force: bool = typer.Option(False, help="Reload the whole file even if the ingest manifest says it is loaded"),
+    bulk: bool = typer.Option(
+        False, help="Stage rows and merge them in one set-based statement (fastest for large loads)"
+    ),
 ) -> None:
     """
     Load a CSV file for the specified platform into the SQLite database.
     """
-    ingestor = _build_ingestor()
-    report = ingestor.ingest_file(platform, csv_path)
+    ingestor = _build_ingestor(
+        batch_size=batch_size,
+        commit_per_batch=commit_per_batch,
+        columnar=columnar,
+        mode=mode,
+        bulk=bulk,
+    )
+    report = ingestor.ingest_file(platform, csv_path, force=force)
+    if report.action == "skip":
+        typer.echo(f"[{report.platform}] {csv_path} is unchanged since the last load; skipped (use --force to reload).")
+        return
+    resumed = {"resume": " (resumed)", "tail": " (appended tail)"}.get(report.action, "")
     typer.secho(
-        f"[{report.platform}] Ingested {report.rows_ingested} rows from {csv_path}",
+        f"[{report.platform}] Ingested {report.rows_ingested} rows{resumed} from {csv_path} "
+        f"in {report.elapsed_seconds:.2f}s ({report.rows_per_second:,.0f} rows/sec)",
         fg=typer.colors.GREEN,
     )
+    stats = ingestor.resolver.stats()
+    typer.echo(f"Campaign id cache: {stats['hits']} hits, {stats['misses']} misses, {stats['size']} cached")
+
+
+@app.command("load-dir")
+def load_dir(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, readable=True),
+    pattern: str = typer.Option("*.csv", help="Glob used to pick files inside the directory"),
+    platform: Optional[str] = typer.Option(
+        None, help="Force one platform slug instead of detecting it from each file's header"
+    ),
+    workers: Optional[int] = typer.Option(None, min=1, help="Worker processes (defaults to CPU count)"),
+    batch_size: Optional[int] = typer.Option(None, min=1, help="Rows per insert chunk"),
+    columnar: bool = typer.Option(False, help="Normalize whole column chunks with pandas"),
+    mode: Optional[str] = typer.Option(
+        None, click_type=MODE_CHOICE, help="Upsert semantics: replace (default) or accumulate"
+    ),
+    force: bool = typer.Option(False, help="Reload every file, ignoring the ingest manifest"),
+    bulk: bool = typer.Option(False, help="Stage rows and merge them in one set-based statement"),
+) -> None:
+    """
+    Load every matching export in a directory, normalizing files in parallel.
+    """
+    files = sorted(path for path in directory.glob(pattern) if path.is_file())
+    if not files:
+        typer.echo(f"No files matching {pattern} under {directory}.")
+        raise typer.Exit(code=0)
+
+    ingestor = _build_ingestor(batch_size=batch_size, columnar=columnar, mode=mode, bulk=bulk)
+    result = ingestor.ingest_many(files, platform_slug=platform, workers=workers, force=force)
+    table = tabulate(
+        [
+            [
+                report.source_file.name,
+                report.platform,
+                report.action,
+                report.rows_ingested,
+                f"{report.rows_per_second:,.0f}",
+                report.error or "ok",
+            ]
+            for report in result.reports
+        ],
+        headers=["File", "Platform", "Action", "Rows", "Rows/sec", "Status"],
+        tablefmt="github",
+    )
+    typer.echo(table)
+    typer.secho(
+        f"\nIngested {result.rows_ingested} rows from {len(result.reports)} files "
+        f"in {result.elapsed_seconds:.2f}s ({result.rows_per_second:,.0f} rows/sec)",
+        fg=typer.colors.RED if result.failures else typer.colors.GREEN,
+    )
+    if result.failures:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def watch(
+    directory: Path = typer.Argument(..., exists=True, file_okay=False, readable=True),
+    platform: Optional[str] = typer.Option(
+        None, help="Force one platform slug instead of detecting it from each file's header"
+    ),
+    pattern: str = typer.Option("*", help="Glob that file names must match"),
+    settle_seconds: float = typer.Option(
+        2.0, min=0, help="When polling, how long a file's size must stay unchanged before it is loaded"
+    ),
+    poll_interval: float = typer.Option(1.0, min=0.01, help="Seconds between directory scans"),
+    max_batch_files: int = typer.Option(100, min=1, help="Most files committed in one transaction"),
+    inotify: Optional[bool] = typer.Option(
+        None, "--inotify/--polling", help="Force inotify or polling (default: inotify when available)"
+    ),
+    status_file: Optional[Path] = typer.Option(
+        None, help="Rewrite this JSON file with queue depth and ingest lag after every batch"
+    ),
+    once: bool = typer.Option(False, help="Load the files already present, then exit"),
+    batch_size: Optional[int] = typer.Option(None, min=1, help="Rows per insert chunk"),
+    columnar: bool = typer.Option(False, help="Normalize whole column chunks with pandas"),
+    mode: Optional[str] = typer.Option(
+        None, click_type=MODE_CHOICE, help="Upsert semantics: replace (default) or accumulate"
+    ),
+) -> None:
+    """
+    Keep loading exports as they land in a directory, committing them in micro-batches.
+    """
+    import signal
+    import threading
+
+    from adpulse.ingestion.watcher import FolderWatcher
+
+    ingestor = _build_ingestor(batch_size=batch_size, columnar=columnar, mode=mode)
+    watcher = FolderWatcher(
+        ingestor,
+        directory,
+        platform=platform,
+        pattern=pattern,
+        settle_seconds=settle_seconds,
+        poll_interval=poll_interval,
+        max_batch_files=max_batch_files,
+        use_inotify=inotify,
+        status_file=status_file,
+    )
+
+    def report_batch(reports) -> None:
+        for report in reports:
+            if report.error:
+                typer.secho(f"[{report.platform}] {report.source_file.name}: {report.error}", fg=typer.colors.RED)
+            elif report.action != "skip":
+                typer.echo(f"[{report.platform}] {report.source_file.name}: {report.rows_ingested} rows ({report.action})")
+        stats = watcher.stats
+        lag = f"{stats.last_lag_seconds:.2f}s" if stats.last_lag_seconds is not None else "n/a"
+        typer.secho(
+            f"Committed {len(reports)} files | queue {stats.queue_depth} | lag {lag} | "
+            f"{stats.rows_ingested} rows, {stats.failures} failures so far",
+            fg=typer.colors.GREEN,
+        )
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    if not once:
+        typer.echo(f"Watching {directory} for {pattern} (Ctrl+C to stop) ...")
+    try:
+        watcher.run(stop_event=stop, once=once, on_batch=report_batch)
+    except KeyboardInterrupt:
+        pass
+    if watcher.stats.failures:
+        raise typer.Exit(code=1)
 
 
 @app.command()
@@ -91,6 +274,135 @@ def verify() -> None:
     typer.echo(f"ad_performance rows: {count}")
 
 
+@app.command()
+def dedupe(
+    strategy: str = typer.Option("latest", help="latest: keep the newest row per key; sum: add duplicates up"),
+    vacuum: bool = typer.Option(True, help="Run VACUUM afterwards to reclaim space"),
+) -> None:
+    """
+    One-off compaction of duplicate (platform, campaign, date) rows left by older loads.
+    """
+    database = _sqlite_database(load_settings(), "dedupe")
+    before, after = database.deduplicate(strategy=strategy, vacuum=vacuum)
+    typer.secho(
+        f"ad_performance compacted from {before} to {after} rows ({before - after} duplicates removed)",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command("rebuild-rollups")
+def rebuild_rollups(
+    workers: Optional[int] = typer.Option(None, min=1, help="Reader threads (defaults to one per platform)"),
+) -> None:
+    """
+    Recompute the daily platform rollup from the fact table.
+    """
+    database = _sqlite_database(load_settings(), "rebuild-rollups")
+    started = time.perf_counter()
+    rows = database.rebuild_rollups(workers=workers)
+    typer.secho(
+        f"Rebuilt {rows} platform-day rollup rows in {time.perf_counter() - started:.2f}s",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command()
+def archive(
+    before: Optional[str] = typer.Option(
+        None, help="Archive the months that end before this date's month, YYYY-MM-DD (default: today)"
+    ),
+    archive_dir: Optional[Path] = typer.Option(
+        None, help="Parquet archive root (defaults to ADPULSE_ARCHIVE_DIR or an archive/ dir next to the database)"
+    ),
+    vacuum: bool = typer.Option(True, help="Run VACUUM afterwards so the database file shrinks"),
+) -> None:
+    """
+    Move closed months out of SQLite into Parquet partitions per platform and month.
+    """
+    settings = load_settings()
+    cutoff = datetime.fromisoformat(before).date() if before else date.today()
+    target = archive_dir or settings.archive_dir or settings.db_path.parent / "archive"
+    database = _sqlite_database(settings, "archive")
+    started = time.perf_counter()
+    partitions = database.archive_months(target, cutoff, vacuum=vacuum)
+    if not partitions:
+        typer.echo(f"Nothing to archive before {cutoff.replace(day=1)}.")
+        return
+    typer.secho(
+        f"Archived {sum(partition.row_count for partition in partitions)} rows in {len(partitions)} "
+        f"platform-month partitions to {target} in {time.perf_counter() - started:.2f}s",
+        fg=typer.colors.GREEN,
+    )
+
+
+@app.command()
+def compact(
+    policy: Optional[str] = typer.Option(
+        None, help='Retention tiers, e.g. "daily:400,weekly:730,monthly" (defaults to ADPULSE_RETENTION_POLICY)'
+    ),
+    interval: Optional[float] = typer.Option(
+        None, min=1, help="Keep running and compact again every this many seconds"
+    ),
+    vacuum: bool = typer.Option(True, help="Return freed pages to the filesystem with PRAGMA incremental_vacuum"),
+) -> None:
+    """
+    Fold facts older than each retention tier into weekly/monthly buckets.
+    """
+    import signal
+    import threading
+
+    from adpulse.storage.retention import RetentionPolicy
+
+    settings = load_settings()
+    try:
+        retention = RetentionPolicy.parse(policy or settings.retention_policy)
+    except ValueError as exc:
+        typer.secho(str(exc), fg=typer.colors.RED)
+        raise typer.Exit(code=2)
+    database = _sqlite_database(settings, "compact")
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        while True:
+            started = time.perf_counter()
+            report = database.compact(retention, vacuum=vacuum)
+            typer.secho(
+                f"[{retention}] folded {report.rows_folded} rows into {report.buckets_written} buckets, "
+                f"deleted {report.rows_deleted} in {report.transactions} transactions "
+                f"({time.perf_counter() - started:.2f}s)",
+                fg=typer.colors.GREEN,
+            )
+            if interval is None or stop.wait(interval):
+                break
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("migrate-duckdb")
+def migrate_duckdb(
+    duckdb_path: Optional[Path] = typer.Option(
+        None, help="Target DuckDB file (defaults to ADPULSE_DUCKDB_PATH or data/adpulse.duckdb)"
+    ),
+) -> None:
+    """
+    Copy the SQLite database into a DuckDB file, replacing what the file held.
+    """
+    from adpulse.storage.duckdb_backend import DuckDBBackend
+
+    settings = load_settings()
+    target = DuckDBBackend(duckdb_path or settings.duckdb_path)
+    started = time.perf_counter()
+    try:
+        rows = target.copy_from_sqlite(DatabaseManager(settings.db_path))
+    finally:
+        target.close()
+    typer.secho(
+        f"Copied {rows} rows from {settings.db_path} to {target.db_path} in {time.perf_counter() - started:.2f}s. "
+        "Set ADPULSE_STORAGE_BACKEND=duckdb (and ADPULSE_DUCKDB_PATH if needed) to use it.",
+        fg=typer.colors.GREEN,
+    )
+
+
 @app.command("generate-report")
 def generate_report_cmd(
     start_date: str = typer.Option(..., help="Report start date YYYY-MM-DD"),
@@ -100,6 +412,9 @@ def generate_report_cmd(
     """
     Build a PDF report for the provided date window (Module 5).
     """
+    # reportlab is slow to import; only pay for it when a report is built.
+    from adpulse.reporting import build_weekly_report, send_report_via_email
+
     start = datetime.fromisoformat(start_date).date()
     end = datetime.fromisoformat(end_date).date()
     typer.echo(f"Building report for {start} to {end} ...")
@@ -4,8 +4,10 @@ Configuration helpers for the AdPulse ingestion module.
 from __future__ import annotations
 
 import os
+import tempfile
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -13,6 +15,20 @@ DATA_DIR = PROJECT_ROOT / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 DEFAULT_DB_PATH = DATA_DIR / "adpulse.db"
+DEFAULT_STORAGE_BACKEND = "sqlite"
+DEFAULT_DUCKDB_PATH = DATA_DIR / "adpulse.duckdb"
+DEFAULT_INGEST_BATCH_SIZE = 5_000
+DEFAULT_INGEST_MODE = "replace"
+DEFAULT_INGEST_WORKERS = 2
+DEFAULT_INGEST_MAX_PENDING = 16
+DEFAULT_INGEST_SPOOL_DIR = Path(tempfile.gettempdir()) / "adpulse-uploads"
+DEFAULT_DB_BUSY_TIMEOUT = 30.0  # seconds a connection waits for a lock before "database is locked"
+DEFAULT_DB_POOL_SIZE = 8
+DEFAULT_DB_CACHE_SIZE_KIB = 65_536
+DEFAULT_DB_MMAP_SIZE = 268_435_456  # 256 MiB
+DEFAULT_RETENTION_POLICY = "daily:400,weekly:730,monthly"  # see adpulse.storage.retention
+DEFAULT_SNAPSHOT_TTL = 300.0  # seconds a pinned read snapshot stays open (see adpulse.api.snapshots)
+DEFAULT_SNAPSHOT_MAX_OPEN = 16
 
 
 @dataclass(frozen=True)
@@ -20,15 +36,79 @@ class Settings:
     """Container for runtime configuration."""
 
     db_path: Path = DEFAULT_DB_PATH
+    storage_backend: str = DEFAULT_STORAGE_BACKEND
+    duckdb_path: Path = DEFAULT_DUCKDB_PATH
+    # Parquet cold tier; None puts it in an archive/ directory next to db_path.
+    archive_dir: Optional[Path] = None
+    ingest_batch_size: int = DEFAULT_INGEST_BATCH_SIZE
+    ingest_mode: str = DEFAULT_INGEST_MODE
+    ingest_workers: int = DEFAULT_INGEST_WORKERS
+    ingest_max_pending: int = DEFAULT_INGEST_MAX_PENDING
+    ingest_spool_dir: Path = DEFAULT_INGEST_SPOOL_DIR
+    db_busy_timeout: float = DEFAULT_DB_BUSY_TIMEOUT
+    db_pool_size: int = DEFAULT_DB_POOL_SIZE
+    db_cache_size_kib: int = DEFAULT_DB_CACHE_SIZE_KIB
+    db_mmap_size: int = DEFAULT_DB_MMAP_SIZE
+    retention_policy: str = DEFAULT_RETENTION_POLICY
+    snapshot_ttl: float = DEFAULT_SNAPSHOT_TTL
+    snapshot_max_open: int = DEFAULT_SNAPSHOT_MAX_OPEN
 
 
 def load_settings() -> Settings:
     """
     Return the Settings object, honoring environment overrides.
     """
+    overrides: dict = {}
     db_path_env = os.getenv("ADPULSE_DB_PATH")
     if db_path_env:
         db_path = Path(db_path_env).expanduser()
         db_path.parent.mkdir(parents=True, exist_ok=True)
-        return Settings(db_path=db_path)
-    return Settings()
+        overrides["db_path"] = db_path
+    backend_env = os.getenv("ADPULSE_STORAGE_BACKEND")
+    if backend_env:
+        overrides["storage_backend"] = backend_env.lower()
+    duckdb_path_env = os.getenv("ADPULSE_DUCKDB_PATH")
+    if duckdb_path_env:
+        duckdb_path = Path(duckdb_path_env).expanduser()
+        duckdb_path.parent.mkdir(parents=True, exist_ok=True)
+        overrides["duckdb_path"] = duckdb_path
+    archive_dir_env = os.getenv("ADPULSE_ARCHIVE_DIR")
+    if archive_dir_env:
+        overrides["archive_dir"] = Path(archive_dir_env).expanduser()
+    batch_size_env = os.getenv("ADPULSE_INGEST_BATCH_SIZE")
+    if batch_size_env:
+        overrides["ingest_batch_size"] = int(batch_size_env)
+    mode_env = os.getenv("ADPULSE_INGEST_MODE")
+    if mode_env:
+        overrides["ingest_mode"] = mode_env.lower()
+    workers_env = os.getenv("ADPULSE_INGEST_WORKERS")
+    if workers_env:
+        overrides["ingest_workers"] = int(workers_env)
+    max_pending_env = os.getenv("ADPULSE_INGEST_MAX_PENDING")
+    if max_pending_env:
+        overrides["ingest_max_pending"] = int(max_pending_env)
+    spool_dir_env = os.getenv("ADPULSE_INGEST_SPOOL_DIR")
+    if spool_dir_env:
+        overrides["ingest_spool_dir"] = Path(spool_dir_env).expanduser()
+    busy_timeout_env = os.getenv("ADPULSE_DB_BUSY_TIMEOUT")
+    if busy_timeout_env:
+        overrides["db_busy_timeout"] = float(busy_timeout_env)
+    pool_size_env = os.getenv("ADPULSE_DB_POOL_SIZE")
+    if pool_size_env:
+        overrides["db_pool_size"] = int(pool_size_env)
+    cache_size_env = os.getenv("ADPULSE_DB_CACHE_SIZE_KIB")
+    if cache_size_env:
+        overrides["db_cache_size_kib"] = int(cache_size_env)
+    mmap_size_env = os.getenv("ADPULSE_DB_MMAP_SIZE")
+    if mmap_size_env:
+        overrides["db_mmap_size"] = int(mmap_size_env)
+    retention_env = os.getenv("ADPULSE_RETENTION_POLICY")
+    if retention_env:
+        overrides["retention_policy"] = retention_env
+    snapshot_ttl_env = os.getenv("ADPULSE_SNAPSHOT_TTL")
+    if snapshot_ttl_env:
+        overrides["snapshot_ttl"] = float(snapshot_ttl_env)
+    snapshot_max_open_env = os.getenv("ADPULSE_SNAPSHOT_MAX_OPEN")
+    if snapshot_max_open_env:
+        overrides["snapshot_max_open"] = int(snapshot_max_open_env)
+    return Settings(**overrides)
@@ -1,15 +1,33 @@
 """
 Connector exports.
+
+Platform connectors are imported on first attribute access, so importing
+`adpulse.connectors.registry` does not load every platform.
 """
-from .google_ads import GoogleAdsCSVConnector
-from .meta_ads import MetaAdsCSVConnector
-from .registry import ConnectorRegistry, build_default_registry
-from .tiktok_ads import TikTokAdsCSVConnector
+from importlib import import_module
+
+from .registry import ConnectorDescriptor, ConnectorRegistry, build_default_registry
+
+_LAZY_EXPORTS = {
+    "GoogleAdsCSVConnector": ".google_ads",
+    "MetaAdsCSVConnector": ".meta_ads",
+    "TikTokAdsCSVConnector": ".tiktok_ads",
+    "ConnectorSpec": ".spec",
+}
 
 __all__ = [
     "GoogleAdsCSVConnector",
     "MetaAdsCSVConnector",
     "TikTokAdsCSVConnector",
+    "ConnectorDescriptor",
     "ConnectorRegistry",
+    "ConnectorSpec",
     "build_default_registry",
 ]
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
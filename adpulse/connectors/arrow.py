@@ -0,0 +1,276 @@
+"""
+Parquet and Arrow IPC connectors.
+
+Warehouse exports arrive typed and columnar, so there is no text to parse:
+these connectors read one row group / record batch at a time, project only
+the columns a platform's mapping knows about, and normalize whole Arrow
+arrays into `RecordBatch`es. Header aliases, revenue fallbacks and campaign
+id rules come from the wrapped CSV connector, so a Parquet file with the
+same column names as a platform's CSV export yields the same rows.
+"""
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence
+
+from adpulse.connectors.base import BaseConnector, CSVConnector
+from adpulse.ingestion.columnar import (
+    DEFAULT_CHUNK_SIZE,
+    _clean_money,
+    _map_unique,
+    _require_pandas,
+    _to_float,
+    _to_int,
+)
+from adpulse.ingestion.compression import CsvSource, is_stream
+from adpulse.ingestion.schema import (
+    UNKNOWN_CAMPAIGN,
+    DateParseFn,
+    DateParser,
+    NormalizedRecord,
+    RecordBatch,
+    parse_date,
+)
+from adpulse.utils import require_optional
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import pyarrow as pa
+
+ARROW_FORMATS = ("parquet", "arrow")
+
+_require_pyarrow = partial(
+    require_optional, "pyarrow", "pyarrow.compute", feature="Parquet/Arrow ingestion", install="'adpulse[arrow]'"
+)
+
+
+def _open_source(source: CsvSource):
+    pa, _ = _require_pyarrow()
+    return source if is_stream(source) else pa.memory_map(str(source), "r")
+
+
+def iter_arrow_batches(
+    source: CsvSource,
+    source_format: str,
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator["pa.RecordBatch"]:
+    """Lazily yield record batches of at most `chunk_size` rows, reading only `columns`."""
+    pa, _ = _require_pyarrow()
+    if source_format == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(_open_source(source))
+        yield from parquet_file.iter_batches(batch_size=chunk_size, columns=columns)
+        return
+    handle = _open_source(source)
+    try:
+        reader = pa.ipc.open_file(handle)
+        batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+    except pa.ArrowInvalid:
+        handle.seek(0)
+        batches = iter(pa.ipc.open_stream(handle))
+    for batch in batches:
+        if columns is not None:
+            batch = batch.select([name for name in columns if name in batch.schema.names])
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size)
+
+
+def read_arrow_schema_names(source: CsvSource, source_format: str) -> List[str]:
+    pa, _ = _require_pyarrow()
+    if source_format == "parquet":
+        import pyarrow.parquet as pq
+
+        return list(pq.ParquetFile(_open_source(source)).schema_arrow.names)
+    handle = _open_source(source)
+    try:
+        return list(pa.ipc.open_file(handle).schema.names)
+    except pa.ArrowInvalid:
+        handle.seek(0)
+        return list(pa.ipc.open_stream(handle).schema.names)
+
+
+def _blank_as_null(array: Any, strip: bool = False) -> Any:
+    """Turn empty strings (whitespace-only too with `strip`) into nulls; decode dictionaries."""
+    pa, pc = _require_pyarrow()
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+        compared = pc.utf8_trim_whitespace(array) if strip else array
+        return pc.if_else(pc.equal(compared, ""), pa.scalar(None, array.type), array)
+    return array
+
+
+def _coalesce(batch: "pa.RecordBatch", names: Sequence[str]) -> Optional[Any]:
+    """Arrow equivalent of `row.get(a) or row.get(b)`: blanks and nulls fall through."""
+    pa, pc = _require_pyarrow()
+    arrays = [_blank_as_null(batch.column(name)) for name in names if name in batch.schema.names]
+    if not arrays:
+        return None
+    if len({array.type for array in arrays}) > 1:
+        arrays = [pc.cast(array, pa.string()) for array in arrays]
+    return arrays[0] if len(arrays) == 1 else pc.coalesce(*arrays)
+
+
+def _is_text(array: Any) -> bool:
+    pa, _ = _require_pyarrow()
+    return pa.types.is_string(array.type) or pa.types.is_large_string(array.type)
+
+
+def _text(array: Any) -> Any:
+    """Object array of strings with '' for nulls, as the CSV reader would produce."""
+    pa, pc = _require_pyarrow()
+    return pc.fill_null(pc.cast(array, pa.string()), "").to_numpy(zero_copy_only=False)
+
+
+def _floats(array: Optional[Any], length: int, money: bool = False) -> Any:
+    np, _ = _require_pandas()
+    if array is None:
+        return np.zeros(length, dtype=np.float64)
+    if _is_text(array):
+        values = _text(array)
+        return _to_float(_clean_money(values) if money else values)
+    _, pc = _require_pyarrow()
+    values = pc.fill_null(pc.cast(array, "float64"), 0.0).to_numpy(zero_copy_only=False, writable=True)
+    values[~np.isfinite(values)] = 0.0
+    return values
+
+
+def _ints(array: Optional[Any], length: int) -> Any:
+    np, _ = _require_pandas()
+    pa, pc = _require_pyarrow()
+    if array is None:
+        return np.zeros(length, dtype=np.int64)
+    if _is_text(array):
+        return _to_int(_text(array))
+    if pa.types.is_integer(array.type) or pa.types.is_boolean(array.type):
+        return pc.fill_null(pc.cast(array, "int64"), 0).to_numpy(zero_copy_only=False)
+    return np.trunc(_floats(array, length)).astype(np.int64)
+
+
+def _iso_dates(array: Optional[Any]) -> Any:
+    pa, pc = _require_pyarrow()
+    if array is None or array.null_count:
+        raise ValueError("Date value is mandatory")
+    if _is_text(array):
+        date_parser = DateParser()
+        return _map_unique(_text(array), lambda value: date_parser(value).isoformat())
+    if pa.types.is_timestamp(array.type) or pa.types.is_date64(array.type):
+        array = pc.cast(array, pa.date32())
+    return _text(array)
+
+
+def _drop_blank_rows(batch: "pa.RecordBatch") -> "pa.RecordBatch":
+    """Drop rows whose cells are all null or blank, like `CSVConnector.iter_rows_from_lines`."""
+    _, pc = _require_pyarrow()
+    blank = None
+    for column in batch.columns:
+        missing = _blank_as_null(column, strip=True).is_null()
+        blank = missing if blank is None else pc.and_(blank, missing)
+    if blank is None or not pc.any(blank).as_py():
+        return batch
+    return batch.filter(pc.invert(blank))
+
+
+def normalize_arrow_batch(batch: "pa.RecordBatch", connector: "ArrowConnector") -> RecordBatch:
+    """Normalize one record batch with the same rules as `normalize_frame` for CSV chunks."""
+    np, _ = _require_pandas()
+    aliases = connector.column_aliases
+    batch = _drop_blank_rows(batch)
+    length = batch.num_rows
+
+    names_array = _coalesce(batch, aliases["campaign_name"])
+    names = _map_unique(
+        _text(names_array) if names_array is not None else np.full(length, "", dtype=object),
+        lambda value: (value or UNKNOWN_CAMPAIGN).strip(),
+    )
+    slug = connector.platform_slug
+    resolver = connector.identity_resolver
+    campaign_ids = _map_unique(names, lambda name: resolver.resolve(slug, name))
+    explicit = _coalesce(batch, aliases.get("campaign_id", ()))
+    if explicit is not None:
+        explicit_ids = _text(explicit)
+        has_explicit = explicit_ids != ""
+        if has_explicit.any():
+            campaign_ids[has_explicit] = _map_unique(explicit_ids[has_explicit], str.strip)
+
+    conversions = _ints(_coalesce(batch, aliases["conversions"]), length)
+    revenue = conversions * connector.default_conversion_value
+    for column in reversed(connector.revenue_columns):
+        if column in batch.schema.names:
+            values = _blank_as_null(batch.column(column))
+            present = values.is_valid().to_numpy(zero_copy_only=False)
+            revenue = np.where(present, _floats(values, length), revenue)
+
+    return RecordBatch(
+        platform=connector.platform_name,
+        campaign_id=campaign_ids,
+        campaign_name=names,
+        event_date=_iso_dates(_coalesce(batch, aliases["event_date"])),
+        impressions=_ints(_coalesce(batch, aliases["impressions"]), length),
+        clicks=_ints(_coalesce(batch, aliases["clicks"]), length),
+        spend=_floats(_coalesce(batch, aliases["spend"]), length, money="spend" in connector.money_fields),
+        conversions=conversions,
+        revenue=np.asarray(revenue, dtype=np.float64),
+    )
+
+
+class ArrowConnector(BaseConnector):
+    """
+    Reads Parquet or Arrow IPC files for the platform of the wrapped CSV connector.
+
+    Always loads through column batches; `iter_records` exists for callers
+    that want NormalizedRecord objects and is not used for bulk loads.
+    """
+
+    source_formats = ARROW_FORMATS
+    columnar_only = True
+
+    def __init__(self, csv_connector: CSVConnector) -> None:
+        self.csv_connector = csv_connector
+        self.platform_slug = csv_connector.platform_slug
+        self.platform_name = csv_connector.platform_name
+        self.column_aliases = csv_connector.column_aliases
+        self.revenue_columns = csv_connector.revenue_columns
+        self.money_fields = csv_connector.money_fields
+        self.default_conversion_value = csv_connector.default_conversion_value
+        super().__init__()
+
+    def match_score(self, header: Sequence[str]) -> int:
+        return self.csv_connector.match_score(header)
+
+    def known_columns(self) -> List[str]:
+        known = list(self.revenue_columns)
+        for aliases in self.column_aliases.values():
+            known.extend(aliases)
+        return known
+
+    def read_header(self, source: CsvSource) -> List[str]:
+        from adpulse.ingestion.compression import sniff_source_format
+
+        return read_arrow_schema_names(source, sniff_source_format(source))
+
+    def iter_column_batches(self, source: CsvSource, chunk_size: int | None = None) -> Iterator[RecordBatch]:
+        from adpulse.ingestion.compression import sniff_source_format
+
+        source_format = sniff_source_format(source)
+        if source_format not in ARROW_FORMATS:
+            raise ValueError(f"{source} is not a Parquet or Arrow IPC file")
+        known = set(self.known_columns())
+        batches = iter_arrow_batches(
+            source,
+            source_format,
+            columns=[name for name in self.read_header(source) if name in known],
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+        )
+        for batch in batches:
+            normalized = normalize_arrow_batch(batch, self)
+            if len(normalized):
+                yield normalized
+
+    def iter_records(self, source: CsvSource) -> Iterator[NormalizedRecord]:
+        for batch in self.iter_column_batches(source):
+            yield from batch
+
+    def normalize_row(self, row: dict[str, str], date_parser: DateParseFn = parse_date) -> NormalizedRecord:
+        return self.csv_connector.normalize_row(row, date_parser)
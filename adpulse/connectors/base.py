@@ -5,9 +5,12 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from adpulse.ingestion.schema import NormalizedRecord
+from adpulse.connectors.spec import DEFAULT_CONVERSION_VALUE, ConnectorSpec, RowNormalizer, compile_normalizer
+from adpulse.ingestion.compression import CsvSource, is_stream, iter_csv_text
+from adpulse.ingestion.schema import DateParseFn, DateParser, NormalizedRecord, RecordBatch, batch_records, parse_date
+from adpulse.utils import CampaignIdentityResolver, default_campaign_resolver
 
 
 class BaseConnector(ABC):
@@ -17,6 +20,12 @@ class BaseConnector(ABC):
 
     platform_slug: str
     platform_name: str
+    # File formats (see `adpulse.ingestion.compression.SOURCE_FORMATS`) this connector reads.
+    source_formats: Tuple[str, ...] = ("csv",)
+    # Connectors that only produce column batches load through them regardless of `--columnar`.
+    columnar_only: bool = False
+    # Shared by every connector so campaign ids are slugged once per process.
+    identity_resolver: CampaignIdentityResolver = default_campaign_resolver()
 
     def __init__(self) -> None:
         if not getattr(self, "platform_slug", None):
@@ -24,32 +33,210 @@ class BaseConnector(ABC):
         if not getattr(self, "platform_name", None):
             raise ValueError("Connector must define platform_name")
 
+    def match_score(self, header: Sequence[str]) -> int:
+        """
+        Return how well a file header fits this connector (0 = not this platform).
+
+        Used by `ConnectorRegistry.detect` to route files without an explicit platform.
+        """
+        return 0
+
+    def read_header(self, source: CsvSource) -> List[str]:
+        """Return the column names of `source`; used by `ConnectorRegistry.detect`."""
+        raise NotImplementedError(f"{type(self).__name__} cannot read headers")
+
+    def use_column_batches(self, requested: bool) -> bool:
+        """Whether a load should go through `iter_column_batches` instead of records."""
+        return self.columnar_only or (requested and hasattr(self, "iter_column_batches"))
+
     @abstractmethod
-    def load_file(self, source: Path | str) -> List[NormalizedRecord]:
+    def iter_records(self, source: CsvSource) -> Iterator[NormalizedRecord]:
+        """Lazily yield normalized records from the provided file (a path or binary file object)."""
+
+    def iter_record_batches(self, source: CsvSource, batch_size: int, columnar: bool = False) -> Iterator[RecordBatch]:
+        """
+        Yield the file's normalized rows as RecordBatches of at most `batch_size` rows.
+
+        Column batches are used when `use_column_batches(columnar)` allows it;
+        otherwise records are packed into typed columns as they are normalized.
+        """
+        if self.use_column_batches(columnar):
+            return self.iter_column_batches(source, chunk_size=batch_size)
+        return batch_records(self.iter_records(source), batch_size)
+
+    def load_file(self, source: CsvSource) -> List[NormalizedRecord]:
         """Return normalized records from the provided file."""
+        return list(self.iter_records(source))
 
     @abstractmethod
-    def normalize_rows(self, rows: Iterable[dict[str, str]]) -> List[NormalizedRecord]:
+    def normalize_row(self, row: dict[str, str], date_parser: DateParseFn = parse_date) -> NormalizedRecord:
         """
-        Transform raw source rows to NormalizedRecord instances.
+        Transform a single raw source row to a NormalizedRecord instance.
 
+        `date_parser` lets streaming callers share a per-file `DateParser`.
         Implementations can assume that missing/invalid fields raised upstream.
         """
 
+    def iter_normalized(self, rows: Iterable[dict[str, str]]) -> Iterator[NormalizedRecord]:
+        """Normalize rows one at a time so callers can stream arbitrarily large sources."""
+        date_parser = DateParser()
+        for row in rows:
+            yield self.normalize_row(row, date_parser)
+
+    def normalize_rows(self, rows: Iterable[dict[str, str]]) -> List[NormalizedRecord]:
+        """Transform raw source rows to NormalizedRecord instances."""
+        return list(self.iter_normalized(rows))
+
 
 class CSVConnector(BaseConnector):
     """
-    Convenience base class for CSV-based connectors.
+    CSV connector driven by a declarative `ConnectorSpec`.
+
+    Subclasses set `spec` (or pass one to the constructor); its header
+    aliases, money fields and revenue rules become `column_aliases`,
+    `money_fields` and `revenue_columns`, which the vectorized path in
+    `adpulse.ingestion.columnar` applies column-wise. Row by row, every file's
+    header is compiled once into a positional normalizer (see
+    `adpulse.connectors.spec`), so rows are never turned into dicts.
     """
 
-    def load_file(self, source: Path | str) -> List[NormalizedRecord]:
-        path = Path(source)
-        if not path.exists():
-            raise FileNotFoundError(f"CSV file not found: {path}")
+    spec: Optional[ConnectorSpec] = None
+    column_aliases: Dict[str, Tuple[str, ...]] = {}
+    revenue_columns: Tuple[str, ...] = ()
+    money_fields: Tuple[str, ...] = ()
+    default_conversion_value: float = DEFAULT_CONVERSION_VALUE
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if "spec" in cls.__dict__ and cls.spec is not None:
+            _apply_spec(cls, cls.spec)
+
+    def __init__(self, spec: Optional[ConnectorSpec] = None) -> None:
+        if spec is not None:
+            _apply_spec(self, spec)
+        super().__init__()
+        if self.spec is None:
+            raise ValueError(f"{type(self).__name__} needs a ConnectorSpec")
+        self._normalizers: Dict[Tuple[Optional[str], ...], RowNormalizer] = {}
+
+    def compile_normalizer(self, header: Sequence[Optional[str]]) -> RowNormalizer:
+        """The positional normalizer for rows laid out like `header`, compiled once per header."""
+        key = tuple(header)
+        normalizer = self._normalizers.get(key)
+        if normalizer is None:
+            normalizer = self._normalizers[key] = compile_normalizer(self.spec, key, self.identity_resolver.resolve)
+        return normalizer
+
+    def normalize_row(self, row: dict[str, str], date_parser: DateParseFn = parse_date) -> NormalizedRecord:
+        return self.compile_normalizer(tuple(row))(list(row.values()), date_parser)
+
+    def match_score(self, header: Sequence[str]) -> int:
+        columns = set(header)
+        required = (self.column_aliases.get("campaign_name", ()), self.column_aliases.get("event_date", ()))
+        if not all(columns.intersection(aliases) for aliases in required):
+            return 0
+        known = set(self.revenue_columns)
+        for aliases in self.column_aliases.values():
+            known.update(aliases)
+        return len(columns & known)
+
+    @staticmethod
+    def read_header(source: CsvSource) -> List[str]:
+        """Return the header row of a (possibly compressed) CSV without reading the rest of it."""
+        import csv
+
+        streams = iter_csv_text(source)
+        try:
+            first = next(streams, None)
+            return next(csv.reader(first), []) if first is not None else []
+        finally:
+            streams.close()
+
+    def iter_rows(self, source: CsvSource) -> Iterator[dict[str, str]]:
+        """
+        Yield non-blank CSV rows as dicts while keeping only one row in memory.
+
+        gzip/bz2/xz/zip inputs are detected by magic bytes and decoded on the
+        fly; every CSV member of a zip archive is read in turn.
+        """
+        if not is_stream(source):
+            path = Path(source)
+            if not path.exists():
+                raise FileNotFoundError(f"CSV file not found: {path}")
+        return self._read_rows(source)
+
+    def iter_records(self, source: CsvSource) -> Iterator[NormalizedRecord]:
+        if not is_stream(source):
+            path = Path(source)
+            if not path.exists():
+                raise FileNotFoundError(f"CSV file not found: {path}")
+        return self._read_records(source)
+
+    def iter_records_from_lines(
+        self, lines: Iterable[str], fieldnames: Sequence[str] | None = None
+    ) -> Iterator[NormalizedRecord]:
+        """
+        Normalize already-decoded CSV lines, skipping blank rows.
+
+        The header (or `fieldnames`, when `lines` starts after it) is compiled
+        into one normalizer up front; rows stay the lists `csv.reader` yields.
+        """
+        import csv
+
+        reader = csv.reader(lines)
+        header = list(fieldnames) if fieldnames is not None else next(reader, None)
+        if not header:
+            return
+        normalize = self.compile_normalizer(header)
+        date_parser = DateParser()
+        width = len(header)
+        # Cells csv.DictReader would keep: with a repeated header name only the last one counts.
+        columns = sorted({name: index for index, name in enumerate(header)}.values())
+        first_column = columns[0]
+        for row in reader:
+            if len(row) < width:
+                # csv.DictReader fills missing trailing cells with None.
+                row += [None] * (width - len(row))
+            first = row[first_column]
+            if (not first or first.isspace()) and not any(row[index] and row[index].strip() for index in columns):
+                continue
+            yield normalize(row, date_parser)
+
+    def iter_column_batches(self, source: CsvSource, chunk_size: int | None = None) -> Iterator[RecordBatch]:
+        """Yield RecordBatches with NumPy columns, normalized a whole chunk at a time (requires pandas)."""
+        from adpulse.ingestion.columnar import DEFAULT_CHUNK_SIZE, iter_column_batches
+
+        return iter_column_batches(self, source, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE)
+
+    @staticmethod
+    def iter_rows_from_lines(lines: Iterable[str], fieldnames: Sequence[str] | None = None) -> Iterator[dict[str, str]]:
+        """
+        Yield non-blank rows parsed from already-decoded CSV lines.
 
+        Pass `fieldnames` when `lines` starts after the header (resumed loads).
+        """
         import csv
 
-        with path.open("r", encoding="utf-8-sig") as handle:
-            reader = csv.DictReader(handle)
-            rows = [row for row in reader if any(value.strip() for value in row.values() if value)]
-        return self.normalize_rows(rows)
+        for row in csv.DictReader(lines, fieldnames=fieldnames):
+            if any(value.strip() for value in row.values() if value):
+                yield row
+
+    @classmethod
+    def _read_rows(cls, source: CsvSource) -> Iterator[dict[str, str]]:
+        for handle in iter_csv_text(source):
+            yield from cls.iter_rows_from_lines(handle)
+
+    def _read_records(self, source: CsvSource) -> Iterator[NormalizedRecord]:
+        # Zip members are compiled separately, since each has its own header.
+        for handle in iter_csv_text(source):
+            yield from self.iter_records_from_lines(handle)
+
+
+def _apply_spec(target, spec: ConnectorSpec) -> None:
+    target.spec = spec
+    target.platform_slug = spec.platform_slug
+    target.platform_name = spec.platform_name
+    target.column_aliases = dict(spec.columns)
+    target.revenue_columns = spec.revenue_columns
+    target.money_fields = spec.money_fields
+    target.default_conversion_value = spec.default_conversion_value
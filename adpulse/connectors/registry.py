@@ -1,49 +1,231 @@
 """
 Connector registry keeps track of supported ingestion sources.
+
+Connectors are registered as `ConnectorDescriptor`s, which say where a
+connector lives ("package.module:Attribute") without importing it. The module
+is imported the first time its slug is requested, so a command that only
+touches Google files never pays for the other platforms.
+
+Besides the built-in platforms, installed packages can add connectors
+through the `adpulse.connectors` entry-point group:
+
+    [project.entry-points."adpulse.connectors"]
+    bing = "adpulse_bing:BING_SPEC"
+
+The target is a `BaseConnector` subclass, a connector instance or a
+`ConnectorSpec`. Entry points are only scanned when a slug is not built in,
+or when every platform is needed (`detect`, `supported_platforms`).
+Built-in slugs cannot be shadowed by plugins; register a replacement
+explicitly instead.
 """
 from __future__ import annotations
 
-from typing import Dict, Iterable
+import importlib
+import logging
+import sys
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from adpulse.ingestion.compression import CsvSource, sniff_source_format
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from adpulse.connectors.base import BaseConnector
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "adpulse.connectors"
+
+BUILTIN_CONNECTORS = {
+    "google": "adpulse.connectors.google_ads:GoogleAdsCSVConnector",
+    "meta": "adpulse.connectors.meta_ads:MetaAdsCSVConnector",
+    "tiktok": "adpulse.connectors.tiktok_ads:TikTokAdsCSVConnector",
+}
+
+
+@dataclass(frozen=True)
+class ConnectorDescriptor:
+    """Where a platform's connector lives, without importing it."""
+
+    slug: str
+    target: str
+    origin: str = "builtin"
+
+    def load(self) -> "BaseConnector":
+        """Import the target and return a connector instance."""
+        from adpulse.connectors.base import BaseConnector, CSVConnector
+        from adpulse.connectors.spec import ConnectorSpec
+
+        module_name, _, attribute = self.target.partition(":")
+        loaded = importlib.import_module(module_name)
+        for name in filter(None, attribute.split(".")):
+            loaded = getattr(loaded, name)
+        if isinstance(loaded, ConnectorSpec):
+            loaded = CSVConnector(loaded)
+        elif isinstance(loaded, type) and issubclass(loaded, BaseConnector):
+            loaded = loaded()
+        if not isinstance(loaded, BaseConnector):
+            raise TypeError(f"{self.target} ({self.origin}) is not a connector class, instance or ConnectorSpec")
+        if loaded.platform_slug.lower() != self.slug:
+            raise ValueError(f"{self.target} is registered as '{self.slug}' but its slug is '{loaded.platform_slug}'")
+        return loaded
+
 
-from adpulse.connectors.base import BaseConnector
+def discover_connectors(group: str = ENTRY_POINT_GROUP) -> List[ConnectorDescriptor]:
+    """Descriptors for every connector advertised by installed packages."""
+    from importlib.metadata import entry_points
+
+    if sys.version_info >= (3, 10):
+        found = entry_points(group=group)
+    else:  # pragma: no cover - Python 3.9 returns a dict of groups
+        found = entry_points().get(group, ())
+    descriptors = []
+    for entry_point in found:
+        distribution = getattr(getattr(entry_point, "dist", None), "name", None)
+        descriptors.append(
+            ConnectorDescriptor(entry_point.name.lower(), entry_point.value, origin=distribution or "entry point")
+        )
+    return descriptors
 
 
 class ConnectorRegistry:
-    """Runtime container for connector implementations."""
+    """
+    Runtime container for connector implementations, keyed by platform and source format.
+
+    Connectors registered through descriptors are imported on first use. A
+    loaded CSV connector also serves Parquet/Arrow files through an
+    `ArrowConnector` with the same mapping.
+    """
 
-    def __init__(self) -> None:
-        self._connectors: Dict[str, BaseConnector] = {}
+    def __init__(self, entry_point_group: Optional[str] = None) -> None:
+        self._connectors: Dict[Tuple[str, str], BaseConnector] = {}
+        self._pending: Dict[str, ConnectorDescriptor] = {}
+        self._targets: Dict[str, str] = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+        self._lock = threading.RLock()
 
     def register(self, connector: BaseConnector) -> None:
         slug = connector.platform_slug.lower()
-        self._connectors[slug] = connector
+        with self._lock:
+            self._pending.pop(slug, None)
+            for source_format in connector.source_formats:
+                self._connectors[(slug, source_format)] = connector
+
+    def register_lazy(self, descriptor: ConnectorDescriptor) -> None:
+        """Add a platform whose connector is only imported when first requested."""
+        with self._lock:
+            if self._is_loaded(descriptor.slug):
+                raise ValueError(f"Connector '{descriptor.slug}' is already registered")
+            self._pending[descriptor.slug] = descriptor
+            self._targets[descriptor.slug] = descriptor.target
+
+    def _is_loaded(self, slug: str) -> bool:
+        return any(key[0] == slug for key in self._connectors)
+
+    def _load(self, slug: str) -> None:
+        with self._lock:
+            if slug not in self._pending and not self._is_loaded(slug):
+                self._discover()
+            descriptor = self._pending.get(slug)
+            if descriptor is None:
+                return
+            from adpulse.connectors.arrow import ArrowConnector
+            from adpulse.connectors.base import CSVConnector
 
-    def get(self, slug: str) -> BaseConnector:
+            connector = descriptor.load()
+            self.register(connector)
+            if isinstance(connector, CSVConnector):
+                self.register(ArrowConnector(connector))
+
+    def _load_all(self) -> None:
+        with self._lock:
+            self._discover()
+            for slug in list(self._pending):
+                self._load(slug)
+
+    def _discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        for descriptor in discover_connectors(self._entry_point_group):
+            if descriptor.slug in self._pending or self._is_loaded(descriptor.slug):
+                if self._targets.get(descriptor.slug) != descriptor.target:
+                    logger.warning(
+                        "Ignoring connector '%s' from %s: the slug is already registered",
+                        descriptor.slug,
+                        descriptor.origin,
+                    )
+                continue
+            self._pending[descriptor.slug] = descriptor
+            self._targets[descriptor.slug] = descriptor.target
+
+    def get(self, slug: str, source: Optional[CsvSource] = None) -> BaseConnector:
+        """
+        Return the connector for `slug`, picking the one that reads `source`'s format.
+
+        Without a source the CSV connector is returned.
+        """
         normalized = slug.lower()
-        if normalized not in self._connectors:
-            supported = ", ".join(sorted(self._connectors))
+        self._load(normalized)
+        if normalized not in self:
+            supported = ", ".join(self.supported_platforms())
             raise KeyError(f"Unsupported platform '{slug}'. Supported: {supported}")
-        return self._connectors[normalized]
+        source_format = sniff_source_format(source) if source is not None else "csv"
+        connector = self._connectors.get((normalized, source_format))
+        if connector is None:
+            raise KeyError(f"No {source_format} connector registered for platform '{slug}'")
+        return connector
+
+    def detect(self, source: CsvSource) -> BaseConnector:
+        """
+        Pick the connector whose known columns best match the file header.
+
+        Only connectors for the file's format (CSV, Parquet, Arrow) compete.
+        Raises ValueError when no connector recognizes the header or when two
+        connectors match equally well.
+        """
+        source_format = sniff_source_format(source)
+        self._load_all()
+        candidates = {
+            slug: connector for (slug, fmt), connector in self._connectors.items() if fmt == source_format
+        }
+        if not candidates:
+            raise ValueError(f"No connector reads {source_format} files like {source}")
+        header = next(iter(candidates.values())).read_header(source)
+        scores = sorted(
+            ((connector.match_score(header), slug) for slug, connector in candidates.items()),
+            reverse=True,
+        )
+        if not scores or scores[0][0] == 0:
+            raise ValueError(f"Could not detect the platform of {source} from its header: {header}")
+        if len(scores) > 1 and scores[0][0] == scores[1][0]:
+            raise ValueError(
+                f"Ambiguous header in {source}: matches both '{scores[0][1]}' and '{scores[1][1]}'"
+            )
+        return candidates[scores[0][1]]
 
     def supported_platforms(self) -> Iterable[str]:
-        return sorted(self._connectors)
+        with self._lock:
+            self._discover()
+            return sorted({slug for slug, _ in self._connectors} | set(self._pending))
 
     def __contains__(self, slug: str) -> bool:
-        return slug.lower() in self._connectors
+        normalized = slug.lower()
+        with self._lock:
+            if normalized not in self._pending and not self._is_loaded(normalized):
+                self._discover()
+            return normalized in self._pending or self._is_loaded(normalized)
 
 
-def build_default_registry() -> ConnectorRegistry:
+def build_default_registry(entry_point_group: Optional[str] = ENTRY_POINT_GROUP) -> ConnectorRegistry:
     """
-    Helper to lazily import connectors and register them.
+    Registry with the built-in platforms plus any installed connector plugins.
 
-    Avoid heavy imports at module import time for CLI responsiveness.
+    Nothing is imported until a platform is used, which keeps CLI start-up
+    and API workers fast however many connectors exist.
     """
-    from adpulse.connectors.google_ads import GoogleAdsCSVConnector
-    from adpulse.connectors.meta_ads import MetaAdsCSVConnector
-    from adpulse.connectors.tiktok_ads import TikTokAdsCSVConnector
-
-    registry = ConnectorRegistry()
-    registry.register(GoogleAdsCSVConnector())
-    registry.register(MetaAdsCSVConnector())
-    registry.register(TikTokAdsCSVConnector())
+    registry = ConnectorRegistry(entry_point_group=entry_point_group)
+    for slug, target in BUILTIN_CONNECTORS.items():
+        registry.register_lazy(ConnectorDescriptor(slug, target))
     return registry
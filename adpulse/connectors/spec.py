@@ -0,0 +1,145 @@
+"""
+Declarative connector specs, compiled per file into positional row normalizers.
+
+A `ConnectorSpec` says how one platform's export maps onto `NormalizedRecord`:
+the header aliases of every field (first non-empty one wins), which numeric
+fields are currency strings such as "$1,234.56", and where revenue comes from
+(the first non-empty revenue column, else conversions times a default value).
+Fields are parsed according to their `NormalizedRecord` type.
+
+`compile_normalizer` turns a spec plus the header actually found in a file
+into one normalizer function. Header names are resolved to column positions
+up front and aliases missing from the file are dropped, so normalizing a row
+is `itemgetter` indexing and parsing, with no dict lookups or alias scans.
+The output is identical to reading the row through `csv.DictReader` and
+applying the rules above.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+from adpulse.ingestion.schema import UNKNOWN_CAMPAIGN, DateParseFn, NormalizedRecord, parse_float, parse_int
+
+DEFAULT_CONVERSION_VALUE = 25.0
+
+# Fields of NormalizedRecord that come from the file, with how each is parsed.
+FIELD_TYPES = {
+    "campaign_name": "text",
+    "campaign_id": "id",
+    "event_date": "date",
+    "impressions": "int",
+    "clicks": "int",
+    "spend": "float",
+    "conversions": "int",
+}
+REQUIRED_FIELDS = ("campaign_name", "event_date", "impressions", "clicks", "spend", "conversions")
+
+RowNormalizer = Callable[[Sequence[Optional[str]], DateParseFn], NormalizedRecord]
+CellGetter = Callable[[Sequence[Optional[str]]], Optional[str]]
+
+
+def clean_money(value: Optional[str]) -> Optional[str]:
+    """Strip currency symbols and thousands separators from one cell."""
+    if value is None:
+        return None
+    return value.replace("$", "").replace(",", "").strip()
+
+
+@dataclass(frozen=True)
+class ConnectorSpec:
+    """How one platform's export maps onto `NormalizedRecord`."""
+
+    platform_slug: str
+    platform_name: str
+    # Normalized field -> candidate headers in priority order.
+    columns: Mapping[str, Tuple[str, ...]]
+    # Revenue headers in priority order; without a value, revenue is conversions * default.
+    revenue_columns: Tuple[str, ...] = ()
+    # Numeric fields written as currency strings.
+    money_fields: Tuple[str, ...] = ()
+    default_conversion_value: float = DEFAULT_CONVERSION_VALUE
+
+    def __post_init__(self) -> None:
+        unknown = sorted(set(self.columns) - set(FIELD_TYPES))
+        if unknown:
+            raise ValueError(f"Unknown fields in the {self.platform_slug} spec: {', '.join(unknown)}")
+        missing = [name for name in REQUIRED_FIELDS if not self.columns.get(name)]
+        if missing:
+            raise ValueError(f"The {self.platform_slug} spec has no headers for: {', '.join(missing)}")
+        numeric = {name for name, kind in FIELD_TYPES.items() if kind in ("int", "float")}
+        if not set(self.money_fields) <= numeric:
+            raise ValueError("money_fields must name numeric fields")
+
+
+def _none(row: Sequence[Optional[str]]) -> None:
+    return None
+
+
+def _cell(aliases: Sequence[str], positions: Dict[str, int]) -> CellGetter:
+    """Getter for the first non-empty of `aliases` that the header has, else the last one's value."""
+    indexes = [positions[alias] for alias in aliases if alias in positions]
+    if not indexes:
+        return _none
+    if len(indexes) == 1:
+        return itemgetter(indexes[0])
+    getter = itemgetter(*indexes)
+
+    def first(row: Sequence[Optional[str]]) -> Optional[str]:
+        value = None
+        for value in getter(row):
+            if value:
+                return value
+        return value
+
+    return first
+
+
+def _parser(name: str, spec: ConnectorSpec, cell: CellGetter) -> Callable[[Sequence[Optional[str]]], Any]:
+    kind = FIELD_TYPES[name]
+    parse = parse_int if kind == "int" else parse_float if kind == "float" else None
+    if parse is None:
+        return cell
+    if name in spec.money_fields:
+        return lambda row: parse(clean_money(cell(row)))
+    return lambda row: parse(cell(row))
+
+
+def compile_normalizer(
+    spec: ConnectorSpec, header: Sequence[Optional[str]], resolve: Callable[[str, str, Optional[str]], str]
+) -> RowNormalizer:
+    """
+    Build `normalize(row, date_parser)` for rows laid out like `header`.
+
+    `row` is the list of cells `csv.reader` yields; it must be at least as
+    long as `header` (pad short rows with None). When a header name repeats,
+    the last column wins, as with `csv.DictReader`. `resolve` maps
+    (platform slug, campaign name, explicit id) to the campaign id.
+    """
+    positions = {name: index for index, name in enumerate(header) if name is not None}
+    cells = {name: _cell(spec.columns.get(name, ()), positions) for name in FIELD_TYPES}
+    campaign_name, campaign_id, event_date = cells["campaign_name"], cells["campaign_id"], cells["event_date"]
+    impressions, clicks, spend, conversions = (
+        _parser(name, spec, cells[name]) for name in ("impressions", "clicks", "spend", "conversions")
+    )
+    revenue = _cell(spec.revenue_columns, positions)
+    platform, slug, default_value = spec.platform_name, spec.platform_slug, spec.default_conversion_value
+
+    def normalize(row: Sequence[Optional[str]], date_parser: DateParseFn) -> NormalizedRecord:
+        name = (campaign_name(row) or UNKNOWN_CAMPAIGN).strip()
+        converted = conversions(row)
+        value = revenue(row)
+        return NormalizedRecord(
+            platform,
+            resolve(slug, name, campaign_id(row)),
+            name,
+            date_parser(event_date(row)),
+            impressions(row),
+            clicks(row),
+            spend(row),
+            converted,
+            parse_float(value) if value else converted * default_value,
+        )
+
+    return normalize
@@ -4,9 +4,7 @@ Streamlit dashboard for Module 3.
 from __future__ import annotations
 
 from datetime import date, timedelta
-from pathlib import Path
 from typing import List, Optional
-import tempfile
 
 import pandas as pd
 import streamlit as st
@@ -310,8 +308,8 @@ def render_upload_widget():
     )
     uploaded_file = st.sidebar.file_uploader(
         "Choose CSV file",
-        type=["csv"],
-        help="Upload raw exports from Google/Meta/TikTok.",
+        type=["csv", "gz", "bz2", "xz", "zip", "parquet", "arrow", "feather"],
+        help="Upload raw exports from Google/Meta/TikTok (CSV, optionally compressed, or Parquet/Arrow).",
         key="csv_uploader",
     )
     disabled = uploaded_file is None
@@ -328,10 +326,8 @@ def render_upload_widget():
 
 def ingest_uploaded_csv(platform_slug: str, uploaded_file) -> str:
     ingestor = get_ingestor()
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-        tmp.write(uploaded_file.getvalue())
-        tmp_path = Path(tmp.name)
-    report = ingestor.ingest_file(platform_slug, tmp_path)
+    # The upload is a binary file object; compressed archives are decoded in memory.
+    report = ingestor.ingest_file(platform_slug, uploaded_file)
     return f"[{report.platform}] Ingested {report.rows_ingested} rows"
 
 
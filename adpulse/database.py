@@ -3,25 +3,70 @@ SQLAlchemy database configuration shared across modules.
 """
 from __future__ import annotations
 
-from sqlalchemy import create_engine
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
-from adpulse.config import load_settings
+from adpulse.config import Settings, load_settings
+from adpulse.storage.database import tune_connection
 
 settings = load_settings()
 DATABASE_URL = f"sqlite:///{settings.db_path}"
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False},
-)
+
+def create_sqlite_engine(db_path: Path, read_only: bool = False, settings: Settings | None = None) -> Engine:
+    """
+    Pooled engine for the SQLite database at `db_path`.
+
+    Connections wait up to `db_busy_timeout` seconds for locks and get the
+    cache, mmap and temp-store pragmas of `tune_connection`. With `read_only`
+    they are opened with `mode=ro`, so a request can never take the write lock
+    that an ingest needs; in WAL mode they read the last committed state
+    without waiting for the writer. Read-only sessions also begin a real
+    transaction (pysqlite leaves SELECTs in autocommit), so all of a session's
+    queries see that one state, even when a load commits in between.
+    """
+    settings = settings or load_settings()
+    url = f"sqlite:///file:{db_path}?mode=ro&uri=true" if read_only else f"sqlite:///{db_path}"
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": settings.db_busy_timeout},
+        poolclass=QueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_pool_size,
+        pool_timeout=settings.db_busy_timeout,
+    )
+
+    @event.listens_for(engine, "connect")
+    def _tune(dbapi_connection, connection_record) -> None:
+        tune_connection(dbapi_connection, settings.db_cache_size_kib, settings.db_mmap_size)
+        if read_only:
+            dbapi_connection.isolation_level = None
+
+    if read_only:
+
+        @event.listens_for(engine, "begin")
+        def _begin(connection) -> None:
+            connection.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+engine = create_sqlite_engine(settings.db_path, settings=settings)
+# API requests only read; they get their own pool of read-only connections.
+read_engine = create_sqlite_engine(settings.db_path, read_only=True, settings=settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
 def init_db() -> None:
-    """Ensure tables exist for SQLAlchemy consumers."""
+    """Bring the schema up to date with the same migrations the CLI runs (see `adpulse.storage.migrations`)."""
     import adpulse.models  # noqa: F401
+    from adpulse.storage.database import DatabaseManager
 
-    Base.metadata.create_all(bind=engine)
+    DatabaseManager(settings.db_path).initialize()
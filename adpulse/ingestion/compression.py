@@ -0,0 +1,128 @@
+"""
+Transparent decompression of CSV exports, and source format sniffing.
+
+Inputs are recognized by their magic bytes, not their file name, and decoded
+as a stream straight into the CSV reader, so nothing is unpacked to disk. A
+zip archive yields every CSV member it contains, one after another. The same
+magic bytes tell CSV exports apart from Parquet and Arrow IPC files.
+"""
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import lzma
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, TextIO, Union
+
+CsvSource = Union[Path, str, BinaryIO]
+
+MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip"),
+)
+FORMAT_MAGIC_NUMBERS = (
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "arrow"),
+    (b"\xff\xff\xff\xff", "arrow"),  # IPC stream continuation marker
+)
+SOURCE_FORMATS = ("csv", "parquet", "arrow")
+_MAGIC_LENGTH = max(len(magic) for magic, _ in MAGIC_NUMBERS + FORMAT_MAGIC_NUMBERS)
+_STREAM_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+def is_stream(source: CsvSource) -> bool:
+    return hasattr(source, "read")
+
+
+def _peek(handle: BinaryIO, size: int) -> bytes:
+    if hasattr(handle, "peek"):
+        return handle.peek(size)[:size]
+    position = handle.tell()
+    head = handle.read(size)
+    handle.seek(position)
+    return head
+
+
+def _read_head(source: CsvSource) -> bytes:
+    if is_stream(source):
+        return _peek(source, _MAGIC_LENGTH)
+    with Path(source).open("rb") as handle:
+        return handle.read(_MAGIC_LENGTH)
+
+
+def _match_magic(head: bytes, table) -> Optional[str]:
+    for magic, kind in table:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def sniff_compression(source: CsvSource) -> Optional[str]:
+    """Return 'gzip', 'bz2', 'xz' or 'zip' for compressed input, None for plain text."""
+    return _match_magic(_read_head(source), MAGIC_NUMBERS)
+
+
+def sniff_source_format(source: CsvSource) -> str:
+    """Return 'parquet' or 'arrow' for columnar files and 'csv' for everything else."""
+    return _match_magic(_read_head(source), FORMAT_MAGIC_NUMBERS) or "csv"
+
+
+def _is_csv_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    return not info.is_dir() and name.lower().endswith(".csv") and not name.startswith("__MACOSX/")
+
+
+def _iter_binary_members(handle: BinaryIO, label: str) -> Iterator[BinaryIO]:
+    kind = sniff_compression(handle)
+    if kind is None:
+        yield handle
+    elif kind == "zip":
+        with zipfile.ZipFile(handle) as archive:
+            members = [info for info in archive.infolist() if _is_csv_member(info)]
+            if not members:
+                raise ValueError(f"Zip archive {label} contains no CSV files")
+            for info in members:
+                with archive.open(info) as member:
+                    yield member
+    else:
+        with _STREAM_OPENERS[kind](handle, "rb") as decoded:
+            yield decoded
+
+
+@contextmanager
+def _open_binary(source: CsvSource) -> Iterator[BinaryIO]:
+    if is_stream(source):
+        if source.seekable():
+            source.seek(0)
+        yield source
+        return
+    path = Path(source)
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    with path.open("rb") as handle:
+        yield handle
+
+
+def source_label(source: CsvSource) -> str:
+    return str(getattr(source, "name", "<stream>")) if is_stream(source) else str(source)
+
+
+def iter_csv_text(source: CsvSource) -> Iterator[TextIO]:
+    """
+    Yield a decoded text stream for every CSV contained in `source`.
+
+    `source` may be a path or a binary file object (read from its start, and
+    left open for the caller). Plain files yield a single stream.
+    """
+    with _open_binary(source) as handle:
+        for member in _iter_binary_members(handle, source_label(source)):
+            text = io.TextIOWrapper(member, encoding="utf-8-sig", newline="")
+            try:
+                yield text
+            finally:
+                text.detach()
@@ -3,11 +3,28 @@ Data ingestion orchestration entry point.
 """
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
 from adpulse.connectors.registry import ConnectorRegistry
-from adpulse.storage.database import DatabaseManager
+from adpulse.ingestion.compression import CsvSource, is_stream, source_label, sniff_compression
+from adpulse.ingestion.manifest import (
+    FULL,
+    SKIP,
+    CheckpointedReader,
+    IngestPlan,
+    completed_entry,
+    open_planned,
+    plan_ingest,
+    supports_checkpoints,
+)
+from adpulse.storage.backend import DEFAULT_BATCH_SIZE, WRITE_MODES, ProgressCallback, StorageBackend
+from adpulse.utils import default_campaign_resolver
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from adpulse.connectors.base import BaseConnector
 
 
 @dataclass(frozen=True)
@@ -15,24 +32,219 @@ class IngestionReport:
     platform: str
     source_file: Path
     rows_ingested: int
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+    action: str = FULL
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_ingested / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+@dataclass(frozen=True)
+class MultiFileIngestionReport:
+    reports: List[IngestionReport]
+    elapsed_seconds: float
+
+    @property
+    def rows_ingested(self) -> int:
+        return sum(report.rows_ingested for report in self.reports)
+
+    @property
+    def failures(self) -> List[IngestionReport]:
+        return [report for report in self.reports if report.error]
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_ingested / self.elapsed_seconds if self.elapsed_seconds else 0.0
 
 
 class DataIngestor:
     """
     Coordinates the flow between connectors and persistent storage.
+
+    Records stream from the connector straight into chunked inserts, so a file
+    is never fully materialized in memory. With `columnar=True` CSV connectors
+    normalize whole chunks with pandas instead of row by row.
+
+    Rows are upserted on (platform, campaign_id, event_date): in `replace` mode
+    re-ingesting a file leaves the table unchanged, while `accumulate` adds the
+    new metrics on top of what is stored.
+
+    Campaign ids derived from names are cached by the connectors' shared
+    resolver; with `persist_campaigns` the mapping is seeded from and saved to
+    the `campaigns` table so later runs skip the slugging entirely.
+
+    With `track_manifest` every file's progress is checkpointed in the ingest
+    manifest (see `adpulse.ingestion.manifest`): unchanged files are skipped,
+    interrupted loads resume and grown files only load their new tail. Pass
+    `force=True` to reload a file from scratch regardless.
     """
 
-    def __init__(self, registry: ConnectorRegistry, database: DatabaseManager) -> None:
+    def __init__(
+        self,
+        registry: ConnectorRegistry,
+        database: StorageBackend,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_per_batch: bool = True,
+        columnar: bool = False,
+        mode: str = "replace",
+        persist_campaigns: bool = True,
+        track_manifest: bool = True,
+    ) -> None:
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode '{mode}'. Supported: {', '.join(WRITE_MODES)}")
         self.registry = registry
         self.database = database
+        self.batch_size = batch_size
+        self.commit_per_batch = commit_per_batch
+        self.columnar = columnar
+        self.mode = mode
+        self.persist_campaigns = persist_campaigns
+        self.track_manifest = track_manifest
+        self.resolver = default_campaign_resolver()
         self.database.initialize()
+        if persist_campaigns:
+            self.resolver.preload(self.database.load_campaign_ids())
+
+    def ingest_file(
+        self,
+        platform_slug: str,
+        csv_path: CsvSource,
+        force: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> IngestionReport:
+        """
+        Load one file (or binary file object, e.g. an upload) for `platform_slug`.
 
-    def ingest_file(self, platform_slug: str, csv_path: Path | str) -> IngestionReport:
-        connector = self.registry.get(platform_slug)
+        Compressed inputs are decoded on the fly. File objects bypass the
+        manifest since there is no path to track. `progress` is called with
+        the row count of every chunk as it is written.
+        """
+        connector = self.registry.get(platform_slug, source=csv_path)
+        started = time.perf_counter()
+        if is_stream(csv_path):
+            return self._ingest_planned(connector, csv_path, None, started, progress)
         path = Path(csv_path)
-        records = connector.load_file(path)
-        ingested = self.database.insert_records(records)
-        return IngestionReport(connector.platform_name, path, ingested)
+        return self._ingest_planned(connector, path, self._plan(connector, path, force), started, progress)
+
+    def _ingest_planned(
+        self,
+        connector: BaseConnector,
+        source: CsvSource,
+        plan: Optional[IngestPlan],
+        started: float,
+        progress: Optional[ProgressCallback] = None,
+    ) -> IngestionReport:
+        label = Path(source_label(source))
+        if plan is not None and plan.action == SKIP:
+            return IngestionReport(connector.platform_name, label, 0, time.perf_counter() - started, action=SKIP)
+        checkpointed = plan is not None and plan.resumable
+        use_columnar = connector.use_column_batches(self.columnar)
+        if checkpointed and (plan.action != FULL or not use_columnar):
+            ingested = self.database.insert_checkpointed_chunks(
+                CheckpointedReader(connector, plan).chunks(self.batch_size),
+                plan.batch_id,
+                commit_per_batch=self.commit_per_batch,
+                mode=self.mode,
+                progress=progress,
+            )
+        else:
+            source, prefix = open_planned(plan) if plan is not None else (source, None)
+            try:
+                ingested = self.database.insert_record_batches(
+                    connector.iter_record_batches(source, self.batch_size, columnar=self.columnar),
+                    commit_per_batch=self.commit_per_batch,
+                    mode=self.mode,
+                    batch_id=plan.batch_id if plan else None,
+                    progress=progress,
+                )
+            finally:
+                if prefix is not None:
+                    prefix.close()
+            if plan is not None:
+                self.database.save_manifest_entry(completed_entry(plan, ingested, prefix))
+        self._save_campaigns(self.resolver.drain_resolved())
+        elapsed = time.perf_counter() - started
+        return IngestionReport(connector.platform_name, label, ingested, elapsed, action=plan.action if plan else FULL)
+
+    def ingest_many(
+        self,
+        paths: Iterable[Path | str],
+        platform_slug: str | None = None,
+        workers: int | None = None,
+        force: bool = False,
+    ) -> MultiFileIngestionReport:
+        """
+        Ingest many files at once, parsing and normalizing them across a process pool.
+
+        Each file's platform is detected from its header unless `platform_slug`
+        is given. Only this process writes to storage; a file that fails is
+        reported with its error while the remaining files continue. Manifest
+        tracking applies as in `ingest_file`: resumed and tailed files are
+        loaded in this process, new files go to the pool.
+        """
+        from adpulse.ingestion.parallel import FileOutcome, run_parallel_ingest
+
+        started = time.perf_counter()
+        jobs: List[FileOutcome] = []
+        sequential: List[IngestionReport] = []
+        for source in paths:
+            path = Path(source)
+            try:
+                connector = self.registry.get(platform_slug, source=path) if platform_slug else self.registry.detect(path)
+                plan = self._plan(connector, path, force)
+            except (FileNotFoundError, KeyError, ValueError) as exc:
+                jobs.append(FileOutcome(connector=None, path=path, error=str(exc), finished=True))
+                continue
+            if plan is None:
+                jobs.append(FileOutcome(connector=connector, path=path))
+            elif plan.action == FULL:
+                jobs.append(FileOutcome(connector=connector, path=path, batch_id=plan.batch_id, plan=plan))
+            else:
+                try:
+                    sequential.append(self._ingest_planned(connector, path, plan, time.perf_counter()))
+                except Exception as exc:  # reported per file like pool failures
+                    sequential.append(
+                        IngestionReport(connector.platform_name, path, 0, error=f"{type(exc).__name__}: {exc}")
+                    )
+
+        run = run_parallel_ingest(
+            jobs,
+            self.database,
+            workers=workers,
+            batch_size=self.batch_size,
+            columnar=self.columnar,
+            commit_per_batch=self.commit_per_batch,
+            mode=self.mode,
+        )
+        self._save_campaigns(run.campaigns + self.resolver.drain_resolved())
+        reports = sequential + [
+            IngestionReport(
+                platform=outcome.connector.platform_name if outcome.connector else "unknown",
+                source_file=outcome.path,
+                rows_ingested=outcome.rows_written,
+                elapsed_seconds=outcome.elapsed_seconds,
+                error=outcome.error,
+            )
+            for outcome in run.outcomes
+        ]
+        return MultiFileIngestionReport(reports=reports, elapsed_seconds=time.perf_counter() - started)
+
+    def _plan(self, connector: BaseConnector, path: Path, force: bool) -> Optional[IngestPlan]:
+        if not self.track_manifest:
+            return None
+        return plan_ingest(
+            self.database,
+            path,
+            connector.platform_slug,
+            force=force,
+            resumable=supports_checkpoints(connector) and sniff_compression(path) is None,
+        )
+
+    def _save_campaigns(self, mappings) -> None:
+        if self.persist_campaigns and mappings:
+            self.database.save_campaign_ids(mappings)
 
     def summary_rows(self):
         return self.database.fetch_summary()
@@ -0,0 +1,168 @@
+"""
+Background ingest jobs for uploads received by the API.
+
+The API spools an upload to a file under `spool_dir`, hands it to
+`IngestJobManager.submit` and answers straight away with the job id. A small
+thread pool then loads the file with the shared `DataIngestor`, while
+`get` reports progress (rows written so far, throughput, errors). At most
+`max_pending` jobs are queued or running at once; beyond that `submit`
+raises `JobQueueFull` so callers can push back instead of piling up work.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from adpulse.ingestion.data_ingestor import DataIngestor
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+JOB_STATUSES = (QUEUED, RUNNING, SUCCEEDED, FAILED)
+
+DEFAULT_JOB_HISTORY = 1_000
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when `max_pending` jobs are already queued or running."""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    platform: str
+    filename: str
+    path: Path
+    bytes_received: int
+    status: str = QUEUED
+    rows_processed: int = 0
+    action: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=_utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return ((self.finished_at or _utcnow()) - self.started_at).total_seconds()
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.elapsed_seconds
+        return self.rows_processed / elapsed if elapsed else 0.0
+
+
+class IngestJobManager:
+    """
+    Runs spooled uploads through `ingestor` on a bounded thread pool.
+
+    Jobs are tracked in memory; the most recent `history` finished jobs stay
+    queryable. Spool files are deleted once their job finishes.
+    """
+
+    def __init__(
+        self,
+        ingestor: DataIngestor,
+        spool_dir: Path,
+        max_workers: int = 2,
+        max_pending: int = 16,
+        history: int = DEFAULT_JOB_HISTORY,
+    ) -> None:
+        if max_workers < 1 or max_pending < 1:
+            raise ValueError("max_workers and max_pending must be positive")
+        self.ingestor = ingestor
+        self.spool_dir = Path(spool_dir)
+        self.max_pending = max_pending
+        self.history = history
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="adpulse-ingest")
+
+    def supports(self, platform: str) -> bool:
+        return platform in self.ingestor.registry
+
+    def new_spool_path(self) -> Path:
+        """Return a fresh path under `spool_dir` to stream an upload into."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        return self.spool_dir / f"{uuid.uuid4().hex}.upload"
+
+    def submit(self, platform: str, path: Path, filename: str, bytes_received: int) -> IngestJob:
+        """Queue `path` for ingestion and return a snapshot of the new job."""
+        job = IngestJob(uuid.uuid4().hex, platform, filename, Path(path), bytes_received)
+        with self._lock:
+            pending = sum(1 for existing in self._jobs.values() if not existing.done)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} ingest jobs are already queued or running; retry later")
+            self._jobs[job.job_id] = job
+            self._trim_history()
+            snapshot = replace(job)
+        self._pool.submit(self._run, job)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        """Return a snapshot of the job, or None when it is unknown (or aged out)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return replace(job) if job is not None else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _run(self, job: IngestJob) -> None:
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = _utcnow()
+        try:
+            report = self.ingestor.ingest_file(job.platform, job.path, progress=lambda rows: self._advance(job, rows))
+        except Exception as exc:  # reported through the job instead of crashing the worker
+            logger.exception("Ingest job %s (%s) failed", job.job_id, job.filename)
+            self._finish(job, FAILED, error=str(exc) or type(exc).__name__)
+        else:
+            self._finish(job, SUCCEEDED, rows=report.rows_ingested, action=report.action)
+        finally:
+            job.path.unlink(missing_ok=True)
+
+    def _advance(self, job: IngestJob, rows: int) -> None:
+        with self._lock:
+            job.rows_processed += rows
+
+    def _finish(
+        self,
+        job: IngestJob,
+        status: str,
+        rows: Optional[int] = None,
+        action: Optional[str] = None,
+        error: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            job.status = status
+            job.finished_at = _utcnow()
+            if rows is not None:
+                job.rows_processed = rows
+            job.action = action
+            job.error = error
+
+    def _trim_history(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
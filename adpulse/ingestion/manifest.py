@@ -0,0 +1,268 @@
+"""
+Ingest manifest: remember what has been committed from each source file.
+
+Every chunk written from a file also records, in the same transaction, the
+byte offset and row count reached and a hash of the bytes read so far. On the
+next run a file is then either
+
+* skipped: it is marked complete and its size and mtime did not change,
+* resumed: an interrupted load continues after the last checkpoint,
+* tailed: a completed file grew, so only the appended bytes are read, or
+* loaded in full: it is new, was rewritten, or `force` was requested.
+
+Resume and tail only happen when the hash of the already-committed prefix
+still matches, and they keep the original load batch id so upsert semantics
+are the same as loading the file in one go.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+from adpulse.ingestion.schema import DbRow, RecordBatch, batch_records
+from adpulse.storage.backend import ManifestEntry, StorageBackend, new_batch_id
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from adpulse.connectors.base import BaseConnector
+
+HASH_BLOCK_SIZE = 1 << 20
+
+FULL = "full"
+RESUME = "resume"
+TAIL = "tail"
+SKIP = "skip"
+
+
+def manifest_key(path: Path | str) -> str:
+    return str(Path(path).resolve())
+
+
+def _new_hasher():
+    return hashlib.sha256()
+
+
+def hash_prefix(path: Path, length: int) -> Tuple[Any, int]:
+    """Hash the first `length` bytes of `path`; returns the hasher and the bytes actually read."""
+    hasher = _new_hasher()
+    remaining = length
+    with path.open("rb") as handle:
+        while remaining > 0:
+            block = handle.read(min(HASH_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher, length - remaining
+
+
+@dataclass
+class IngestPlan:
+    """
+    What to do with one file, decided from its manifest entry.
+
+    `hasher` holds the hash state after `start_offset` bytes for resumed and
+    tailed loads; full loads start a fresh one (and stay picklable for workers).
+    Non-`resumable` files (compressed ones, whose byte offsets do not map to
+    rows) are only recorded once complete and are reloaded in full on change.
+    """
+
+    action: str
+    path: Path
+    platform: str
+    batch_id: str
+    size: int
+    mtime_ns: int
+    start_offset: int = 0
+    start_rows: int = 0
+    hasher: Any = None
+    resumable: bool = True
+
+
+def plan_ingest(
+    database: StorageBackend,
+    path: Path,
+    platform: str,
+    force: bool = False,
+    resumable: bool = True,
+) -> IngestPlan:
+    """Compare `path` against its manifest entry and decide how to (re)load it."""
+    if not path.exists():
+        raise FileNotFoundError(f"CSV file not found: {path}")
+    stat = path.stat()
+    entry = None if force else database.get_manifest_entry(manifest_key(path))
+    plan = IngestPlan(FULL, path, platform, new_batch_id(), stat.st_size, stat.st_mtime_ns, resumable=resumable)
+    if entry is None or entry.platform != platform or stat.st_size < entry.bytes_committed:
+        return plan
+    if entry.status == "complete" and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        plan.action = SKIP
+        return plan
+    if not resumable:
+        return plan
+    hasher, read = hash_prefix(path, entry.bytes_committed)
+    if read != entry.bytes_committed or hasher.hexdigest() != entry.content_hash:
+        return plan  # rewritten in place: reload everything under a new batch id
+    if entry.status == "complete" and stat.st_size == entry.bytes_committed:
+        plan.action = SKIP  # only the mtime changed (touched or copied)
+        return plan
+    plan.action = RESUME if entry.status == "partial" else TAIL
+    plan.batch_id = entry.batch_id
+    plan.start_offset = entry.bytes_committed
+    plan.start_rows = entry.rows_committed
+    plan.hasher = hasher
+    return plan
+
+
+class TrackedLines:
+    """
+    Decode a file line by line from a byte offset, tracking offset and hash.
+
+    `csv` pulls exactly the lines a record needs and never reads ahead, so
+    after a row is yielded `offset` points just past it. A final line without
+    its newline may still be being written: it is neither hashed nor yielded,
+    and the next tail load reads it once it is complete.
+    """
+
+    def __init__(self, path: Path, offset: int = 0, hasher: Any = None) -> None:
+        self.path = path
+        self.start = offset
+        self.offset = offset
+        self.hasher = hasher if hasher is not None else _new_hasher()
+
+    def __iter__(self) -> Iterator[str]:
+        with self.path.open("rb") as handle:
+            handle.seek(self.start)
+            encoding = "utf-8-sig" if self.start == 0 else "utf-8"
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break
+                self.hasher.update(raw)
+                self.offset += len(raw)
+                yield raw.decode(encoding)
+                encoding = "utf-8"
+
+
+class CheckpointedReader:
+    """Stream a CSV file as database chunks, each paired with the manifest checkpoint it reaches."""
+
+    def __init__(self, connector: "BaseConnector", plan: IngestPlan) -> None:
+        self.connector = connector
+        self.plan = plan
+        self.lines = TrackedLines(plan.path, plan.start_offset, plan.hasher)
+        self.rows = plan.start_rows
+
+    def chunks(self, batch_size: int) -> Iterator[Tuple[Union[RecordBatch, List[DbRow]], ManifestEntry]]:
+        fieldnames = self.connector.read_header(self.plan.path) if self.plan.start_offset else None
+        records = self.connector.iter_records_from_lines(self.lines, fieldnames=fieldnames)
+        for batch in batch_records(records, batch_size):
+            self.rows += len(batch)
+            yield batch, self.entry("partial")
+        yield [], self.entry("complete")
+
+    def entry(self, status: str) -> ManifestEntry:
+        return ManifestEntry(
+            path=manifest_key(self.plan.path),
+            platform=self.plan.platform,
+            size=max(self.plan.size, self.lines.offset),
+            mtime_ns=self.plan.mtime_ns,
+            content_hash=self.lines.hasher.hexdigest(),
+            bytes_committed=self.lines.offset,
+            rows_committed=self.rows,
+            batch_id=self.plan.batch_id,
+            status=status,
+        )
+
+
+def supports_checkpoints(connector: "BaseConnector") -> bool:
+    return hasattr(connector, "iter_records_from_lines")
+
+
+def _complete_lines(handle: BinaryIO, size: int) -> int:
+    """Length of the longest prefix of the first `size` bytes of `handle` that ends in a newline."""
+    end = size
+    while end > 0:
+        start = max(0, end - HASH_BLOCK_SIZE)
+        handle.seek(start)
+        newline = handle.read(end - start).rfind(b"\n")
+        if newline >= 0:
+            return start + newline + 1
+        end = start
+    return 0
+
+
+class PrefixReader(io.RawIOBase):
+    """
+    The complete lines among the first `plan.size` bytes of a planned file, hashed as they are read.
+
+    Loads without per-chunk checkpoints (the columnar CSV reader) read
+    resumable files through it, so their manifest entry covers exactly the
+    bytes they consumed: rows appended during the load, and a final line
+    still missing its newline, are left for the next tail load.
+    """
+
+    def __init__(self, plan: IngestPlan) -> None:
+        super().__init__()
+        self.name = str(plan.path)
+        self.offset = 0
+        self.hasher = _new_hasher()
+        self._handle = plan.path.open("rb")
+        self._remaining = _complete_lines(self._handle, plan.size)
+        self._handle.seek(0)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._remaining <= 0:
+            return 0
+        view = memoryview(buffer)[: self._remaining]
+        read = self._handle.readinto(view) or 0
+        self.hasher.update(view[:read])
+        self.offset += read
+        self._remaining -= read
+        return read
+
+    def close(self) -> None:
+        self._handle.close()
+        super().close()
+
+
+def open_planned(plan: IngestPlan) -> Tuple[BinaryIO, Optional[PrefixReader]]:
+    """
+    The source to read for a load without checkpoints, and its `PrefixReader` when it has one.
+
+    Compressed and columnar files are read from their path: they are never
+    resumed or tailed, so only their size and mtime matter.
+    """
+    if not plan.resumable:
+        return plan.path, None
+    prefix = PrefixReader(plan)
+    return io.BufferedReader(prefix, HASH_BLOCK_SIZE), prefix
+
+
+def completed_entry(plan: IngestPlan, rows_written: int, prefix: Optional[PrefixReader] = None) -> ManifestEntry:
+    """
+    Manifest entry for a file loaded without per-chunk checkpoints (columnar or compressed).
+
+    Size and mtime are the plan's, taken before the file was read, so a file
+    that changed during the load is not skipped next time. `prefix` supplies
+    the bytes consumed and their hash; without one the planned size is hashed.
+    An interrupted load of this kind restarts from the beginning next time.
+    """
+    if prefix is not None:
+        hasher, read = prefix.hasher, prefix.offset
+    else:
+        hasher, read = hash_prefix(plan.path, plan.size)
+    return ManifestEntry(
+        path=manifest_key(plan.path),
+        platform=plan.platform,
+        size=plan.size,
+        mtime_ns=plan.mtime_ns,
+        content_hash=hasher.hexdigest(),
+        bytes_committed=read,
+        rows_committed=rows_written,
+        batch_id=plan.batch_id,
+        status="complete",
+    )
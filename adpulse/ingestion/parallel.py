@@ -0,0 +1,184 @@
+"""
+Multi-file ingestion: parse/normalize in a process pool, write from one process.
+
+SQLite allows a single writer, so worker processes never touch the database.
+They stream RecordBatches through a bounded queue, and the parent process
+drains that queue into one `ChunkWriter`, tagging every chunk with its file's
+load batch id. The bounded queue applies back-pressure, so memory stays
+flat however many files run.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue as queue_module
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from adpulse.connectors.base import BaseConnector
+from adpulse.ingestion.manifest import CheckpointedReader, IngestPlan, completed_entry, open_planned
+from adpulse.storage.backend import CampaignMapping, ManifestEntry, RowChunk, StorageBackend, new_batch_id
+
+QUEUE_CHUNKS_PER_WORKER = 4
+_POLL_SECONDS = 0.5
+
+_worker_queue = None
+
+
+@dataclass
+class _FileDone:
+    elapsed_seconds: float
+    campaigns: List[CampaignMapping] = field(default_factory=list)
+    manifest: Optional[ManifestEntry] = None
+
+
+@dataclass
+class _FileFailed:
+    error: str
+
+
+@dataclass
+class FileOutcome:
+    """Per-file bookkeeping kept by the writer while the pool runs."""
+
+    connector: Optional[BaseConnector]
+    path: Path
+    batch_id: str = field(default_factory=new_batch_id)
+    rows_written: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+    finished: bool = False
+    plan: Optional[IngestPlan] = None
+
+
+@dataclass
+class ParallelRun:
+    outcomes: List[FileOutcome] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    campaigns: List[CampaignMapping] = field(default_factory=list)
+
+
+def _init_worker(chunk_queue) -> None:
+    global _worker_queue
+    _worker_queue = chunk_queue
+
+
+def _normalize_file(
+    index: int,
+    connector: BaseConnector,
+    path: Path,
+    batch_size: int,
+    columnar: bool,
+    plan: Optional[IngestPlan] = None,
+) -> None:
+    """Worker entry point: stream one file's record batches (and manifest checkpoints) to the writer queue."""
+    started = time.perf_counter()
+    manifest = None
+    use_columnar = connector.use_column_batches(columnar)
+    try:
+        if plan is not None and plan.resumable and not use_columnar:
+            for chunk in CheckpointedReader(connector, plan).chunks(batch_size):
+                _worker_queue.put((index, chunk))
+        else:
+            rows = 0
+            source, prefix = open_planned(plan) if plan is not None else (path, None)
+            try:
+                # RecordBatches pickle as a handful of typed arrays rather than a list of row tuples.
+                for batch in connector.iter_record_batches(source, batch_size, columnar=columnar):
+                    rows += len(batch)
+                    _worker_queue.put((index, (batch, None)))
+            finally:
+                if prefix is not None:
+                    prefix.close()
+            if plan is not None:
+                manifest = completed_entry(plan, rows, prefix)
+    except Exception as exc:  # reported per file, the rest of the run continues
+        _worker_queue.put((index, _FileFailed(f"{type(exc).__name__}: {exc}")))
+        return
+    # Worker processes have their own resolver; hand its ids to the parent to persist.
+    campaigns = connector.identity_resolver.drain_resolved()
+    _worker_queue.put((index, _FileDone(time.perf_counter() - started, campaigns, manifest)))
+
+
+def _drain(
+    chunk_queue,
+    outcomes: Sequence[FileOutcome],
+    futures: Dict[Future, int],
+    campaigns: List[CampaignMapping],
+) -> Iterator[Tuple[FileOutcome, RowChunk, Optional[ManifestEntry]]]:
+    """Yield (file, row chunk, checkpoint) triples from the queue until every file reported done or failed."""
+    pending = {index for index, outcome in enumerate(outcomes) if not outcome.finished}
+    while pending:
+        try:
+            index, payload = chunk_queue.get(timeout=_POLL_SECONDS)
+        except queue_module.Empty:
+            # A worker that died hard (e.g. OOM-killed) never reports back.
+            for future, index in futures.items():
+                if index in pending and future.done() and future.exception() is not None:
+                    outcomes[index].error = f"Worker crashed: {future.exception()!r}"
+                    outcomes[index].finished = True
+                    pending.discard(index)
+            continue
+        outcome = outcomes[index]
+        if isinstance(payload, _FileDone):
+            outcome.elapsed_seconds = payload.elapsed_seconds
+            campaigns.extend(payload.campaigns)
+            if payload.manifest is not None:
+                yield outcome, [], payload.manifest
+        elif isinstance(payload, _FileFailed):
+            outcome.error = payload.error
+        else:
+            rows, checkpoint = payload
+            yield outcome, rows, checkpoint
+            continue
+        outcome.finished = True
+        pending.discard(index)
+
+
+def run_parallel_ingest(
+    jobs: Sequence[FileOutcome],
+    database: StorageBackend,
+    workers: Optional[int] = None,
+    batch_size: int = 5_000,
+    columnar: bool = False,
+    commit_per_batch: bool = True,
+    mode: str = "replace",
+) -> ParallelRun:
+    """
+    Normalize `jobs` across a process pool and write them through one connection.
+
+    Jobs that are already marked finished (e.g. failed platform detection) are
+    passed through untouched so callers get one outcome per requested file.
+    """
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    context = multiprocessing.get_context()
+    chunk_queue = context.Queue(maxsize=max(1, workers * QUEUE_CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(chunk_queue,),
+    ) as pool:
+        futures = {
+            pool.submit(_normalize_file, index, job.connector, job.path, batch_size, columnar, job.plan): index
+            for index, job in enumerate(jobs)
+            if not job.finished
+        }
+        campaigns: List[CampaignMapping] = []
+        chunks = _drain(chunk_queue, jobs, futures, campaigns)
+        try:
+            with database.open_writer(mode=mode, commit_per_batch=commit_per_batch) as writer:
+                for outcome, rows, checkpoint in chunks:
+                    outcome.rows_written += writer.write(rows, outcome.batch_id, checkpoint=checkpoint)
+        except BaseException:
+            # Keep draining so blocked workers can exit before the pool shuts down.
+            for future in futures:
+                future.cancel()
+            for _ in chunks:
+                pass
+            raise
+    return ParallelRun(outcomes=list(jobs), elapsed_seconds=time.perf_counter() - started, campaigns=campaigns)
@@ -3,12 +3,24 @@ Normalized schema definitions used across the ingestion layer.
 """
 from __future__ import annotations
 
+import sys
+from array import array
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, datetime
-from typing import Iterable, Tuple
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+DbRow = Tuple[str, str, str, str, int, int, float, int, float]
 
-@dataclass
+# Campaign name for rows whose name cell is empty.
+UNKNOWN_CAMPAIGN = "Unknown Campaign"
+
+# Slotted records drop the per-instance __dict__ (dataclass slots need Python 3.10+).
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class NormalizedRecord:
     platform: str
     campaign_id: str
@@ -20,7 +32,7 @@ class NormalizedRecord:
     conversions: int
     revenue: float = 0.0
 
-    def as_db_tuple(self) -> Tuple[str, str, str, str, int, int, float, int, float]:
+    def as_db_tuple(self) -> DbRow:
         """Return the tuple ordering expected by the database writer."""
         return (
             self.platform,
@@ -35,6 +47,128 @@ class NormalizedRecord:
         )
 
 
+def _column_values(column: Any) -> Iterable[Any]:
+    """Python values of a column: lists and `array`s as they are, NumPy arrays via `tolist`."""
+    return column if isinstance(column, (list, array)) else column.tolist()
+
+
+@dataclass
+class RecordBatch:
+    """
+    A chunk of normalized rows for one platform, stored column by column.
+
+    Counters and money live in typed arrays (`array.array` on the row path,
+    NumPy arrays on the columnar one) and strings are shared rather than
+    copied per row, so a batch costs a few bytes per value instead of an
+    object per row. `event_date` holds ISO-8601 strings so the batch can be
+    written without any further per-row conversion. Iterating a batch yields
+    `NormalizedRecord`s for code that wants rows.
+    """
+
+    platform: str
+    campaign_id: Any
+    campaign_name: Any
+    event_date: Any
+    impressions: Any
+    clicks: Any
+    spend: Any
+    conversions: Any
+    revenue: Any
+
+    def __len__(self) -> int:
+        return len(self.campaign_id)
+
+    def iter_db_tuples(self, batch_id: Optional[str] = None) -> Iterator[tuple]:
+        """Yield rows in the order expected by the database writer, with `batch_id` appended if given."""
+        columns = [
+            repeat(self.platform),
+            _column_values(self.campaign_id),
+            _column_values(self.campaign_name),
+            _column_values(self.event_date),
+            _column_values(self.impressions),
+            _column_values(self.clicks),
+            _column_values(self.spend),
+            _column_values(self.conversions),
+            _column_values(self.revenue),
+        ]
+        if batch_id is not None:
+            columns.append(repeat(batch_id))
+        return zip(*columns)
+
+    def __iter__(self) -> Iterator[NormalizedRecord]:
+        dates: Dict[str, date] = {}
+        for row in self.iter_db_tuples():
+            event_date = dates.get(row[3])
+            if event_date is None:
+                event_date = dates[row[3]] = date.fromisoformat(row[3])
+            yield NormalizedRecord(row[0], row[1], row[2], event_date, *row[4:])
+
+
+class RecordBatchBuilder:
+    """Append records for one platform into typed columns; `build` hands out the batch and starts over."""
+
+    def __init__(self, platform: str) -> None:
+        self.platform = sys.intern(platform)
+        self._iso_dates: Dict[date, str] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.campaign_id: List[str] = []
+        self.campaign_name: List[str] = []
+        self.event_date: List[str] = []
+        self.impressions = array("q")
+        self.clicks = array("q")
+        self.spend = array("d")
+        self.conversions = array("q")
+        self.revenue = array("d")
+
+    def __len__(self) -> int:
+        return len(self.campaign_id)
+
+    def append(self, record: NormalizedRecord) -> None:
+        iso_date = self._iso_dates.get(record.event_date)
+        if iso_date is None:
+            iso_date = self._iso_dates[record.event_date] = record.event_date.isoformat()
+        self.campaign_id.append(sys.intern(record.campaign_id))
+        self.campaign_name.append(sys.intern(record.campaign_name))
+        self.event_date.append(iso_date)
+        self.impressions.append(record.impressions)
+        self.clicks.append(record.clicks)
+        self.spend.append(record.spend)
+        self.conversions.append(record.conversions)
+        self.revenue.append(record.revenue)
+
+    def build(self) -> RecordBatch:
+        batch = RecordBatch(
+            self.platform,
+            self.campaign_id,
+            self.campaign_name,
+            self.event_date,
+            self.impressions,
+            self.clicks,
+            self.spend,
+            self.conversions,
+            self.revenue,
+        )
+        self._reset()
+        return batch
+
+
+def batch_records(records: Iterable[NormalizedRecord], batch_size: int) -> Iterator[RecordBatch]:
+    """Pack a record stream into RecordBatches of at most `batch_size` rows (one platform each)."""
+    builder: Optional[RecordBatchBuilder] = None
+    for record in records:
+        if builder is None or builder.platform != record.platform:
+            if builder is not None and len(builder):
+                yield builder.build()
+            builder = RecordBatchBuilder(record.platform)
+        builder.append(record)
+        if len(builder) >= batch_size:
+            yield builder.build()
+    if builder is not None and len(builder):
+        yield builder.build()
+
+
 def parse_int(value: str | None, default: int = 0) -> int:
     try:
         return int(float(value)) if value not in (None, "") else default
@@ -49,11 +183,23 @@ def parse_float(value: str | None, default: float = 0.0) -> float:
         return default
 
 
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d")
+
+DateParseFn = Callable[[Optional[str]], date]
+
+# Fixed-position layouts for DATE_FORMATS: (separator, separator offsets, year/month/day slices).
+_DATE_LAYOUTS = {
+    "%Y-%m-%d": ("-", 4, 7, slice(0, 4), slice(5, 7), slice(8, 10)),
+    "%m/%d/%Y": ("/", 2, 5, slice(6, 10), slice(0, 2), slice(3, 5)),
+    "%Y/%m/%d": ("/", 4, 7, slice(0, 4), slice(5, 7), slice(8, 10)),
+}
+
+
 def parse_date(value: str | None) -> date:
     if not value:
         raise ValueError("Date value is mandatory")
 
-    for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%Y/%m/%d"):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(value, fmt).date()
         except ValueError:
@@ -61,3 +207,75 @@ def parse_date(value: str | None) -> date:
 
     # Last resort: try fromisoformat which handles YYYY-MM-DD
     return date.fromisoformat(value)
+
+
+def _match_date_format(value: str) -> Optional[str]:
+    for fmt in DATE_FORMATS:
+        try:
+            datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+def _parse_fixed(value: str, fmt: str) -> Optional[date]:
+    """Slice a date out of `value` using the fixed layout of `fmt`, or None on mismatch."""
+    separator, first, second, year, month, day = _DATE_LAYOUTS[fmt]
+    if len(value) != 10 or value[first] != separator or value[second] != separator:
+        return None
+    year_text, month_text, day_text = value[year], value[month], value[day]
+    if not (value.isascii() and (year_text + month_text + day_text).isdigit()):
+        return None
+    try:
+        return date(int(year_text), int(month_text), int(day_text))
+    except ValueError:
+        return None
+
+
+class DateParser:
+    """
+    Per-file date parser that locks in the export's date format.
+
+    The first `sample_size` distinct values go through `parse_date` while the
+    matching format is tallied; after that the winning format is parsed by fixed-position
+    slicing. Results are memoized per distinct string (exports only span a few
+    days), and any value the locked format rejects falls back to `parse_date`,
+    so the output always matches it.
+    """
+
+    def __init__(self, sample_size: int = 20, max_cache_size: int = 10_000) -> None:
+        self.sample_size = sample_size
+        self.max_cache_size = max_cache_size
+        self.format: Optional[str] = None
+        self.fallbacks = 0
+        self._samples: Counter = Counter()
+        self._cache: Dict[str, date] = {}
+
+    def __call__(self, value: str | None) -> date:
+        if not value:
+            return parse_date(value)
+        cached = self._cache.get(value)
+        if cached is not None:
+            return cached
+        parsed = self._parse(value)
+        if len(self._cache) < self.max_cache_size:
+            self._cache[value] = parsed
+        return parsed
+
+    def _parse(self, value: str) -> date:
+        if self.format is None:
+            self._sample(value)
+            return parse_date(value)
+        parsed = _parse_fixed(value, self.format)
+        if parsed is None:
+            self.fallbacks += 1
+            return parse_date(value)
+        return parsed
+
+    def _sample(self, value: str) -> None:
+        fmt = _match_date_format(value)
+        if fmt in _DATE_LAYOUTS:
+            self._samples[fmt] += 1
+        if sum(self._samples.values()) >= self.sample_size:
+            self.format = self._samples.most_common(1)[0][0]
@@ -0,0 +1,371 @@
+"""
+Watch-folder ingestion: load exports as they land in a directory.
+
+`FolderWatcher` notices new or rewritten files in one directory (not its
+subdirectories). A file is ready once it is complete:
+
+- on Linux, inotify reports it closed after writing or moved into the
+  directory, so it is picked up straight away;
+- elsewhere (or when inotify is unavailable) the directory is polled and a
+  file is ready once its size and mtime have not changed for
+  `settle_seconds`.
+
+Ready files are loaded in micro-batches: up to `max_batch_files` files share
+one SQLite transaction (`DatabaseManager.transaction`), so a burst of small
+exports costs one commit instead of one per file. Each file runs in its own
+savepoint, so a broken file is rolled back and reported while the rest of
+the batch commits. Each file's platform comes from its header unless one is
+forced, exactly as in `adpulse load-dir`.
+
+`WatchStats` tracks queue depth (files seen but not yet committed) and
+ingest lag (from a file's last modification to the commit that loaded it).
+Pass `status_file` to have it rewritten as JSON after every batch.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from adpulse.ingestion.data_ingestor import DataIngestor, IngestionReport
+from adpulse.ingestion.manifest import SKIP
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_SECONDS = 2.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_BATCH_FILES = 100
+# With inotify the directory is still rescanned now and then, in case events were missed.
+RESCAN_INTERVAL = 30.0
+# Files that are still being written or copied by common tools.
+IGNORED_SUFFIXES = (".tmp", ".part", ".partial", ".crdownload", ".swp")
+
+# From <sys/inotify.h>.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+BatchCallback = Callable[[List[IngestionReport]], None]
+FileKey = Tuple[int, int]
+
+
+class _Inotify:
+    """Minimal inotify binding over libc: close-after-write and moved-in events for one directory."""
+
+    def __init__(self, fd: int) -> None:
+        self.fd = fd
+
+    @classmethod
+    def open(cls, directory: Path) -> Optional["_Inotify"]:
+        """Watch `directory`, or return None when inotify is not available here."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            init, add_watch = libc.inotify_init1, libc.inotify_add_watch
+        except (OSError, AttributeError):
+            return None
+        fd = init(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if add_watch(fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO) < 0:
+            os.close(fd)
+            return None
+        return cls(fd)
+
+    def read(self, timeout: float) -> Tuple[List[str], bool]:
+        """Wait up to `timeout` seconds; returns the completed file names and whether events overflowed."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return [], False
+        try:
+            data = os.read(self.fd, _READ_SIZE)
+        except BlockingIOError:
+            return [], False
+        names: List[str] = []
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+            elif name:
+                names.append(os.fsdecode(name))
+        return names, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+@dataclass
+class _Pending:
+    size: int
+    mtime_ns: int
+    stable_since: float
+    # inotify reported the file closed after writing (or moved in), so it is complete.
+    closed: bool = False
+
+    @property
+    def key(self) -> FileKey:
+        return self.size, self.mtime_ns
+
+
+@dataclass
+class WatchStats:
+    queue_depth: int = 0
+    oldest_pending_seconds: float = 0.0
+    files_ingested: int = 0
+    rows_ingested: int = 0
+    failures: int = 0
+    batches: int = 0
+    last_lag_seconds: Optional[float] = None
+    max_lag_seconds: Optional[float] = None
+    total_lag_seconds: float = 0.0
+    lag_samples: int = 0
+    last_batch_at: Optional[str] = None
+    mode: str = "polling"
+
+    @property
+    def avg_lag_seconds(self) -> Optional[float]:
+        return self.total_lag_seconds / self.lag_samples if self.lag_samples else None
+
+    def as_dict(self) -> dict:
+        payload = asdict(self)
+        payload["avg_lag_seconds"] = self.avg_lag_seconds
+        return payload
+
+
+class FolderWatcher:
+    """
+    Ingests files that appear (or change) in `directory` with `ingestor`.
+
+    The ingestor's manifest still applies, so unchanged files are skipped
+    after a restart and grown files only load their new tail. Files already
+    committed are remembered by (size, mtime) and not picked up again until
+    they change.
+    """
+
+    def __init__(
+        self,
+        ingestor: DataIngestor,
+        directory: Path,
+        platform: Optional[str] = None,
+        pattern: str = "*",
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        max_batch_files: int = DEFAULT_MAX_BATCH_FILES,
+        use_inotify: Optional[bool] = None,
+        status_file: Optional[Path] = None,
+    ) -> None:
+        if max_batch_files < 1:
+            raise ValueError("max_batch_files must be positive")
+        if settle_seconds < 0 or poll_interval <= 0:
+            raise ValueError("settle_seconds must not be negative and poll_interval must be positive")
+        if platform is not None and platform not in ingestor.registry:
+            supported = ", ".join(ingestor.registry.supported_platforms())
+            raise KeyError(f"Unsupported platform '{platform}'. Supported: {supported}")
+        self.ingestor = ingestor
+        self.directory = Path(directory)
+        self.platform = platform
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.max_batch_files = max_batch_files
+        self.use_inotify = use_inotify
+        self.status_file = Path(status_file) if status_file else None
+        self.stats = WatchStats()
+        self._pending: Dict[Path, _Pending] = {}
+        self._seen: Dict[Path, FileKey] = {}
+
+    def run(
+        self,
+        stop_event: Optional[threading.Event] = None,
+        once: bool = False,
+        on_batch: Optional[BatchCallback] = None,
+    ) -> None:
+        """
+        Watch until `stop_event` is set, calling `on_batch` with every committed batch's reports.
+
+        With `once`, every file already in the directory is loaded and the
+        call returns; files are assumed complete, so nothing waits to settle.
+        """
+        stop_event = stop_event or threading.Event()
+        if once:
+            self.scan()
+            while self._pending and not stop_event.is_set():
+                self._commit_batch(self.ready(flush=True), on_batch)
+            return
+
+        inotify = _Inotify.open(self.directory) if self.use_inotify is not False else None
+        if self.use_inotify and inotify is None:
+            raise RuntimeError("inotify is not available on this system; watch with polling instead")
+        self.stats.mode = "inotify" if inotify else "polling"
+        try:
+            self.scan()
+            last_scan = time.monotonic()
+            while not stop_event.is_set():
+                batch = self.ready()
+                if batch:
+                    try:
+                        self._commit_batch(batch, on_batch)
+                    except Exception:  # e.g. the database is locked; the files stay queued
+                        logger.exception("Watch batch of %d files failed; retrying", len(batch))
+                        stop_event.wait(self.poll_interval)
+                    continue
+                if inotify is None:
+                    stop_event.wait(self.poll_interval)
+                    self.scan()
+                    continue
+                names, overflow = inotify.read(self.poll_interval)
+                for name in names:
+                    self._mark_closed(self.directory / name)
+                now = time.monotonic()
+                unsettled = any(not pending.closed for pending in self._pending.values())
+                if overflow or unsettled or now - last_scan >= RESCAN_INTERVAL:
+                    self.scan()
+                    last_scan = now
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def poll(self, flush: bool = False) -> List[IngestionReport]:
+        """Scan once and commit one batch of ready files (all present files with `flush`)."""
+        self.scan()
+        batch = self.ready(flush=flush)
+        return self._commit_batch(batch) if batch else []
+
+    def scan(self) -> None:
+        """Refresh the pending queue from a directory listing."""
+        now = time.monotonic()
+        present = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not self._eligible(entry.name) or not entry.is_file():
+                    continue
+                path = Path(entry.path)
+                present.add(path)
+                stat = entry.stat()
+                self._track(path, (stat.st_size, stat.st_mtime_ns), now)
+        for path in [path for path in self._pending if path not in present]:
+            del self._pending[path]
+        for path in [path for path in self._seen if path not in present]:
+            del self._seen[path]
+        self._refresh_queue_stats()
+
+    def ready(self, flush: bool = False) -> List[Path]:
+        """Pending files that are complete, oldest first, at most `max_batch_files` of them."""
+        now = time.monotonic()
+        ready = [
+            (pending.mtime_ns, path)
+            for path, pending in self._pending.items()
+            if flush or pending.closed or now - pending.stable_since >= self.settle_seconds
+        ]
+        return [path for _, path in sorted(ready)[: self.max_batch_files]]
+
+    def _eligible(self, name: str) -> bool:
+        if name.startswith(".") or name.lower().endswith(IGNORED_SUFFIXES):
+            return False
+        return fnmatch.fnmatch(name, self.pattern)
+
+    def _track(self, path: Path, key: FileKey, now: float, closed: bool = False) -> None:
+        if self._seen.get(path) == key:
+            return
+        pending = self._pending.get(path)
+        if pending is None or pending.key != key:
+            self._pending[path] = _Pending(key[0], key[1], now, closed)
+        elif closed:
+            pending.closed = True
+
+    def _mark_closed(self, path: Path) -> None:
+        if not self._eligible(path.name):
+            return
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return
+        self._track(path, (stat.st_size, stat.st_mtime_ns), time.monotonic(), closed=True)
+        self._refresh_queue_stats()
+
+    def _commit_batch(self, paths: List[Path], on_batch: Optional[BatchCallback] = None) -> List[IngestionReport]:
+        """Load `paths` in one transaction, each file in its own savepoint."""
+        reports: List[IngestionReport] = []
+        loaded: Dict[Path, Tuple[FileKey, float]] = {}
+        database = self.ingestor.database
+        with database.transaction():
+            for path in paths:
+                pending = self._pending[path]
+                try:
+                    with database.savepoint("adpulse_watch_file"):
+                        reports.append(self._ingest(path))
+                except Exception as exc:  # reported per file; the rest of the batch still commits
+                    logger.warning("Could not ingest %s: %s", path, exc)
+                    reports.append(IngestionReport("unknown", path, 0, error=f"{type(exc).__name__}: {exc}"))
+                loaded[path] = (pending.key, pending.mtime_ns / 1e9)
+        committed = time.time()
+
+        for path, (key, _) in loaded.items():
+            self._seen[path] = key
+            if self._pending.get(path) is not None and self._pending[path].key == key:
+                del self._pending[path]
+        stats = self.stats
+        stats.batches += 1
+        stats.last_batch_at = datetime.fromtimestamp(committed, timezone.utc).isoformat(timespec="seconds")
+        for report in reports:
+            if report.error:
+                stats.failures += 1
+                continue
+            stats.files_ingested += 1
+            stats.rows_ingested += report.rows_ingested
+            if report.action == SKIP:
+                continue
+            lag = max(0.0, committed - loaded[report.source_file][1])
+            stats.last_lag_seconds = lag
+            stats.max_lag_seconds = max(lag, stats.max_lag_seconds or 0.0)
+            stats.total_lag_seconds += lag
+            stats.lag_samples += 1
+        self._refresh_queue_stats()
+        if on_batch is not None:
+            on_batch(reports)
+        return reports
+
+    def _ingest(self, path: Path) -> IngestionReport:
+        connector = (
+            self.ingestor.registry.get(self.platform, source=path)
+            if self.platform
+            else self.ingestor.registry.detect(path)
+        )
+        report = self.ingestor.ingest_file(connector.platform_slug, path)
+        # Report the path as queued, so lag and seen-tracking line up with it.
+        return IngestionReport(
+            report.platform, path, report.rows_ingested, report.elapsed_seconds, report.error, report.action
+        )
+
+    def _refresh_queue_stats(self) -> None:
+        self.stats.queue_depth = len(self._pending)
+        oldest = min((pending.mtime_ns for pending in self._pending.values()), default=None)
+        self.stats.oldest_pending_seconds = max(0.0, time.time() - oldest / 1e9) if oldest is not None else 0.0
+        self._write_status()
+
+    def _write_status(self) -> None:
+        if self.status_file is None:
+            return
+        temporary = self.status_file.with_name(f".{self.status_file.name}.tmp")
+        temporary.write_text(json.dumps(self.stats.as_dict(), indent=2) + "\n", encoding="utf-8")
+        os.replace(temporary, self.status_file)
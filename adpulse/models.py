@@ -1,28 +1,79 @@
 """
 SQLAlchemy ORM models.
+
+The schema itself is owned by `adpulse.storage.migrations`: `ad_performance`
+and the daily rollups are views over the star schema (ad_facts and its
+dimension tables), and writes through the ad_performance view land in the
+fact table via INSTEAD OF triggers. `Base.metadata.create_all` therefore
+creates no tables of its own; it runs the migrations instead.
 """
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, func, Index
+from sqlalchemy import Column, Float, Integer, MetaData, String, event
 
 from adpulse.database import Base
+from adpulse.storage.migrations import migrate
+from adpulse.storage.rollups import CAMPAIGN_ROLLUP, PLATFORM_ROLLUP
+
+
+class _Migrated(Base):
+    """Base for models over migration-managed views; its own metadata keeps them out of `create_all`."""
+
+    __abstract__ = True
+    metadata = MetaData()
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _apply_migrations(target, connection, **kw) -> None:
+    migrate(connection.connection.dbapi_connection)
 
 
-class AdPerformance(Base):
+class AdPerformance(_Migrated):
     __tablename__ = "ad_performance"
-    __table_args__ = (
-        Index("idx_ad_perf_campaign_date", "campaign_id", "event_date"),
-        Index("idx_ad_perf_platform_date", "platform", "event_date"),
-    )
-
-    id = Column(Integer, primary_key=True, index=True)
-    platform = Column(String, nullable=False, index=True)
-    campaign_id = Column(String, nullable=False, index=True)
+
+    platform = Column(String, primary_key=True)
+    campaign_id = Column(String, primary_key=True)
     campaign_name = Column(String, nullable=False)
-    event_date = Column(String, nullable=False)
+    event_date = Column(String, primary_key=True)
     impressions = Column(Integer, nullable=False)
     clicks = Column(Integer, nullable=False)
     spend = Column(Float, nullable=False)
     conversions = Column(Integer, nullable=False)
     revenue = Column(Float, nullable=False, default=0.0)
-    created_at = Column(DateTime, server_default=func.current_timestamp())
+    load_batch_id = Column(String, nullable=True)
+    # YYYYMMDD key derived from event_date; read-only (see `adpulse.storage.dimensions`).
+    day = Column(Integer, nullable=False)
+
+
+class DailyCampaignRollup(_Migrated):
+    """Per-campaign daily metrics: the fact table with names and ISO dates (see `adpulse.storage.rollups`)."""
+
+    __tablename__ = CAMPAIGN_ROLLUP
+
+    platform = Column(String, primary_key=True)
+    campaign_id = Column(String, primary_key=True)
+    event_date = Column(String, primary_key=True)
+    day = Column(Integer, nullable=False)
+    campaign_name = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    spend = Column(Float, nullable=False)
+    conversions = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+
+class DailyPlatformRollup(_Migrated):
+    """Per-platform daily sums of the facts, maintained by triggers."""
+
+    __tablename__ = PLATFORM_ROLLUP
+
+    platform = Column(String, primary_key=True)
+    event_date = Column(String, primary_key=True)
+    day = Column(Integer, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    impressions = Column(Integer, nullable=False)
+    clicks = Column(Integer, nullable=False)
+    spend = Column(Float, nullable=False)
+    conversions = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
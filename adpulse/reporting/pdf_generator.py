@@ -42,6 +42,8 @@ def generate_performance_report(output_path: str, report_data: Dict) -> None:
     story.append(Spacer(1, 0.2 * inch))
     story.append(_body(report_data.get("title", "Weekly Marketing Overview")))
     story.append(_body(report_data.get("date_range", "")))
+    if report_data.get("data_version") is not None:
+        story.append(_body(f"Data version {report_data['data_version']}"))
     story.append(Spacer(1, 0.3 * inch))
 
     story.append(_heading("Overall Summary", level=2))
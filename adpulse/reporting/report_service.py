@@ -4,12 +4,14 @@ Generate performance reports by composing API + AI outputs.
 from __future__ import annotations
 
 import os
+from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 import requests
 
+from adpulse.api.headers import SNAPSHOT_HEADER
 from adpulse.reporting.pdf_generator import generate_performance_report
 
 API_BASE_URL = os.getenv("ADPULSE_API_BASE_URL", "http://127.0.0.1:8000").rstrip("/")
@@ -27,16 +29,41 @@ def _clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
     return cleaned
 
 
-def _safe_get(path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+def _safe_get(path: str, params: Optional[Dict[str, Any]] = None, snapshot_id: Optional[str] = None) -> Optional[Any]:
     url = f"{API_BASE_URL}{path}"
+    headers = {SNAPSHOT_HEADER: snapshot_id} if snapshot_id else None
     try:
-        response = requests.get(url, params=_clean_params(params or {}), timeout=30)
+        response = requests.get(url, params=_clean_params(params or {}), headers=headers, timeout=30)
         response.raise_for_status()
         return response.json()
     except requests.RequestException:
         return None
 
 
+@contextmanager
+def _pinned_snapshot() -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Pin the API's current data version for the duration of the block.
+
+    Yields the snapshot (`snapshot_id`, `data_version`, ...), or None when the
+    API cannot open one; the report then reads the latest data per call.
+    """
+    try:
+        response = requests.post(f"{API_BASE_URL}/snapshots", timeout=30)
+        response.raise_for_status()
+        snapshot = response.json()
+    except requests.RequestException:
+        snapshot = None
+    try:
+        yield snapshot
+    finally:
+        if snapshot is not None:
+            try:
+                requests.delete(f"{API_BASE_URL}/snapshots/{snapshot['snapshot_id']}", timeout=30)
+            except requests.RequestException:
+                pass  # it expires on its own
+
+
 def _ensure_date(value) -> date:
     if isinstance(value, date):
         return value
@@ -51,32 +78,31 @@ def build_weekly_report(start_date, end_date, output_dir: str = "reports") -> st
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    platform_summaries = _safe_get(
-        "/summary/platforms", params={"start_date": start, "end_date": end}
-    ) or []
-    campaign_summaries = _safe_get(
-        "/campaigns/summary", params={"start_date": start, "end_date": end}
-    ) or []
-
-    top_campaigns = sorted(
-        campaign_summaries,
-        key=lambda row: row.get("total_spend", 0),
-        reverse=True,
-    )[:10]
-
-    account_health = _safe_get(
-        "/insights/account-health", params={"start_date": start, "end_date": end}
-    )
-    account_text = (account_health or {}).get("analysis") or "AI account insights unavailable."
-
-    roas_text = None
-    if platform_summaries:
-        primary_platform = platform_summaries[0]["platform"]
-        roas_insight = _safe_get(
-            "/insights/roas-drop",
-            params={"platform": primary_platform, "start_date": start, "end_date": end},
-        )
-        roas_text = (roas_insight or {}).get("analysis")
+    # Every section reads the same data version, even if a load commits meanwhile.
+    with _pinned_snapshot() as snapshot:
+        snapshot_id = snapshot["snapshot_id"] if snapshot else None
+        params = {"start_date": start, "end_date": end}
+        platform_summaries = _safe_get("/summary/platforms", params=params, snapshot_id=snapshot_id) or []
+        campaign_summaries = _safe_get("/campaigns/summary", params=params, snapshot_id=snapshot_id) or []
+
+        top_campaigns = sorted(
+            campaign_summaries,
+            key=lambda row: row.get("total_spend", 0),
+            reverse=True,
+        )[:10]
+
+        account_health = _safe_get("/insights/account-health", params=params, snapshot_id=snapshot_id)
+        account_text = (account_health or {}).get("analysis") or "AI account insights unavailable."
+
+        roas_text = None
+        if platform_summaries:
+            primary_platform = platform_summaries[0]["platform"]
+            roas_insight = _safe_get(
+                "/insights/roas-drop",
+                params={"platform": primary_platform, **params},
+                snapshot_id=snapshot_id,
+            )
+            roas_text = (roas_insight or {}).get("analysis")
 
     report_data = {
         "title": "AdPulse Weekly Performance Overview",
@@ -85,6 +111,7 @@ def build_weekly_report(start_date, end_date, output_dir: str = "reports") -> st
         "top_campaigns": top_campaigns,
         "ai_account_health": account_text,
         "ai_roas_insights": roas_text,
+        "data_version": snapshot["data_version"] if snapshot else None,
     }
 
     filename = f"adpulse_report_{start.isoformat()}_{end.isoformat()}.pdf"
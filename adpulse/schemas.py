@@ -3,7 +3,7 @@ Pydantic schemas shared across API endpoints.
 """
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
@@ -63,3 +63,26 @@ class CampaignDetail(BaseModel):
     cpa: float
     roas: float
     timeseries: List[DailyTimeseriesPoint]
+
+
+class IngestJobStatus(BaseModel):
+    job_id: str
+    platform: str
+    filename: str
+    status: str = Field(..., description="queued, running, succeeded or failed")
+    bytes_received: int
+    rows_processed: int = 0
+    rows_per_second: float = 0.0
+    elapsed_seconds: float = 0.0
+    action: Optional[str] = Field(None, description="How the file was loaded once the job finished")
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SnapshotStatus(BaseModel):
+    snapshot_id: str = Field(..., description="Send as the X-AdPulse-Snapshot header to read this data version")
+    data_version: int
+    created_at: datetime
+    expires_at: datetime
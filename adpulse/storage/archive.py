@@ -0,0 +1,379 @@
+"""
+Cold tier for closed months: Parquet partitions per platform and month.
+
+`archive_months` moves the facts of every month before a cutoff out of
+ad_facts into one Parquet file per (platform, month) under the archive
+directory, `platform=<slug>/month=YYYY-MM/<token>.parquet`, sorted by day so
+row-group statistics prune day ranges inside a file. The `archive_partitions`
+table is the manifest: file, min/max day, row count and metric sums per
+partition. Files are written first; the manifest rows and the fact deletes
+then commit together, so a reader sees each month either hot or cold, never
+both or neither. Paths are stored relative to the database's directory.
+
+A write that lands in an archived month first restores that partition into
+ad_facts (`ArchivedMonths`), so replace and accumulate loads behave as if it
+had never left; the next archive run moves it out again. `ColdArchive`
+aggregates the partitions that overlap a query for the API, which adds the
+results to the hot rollups.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from adpulse.config import DEFAULT_DB_BUSY_TIMEOUT
+from adpulse.storage.dimensions import DimensionKeys, day_key
+from adpulse.storage.rollups import METRIC_COLUMNS, create_rollups, drop_rollup_triggers, refresh_rollups
+from adpulse.storage.versions import bump_data_version
+from adpulse.utils import require_optional
+from adpulse.utils.identifiers import slugify_name
+
+ARCHIVE_MANIFEST = "archive_partitions"
+# Rows per Parquet row group; a month of one platform is usually a handful of groups.
+ROW_GROUP_SIZE = 65_536
+
+# Metric sums in METRIC_COLUMNS order.
+Metrics = Tuple[int, int, float, int, float]
+
+PARTITIONS_SQL = f"""
+SELECT p.name, a.month, a.path, a.min_day, a.max_day, a.row_count, {", ".join(f"a.{column}" for column in METRIC_COLUMNS)}
+FROM {ARCHIVE_MANIFEST} a
+JOIN dim_platforms p ON p.platform_key = a.platform_key
+ORDER BY p.name, a.month
+"""
+
+# Closed months still in ad_facts, with the manifest figures. Buckets compacted by
+# the retention policy (see `adpulse.storage.retention`) stay in the hot tier.
+_MONTHS_SQL = f"""
+SELECT platform_key, day / 100 AS month, MIN(day), MAX(day), COUNT(*),
+       {", ".join(f"SUM({column})" for column in METRIC_COLUMNS)}
+FROM ad_facts
+WHERE day < ?
+GROUP BY platform_key, month
+ORDER BY platform_key, month
+"""
+
+_EXPORT_SQL = f"""
+SELECT c.campaign_id, c.campaign_name, f.day, {", ".join(f"f.{column}" for column in METRIC_COLUMNS)}, b.batch_id
+FROM ad_facts f
+JOIN dim_campaigns c ON c.platform_key = f.platform_key AND c.campaign_key = f.campaign_key
+LEFT JOIN load_batches b ON b.load_key = f.load_key
+WHERE f.platform_key = ? AND f.day BETWEEN ? AND ?
+ORDER BY f.day, c.campaign_id
+"""
+
+_MANIFEST_INSERT_SQL = f"""
+INSERT INTO {ARCHIVE_MANIFEST} (platform_key, month, path, min_day, max_day, row_count, {", ".join(METRIC_COLUMNS)})
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Restored rows never overwrite a fact written for the same key since the month was archived.
+_RESTORE_SQL = f"""
+INSERT INTO ad_facts (platform_key, campaign_key, day, {", ".join(METRIC_COLUMNS)}, load_key)
+SELECT platform_key, campaign_key, ?, ?, ?, ?, ?, ?, ?
+FROM dim_campaigns
+WHERE platform_key = ? AND campaign_id = ?
+ON CONFLICT (platform_key, campaign_key, day) DO NOTHING
+"""
+
+_FILE_COLUMNS = ("campaign_id", "campaign_name", "day", *METRIC_COLUMNS, "load_batch_id")
+
+
+@dataclass(frozen=True)
+class ArchivePartition:
+    """One archived (platform, month) as recorded in the manifest."""
+
+    platform: str
+    month: int
+    path: Path
+    min_day: int
+    max_day: int
+    row_count: int
+    impressions: int
+    clicks: int
+    spend: float
+    conversions: int
+    revenue: float
+
+    def overlaps(self, start_day: Optional[int], end_day: Optional[int]) -> bool:
+        return (start_day is None or self.max_day >= start_day) and (end_day is None or self.min_day <= end_day)
+
+    def within(self, start_day: Optional[int], end_day: Optional[int]) -> bool:
+        return (start_day is None or self.min_day >= start_day) and (end_day is None or self.max_day <= end_day)
+
+
+_require_parquet = partial(
+    require_optional,
+    "pyarrow",
+    "pyarrow.compute",
+    "pyarrow.parquet",
+    feature="The Parquet archive",
+    install="'adpulse[arrow]'",
+)
+
+
+def database_dir(conn: sqlite3.Connection) -> Path:
+    """Directory of the main database file, which manifest paths are relative to."""
+    return Path(conn.execute("PRAGMA database_list").fetchone()[2]).parent
+
+
+def partition_dir(archive_dir: Path, platform: str, month: int) -> Path:
+    return archive_dir / f"platform={slugify_name(platform)}" / f"month={month // 100:04d}-{month % 100:02d}"
+
+
+def load_partitions(rows: Iterable[Sequence], base_dir: Path) -> List[ArchivePartition]:
+    """Manifest rows from `PARTITIONS_SQL` as partitions with absolute paths."""
+    return [ArchivePartition(row[0], row[1], base_dir / row[2], *row[3:]) for row in rows]
+
+
+def _write_partition(rows: List[tuple], target_dir: Path, row_group_size: int) -> Path:
+    pa, _, pq = _require_parquet()
+    columns = list(zip(*rows))
+    types = (
+        pa.string(), pa.string(), pa.int32(),
+        pa.int64(), pa.int64(), pa.float64(), pa.int64(), pa.float64(),
+        pa.string(),
+    )
+    table = pa.table(
+        {name: pa.array(values, type=kind) for name, values, kind in zip(_FILE_COLUMNS, columns, types)}
+    )
+    target_dir.mkdir(parents=True, exist_ok=True)
+    target = target_dir / f"{uuid.uuid4().hex}.parquet"
+    staging = target.with_suffix(".parquet.tmp")
+    pq.write_table(table, staging, row_group_size=row_group_size, compression="zstd")
+    os.replace(staging, target)
+    return target
+
+
+class ArchivedMonths:
+    """
+    The archived months of one writer's connection, restored into ad_facts on first write.
+
+    Restoring inserts the partition's rows (keeping their load batch, so
+    replace semantics are unchanged) and deletes its manifest row in the
+    writer's transaction; the file itself is left for `archive_months` to sweep.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, keys: DimensionKeys) -> None:
+        self.conn = conn
+        self.keys = keys
+        self.paths: Dict[Tuple[int, int], str] = {
+            (row[0], row[1]): row[2] for row in conn.execute(f"SELECT platform_key, month, path FROM {ARCHIVE_MANIFEST}")
+        }
+
+    def restore_touched(self, facts: Sequence[tuple]) -> int:
+        """Restore every archived month that `facts` (ad_facts rows) write to; returns the rows restored."""
+        if not self.paths:
+            return 0
+        touched = {(fact[0], fact[2] // 100) for fact in facts}.intersection(self.paths)
+        return sum(self.restore(*key) for key in sorted(touched))
+
+    def restore(self, platform_key: int, month: int) -> int:
+        path = database_dir(self.conn) / self.paths.pop((platform_key, month))
+        _, _, pq = _require_parquet()
+        table = pq.read_table(path, columns=["campaign_id", "day", *METRIC_COLUMNS, "load_batch_id"])
+        load_keys: Dict[Optional[str], Optional[int]] = {None: None}
+        rows = []
+        for campaign_id, day, *metrics, batch_id in zip(*(column.to_pylist() for column in table.columns)):
+            if batch_id not in load_keys:
+                load_keys[batch_id] = self.keys.load_key(batch_id)
+            rows.append((day, *metrics, load_keys[batch_id], platform_key, campaign_id))
+        self.conn.executemany(_RESTORE_SQL, rows)
+        self.conn.execute(f"DELETE FROM {ARCHIVE_MANIFEST} WHERE platform_key = ? AND month = ?", (platform_key, month))
+        return len(rows)
+
+
+def _sweep(conn: sqlite3.Connection, archive_dir: Path) -> int:
+    """Delete partition files under `archive_dir` that the manifest no longer references."""
+    base_dir = database_dir(conn)
+    referenced = {(base_dir / row[0]).resolve() for row in conn.execute(f"SELECT path FROM {ARCHIVE_MANIFEST}")}
+    removed = 0
+    for path in archive_dir.glob("platform=*/month=*/*.parquet"):
+        if path.resolve() not in referenced:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def archive_months(
+    db_path: Path,
+    archive_dir: Path,
+    before: date,
+    row_group_size: int = ROW_GROUP_SIZE,
+) -> List[ArchivePartition]:
+    """
+    Move every month that ends before `before`'s month out of ad_facts into Parquet.
+
+    Runs under the write lock, so no load can add rows to a month between its
+    export and its delete. Months archived earlier that took late writes were
+    restored by those writes and are exported again as a whole. Returns the
+    partitions written.
+    """
+    _require_parquet()
+    archive_dir = Path(archive_dir)
+    cutoff = day_key(before.replace(day=1).isoformat())
+    written: List[Path] = []
+    conn = sqlite3.connect(db_path, timeout=DEFAULT_DB_BUSY_TIMEOUT)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        base_dir = database_dir(conn)
+        months = conn.execute(_MONTHS_SQL, (cutoff,)).fetchall()
+        platforms = dict(conn.execute("SELECT platform_key, name FROM dim_platforms"))
+        archived = ArchivedMonths(conn, DimensionKeys(conn))
+        for platform_key, month, *_ in months:
+            if (platform_key, month) in archived.paths:
+                archived.restore(platform_key, month)
+        # The month's rollup rows are recomputed once below; per-row triggers would only subtract them.
+        drop_rollup_triggers(conn)
+        partitions = []
+        for platform_key, month, min_day, max_day, row_count, *sums in conn.execute(_MONTHS_SQL, (cutoff,)).fetchall():
+            days = (platform_key, month * 100, month * 100 + 99)
+            rows = conn.execute(_EXPORT_SQL, days).fetchall()
+            path = _write_partition(rows, partition_dir(archive_dir, platforms[platform_key], month), row_group_size)
+            written.append(path)
+            relative = Path(os.path.relpath(path, base_dir)).as_posix()
+            conn.execute(_MANIFEST_INSERT_SQL, (platform_key, month, relative, min_day, max_day, row_count, *sums))
+            conn.execute("DELETE FROM ad_facts WHERE platform_key = ? AND day BETWEEN ? AND ?", days)
+            refresh_rollups(conn, platform_key, days[1:])
+            partitions.append(
+                ArchivePartition(platforms[platform_key], month, path, min_day, max_day, row_count, *sums)
+            )
+        create_rollups(conn)
+        if partitions:
+            bump_data_version(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        for path in written:
+            path.unlink(missing_ok=True)
+        raise
+    try:
+        _sweep(conn, archive_dir)
+    finally:
+        conn.close()
+    return partitions
+
+
+class ColdArchive:
+    """
+    Aggregates over archived partitions for the read API.
+
+    Only partitions of the requested platform whose day range overlaps the
+    requested dates are opened, and only the needed columns are read; day and
+    campaign filters are pushed down to Parquet row groups. Platform totals
+    over partitions inside the range come from the manifest sums instead.
+    """
+
+    def __init__(self, partitions: Sequence[ArchivePartition]) -> None:
+        self.partitions = list(partitions)
+
+    def aggregate(
+        self,
+        group_by: Sequence[str] = (),
+        platform: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[Tuple[str, tuple, Metrics]]:
+        """(platform, group values, metric sums) per platform and `group_by` key ("campaign_id" and/or "day")."""
+        start_day = day_key(start_date.isoformat()) if start_date else None
+        end_day = day_key(end_date.isoformat()) if end_date else None
+        results: Dict[Tuple[str, tuple], List] = {}
+        for partition in self.partitions:
+            if (platform and partition.platform != platform) or not partition.overlaps(start_day, end_day):
+                continue
+            if not group_by and campaign_id is None and partition.within(start_day, end_day):
+                # Whole-partition totals are in the manifest; the file is not opened.
+                found = [((), tuple(getattr(partition, column) for column in METRIC_COLUMNS))]
+            else:
+                found = _aggregate_file(partition, group_by, campaign_id, start_day, end_day)
+            for key, metrics in found:
+                totals = results.setdefault((partition.platform, key), [0, 0, 0.0, 0, 0.0])
+                for index, value in enumerate(metrics):
+                    totals[index] += value
+        return [(platform_name, key, tuple(totals)) for (platform_name, key), totals in results.items()]
+
+    def iter_rows(
+        self,
+        platform: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        batch_size: int = ROW_GROUP_SIZE,
+    ) -> Iterator[List[tuple]]:
+        """
+        The archived facts as lists of at most `batch_size` rows.
+
+        Rows are (platform, campaign_id, campaign_name, day, *METRIC_COLUMNS),
+        partition by partition in day order. Files are read one batch at a time.
+        """
+        start_day = day_key(start_date.isoformat()) if start_date else None
+        end_day = day_key(end_date.isoformat()) if end_date else None
+        columns = ["campaign_id", "campaign_name", "day", *METRIC_COLUMNS]
+        for partition in self.partitions:
+            if (platform and partition.platform != platform) or not partition.overlaps(start_day, end_day):
+                continue
+            for batch in _iter_file(partition, columns, campaign_id, start_day, end_day, batch_size):
+                yield [(partition.platform, *row) for row in zip(*(batch[column].to_pylist() for column in columns))]
+
+
+def _iter_file(
+    partition: ArchivePartition,
+    columns: Sequence[str],
+    campaign_id: Optional[str],
+    start_day: Optional[int],
+    end_day: Optional[int],
+    batch_size: int,
+):
+    _, pc, pq = _require_parquet()
+    handle = pq.ParquetFile(partition.path)
+    try:
+        for batch in handle.iter_batches(batch_size=batch_size, columns=list(columns)):
+            mask = None
+            if start_day is not None and start_day > partition.min_day:
+                mask = pc.greater_equal(batch["day"], start_day)
+            if end_day is not None and end_day < partition.max_day:
+                upper = pc.less_equal(batch["day"], end_day)
+                mask = upper if mask is None else pc.and_(mask, upper)
+            if campaign_id is not None:
+                wanted = pc.equal(batch["campaign_id"], campaign_id)
+                mask = wanted if mask is None else pc.and_(mask, wanted)
+            if mask is not None:
+                batch = batch.filter(mask)
+            if batch.num_rows:
+                yield batch
+    finally:
+        handle.close()
+
+
+def _aggregate_file(
+    partition: ArchivePartition,
+    group_by: Sequence[str],
+    campaign_id: Optional[str],
+    start_day: Optional[int],
+    end_day: Optional[int],
+) -> List[Tuple[tuple, Metrics]]:
+    _, pc, pq = _require_parquet()
+    filters = []
+    if start_day is not None and start_day > partition.min_day:
+        filters.append(("day", ">=", start_day))
+    if end_day is not None and end_day < partition.max_day:
+        filters.append(("day", "<=", end_day))
+    if campaign_id is not None:
+        filters.append(("campaign_id", "==", campaign_id))
+    table = pq.read_table(partition.path, columns=[*group_by, *METRIC_COLUMNS], filters=filters or None)
+    if table.num_rows == 0:
+        return []
+    if not group_by:
+        return [((), tuple(pc.sum(table[column]).as_py() for column in METRIC_COLUMNS))]
+    grouped = table.group_by(list(group_by)).aggregate([(column, "sum") for column in METRIC_COLUMNS])
+    keys = zip(*(grouped[column].to_pylist() for column in group_by))
+    metrics = zip(*(grouped[f"{column}_sum"].to_pylist() for column in METRIC_COLUMNS))
+    return list(zip(keys, metrics))
+
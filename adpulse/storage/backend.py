@@ -0,0 +1,272 @@
+"""
+Storage backend interface shared by the CLI, `DataIngestor` and the API.
+
+`DatabaseManager` (SQLite, the default) and `DuckDBBackend` (embedded DuckDB,
+optional) implement `StorageBackend`; `open_backend` picks one from
+`Settings.storage_backend`. The API reads aggregates through a
+`MetricsReader`: DuckDB answers them itself, SQLite through the ORM session
+(`adpulse.api.metrics.OrmMetricsReader`).
+"""
+from __future__ import annotations
+
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from adpulse.ingestion.schema import DbRow, NormalizedRecord, RecordBatch, batch_records
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from adpulse.config import Settings
+
+DEFAULT_BATCH_SIZE = 5_000
+STORAGE_BACKENDS = ("sqlite", "duckdb")
+
+CampaignMapping = Tuple[str, str, str]
+# Called with the number of rows written after every chunk.
+ProgressCallback = Callable[[int], None]
+# What writers accept per chunk: a RecordBatch, or database tuples (see `NormalizedRecord.as_db_tuple`).
+RowChunk = Union[RecordBatch, Iterable[DbRow]]
+
+WRITE_MODES = ("replace", "accumulate")
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """
+    What has been committed from one source file.
+
+    `content_hash` covers the first `bytes_committed` bytes, so a later run can
+    tell whether the file was only appended to (or is unchanged) or rewritten.
+    """
+
+    path: str
+    platform: str
+    size: int
+    mtime_ns: int
+    content_hash: str
+    bytes_committed: int
+    rows_committed: int
+    batch_id: str
+    status: str
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+@dataclass(frozen=True)
+class MetricTotals:
+    """Summed metrics for a platform, or for a campaign when the campaign fields are set."""
+
+    platform: str
+    impressions: int
+    clicks: int
+    spend: float
+    conversions: int
+    revenue: float
+    campaign_id: Optional[str] = None
+    campaign_name: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DailyMetrics:
+    """Summed metrics for one day; `platform` is None when the day spans a filtered-out platform mix."""
+
+    event_date: date
+    impressions: int
+    clicks: int
+    spend: float
+    conversions: int
+    revenue: float
+    platform: Optional[str] = None
+
+
+class MetricsReader(ABC):
+    """The aggregates behind the API routes. Date bounds are inclusive and optional."""
+
+    @abstractmethod
+    def platform_totals(self, start_date: Optional[date], end_date: Optional[date]) -> List[MetricTotals]:
+        """Totals per platform, ordered by platform."""
+
+    @abstractmethod
+    def campaign_totals(
+        self, platform: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> List[MetricTotals]:
+        """Totals per campaign, ordered by platform, campaign name and id."""
+
+    @abstractmethod
+    def campaign(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> Optional[MetricTotals]:
+        """Totals for one campaign id (across platforms), or None when it has no rows in the window."""
+
+    @abstractmethod
+    def campaign_days(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[DailyMetrics]:
+        """Daily totals for one campaign id, ordered by date."""
+
+    @abstractmethod
+    def daily_totals(
+        self,
+        platform: Optional[str],
+        campaign_id: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[DailyMetrics]:
+        """Daily totals, per platform unless `platform` is given, ordered by date and platform."""
+
+
+class StorageBackend(ABC):
+    """
+    Where normalized rows, the ingest manifest and campaign ids are stored.
+
+    Writers returned by `open_writer` expose `write(rows, batch_id,
+    checkpoint=None) -> int` and upsert on (platform, campaign_id,
+    event_date) with `replace` or `accumulate` semantics.
+    """
+
+    bulk_load: bool = False
+
+    @abstractmethod
+    def initialize(self) -> None:
+        """Create the store if needed and bring its schema up to date."""
+
+    @abstractmethod
+    def open_writer(self, mode: str = "replace", commit_per_batch: bool = True):
+        """Context manager yielding a writer bound to one connection for the duration of a load."""
+
+    @abstractmethod
+    def transaction(self):
+        """Context manager running every read and write of the calling thread in one transaction."""
+
+    @abstractmethod
+    def savepoint(self, name: str = "adpulse_savepoint"):
+        """Inside `transaction()`, a context manager rolling back only its block's writes if it raises."""
+
+    @abstractmethod
+    def get_manifest_entry(self, path: str) -> Optional[ManifestEntry]:
+        ...
+
+    @abstractmethod
+    def save_manifest_entry(self, entry: ManifestEntry) -> None:
+        ...
+
+    @abstractmethod
+    def load_campaign_ids(self) -> List[CampaignMapping]:
+        """Return persisted (platform_slug, campaign_name, campaign_id) mappings."""
+
+    @abstractmethod
+    def save_campaign_ids(self, mappings: Iterable[CampaignMapping]) -> int:
+        """Persist derived campaign ids; names that are already known are left alone."""
+
+    @abstractmethod
+    def fetch_summary(self) -> List[Mapping[str, Any]]:
+        """Per-platform `rows_ingested` and metric sums, ordered by platform."""
+
+    @abstractmethod
+    def fetch_totals(self) -> Optional[Mapping[str, Any]]:
+        """`rows_ingested` and metric sums over everything stored."""
+
+    @abstractmethod
+    def row_count(self) -> int:
+        ...
+
+    def insert_records(
+        self,
+        records: Iterable[NormalizedRecord],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        commit_per_batch: bool = True,
+        mode: str = "replace",
+        batch_id: str | None = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Stream records into storage in chunks of `batch_size`.
+
+        Only one chunk of tuples is alive at a time, so memory stays flat for
+        arbitrarily large inputs. With `commit_per_batch` each chunk is its own
+        transaction; otherwise the whole input commits (or rolls back) at once.
+        Rows are upserted on (platform, campaign_id, event_date) using `mode`.
+        """
+        return self.insert_row_chunks(
+            batch_records(records, batch_size),
+            commit_per_batch=commit_per_batch,
+            mode=mode,
+            batch_id=batch_id,
+            progress=progress,
+        )
+
+    def insert_record_batches(
+        self,
+        batches: Iterable[RecordBatch],
+        commit_per_batch: bool = True,
+        mode: str = "replace",
+        batch_id: str | None = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """Upsert RecordBatches column-wise, without building per-row records."""
+        return self.insert_row_chunks(
+            batches, commit_per_batch=commit_per_batch, mode=mode, batch_id=batch_id, progress=progress
+        )
+
+    def insert_row_chunks(
+        self,
+        chunks: Iterable[RowChunk],
+        commit_per_batch: bool = True,
+        mode: str = "replace",
+        batch_id: str | None = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """
+        Write RecordBatches or pre-built database tuples, one chunk at a time.
+
+        All chunks belong to a single load batch (`batch_id`, generated when
+        omitted). `progress` is called with each chunk's row count once it is
+        written.
+        """
+        batch_id = batch_id or new_batch_id()
+        written = 0
+        with self.open_writer(mode=mode, commit_per_batch=commit_per_batch) as writer:
+            for chunk in chunks:
+                count = writer.write(chunk, batch_id)
+                written += count
+                if progress is not None:
+                    progress(count)
+        return written
+
+    def insert_checkpointed_chunks(
+        self,
+        chunks: Iterable[Tuple[RowChunk, Optional[ManifestEntry]]],
+        batch_id: str,
+        commit_per_batch: bool = True,
+        mode: str = "replace",
+        progress: Optional[ProgressCallback] = None,
+    ) -> int:
+        """Like `insert_row_chunks`, but each chunk carries the manifest checkpoint reached after it."""
+        written = 0
+        with self.open_writer(mode=mode, commit_per_batch=commit_per_batch) as writer:
+            for rows, checkpoint in chunks:
+                count = writer.write(rows, batch_id, checkpoint=checkpoint)
+                written += count
+                if progress is not None:
+                    progress(count)
+        return written
+
+
+def open_backend(settings: Optional["Settings"] = None, bulk_load: bool = False) -> StorageBackend:
+    """The backend named by `settings.storage_backend` (SQLite unless configured otherwise)."""
+    from adpulse.config import load_settings
+
+    settings = settings or load_settings()
+    if settings.storage_backend == "duckdb":
+        from adpulse.storage.duckdb_backend import DuckDBBackend
+
+        return DuckDBBackend(settings.duckdb_path, bulk_load=bulk_load)
+    if settings.storage_backend == "sqlite":
+        from adpulse.storage.database import DatabaseManager
+
+        return DatabaseManager(settings.db_path, bulk_load=bulk_load)
+    raise ValueError(
+        f"Unsupported storage backend '{settings.storage_backend}'. Supported: {', '.join(STORAGE_BACKENDS)}"
+    )
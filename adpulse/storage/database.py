@@ -4,32 +4,156 @@ SQLite database helpers for persisting normalized data.
 from __future__ import annotations
 
 import sqlite3
+import threading
 from contextlib import contextmanager
+from dataclasses import astuple
+from datetime import date
 from pathlib import Path
-from typing import Iterable, Iterator, List, Sequence
-
-from adpulse.ingestion.schema import NormalizedRecord
-
-SCHEMA = """
-CREATE TABLE IF NOT EXISTS ad_performance (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    platform TEXT NOT NULL,
-    campaign_id TEXT NOT NULL,
-    campaign_name TEXT NOT NULL,
-    event_date TEXT NOT NULL,
-    impressions INTEGER NOT NULL,
-    clicks INTEGER NOT NULL,
-    spend REAL NOT NULL,
-    conversions INTEGER NOT NULL,
-    revenue REAL NOT NULL DEFAULT 0,
-    created_at TEXT DEFAULT CURRENT_TIMESTAMP
-);
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from adpulse.config import DEFAULT_DB_BUSY_TIMEOUT, DEFAULT_DB_CACHE_SIZE_KIB, DEFAULT_DB_MMAP_SIZE
+from adpulse.storage.archive import (
+    ARCHIVE_MANIFEST,
+    PARTITIONS_SQL,
+    ArchivedMonths,
+    ArchivePartition,
+    ColdArchive,
+    archive_months,
+    database_dir,
+    load_partitions,
+)
+from adpulse.storage.backend import (  # re-exported: callers import these from here
+    DEFAULT_BATCH_SIZE,
+    WRITE_MODES,
+    CampaignMapping,
+    ManifestEntry,
+    ProgressCallback,
+    RowChunk,
+    StorageBackend,
+    new_batch_id,
+)
+from adpulse.storage.dimensions import DimensionKeys
+from adpulse.storage.migrations import (
+    ARCHIVE_SCHEMA_VERSION,
+    NATURAL_KEY_INDEX_SQL,
+    SCHEMA,
+    STAR_SCHEMA_VERSION,
+    migrate,
+    schema_version,
+)
+from adpulse.storage.retention import CompactedDays, CompactionReport, RetentionPolicy, compact
+from adpulse.storage.rollups import (
+    METRIC_COLUMNS,
+    PLATFORM_DAY_ROLLUP,
+    PLATFORM_ROLLUP,
+    create_rollups,
+    drop_rollup_triggers,
+    rebuild_rollups,
+    refresh_rollups,
+)
+from adpulse.storage.versions import bump_data_version
+
+DEDUPE_STRATEGIES = ("latest", "sum")
+
+# Platform-level rows of both tiers: the hot daily rollup and the archive manifest's per-month sums.
+_HOT_TIER = f"""
+SELECT platform, row_count, {", ".join(METRIC_COLUMNS)} FROM {PLATFORM_ROLLUP}"""
+_ALL_TIERS = f"""{_HOT_TIER}
+UNION ALL
+SELECT p.name, a.row_count, {", ".join(f"a.{column}" for column in METRIC_COLUMNS)}
+FROM {ARCHIVE_MANIFEST} a JOIN dim_platforms p ON p.platform_key = a.platform_key"""
+
+_INSERT_INTO = f"""
+INSERT INTO ad_facts (platform_key, campaign_key, day, {", ".join(METRIC_COLUMNS)}, load_key)"""
+
+_ON_CONFLICT = """
+ON CONFLICT (platform_key, campaign_key, day) DO UPDATE SET
 """
 
+# Replace: the first row of a load overwrites what an earlier load stored, and
+# later rows for the same key within that load (same load key) add up. That
+# way re-ingesting a file is idempotent even when it has several rows per key.
+_REPLACE_SET = ",\n".join(
+    f"    {column} = CASE WHEN ad_facts.load_key = excluded.load_key "
+    f"THEN ad_facts.{column} + excluded.{column} ELSE excluded.{column} END"
+    for column in METRIC_COLUMNS
+) + ",\n    load_key = excluded.load_key"
+
+# Accumulate: every load adds on top of what is stored (for delta exports).
+_ACCUMULATE_SET = ",\n".join(
+    f"    {column} = ad_facts.{column} + excluded.{column}" for column in METRIC_COLUMNS
+) + ",\n    load_key = excluded.load_key"
+
+_UPSERT_SET = {"replace": _REPLACE_SET, "accumulate": _ACCUMULATE_SET}
+
+UPSERT_SQL = {
+    mode: f"{_INSERT_INTO} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?){_ON_CONFLICT}{assignments}"
+    for mode, assignments in _UPSERT_SET.items()
+}
+UPSERT_REPLACE_SQL = UPSERT_SQL["replace"]
+UPSERT_ACCUMULATE_SQL = UPSERT_SQL["accumulate"]
+
+# Bulk loads stage fact rows in an unindexed temp table and merge them in one
+# statement. Staged rows are applied in key order and, within a key, in the
+# order they were staged, so each key ends up exactly as if its rows had been
+# upserted one by one, while the fact table's primary key is appended to sequentially.
+# (`WHERE true` keeps SQLite from parsing ON CONFLICT as a join constraint.)
+STAGING_TABLE = "staging_ad_facts"
+STAGING_SCHEMA = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    platform_key INTEGER, campaign_key INTEGER, day INTEGER,
+    impressions INTEGER, clicks INTEGER, spend REAL, conversions INTEGER, revenue REAL,
+    load_key INTEGER
+)
+"""
+STAGE_SQL = f"INSERT INTO {STAGING_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_MERGE_SELECT = f"""
+SELECT platform_key, campaign_key, day, {", ".join(METRIC_COLUMNS)}, load_key
+FROM {STAGING_TABLE}
+WHERE true
+ORDER BY platform_key, campaign_key, day, rowid"""
+MERGE_SQL = {
+    mode: f"{_INSERT_INTO}{_MERGE_SELECT}{_ON_CONFLICT}{assignments}"
+    for mode, assignments in _UPSERT_SET.items()
+}
+
+BULK_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -262144",  # 256 MiB page cache
+    "PRAGMA journal_size_limit = 67108864",  # truncate the WAL back to 64 MiB after checkpoints
+)
+# Secondary indexes are dropped and rebuilt around a merge that adds at least
+# this fraction of the table's current size; rebuilding is cheaper then.
+DEFER_INDEX_RATIO = 0.5
+
+
+MANIFEST_STATUSES = ("partial", "complete")
+
+_MANIFEST_COLUMNS = (
+    "path, platform, size, mtime_ns, content_hash, bytes_committed, rows_committed, batch_id, status"
+)
+MANIFEST_UPSERT_SQL = f"""
+INSERT OR REPLACE INTO ingest_manifest ({_MANIFEST_COLUMNS}, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+"""
+
+
+def tune_connection(
+    conn: sqlite3.Connection,
+    cache_size_kib: int = DEFAULT_DB_CACHE_SIZE_KIB,
+    mmap_size: int = DEFAULT_DB_MMAP_SIZE,
+) -> None:
+    """Per-connection pragmas shared by the CLI, the writers and the API's pooled connections."""
+    conn.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
 
 def _connect(db_path: Path) -> sqlite3.Connection:
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, timeout=DEFAULT_DB_BUSY_TIMEOUT)
     conn.row_factory = sqlite3.Row
+    tune_connection(conn)
     return conn
 
 
@@ -43,66 +167,372 @@ def _connection(db_path: Path) -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
-class DatabaseManager:
-    """Thin wrapper around sqlite3 to keep responsibilities tidy."""
+def _require_star_schema(conn: sqlite3.Connection) -> None:
+    if schema_version(conn) < STAR_SCHEMA_VERSION:
+        raise RuntimeError(
+            "ad_performance contains duplicate (platform, campaign_id, event_date) rows, so it has not "
+            "been migrated to the fact table yet. Run `adpulse dedupe` once before ingesting."
+        )
+
+
+def _tiers(conn: sqlite3.Connection) -> str:
+    # Until `adpulse dedupe` lets the migrations run, there is no archive manifest and nothing archived.
+    return _ALL_TIERS if schema_version(conn) >= ARCHIVE_SCHEMA_VERSION else _HOT_TIER
+
+
+class ChunkWriter:
+    """
+    Upserts chunks of database tuples over one open connection.
+
+    Each chunk is tagged with the load batch id that drives replace semantics,
+    and its rows are turned into fact rows (see `DimensionKeys`). Rows inside
+    compacted retention periods are skipped (see `adpulse.storage.retention`),
+    and archived months a chunk writes to are restored first (see
+    `adpulse.storage.archive`).
+    """
+
+    def __init__(self, conn: sqlite3.Connection, mode: str = "replace", commit_per_batch: bool = True) -> None:
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode '{mode}'. Supported: {', '.join(WRITE_MODES)}")
+        _require_star_schema(conn)
+        self.conn = conn
+        self.keys = DimensionKeys(conn)
+        self.compacted = CompactedDays(conn)
+        self.archived = ArchivedMonths(conn, self.keys)
+        self.sql = UPSERT_SQL[mode]
+        self.commit_per_batch = commit_per_batch
+
+    def write(self, rows: RowChunk, batch_id: str, checkpoint: Optional[ManifestEntry] = None) -> int:
+        """Upsert one chunk; `checkpoint` is recorded in the same transaction as the rows."""
+        facts = self.compacted.keep(self.keys.fact_rows(rows, batch_id))
+        self.archived.restore_touched(facts)
+        cursor = self.conn.executemany(self.sql, facts)
+        written = cursor.rowcount
+        if written:
+            bump_data_version(self.conn)
+        if checkpoint is not None:
+            self.conn.execute(MANIFEST_UPSERT_SQL, astuple(checkpoint))
+        if self.commit_per_batch:
+            self.conn.commit()
+        return written
+
+
+class BulkWriter:
+    """
+    Bulk-load counterpart of `ChunkWriter` with the same `write` signature.
+
+    Chunks go into an unindexed temp staging table on one long-lived, tuned
+    connection (WAL, synchronous=NORMAL, large page cache). `finish` merges
+    everything into ad_facts with a single set-based upsert, rebuilding
+    secondary indexes and the daily rollups afterwards when the load is large
+    relative to the table, and records manifest checkpoints in that same transaction. Nothing is
+    visible until then, so a failed load leaves the table untouched.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, mode: str = "replace") -> None:
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode '{mode}'. Supported: {', '.join(WRITE_MODES)}")
+        _require_star_schema(conn)
+        self.conn = conn
+        self.keys = DimensionKeys(conn)
+        self.compacted = CompactedDays(conn)
+        self.archived = ArchivedMonths(conn, self.keys)
+        self.mode = mode
+        self.staged = 0
+        self.checkpoints: Dict[str, ManifestEntry] = {}
+        for pragma in BULK_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute(STAGING_SCHEMA)
+        conn.execute(f"DELETE FROM {STAGING_TABLE}")
+
+    def write(self, rows: RowChunk, batch_id: str, checkpoint: Optional[ManifestEntry] = None) -> int:
+        facts = self.compacted.keep(self.keys.fact_rows(rows, batch_id))
+        self.archived.restore_touched(facts)
+        cursor = self.conn.executemany(STAGE_SQL, facts)
+        if checkpoint is not None:
+            self.checkpoints[checkpoint.path] = checkpoint
+        self.staged += cursor.rowcount
+        return cursor.rowcount
+
+    def finish(self) -> None:
+        defer = self._should_defer_indexes()
+        deferred = self._drop_secondary_indexes() if defer else []
+        if defer:
+            # Per-row rollup triggers would dominate a merge this large; recompute the rollups once instead.
+            drop_rollup_triggers(self.conn)
+        self.conn.execute(MERGE_SQL[self.mode])
+        for sql in deferred:
+            self.conn.execute(sql)
+        if defer:
+            refresh_rollups(self.conn)
+            create_rollups(self.conn)
+        self.conn.executemany(MANIFEST_UPSERT_SQL, [astuple(entry) for entry in self.checkpoints.values()])
+        if self.staged:
+            bump_data_version(self.conn)
+        self.conn.execute(f"DROP TABLE {STAGING_TABLE}")
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def _should_defer_indexes(self) -> bool:
+        existing = self.conn.execute(f"SELECT COALESCE(SUM(row_count), 0) FROM {PLATFORM_DAY_ROLLUP}").fetchone()[0]
+        return self.staged >= existing * DEFER_INDEX_RATIO
+
+    def _drop_secondary_indexes(self) -> List[str]:
+        """Drop explicitly created non-unique indexes and return the SQL to rebuild them."""
+        rows = self.conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'ad_facts' AND sql IS NOT NULL"
+        ).fetchall()
+        secondary = [(row["name"], row["sql"]) for row in rows if not row["sql"].upper().startswith("CREATE UNIQUE")]
+        for name, _ in secondary:
+            self.conn.execute(f'DROP INDEX "{name}"')
+        return [sql for _, sql in secondary]
 
-    def __init__(self, db_path: Path) -> None:
+
+class DatabaseManager(StorageBackend):
+    """
+    SQLite storage backend: a thin wrapper around sqlite3 to keep responsibilities tidy.
+
+    With `bulk_load` every writer is a `BulkWriter` (staged, set-based merge)
+    instead of a `ChunkWriter` (chunked upserts).
+    """
+
+    def __init__(self, db_path: Path, bulk_load: bool = False) -> None:
         self.db_path = Path(db_path)
+        self.bulk_load = bulk_load
+        self._local = threading.local()
+
+    @property
+    def _transaction(self) -> Optional[sqlite3.Connection]:
+        return getattr(self._local, "connection", None)
+
+    @contextmanager
+    def _session(self) -> Iterator[sqlite3.Connection]:
+        """The connection of this thread's open `transaction()`, or a fresh one committed on exit."""
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        with _connection(self.db_path) as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Run every read and write inside the block on one connection and commit once at the end.
+
+        Writers opened inside the block are ChunkWriters that never commit on
+        their own (bulk mode does not apply), so many small loads share one
+        transaction. Everything rolls back if the block raises; `savepoint`
+        undoes just part of it. The block only applies to the calling thread.
+        """
+        if self._transaction is not None:
+            raise RuntimeError("A transaction is already open on this DatabaseManager")
+        conn = _connect(self.db_path)
+        conn.execute("BEGIN")
+        self._local.connection = conn
+        try:
+            yield
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.connection = None
+            conn.close()
+
+    @contextmanager
+    def savepoint(self, name: str = "adpulse_savepoint") -> Iterator[None]:
+        """Inside `transaction()`, roll back only this block's writes if it raises."""
+        conn = self._transaction
+        if conn is None:
+            raise RuntimeError("savepoint() needs an enclosing transaction()")
+        conn.execute(f'SAVEPOINT "{name}"')
+        try:
+            yield
+        except BaseException:
+            conn.execute(f'ROLLBACK TO "{name}"')
+            conn.execute(f'RELEASE "{name}"')
+            raise
+        conn.execute(f'RELEASE "{name}"')
 
     def initialize(self) -> None:
+        """
+        Create the database if needed and apply pending schema migrations (see `adpulse.storage.migrations`).
+
+        The database is switched to WAL journaling, which persists in the file:
+        readers then see the last committed state while a load is writing,
+        instead of waiting for it.
+        """
         with _connection(self.db_path) as conn:
-            conn.executescript(SCHEMA)
+            conn.execute("PRAGMA journal_mode = WAL")
+            migrate(conn)
+
+    @contextmanager
+    def open_writer(
+        self,
+        mode: str = "replace",
+        commit_per_batch: bool = True,
+    ) -> Iterator[Union[ChunkWriter, BulkWriter]]:
+        """
+        Yield a writer bound to one connection for the duration of a load.
 
-    def insert_records(self, records: Sequence[NormalizedRecord]) -> int:
-        if not records:
-            return 0
+        Bulk writers always load in a single transaction, so `commit_per_batch`
+        only applies to the regular ChunkWriter. Inside `transaction()` the
+        writer shares that transaction instead.
+        """
+        if self._transaction is not None:
+            yield ChunkWriter(self._transaction, mode=mode, commit_per_batch=False)
+            return
         with _connection(self.db_path) as conn:
-            conn.executemany(
-                """
-                INSERT INTO ad_performance (
-                    platform, campaign_id, campaign_name, event_date,
-                    impressions, clicks, spend, conversions, revenue
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                [record.as_db_tuple() for record in records],
+            if not self.bulk_load:
+                yield ChunkWriter(conn, mode=mode, commit_per_batch=commit_per_batch)
+                return
+            writer = BulkWriter(conn, mode=mode)
+            try:
+                yield writer
+            except BaseException:
+                conn.rollback()
+                raise
+            writer.finish()
+
+    def get_manifest_entry(self, path: str) -> Optional[ManifestEntry]:
+        with self._session() as conn:
+            row = conn.execute(f"SELECT {_MANIFEST_COLUMNS} FROM ingest_manifest WHERE path = ?", (path,)).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def save_manifest_entry(self, entry: ManifestEntry) -> None:
+        with self._session() as conn:
+            conn.execute(MANIFEST_UPSERT_SQL, astuple(entry))
+
+    def load_campaign_ids(self) -> List[CampaignMapping]:
+        """Return persisted (platform_slug, campaign_name, campaign_id) mappings."""
+        with self._session() as conn:
+            cursor = conn.execute("SELECT platform_slug, campaign_name, campaign_id FROM campaigns")
+            return [tuple(row) for row in cursor.fetchall()]
+
+    def save_campaign_ids(self, mappings: Iterable[CampaignMapping]) -> int:
+        """Persist derived campaign ids; names that are already known are left alone."""
+        with self._session() as conn:
+            cursor = conn.executemany(
+                "INSERT OR IGNORE INTO campaigns (platform_slug, campaign_name, campaign_id) VALUES (?, ?, ?)",
+                mappings,
             )
-        return len(records)
+            return cursor.rowcount
 
-    def fetch_summary(self) -> List[sqlite3.Row]:
-        query = """
-        SELECT
-            platform,
-            COUNT(*) AS rows_ingested,
-            SUM(impressions) AS impressions,
-            SUM(clicks) AS clicks,
-            SUM(spend) AS spend,
-            SUM(conversions) AS conversions,
-            SUM(revenue) AS revenue
-        FROM ad_performance
-        GROUP BY platform
-        ORDER BY platform;
+    def deduplicate(self, strategy: str = "latest", vacuum: bool = True) -> Tuple[int, int]:
         """
-        with _connection(self.db_path) as conn:
-            cursor = conn.execute(query)
-            return cursor.fetchall()
+        Collapse duplicate natural keys left by pre-upsert loads, then finish the schema migrations.
 
-    def fetch_totals(self) -> sqlite3.Row | None:
-        query = """
-        SELECT
-            COUNT(*) AS rows_ingested,
-            SUM(impressions) AS impressions,
-            SUM(clicks) AS clicks,
-            SUM(spend) AS spend,
-            SUM(conversions) AS conversions,
-            SUM(revenue) AS revenue
-        FROM ad_performance;
+        `latest` keeps the most recently inserted row per key (what a re-load
+        meant to do); `sum` folds every duplicate into one row. Databases
+        already on the fact table cannot hold duplicates and are only vacuumed.
+        Returns the row counts before and after.
         """
+        if strategy not in DEDUPE_STRATEGIES:
+            raise ValueError(f"Unsupported strategy '{strategy}'. Supported: {', '.join(DEDUPE_STRATEGIES)}")
+        self.initialize()
+        before = self.row_count()
         with _connection(self.db_path) as conn:
-            cursor = conn.execute(query)
-            return cursor.fetchone()
+            legacy = schema_version(conn) < STAR_SCHEMA_VERSION
+            if legacy and strategy == "sum":
+                sums = ", ".join(f"SUM({column}) AS {column}" for column in METRIC_COLUMNS)
+                conn.execute(
+                    f"""
+                    CREATE TEMP TABLE dedupe_totals AS
+                    SELECT MAX(id) AS keep_id, {sums}
+                    FROM ad_performance
+                    GROUP BY platform, campaign_id, event_date
+                    HAVING COUNT(*) > 1
+                    """
+                )
+                columns = ", ".join(METRIC_COLUMNS)
+                conn.execute(
+                    f"""
+                    UPDATE ad_performance
+                    SET ({columns}) = (SELECT {columns} FROM dedupe_totals WHERE keep_id = ad_performance.id)
+                    WHERE id IN (SELECT keep_id FROM dedupe_totals)
+                    """
+                )
+                conn.execute("DROP TABLE dedupe_totals")
+            if legacy:
+                conn.execute(
+                    """
+                    DELETE FROM ad_performance
+                    WHERE id NOT IN (
+                        SELECT MAX(id) FROM ad_performance GROUP BY platform, campaign_id, event_date
+                    )
+                    """
+                )
+                conn.execute(NATURAL_KEY_INDEX_SQL)
+        if legacy:
+            # The star schema migration was waiting on the natural key; it vacuums on its own.
+            self.initialize()
+        elif vacuum:
+            with _connection(self.db_path) as conn:
+                conn.execute("VACUUM")
+        return before, self.row_count()
+
+    def fetch_summary(self) -> List[sqlite3.Row]:
+        """Per-platform sums of the hot rollup and the archived partitions."""
+        with self._session() as conn:
+            query = f"""
+            SELECT
+                platform,
+                SUM(row_count) AS rows_ingested,
+                SUM(impressions) AS impressions,
+                SUM(clicks) AS clicks,
+                SUM(spend) AS spend,
+                SUM(conversions) AS conversions,
+                SUM(revenue) AS revenue
+            FROM ({_tiers(conn)})
+            GROUP BY platform
+            ORDER BY platform;
+            """
+            return conn.execute(query).fetchall()
+
+    def fetch_totals(self) -> sqlite3.Row | None:
+        with self._session() as conn:
+            query = f"""
+            SELECT
+                SUM(row_count) AS rows_ingested,
+                SUM(impressions) AS impressions,
+                SUM(clicks) AS clicks,
+                SUM(spend) AS spend,
+                SUM(conversions) AS conversions,
+                SUM(revenue) AS revenue
+            FROM ({_tiers(conn)});
+            """
+            return conn.execute(query).fetchone()
+
+    def archive_months(self, archive_dir: Path, before: date, vacuum: bool = False) -> List[ArchivePartition]:
+        """Move the months before `before`'s month to Parquet under `archive_dir` (see `adpulse.storage.archive`)."""
+        self.initialize()
+        partitions = archive_months(self.db_path, archive_dir, before)
+        if vacuum and partitions:
+            with _connection(self.db_path) as conn:
+                conn.execute("VACUUM")
+        return partitions
+
+    def compact(self, policy: RetentionPolicy, today: Optional[date] = None, vacuum: bool = True) -> CompactionReport:
+        """Apply a retention policy (see `adpulse.storage.retention`)."""
+        self.initialize()
+        return compact(self.db_path, policy, today=today, vacuum=vacuum)
+
+    def rebuild_rollups(self, workers: Optional[int] = None) -> int:
+        """Recompute the platform-day rollup from the daily and compacted facts; returns its row count."""
+        self.initialize()
+        return rebuild_rollups(self.db_path, workers=workers)
 
     def row_count(self) -> int:
-        with _connection(self.db_path) as conn:
-            cursor = conn.execute("SELECT COUNT(*) FROM ad_performance")
-            result = cursor.fetchone()
-        return int(result[0]) if result else 0
+        """Facts in both tiers, the `rows_ingested` of `fetch_totals`."""
+        with self._session() as conn:
+            result = conn.execute(f"SELECT SUM(row_count) FROM ({_tiers(conn)})").fetchone()
+        return int(result[0] or 0) if result else 0
+
+    def cold_archive(self) -> Optional[ColdArchive]:
+        """The archived partitions, or None when nothing is archived."""
+        with self._session() as conn:
+            if schema_version(conn) < ARCHIVE_SCHEMA_VERSION:
+                return None
+            rows = conn.execute(PARTITIONS_SQL).fetchall()
+            base_dir = database_dir(conn)
+        return ColdArchive(load_partitions(rows, base_dir)) if rows else None
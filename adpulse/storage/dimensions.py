@@ -0,0 +1,110 @@
+"""
+Surrogate keys for the star schema: integer day keys and dictionary-encoded dimensions.
+
+Facts in `ad_facts` reference platforms, campaigns and load batches by small
+integer keys, and store the date as a YYYYMMDD integer (20240501), which
+sorts and compares like the ISO string it replaces. `DimensionKeys` turns the
+writer's row tuples into fact rows, creating dimension rows on first sight.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Dict, Iterable, List, Tuple, Union
+
+from adpulse.ingestion.schema import DbRow, RecordBatch
+
+# SQL expressions converting between ISO date text and day keys; format with a column or parameter.
+DAY_KEY_SQL = "CAST(replace({0}, '-', '') AS INTEGER)"
+ISO_DATE_SQL = "printf('%04d-%02d-%02d', {0} / 10000, {0} / 100 % 100, {0} % 100)"
+
+
+def day_key(iso_date: str) -> int:
+    """`"2024-05-01"` -> `20240501`."""
+    return int(iso_date.replace("-", ""))
+
+
+def iso_date(day: int) -> str:
+    """`20240501` -> `"2024-05-01"`."""
+    return f"{day // 10000:04d}-{day // 100 % 100:02d}-{day % 100:02d}"
+
+
+class DimensionKeys:
+    """
+    Resolves dimension keys on one connection, caching them for the writer's lifetime.
+
+    New dimension rows and campaign renames are written on the same connection,
+    so they commit or roll back together with the facts that use them. A
+    writer gets a fresh instance, so keys never outlive a rolled-back write.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self._platforms: Dict[str, int] = {}
+        # (platform, campaign_id) -> (platform_key, campaign_key, campaign_name)
+        self._campaigns: Dict[Tuple[str, str], Tuple[int, int, str]] = {}
+        self._loads: Dict[str, int] = {}
+        self._days: Dict[str, int] = {}
+
+    def platform_key(self, platform: str) -> int:
+        key = self._platforms.get(platform)
+        if key is None:
+            row = self.conn.execute("SELECT platform_key FROM dim_platforms WHERE name = ?", (platform,)).fetchone()
+            if row is None:
+                key = self.conn.execute("INSERT INTO dim_platforms (name) VALUES (?)", (platform,)).lastrowid
+            else:
+                key = row[0]
+            self._platforms[platform] = key
+        return key
+
+    def campaign_keys(self, platform: str, campaign_id: str, campaign_name: str) -> Tuple[int, int]:
+        """(platform_key, campaign_key) for a campaign; the latest name written wins."""
+        cached = self._campaigns.get((platform, campaign_id))
+        if cached is not None and cached[2] == campaign_name:
+            return cached[0], cached[1]
+        platform_key = self.platform_key(platform)
+        if cached is None:
+            row = self.conn.execute(
+                "SELECT campaign_key, campaign_name FROM dim_campaigns WHERE platform_key = ? AND campaign_id = ?",
+                (platform_key, campaign_id),
+            ).fetchone()
+        else:
+            row = (cached[1], cached[2])
+        if row is None:
+            campaign_key = self.conn.execute(
+                "INSERT INTO dim_campaigns (platform_key, campaign_id, campaign_name) VALUES (?, ?, ?)",
+                (platform_key, campaign_id, campaign_name),
+            ).lastrowid
+        else:
+            campaign_key = row[0]
+            if row[1] != campaign_name:
+                self.conn.execute(
+                    "UPDATE dim_campaigns SET campaign_name = ? WHERE campaign_key = ?", (campaign_name, campaign_key)
+                )
+        self._campaigns[(platform, campaign_id)] = (platform_key, campaign_key, campaign_name)
+        return platform_key, campaign_key
+
+    def load_key(self, batch_id: str) -> int:
+        key = self._loads.get(batch_id)
+        if key is None:
+            row = self.conn.execute("SELECT load_key FROM load_batches WHERE batch_id = ?", (batch_id,)).fetchone()
+            if row is None:
+                key = self.conn.execute("INSERT INTO load_batches (batch_id) VALUES (?)", (batch_id,)).lastrowid
+            else:
+                key = row[0]
+            self._loads[batch_id] = key
+        return key
+
+    def fact_rows(self, rows: Union[RecordBatch, Iterable[DbRow]], batch_id: str) -> List[tuple]:
+        """`ad_facts` rows (platform_key, campaign_key, day, metrics..., load_key) for one chunk."""
+        load_key = self.load_key(batch_id)
+        days = self._days
+        campaign_keys = self.campaign_keys
+        facts = []
+        source = rows.iter_db_tuples() if isinstance(rows, RecordBatch) else rows
+        for platform, campaign_id, campaign_name, event_date, impressions, clicks, spend, conversions, revenue in source:
+            day = days.get(event_date)
+            if day is None:
+                day = days[event_date] = day_key(event_date)
+            platform_key, campaign_key = campaign_keys(platform, campaign_id, campaign_name)
+            facts.append((platform_key, campaign_key, day, impressions, clicks, spend, conversions, revenue, load_key))
+        return facts
@@ -0,0 +1,497 @@
+"""
+Embedded DuckDB storage backend.
+
+DuckDB stores every column separately and compressed, and aggregates whole
+vectors at a time, so the API's SUM() group-bys read only the columns they
+need straight from the fact table; no rollups or covering indexes are kept.
+Chunks are upserted with the same replace/accumulate semantics as the SQLite
+backend, and every `MetricsReader` query returns what the SQLite routes do.
+
+DuckDB lets one process open a file read-write: with this backend, load data
+through the API (`POST /ingest`) while it runs, or stop it before loading
+from the CLI. It has no savepoints either, so `adpulse watch` needs SQLite.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import astuple, replace
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from adpulse.ingestion.schema import RecordBatch
+from adpulse.storage.backend import (
+    DEFAULT_BATCH_SIZE,
+    WRITE_MODES,
+    CampaignMapping,
+    DailyMetrics,
+    ManifestEntry,
+    MetricsReader,
+    MetricTotals,
+    RowChunk,
+    StorageBackend,
+)
+from adpulse.storage.database import _MANIFEST_COLUMNS, MANIFEST_UPSERT_SQL, DatabaseManager
+from adpulse.storage.dimensions import ISO_DATE_SQL, iso_date
+from adpulse.storage.rollups import COMPACTED_FACTS, METRIC_COLUMNS
+from adpulse.utils import require_optional
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    import duckdb
+
+DUCKDB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dim_campaigns (
+    platform VARCHAR NOT NULL,
+    campaign_id VARCHAR NOT NULL,
+    campaign_name VARCHAR NOT NULL,
+    PRIMARY KEY (platform, campaign_id)
+);
+
+CREATE TABLE IF NOT EXISTS ad_facts (
+    platform VARCHAR NOT NULL,
+    campaign_id VARCHAR NOT NULL,
+    event_date DATE NOT NULL,
+    impressions BIGINT NOT NULL,
+    clicks BIGINT NOT NULL,
+    spend DOUBLE NOT NULL,
+    conversions BIGINT NOT NULL,
+    revenue DOUBLE NOT NULL DEFAULT 0,
+    load_batch_id VARCHAR,
+    PRIMARY KEY (platform, campaign_id, event_date)
+);
+
+CREATE TABLE IF NOT EXISTS campaigns (
+    platform_slug VARCHAR NOT NULL,
+    campaign_name VARCHAR NOT NULL,
+    campaign_id VARCHAR NOT NULL,
+    PRIMARY KEY (platform_slug, campaign_name)
+);
+
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    path VARCHAR PRIMARY KEY,
+    platform VARCHAR NOT NULL,
+    size BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    content_hash VARCHAR NOT NULL,
+    bytes_committed BIGINT NOT NULL,
+    rows_committed BIGINT NOT NULL,
+    batch_id VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Writer tuples, as in `NormalizedRecord.as_db_tuple`.
+DB_COLUMNS = ("platform", "campaign_id", "campaign_name", "event_date", *METRIC_COLUMNS)
+CHUNK_VIEW = "adpulse_chunk"
+
+_SUMS = ", ".join(f"SUM({column}) AS {column}" for column in METRIC_COLUMNS)
+
+# DuckDB cannot update one row twice in a statement, so each chunk is summed
+# per key first. A chunk belongs to one load, which makes that equivalent to
+# upserting its rows one by one (see the SQLite writer's replace semantics).
+_UPSERT_FROM_CHUNK = f"""
+INSERT INTO ad_facts
+SELECT platform, campaign_id, CAST(event_date AS DATE), {", ".join(f"SUM({column})" for column in METRIC_COLUMNS)}, ?
+FROM {CHUNK_VIEW}
+GROUP BY platform, campaign_id, event_date
+ON CONFLICT DO UPDATE SET
+"""
+UPSERT_SQL = {
+    "replace": _UPSERT_FROM_CHUNK
+    + ",\n".join(
+        f"    {column} = CASE WHEN ad_facts.load_batch_id = excluded.load_batch_id "
+        f"THEN ad_facts.{column} + excluded.{column} ELSE excluded.{column} END"
+        for column in METRIC_COLUMNS
+    )
+    + ",\n    load_batch_id = excluded.load_batch_id",
+    "accumulate": _UPSERT_FROM_CHUNK
+    + ",\n".join(f"    {column} = ad_facts.{column} + excluded.{column}" for column in METRIC_COLUMNS)
+    + ",\n    load_batch_id = excluded.load_batch_id",
+}
+CAMPAIGN_NAME_UPSERT_SQL = (
+    "INSERT INTO dim_campaigns VALUES (?, ?, ?) ON CONFLICT DO UPDATE SET campaign_name = excluded.campaign_name"
+)
+
+
+# pandas hands each chunk to DuckDB as a data frame.
+_require_duckdb = partial(
+    require_optional, "duckdb", "pandas", feature="The DuckDB storage backend", install="'adpulse[duckdb]'"
+)
+
+
+def _chunk_frame(rows: RowChunk):
+    """A data frame with `DB_COLUMNS`; RecordBatch columns are handed over without building rows."""
+    _, pd = _require_duckdb()
+    if isinstance(rows, RecordBatch):
+        columns = {name: getattr(rows, name) for name in DB_COLUMNS[1:]}
+        return pd.DataFrame({"platform": rows.platform, **columns}, columns=list(DB_COLUMNS))
+    return pd.DataFrame.from_records(list(rows), columns=list(DB_COLUMNS))
+
+
+def _date_filters(start_date: Optional[date], end_date: Optional[date]) -> Tuple[List[str], List[Any]]:
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start_date:
+        clauses.append("event_date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append("event_date <= ?")
+        params.append(end_date)
+    return clauses, params
+
+
+def _where(clauses: Sequence[str]) -> str:
+    return f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+class DuckDBWriter:
+    """Upserts chunks into ad_facts and keeps each campaign's latest name in dim_campaigns."""
+
+    def __init__(self, conn: "duckdb.DuckDBPyConnection", mode: str = "replace", commit_per_batch: bool = True) -> None:
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode '{mode}'. Supported: {', '.join(WRITE_MODES)}")
+        self.conn = conn
+        self.sql = UPSERT_SQL[mode]
+        self.commit_per_batch = commit_per_batch
+        self._names: Dict[Tuple[str, str], str] = {}
+
+    def write(self, rows: RowChunk, batch_id: str, checkpoint: Optional[ManifestEntry] = None) -> int:
+        """Upsert one chunk; `checkpoint` is recorded in the same transaction as the rows."""
+        frame = _chunk_frame(rows)
+        latest = frame.drop_duplicates(["platform", "campaign_id"], keep="last")
+        renamed = [
+            (platform, campaign_id, name)
+            for platform, campaign_id, name in zip(latest["platform"], latest["campaign_id"], latest["campaign_name"])
+            if self._names.get((platform, campaign_id)) != name
+        ]
+        if self.commit_per_batch:
+            self.conn.begin()
+        try:
+            if renamed:
+                self.conn.executemany(CAMPAIGN_NAME_UPSERT_SQL, renamed)
+            if len(frame):
+                self.conn.register(CHUNK_VIEW, frame)
+                try:
+                    self.conn.execute(self.sql, [batch_id])
+                finally:
+                    self.conn.unregister(CHUNK_VIEW)
+            if checkpoint is not None:
+                self.conn.execute(MANIFEST_UPSERT_SQL, list(astuple(checkpoint)))
+            if self.commit_per_batch:
+                self.conn.commit()
+        except BaseException:
+            if self.commit_per_batch:
+                self.conn.rollback()
+            raise
+        self._names.update(((platform, campaign_id), name) for platform, campaign_id, name in renamed)
+        return len(frame)
+
+
+class DuckDBBackend(StorageBackend, MetricsReader):
+    """
+    Storage backend over one embedded DuckDB file.
+
+    Every operation runs on its own cursor of one shared connection, so the
+    backend can be used from the API's worker threads. `bulk_load` is
+    accepted for parity with SQLite; every chunk is already one set-based
+    upsert.
+    """
+
+    def __init__(self, db_path: Path, bulk_load: bool = False) -> None:
+        # Fail on open rather than on the first query when the optional dependencies are missing.
+        _require_duckdb()
+        self.db_path = Path(db_path)
+        self.bulk_load = bulk_load
+        self._root: Optional["duckdb.DuckDBPyConnection"] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _cursor(self) -> "duckdb.DuckDBPyConnection":
+        with self._lock:
+            if self._root is None:
+                duckdb, _ = _require_duckdb()
+                self._root = duckdb.connect(str(self.db_path))
+            return self._root.cursor()
+
+    def close(self) -> None:
+        """Release the file (DuckDB holds it locked while a connection is open)."""
+        with self._lock:
+            if self._root is not None:
+                self._root.close()
+                self._root = None
+
+    @property
+    def _transaction(self) -> Optional["duckdb.DuckDBPyConnection"]:
+        return getattr(self._local, "connection", None)
+
+    @contextmanager
+    def _session(self) -> Iterator["duckdb.DuckDBPyConnection"]:
+        """The cursor of this thread's open `transaction()`, or a fresh autocommit one."""
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        cursor = self._cursor()
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run every read and write of the calling thread in one transaction, committed at the end."""
+        if self._transaction is not None:
+            raise RuntimeError("A transaction is already open on this DuckDBBackend")
+        cursor = self._cursor()
+        cursor.begin()
+        self._local.connection = cursor
+        try:
+            yield
+            cursor.commit()
+        except BaseException:
+            cursor.rollback()
+            raise
+        finally:
+            self._local.connection = None
+            cursor.close()
+
+    def savepoint(self, name: str = "adpulse_savepoint"):
+        raise NotImplementedError("DuckDB has no savepoints; use the SQLite backend for `adpulse watch`")
+
+    def initialize(self) -> None:
+        """Create the DuckDB file and its tables if needed."""
+        with self._session() as conn:
+            for statement in DUCKDB_SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+
+    @contextmanager
+    def open_writer(self, mode: str = "replace", commit_per_batch: bool = True) -> Iterator[DuckDBWriter]:
+        """
+        Yield a writer on its own cursor for the duration of a load.
+
+        Without `commit_per_batch` the whole load is one transaction. Inside
+        `transaction()` the writer shares that transaction instead.
+        """
+        if self._transaction is not None:
+            yield DuckDBWriter(self._transaction, mode=mode, commit_per_batch=False)
+            return
+        cursor = self._cursor()
+        try:
+            if commit_per_batch:
+                yield DuckDBWriter(cursor, mode=mode, commit_per_batch=True)
+                return
+            cursor.begin()
+            try:
+                yield DuckDBWriter(cursor, mode=mode, commit_per_batch=False)
+            except BaseException:
+                cursor.rollback()
+                raise
+            cursor.commit()
+        finally:
+            cursor.close()
+
+    def get_manifest_entry(self, path: str) -> Optional[ManifestEntry]:
+        with self._session() as conn:
+            row = conn.execute(f"SELECT {_MANIFEST_COLUMNS} FROM ingest_manifest WHERE path = ?", [path]).fetchone()
+        return ManifestEntry(*row) if row else None
+
+    def save_manifest_entry(self, entry: ManifestEntry) -> None:
+        with self._session() as conn:
+            conn.execute(MANIFEST_UPSERT_SQL, list(astuple(entry)))
+
+    def load_campaign_ids(self) -> List[CampaignMapping]:
+        with self._session() as conn:
+            return [tuple(row) for row in conn.execute("SELECT platform_slug, campaign_name, campaign_id FROM campaigns").fetchall()]
+
+    def save_campaign_ids(self, mappings: Iterable[CampaignMapping]) -> int:
+        rows = [list(mapping) for mapping in mappings]
+        if not rows:
+            return 0
+        with self._session() as conn:
+            before = conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+            conn.executemany(
+                "INSERT OR IGNORE INTO campaigns (platform_slug, campaign_name, campaign_id) VALUES (?, ?, ?)", rows
+            )
+            return conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0] - before
+
+    def _records(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._session() as conn:
+            cursor = conn.execute(sql, list(params))
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def fetch_summary(self) -> List[Mapping[str, Any]]:
+        return self._records(
+            f"SELECT platform, COUNT(*) AS rows_ingested, {_SUMS} FROM ad_facts GROUP BY platform ORDER BY platform"
+        )
+
+    def fetch_totals(self) -> Optional[Mapping[str, Any]]:
+        rows = self._records(f"SELECT COUNT(*) AS rows_ingested, {_SUMS} FROM ad_facts")
+        return rows[0] if rows else None
+
+    def row_count(self) -> int:
+        with self._session() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM ad_facts").fetchone()[0])
+
+    def platform_totals(self, start_date: Optional[date], end_date: Optional[date]) -> List[MetricTotals]:
+        clauses, params = _date_filters(start_date, end_date)
+        rows = self._records(
+            f"SELECT platform, {_SUMS} FROM ad_facts {_where(clauses)} GROUP BY platform ORDER BY platform", params
+        )
+        return [MetricTotals(**row) for row in rows]
+
+    def campaign_totals(
+        self, platform: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> List[MetricTotals]:
+        clauses, params = _date_filters(start_date, end_date)
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        rows = self._records(
+            f"""
+            SELECT f.platform, f.campaign_id, c.campaign_name, {_SUMS}
+            FROM (SELECT * FROM ad_facts {_where(clauses)}) f
+            JOIN dim_campaigns c USING (platform, campaign_id)
+            GROUP BY f.platform, f.campaign_id, c.campaign_name
+            ORDER BY f.platform, c.campaign_name, f.campaign_id
+            """,
+            params,
+        )
+        return [MetricTotals(**row) for row in rows]
+
+    def campaign(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> Optional[MetricTotals]:
+        clauses, params = _date_filters(start_date, end_date)
+        clauses.append("campaign_id = ?")
+        params.append(campaign_id)
+        first = self._records(
+            f"""
+            SELECT f.platform, c.campaign_name
+            FROM (SELECT platform, campaign_id FROM ad_facts {_where(clauses)}) f
+            JOIN dim_campaigns c USING (platform, campaign_id)
+            ORDER BY f.platform
+            LIMIT 1
+            """,
+            params,
+        )
+        if not first:
+            return None
+        totals = self._records(f"SELECT {_SUMS} FROM ad_facts {_where(clauses)}", params)[0]
+        return MetricTotals(campaign_id=campaign_id, **first[0], **totals)
+
+    def campaign_days(self, campaign_id: str, start_date: Optional[date], end_date: Optional[date]) -> List[DailyMetrics]:
+        return self._days(["event_date"], None, campaign_id, start_date, end_date)
+
+    def daily_totals(
+        self,
+        platform: Optional[str],
+        campaign_id: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[DailyMetrics]:
+        rows = self._days(["event_date"] if platform else ["event_date", "platform"], platform, campaign_id, start_date, end_date)
+        return [row if row.platform else replace(row, platform=platform) for row in rows]
+
+    def _days(
+        self,
+        keys: List[str],
+        platform: Optional[str],
+        campaign_id: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[DailyMetrics]:
+        clauses, params = _date_filters(start_date, end_date)
+        if platform:
+            clauses.append("platform = ?")
+            params.append(platform)
+        if campaign_id:
+            clauses.append("campaign_id = ?")
+            params.append(campaign_id)
+        rows = self._records(
+            f"SELECT {', '.join(keys)}, {_SUMS} FROM ad_facts {_where(clauses)} "
+            f"GROUP BY {', '.join(keys)} ORDER BY {', '.join(keys)}",
+            params,
+        )
+        return [DailyMetrics(**row) for row in rows]
+
+    def copy_from_sqlite(self, source: DatabaseManager, chunk_size: int = DEFAULT_BATCH_SIZE * 20) -> int:
+        """
+        Replace this store's contents with a SQLite database's, in one transaction; returns the fact rows copied.
+
+        Hot facts keep their load batch ids, so a later `replace` reload of the
+        same file behaves as it would have on SQLite. Archived months are read
+        back from their Parquet partitions into the fact table.
+        """
+        _, pd = _require_duckdb()
+        source.initialize()
+        self.initialize()
+        archive = source.cold_archive()
+        reader = sqlite3.connect(source.db_path)
+        copied = 0
+        with self.transaction():
+            conn = self._transaction
+
+            def insert(table: str, names: Sequence[str], rows: List[tuple]) -> None:
+                nonlocal copied
+                conn.register(CHUNK_VIEW, pd.DataFrame.from_records(rows, columns=names))
+                try:
+                    conn.execute(f"INSERT INTO {table} SELECT * FROM {CHUNK_VIEW}")
+                finally:
+                    conn.unregister(CHUNK_VIEW)
+                if table == "ad_facts":
+                    copied += len(rows)
+
+            for table in ("ad_facts", "dim_campaigns", "campaigns", "ingest_manifest"):
+                conn.execute(f"DELETE FROM {table}")
+            copies = (
+                ("campaigns", "SELECT platform_slug, campaign_name, campaign_id FROM campaigns"),
+                (
+                    "ingest_manifest",
+                    f"SELECT {_MANIFEST_COLUMNS}, updated_at FROM ingest_manifest",
+                ),
+                (
+                    "dim_campaigns",
+                    "SELECT p.name, c.campaign_id, c.campaign_name FROM dim_campaigns c "
+                    "JOIN dim_platforms p ON p.platform_key = c.platform_key",
+                ),
+                (
+                    "ad_facts",
+                    f"SELECT platform, campaign_id, event_date, {', '.join(METRIC_COLUMNS)}, load_batch_id "
+                    "FROM ad_performance",
+                ),
+                # Retention buckets become one fact on their first day.
+                (
+                    "ad_facts",
+                    f"SELECT p.name, c.campaign_id, {ISO_DATE_SQL.format('f.day')}, "
+                    f"{', '.join(f'f.{column}' for column in METRIC_COLUMNS)}, NULL "
+                    f"FROM {COMPACTED_FACTS} f "
+                    "JOIN dim_campaigns c ON c.platform_key = f.platform_key AND c.campaign_key = f.campaign_key "
+                    "JOIN dim_platforms p ON p.platform_key = f.platform_key",
+                ),
+            )
+            try:
+                for table, query in copies:
+                    cursor = reader.execute(query)
+                    names = [column[0] for column in cursor.description]
+                    while True:
+                        rows = cursor.fetchmany(chunk_size)
+                        if not rows:
+                            break
+                        insert(table, names, rows)
+            finally:
+                reader.close()
+            if archive is not None:
+                names = ["platform", "campaign_id", "event_date", *METRIC_COLUMNS, "load_batch_id"]
+                for rows in archive.iter_rows(batch_size=chunk_size):
+                    insert(
+                        "ad_facts",
+                        names,
+                        [
+                            (platform, campaign_id, iso_date(day), *metrics, None)
+                            for platform, campaign_id, _, day, *metrics in rows
+                        ],
+                    )
+        return copied
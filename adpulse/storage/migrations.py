@@ -0,0 +1,480 @@
+"""
+Versioned schema migrations shared by the sqlite3 and SQLAlchemy layers.
+
+The schema version lives in SQLite's `PRAGMA user_version`. `migrate` applies
+every migration above it in order, each in its own `BEGIN IMMEDIATE`
+transaction together with the version bump, so concurrent processes cannot
+apply the same step twice and a failed step leaves the database at the
+previous version. `DatabaseManager.initialize` (CLI, ingestion) and
+`adpulse.database.init_db` (API) both call it, and `adpulse.models` declares
+the same tables, indexes and rollup triggers, so every layer sees one schema.
+
+To change the schema, append a `Migration`; never edit one that has shipped.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from adpulse.storage.dimensions import DAY_KEY_SQL, ISO_DATE_SQL
+from adpulse.storage.rollups import CAMPAIGN_ROLLUP, METRIC_COLUMNS, create_rollups, refresh_rollups, rollup_triggers
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ad_performance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    platform TEXT NOT NULL,
+    campaign_id TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    event_date TEXT NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL DEFAULT 0,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    load_batch_id TEXT
+);
+
+CREATE TABLE IF NOT EXISTS campaigns (
+    platform_slug TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    campaign_id TEXT NOT NULL,
+    PRIMARY KEY (platform_slug, campaign_name)
+);
+
+CREATE TABLE IF NOT EXISTS ingest_manifest (
+    path TEXT PRIMARY KEY,
+    platform TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    bytes_committed INTEGER NOT NULL,
+    rows_committed INTEGER NOT NULL,
+    batch_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+NATURAL_KEY_INDEX = "uq_ad_perf_natural_key"
+NATURAL_KEY_INDEX_SQL = f"""
+CREATE UNIQUE INDEX IF NOT EXISTS {NATURAL_KEY_INDEX}
+ON ad_performance (platform, campaign_id, event_date)
+"""
+
+# Covering indexes for the API's query shapes as of migration 2. The metric
+# columns ride along in every index, so the aggregates are answered from the
+# index alone. Migration 3 drops them again: the daily rollups serve those
+# queries, and each index cost about as much per ingested row as the rollup
+# triggers do.
+COVERING_INDEXES: Dict[str, Tuple[str, ...]] = {
+    # Date ranges per platform: /summary/platforms, /timeseries/daily?platform=...
+    "idx_ad_perf_platform_date_cover": ("platform", "event_date", *METRIC_COLUMNS),
+    # One campaign over a date range: /campaigns/{id}/detail, /timeseries/daily?campaign_id=...
+    "idx_ad_perf_campaign_date_cover": ("campaign_id", "event_date", "platform", *METRIC_COLUMNS),
+    # GROUP BY campaign in /campaigns/summary, optionally for one platform.
+    "idx_ad_perf_campaign_summary": ("platform", "campaign_name", "campaign_id", "event_date", *METRIC_COLUMNS),
+}
+
+# Narrow indexes an older SQLAlchemy `create_all` may have built; the covering ones replace them.
+_SUPERSEDED_INDEXES = (
+    "idx_ad_perf_campaign_date",
+    "idx_ad_perf_platform_date",
+    "ix_ad_performance_id",
+    "ix_ad_performance_platform",
+    "ix_ad_performance_campaign_id",
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+    # Returns why the migration cannot run yet (None when it can); `migrate` stops there.
+    blocker: Optional[Callable[[sqlite3.Connection], Optional[str]]] = None
+    # Run VACUUM after committing, for migrations that rewrite most of the file.
+    vacuum: bool = False
+
+
+def _statements(script: str) -> List[str]:
+    # `executescript` would commit the migration's transaction, so run statements one by one.
+    return [statement.strip() for statement in script.split(";") if statement.strip()]
+
+
+def _create_base_tables(conn: sqlite3.Connection) -> None:
+    for statement in _statements(SCHEMA):
+        conn.execute(statement)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(ad_performance)")}
+    if "load_batch_id" not in columns:
+        conn.execute("ALTER TABLE ad_performance ADD COLUMN load_batch_id TEXT")
+    conn.execute("SAVEPOINT natural_key")
+    try:
+        conn.execute(NATURAL_KEY_INDEX_SQL)
+    except sqlite3.IntegrityError:
+        # Legacy databases may hold duplicates; `adpulse dedupe` repairs them and adds the index.
+        conn.execute("ROLLBACK TO natural_key")
+    conn.execute("RELEASE natural_key")
+
+
+# Keeps the one-off ANALYZE cheap on large databases; the statistics are approximate.
+ANALYSIS_LIMIT = 1000
+
+
+def _add_covering_indexes(conn: sqlite3.Connection) -> None:
+    for name in _SUPERSEDED_INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+    for name, columns in COVERING_INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS "{name}" ON ad_performance ({", ".join(columns)})')
+    # Statistics let the planner skip-scan the platform-led indexes for date-only filters.
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    conn.execute("ANALYZE ad_performance")
+
+
+# Migration 3's daily rollups over the raw table. Migration 4 drops them with the
+# table and builds the star-schema rollups of `adpulse.storage.rollups` instead.
+_V3_ROLLUP_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS daily_campaign_rollup (
+    platform TEXT NOT NULL,
+    campaign_id TEXT NOT NULL,
+    event_date TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (platform, campaign_id, event_date)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_campaign_rollup_campaign_date ON daily_campaign_rollup (campaign_id, event_date);
+
+CREATE TABLE IF NOT EXISTS daily_platform_rollup (
+    platform TEXT NOT NULL,
+    event_date TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (platform, event_date)
+) WITHOUT ROWID;
+
+INSERT INTO daily_campaign_rollup
+SELECT platform, campaign_id, event_date, MAX(campaign_name), COUNT(*), {", ".join(f"SUM({column})" for column in METRIC_COLUMNS)}
+FROM ad_performance
+GROUP BY platform, campaign_id, event_date;
+
+INSERT INTO daily_platform_rollup
+SELECT platform, event_date, SUM(row_count), {", ".join(f"SUM({column})" for column in METRIC_COLUMNS)}
+FROM daily_campaign_rollup
+GROUP BY platform, event_date
+"""
+_V3_ROLLUP_TRIGGERS = rollup_triggers(
+    "ad_performance",
+    [
+        ("daily_campaign_rollup", ("platform", "campaign_id", "event_date"), ("campaign_name",)),
+        ("daily_platform_rollup", ("platform", "event_date"), ()),
+    ],
+    "trg_ad_perf_rollup",
+)
+
+
+def _add_daily_rollups(conn: sqlite3.Connection) -> None:
+    for statement in _statements(_V3_ROLLUP_SCHEMA):
+        conn.execute(statement)
+    for sql in _V3_ROLLUP_TRIGGERS.values():
+        conn.execute(sql)
+    for name in COVERING_INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+# Star schema: dictionary-encoded dimensions, YYYYMMDD integer day keys (see
+# `adpulse.storage.dimensions`) and a narrow fact table clustered by platform,
+# campaign and day. Its primary key is the old natural key.
+STAR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dim_platforms (
+    platform_key INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS dim_campaigns (
+    campaign_key INTEGER PRIMARY KEY,
+    platform_key INTEGER NOT NULL REFERENCES dim_platforms (platform_key),
+    campaign_id TEXT NOT NULL,
+    campaign_name TEXT NOT NULL,
+    UNIQUE (platform_key, campaign_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dim_campaigns_campaign_id ON dim_campaigns (campaign_id);
+
+CREATE TABLE IF NOT EXISTS load_batches (
+    load_key INTEGER PRIMARY KEY,
+    batch_id TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS ad_facts (
+    platform_key INTEGER NOT NULL,
+    campaign_key INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL DEFAULT 0,
+    load_key INTEGER,
+    PRIMARY KEY (platform_key, campaign_key, day)
+) WITHOUT ROWID
+"""
+
+_FACT_METRICS = ", ".join(f"f.{column}" for column in METRIC_COLUMNS)
+
+# The old table's columns (minus the surrogate id and created_at), so readers
+# and ad-hoc SQL keep working. `day` is exposed for index-friendly filters.
+AD_PERFORMANCE_VIEW = f"""
+CREATE VIEW IF NOT EXISTS ad_performance AS
+SELECT p.name AS platform, c.campaign_id, c.campaign_name, {ISO_DATE_SQL.format("f.day")} AS event_date,
+       {_FACT_METRICS}, b.batch_id AS load_batch_id, f.day
+FROM ad_facts f
+JOIN dim_campaigns c ON c.platform_key = f.platform_key AND c.campaign_key = f.campaign_key
+JOIN dim_platforms p ON p.platform_key = f.platform_key
+LEFT JOIN load_batches b ON b.load_key = f.load_key
+"""
+
+
+def _view_writes(ref: str) -> List[str]:
+    """Statements inserting the view row `ref` (NEW) as a fact, creating its dimension rows."""
+    return [
+        f"INSERT OR IGNORE INTO dim_platforms (name) VALUES ({ref}.platform);",
+        "INSERT INTO dim_campaigns (platform_key, campaign_id, campaign_name)\n"
+        f"    SELECT platform_key, {ref}.campaign_id, {ref}.campaign_name FROM dim_platforms WHERE name = {ref}.platform\n"
+        "    ON CONFLICT (platform_key, campaign_id) DO UPDATE SET campaign_name = excluded.campaign_name;",
+        f"INSERT OR IGNORE INTO load_batches (batch_id) SELECT {ref}.load_batch_id WHERE {ref}.load_batch_id IS NOT NULL;",
+        f"INSERT INTO ad_facts (platform_key, campaign_key, day, {', '.join(METRIC_COLUMNS)}, load_key)\n"
+        f"    SELECT c.platform_key, c.campaign_key, {DAY_KEY_SQL.format(ref + '.event_date')}, "
+        f"{', '.join(f'{ref}.{column}' for column in METRIC_COLUMNS)},\n"
+        f"        (SELECT load_key FROM load_batches WHERE batch_id = {ref}.load_batch_id)\n"
+        "    FROM dim_campaigns c JOIN dim_platforms p ON p.platform_key = c.platform_key\n"
+        f"    WHERE p.name = {ref}.platform AND c.campaign_id = {ref}.campaign_id;",
+    ]
+
+
+_DELETE_VIEW_ROW = """DELETE FROM ad_facts
+    WHERE (platform_key, campaign_key) = (
+        SELECT c.platform_key, c.campaign_key FROM dim_campaigns c JOIN dim_platforms p ON p.platform_key = c.platform_key
+        WHERE p.name = OLD.platform AND c.campaign_id = OLD.campaign_id
+    ) AND day = OLD.day;"""
+
+# Writes through the view (ORM sessions, ad-hoc SQL) land in the fact table.
+# `event_date` is authoritative on insert and update; `day` is derived from it.
+AD_PERFORMANCE_VIEW_TRIGGERS = {
+    name: f"CREATE TRIGGER IF NOT EXISTS {name} INSTEAD OF {event} ON ad_performance\nBEGIN\n    "
+    + "\n    ".join(statements)
+    + "\nEND"
+    for name, event, statements in (
+        ("trg_ad_performance_insert", "INSERT", _view_writes("NEW")),
+        ("trg_ad_performance_update", "UPDATE", [_DELETE_VIEW_ROW, *_view_writes("NEW")]),
+        ("trg_ad_performance_delete", "DELETE", [_DELETE_VIEW_ROW]),
+    )
+}
+
+
+def _duplicate_keys_block(conn: sqlite3.Connection) -> Optional[str]:
+    indexes = {row[1] for row in conn.execute("PRAGMA index_list(ad_performance)")}
+    if NATURAL_KEY_INDEX not in indexes:
+        return "ad_performance holds duplicate (platform, campaign_id, event_date) rows; run `adpulse dedupe`"
+    return None
+
+
+def _create_star_schema(conn: sqlite3.Connection) -> None:
+    for name in _V3_ROLLUP_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute("DROP TABLE IF EXISTS daily_campaign_rollup")
+    conn.execute("DROP TABLE IF EXISTS daily_platform_rollup")
+    for statement in _statements(STAR_SCHEMA):
+        conn.execute(statement)
+
+    conn.execute("INSERT INTO dim_platforms (name) SELECT DISTINCT platform FROM ad_performance ORDER BY platform")
+    # Campaigns take the name of their most recently written row.
+    conn.execute(
+        """
+        INSERT INTO dim_campaigns (platform_key, campaign_id, campaign_name)
+        SELECT p.platform_key, a.campaign_id, a.campaign_name
+        FROM ad_performance a JOIN dim_platforms p ON p.name = a.platform
+        WHERE a.id IN (SELECT MAX(id) FROM ad_performance GROUP BY platform, campaign_id)
+        ORDER BY p.platform_key, a.campaign_id
+        """
+    )
+    conn.execute(
+        "INSERT INTO load_batches (batch_id) "
+        "SELECT DISTINCT load_batch_id FROM ad_performance WHERE load_batch_id IS NOT NULL"
+    )
+    conn.execute(
+        f"""
+        INSERT INTO ad_facts (platform_key, campaign_key, day, {", ".join(METRIC_COLUMNS)}, load_key)
+        SELECT c.platform_key, c.campaign_key, {DAY_KEY_SQL.format("a.event_date")},
+               {", ".join(f"a.{column}" for column in METRIC_COLUMNS)}, b.load_key
+        FROM ad_performance a
+        JOIN dim_platforms p ON p.name = a.platform
+        JOIN dim_campaigns c ON c.platform_key = p.platform_key AND c.campaign_id = a.campaign_id
+        LEFT JOIN load_batches b ON b.batch_id = a.load_batch_id
+        ORDER BY 1, 2, 3
+        """
+    )
+    conn.execute("DROP TABLE ad_performance")
+    conn.execute(AD_PERFORMANCE_VIEW)
+    for sql in AD_PERFORMANCE_VIEW_TRIGGERS.values():
+        conn.execute(sql)
+    create_rollups(conn)
+    refresh_rollups(conn)
+
+
+# Manifest of the Parquet cold tier (see `adpulse.storage.archive`): one row
+# per archived (platform, YYYYMM month) with its file, day range and metric sums.
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_partitions (
+    platform_key INTEGER NOT NULL REFERENCES dim_platforms (platform_key),
+    month INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    min_day INTEGER NOT NULL,
+    max_day INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    archived_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (platform_key, month)
+) WITHOUT ROWID
+"""
+
+
+def _create_archive_manifest(conn: sqlite3.Connection) -> None:
+    conn.execute(ARCHIVE_SCHEMA)
+
+
+# Per-platform horizon of retention compaction (see `adpulse.storage.retention`):
+# facts dated on or before `through_day` only exist in coarser buckets.
+RETENTION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS retention_horizons (
+    platform_key INTEGER PRIMARY KEY REFERENCES dim_platforms (platform_key),
+    through_day INTEGER NOT NULL
+)
+"""
+
+
+def _add_retention(conn: sqlite3.Connection) -> None:
+    # The campaign view now unions the compacted buckets; `create_rollups` adds their table and triggers.
+    conn.execute(f"DROP VIEW IF EXISTS {CAMPAIGN_ROLLUP}")
+    create_rollups(conn)
+    conn.execute(RETENTION_SCHEMA)
+    # Takes effect with the VACUUM that follows the migration.
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+# Counter of committed data states (see `adpulse.storage.versions`). Writers
+# bump it once per transaction; writes through the ad_performance view, once per row.
+DATA_VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+"""
+DATA_VERSION_TRIGGERS = {
+    name: f"CREATE TRIGGER IF NOT EXISTS {name} INSTEAD OF {event} ON ad_performance\n"
+    "BEGIN\n    UPDATE data_version SET version = version + 1;\nEND"
+    for name, event in (
+        ("trg_ad_performance_version_insert", "INSERT"),
+        ("trg_ad_performance_version_update", "UPDATE"),
+        ("trg_ad_performance_version_delete", "DELETE"),
+    )
+}
+
+
+def _add_data_version(conn: sqlite3.Connection) -> None:
+    for statement in _statements(DATA_VERSION_SCHEMA):
+        conn.execute(statement)
+    for sql in DATA_VERSION_TRIGGERS.values():
+        conn.execute(sql)
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "ad_performance, campaigns and ingest_manifest tables", _create_base_tables),
+    Migration(2, "covering indexes for the API queries", _add_covering_indexes),
+    Migration(3, "trigger-maintained daily rollups in place of the covering indexes", _add_daily_rollups),
+    Migration(
+        4,
+        "star schema: dimension tables, integer day keys and a narrow fact table",
+        _create_star_schema,
+        blocker=_duplicate_keys_block,
+        vacuum=True,
+    ),
+    Migration(5, "manifest of months archived to Parquet", _create_archive_manifest),
+    Migration(
+        6,
+        "compacted weekly/monthly facts for retention policies, incremental auto-vacuum",
+        _add_retention,
+        vacuum=True,
+    ),
+    Migration(7, "data version counter for consistent read snapshots", _add_data_version),
+)
+STAR_SCHEMA_VERSION = 4
+ARCHIVE_SCHEMA_VERSION = 5
+DATA_VERSION_SCHEMA_VERSION = 7
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration] = MIGRATIONS) -> Tuple[int, int]:
+    """
+    Apply pending migrations and return the (old, new) schema version.
+
+    Raises RuntimeError when the database was migrated by a newer release.
+    """
+    start = schema_version(conn)
+    target = migrations[-1].version if migrations else start
+    if start > target:
+        raise RuntimeError(
+            f"Database schema version {start} is newer than this release supports ({target}); upgrade adpulse"
+        )
+    if start == target:
+        return start, start
+    if conn.in_transaction:
+        conn.commit()
+    for migration in migrations:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock: another process may have migrated meanwhile.
+            if migration.version <= schema_version(conn):
+                conn.rollback()
+                continue
+            reason = migration.blocker(conn) if migration.blocker else None
+            if reason:
+                conn.rollback()
+                logger.warning("Schema migration %d postponed: %s", migration.version, reason)
+                break
+            migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        if migration.vacuum:
+            conn.execute("VACUUM")
+    return start, schema_version(conn)
+
+
+def query_plan(conn: sqlite3.Connection, sql: str, parameters: Sequence = ()) -> List[str]:
+    """The `EXPLAIN QUERY PLAN` detail lines for `sql`."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(parameters))]
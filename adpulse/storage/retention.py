@@ -0,0 +1,288 @@
+"""
+Retention policies: keep recent facts at daily grain and fold older ones into coarser buckets.
+
+A policy lists tiers finest first, e.g. "daily:400,weekly:730,monthly": facts
+stay daily until they are 400 days old, then weekly until 730 days, then
+monthly for good. An age on the last tier ("...,monthly:1825") deletes what
+is older. Weekly buckets are ISO weeks cut at month boundaries, so a month of
+weekly buckets folds exactly into its monthly bucket.
+
+Buckets live in `ad_facts_compacted` (see `adpulse.storage.rollups`), dated on
+their first day and counting the daily rows behind them. The rollup views
+combine them with the daily facts, so API queries that cross a tier boundary
+sum every grain; a date filter counts a bucket when its first day is inside
+the range.
+
+`compact` applies a policy one platform-month at a time, each in its own
+short transaction, so writers and the API only ever wait for one month, and
+then returns the freed pages with `PRAGMA incremental_vacuum` (migration 6
+switches databases to incremental auto-vacuum). Writers skip facts dated on
+or before a platform's compacted horizon (`CompactedDays`): those days no
+longer exist at daily grain, and a replacement folded in would count twice.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from adpulse.config import DEFAULT_DB_BUSY_TIMEOUT
+from adpulse.storage.dimensions import ISO_DATE_SQL, day_key
+from adpulse.storage.rollups import COMPACTED_FACTS, METRIC_COLUMNS
+from adpulse.storage.versions import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+GRAINS = ("daily", "weekly", "monthly")
+RETENTION_HORIZONS = "retention_horizons"
+VACUUM_PAGES = 4096  # freed per incremental_vacuum transaction
+
+_METRICS = ", ".join(METRIC_COLUMNS)
+_SUMS = ", ".join(f"SUM({column})" for column in METRIC_COLUMNS)
+
+# First day of the bucket holding day key `{0}`, per grain.
+_MONTH_START_SQL = "({0} / 100 * 100 + 1)"
+_MONDAY_SQL = (
+    "CAST(strftime('%Y%m%d', {iso}, '-' || ((CAST(strftime('%w', {iso}) AS INTEGER) + 6) % 7) || ' days') AS INTEGER)"
+)
+BUCKET_SQL = {
+    "weekly": f"MAX({_MONDAY_SQL.format(iso=ISO_DATE_SQL.format('{0}'))}, {_MONTH_START_SQL})",
+    "monthly": _MONTH_START_SQL,
+}
+
+_STAGING = "compaction_buckets"
+_STAGING_SCHEMA = f"""
+CREATE TEMP TABLE IF NOT EXISTS {_STAGING} (
+    platform_key INTEGER, campaign_key INTEGER, day INTEGER, row_count INTEGER,
+    impressions INTEGER, clicks INTEGER, spend REAL, conversions INTEGER, revenue REAL
+)
+"""
+# Joining through dim_campaigns turns each platform-month into one primary key range per campaign.
+_CAMPAIGNS = "dim_campaigns c JOIN {table} f ON f.platform_key = c.platform_key AND f.campaign_key = c.campaign_key"
+_OF_PLATFORM = "campaign_key IN (SELECT campaign_key FROM dim_campaigns WHERE platform_key = ?)"
+
+
+@dataclass(frozen=True)
+class RetentionTier:
+    grain: str
+    # Facts older than this move to the next tier (or are deleted after the last); None keeps them.
+    max_age_days: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    tiers: Tuple[RetentionTier, ...]
+
+    @classmethod
+    def parse(cls, spec: str) -> "RetentionPolicy":
+        """`"daily:400,weekly:730,monthly"` -> a validated policy."""
+        tiers = []
+        for part in spec.split(","):
+            grain, _, age = part.strip().partition(":")
+            try:
+                tiers.append(RetentionTier(grain.strip().lower(), int(age) if age.strip() else None))
+            except ValueError:
+                raise ValueError(f"Invalid retention tier '{part.strip()}'; expected grain[:days]") from None
+        policy = cls(tuple(tiers))
+        policy.validate()
+        return policy
+
+    def validate(self) -> None:
+        grains = [tier.grain for tier in self.tiers]
+        unknown = [grain for grain in grains if grain not in GRAINS]
+        if unknown:
+            raise ValueError(f"Unsupported retention grain '{unknown[0]}'. Supported: {', '.join(GRAINS)}")
+        if not grains or grains[0] != "daily":
+            raise ValueError("A retention policy starts with a daily tier")
+        if [GRAINS.index(grain) for grain in grains] != sorted(GRAINS.index(grain) for grain in set(grains)):
+            raise ValueError("Retention tiers must go from finer to coarser grains, each grain once")
+        ages = [tier.max_age_days for tier in self.tiers]
+        if any(age is None for age in ages[:-1]):
+            raise ValueError("Every retention tier but the last needs an age in days")
+        bounded = [age for age in ages if age is not None]
+        if any(age <= 0 for age in bounded) or bounded != sorted(set(bounded)):
+            raise ValueError("Retention ages must be positive and increase from tier to tier")
+
+    def __str__(self) -> str:
+        return ",".join(
+            tier.grain if tier.max_age_days is None else f"{tier.grain}:{tier.max_age_days}" for tier in self.tiers
+        )
+
+
+@dataclass
+class CompactionReport:
+    rows_folded: int = 0
+    buckets_written: int = 0
+    rows_deleted: int = 0
+    transactions: int = 0
+
+
+def bucket_start(day: date, grain: str) -> date:
+    """First day of the `grain` bucket holding `day`."""
+    if grain == "monthly":
+        return day.replace(day=1)
+    if grain == "weekly":
+        return max(day - timedelta(days=day.weekday()), day.replace(day=1))
+    return day
+
+
+def _steps(policy: RetentionPolicy, today: date) -> List[Tuple[Optional[str], int]]:
+    """(target grain, or None to delete; cutoff day key) per step, coarsest first."""
+    tiers = policy.tiers
+    steps: List[Tuple[Optional[str], int]] = []
+    if tiers[-1].max_age_days is not None:
+        cutoff = bucket_start(today - timedelta(days=tiers[-1].max_age_days), tiers[-1].grain)
+        steps.append((None, day_key(cutoff.isoformat())))
+    for previous, tier in reversed(list(zip(tiers, tiers[1:]))):
+        cutoff = bucket_start(today - timedelta(days=previous.max_age_days), tier.grain)
+        steps.append((tier.grain, day_key(cutoff.isoformat())))
+    return steps
+
+
+def _pending_months(conn: sqlite3.Connection, grains: Sequence[str], cutoff: int) -> List[Tuple[int, int]]:
+    """(platform_key, YYYYMM month) with facts of `grains` dated before `cutoff`."""
+    queries, params = [], []
+    if "daily" in grains:
+        queries.append("SELECT DISTINCT platform_key, day / 100 FROM ad_facts WHERE day < ?")
+        params.append(cutoff)
+    coarse = [grain for grain in grains if grain != "daily"]
+    if coarse:
+        queries.append(
+            f"SELECT DISTINCT platform_key, day / 100 FROM {COMPACTED_FACTS} "
+            f"WHERE day < ? AND grain IN ({', '.join('?' for _ in coarse)})"
+        )
+        params += [cutoff, *coarse]
+    return conn.execute(f"{' UNION '.join(queries)} ORDER BY 1, 2", params).fetchall()
+
+
+def _fold(conn: sqlite3.Connection, platform_key: int, days: Tuple[int, int], grain: str, report: CompactionReport) -> None:
+    """Fold the finer facts of one platform's day range into `grain` buckets."""
+    finer = GRAINS[1 : GRAINS.index(grain)]
+    bucket = BUCKET_SQL[grain].format("f.day")
+    conn.execute(_STAGING_SCHEMA)
+    conn.execute(f"DELETE FROM {_STAGING}")
+    conn.execute(
+        f"INSERT INTO {_STAGING} SELECT f.platform_key, f.campaign_key, {bucket}, 1, "
+        f"{', '.join(f'f.{column}' for column in METRIC_COLUMNS)} "
+        f"FROM {_CAMPAIGNS.format(table='ad_facts')} WHERE c.platform_key = ? AND f.day BETWEEN ? AND ?",
+        (platform_key, *days),
+    )
+    report.rows_folded += conn.execute(
+        f"DELETE FROM ad_facts WHERE platform_key = ? AND {_OF_PLATFORM} AND day BETWEEN ? AND ?",
+        (platform_key, platform_key, *days),
+    ).rowcount
+    if finer:
+        grains = ", ".join("?" for _ in finer)
+        conn.execute(
+            f"INSERT INTO {_STAGING} SELECT f.platform_key, f.campaign_key, {bucket}, f.row_count, "
+            f"{', '.join(f'f.{column}' for column in METRIC_COLUMNS)} "
+            f"FROM {_CAMPAIGNS.format(table=COMPACTED_FACTS)} "
+            f"WHERE c.platform_key = ? AND f.day BETWEEN ? AND ? AND f.grain IN ({grains})",
+            (platform_key, *days, *finer),
+        )
+        conn.execute(
+            f"DELETE FROM {COMPACTED_FACTS} WHERE platform_key = ? AND {_OF_PLATFORM} AND day BETWEEN ? AND ? "
+            f"AND grain IN ({grains})",
+            (platform_key, platform_key, *days, *finer),
+        )
+    # Late daily rows of an already compacted bucket add to it. (`WHERE true`: see MERGE_SQL.)
+    report.buckets_written += conn.execute(
+        f"""
+        INSERT INTO {COMPACTED_FACTS} (platform_key, campaign_key, day, grain, row_count, {_METRICS})
+        SELECT platform_key, campaign_key, day, ?, SUM(row_count), {_SUMS}
+        FROM {_STAGING}
+        WHERE true
+        GROUP BY platform_key, campaign_key, day
+        ON CONFLICT (platform_key, campaign_key, day) DO UPDATE SET
+            row_count = row_count + excluded.row_count,
+            {", ".join(f"{column} = {column} + excluded.{column}" for column in METRIC_COLUMNS)}
+        """,
+        (grain,),
+    ).rowcount
+    conn.execute(f"DELETE FROM {_STAGING}")
+
+
+def _delete(conn: sqlite3.Connection, platform_key: int, days: Tuple[int, int], report: CompactionReport) -> None:
+    for table in ("ad_facts", COMPACTED_FACTS):
+        report.rows_deleted += conn.execute(
+            f"DELETE FROM {table} WHERE platform_key = ? AND {_OF_PLATFORM} AND day BETWEEN ? AND ?",
+            (platform_key, platform_key, *days),
+        ).rowcount
+
+
+def _release_free_pages(conn: sqlite3.Connection) -> None:
+    """Truncate the free pages off the file, `VACUUM_PAGES` per write transaction."""
+    while conn.execute("PRAGMA freelist_count").fetchone()[0]:
+        # The pragma frees one page per step; executescript steps it to the end.
+        conn.executescript(f"PRAGMA incremental_vacuum({VACUUM_PAGES});")
+
+
+def compact(
+    db_path: Path,
+    policy: RetentionPolicy,
+    today: Optional[date] = None,
+    vacuum: bool = True,
+) -> CompactionReport:
+    """
+    Apply `policy` as of `today`: delete what outlived the last tier, then fold each tier's facts.
+
+    Each platform-month is one `BEGIN IMMEDIATE` transaction that also moves
+    the platform's compacted horizon, so an interrupted run leaves a
+    consistent database and the next run picks up where it stopped.
+    """
+    today = today or date.today()
+    report = CompactionReport()
+    conn = sqlite3.connect(db_path, timeout=DEFAULT_DB_BUSY_TIMEOUT)
+    try:
+        for grain, cutoff in _steps(policy, today):
+            sources = GRAINS if grain is None else GRAINS[: GRAINS.index(grain)]
+            for platform_key, month in _pending_months(conn, sources, cutoff):
+                days = (month * 100 + 1, min(month * 100 + 31, cutoff - 1))
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    if grain is None:
+                        _delete(conn, platform_key, days, report)
+                    else:
+                        _fold(conn, platform_key, days, grain, report)
+                    conn.execute(
+                        f"INSERT INTO {RETENTION_HORIZONS} (platform_key, through_day) VALUES (?, ?) "
+                        "ON CONFLICT (platform_key) DO UPDATE SET through_day = MAX(through_day, excluded.through_day)",
+                        (platform_key, days[1]),
+                    )
+                    bump_data_version(conn)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                report.transactions += 1
+        if vacuum and report.transactions:
+            _release_free_pages(conn)
+    finally:
+        conn.close()
+    return report
+
+
+class CompactedDays:
+    """
+    Per-platform compacted horizons, read once per writer.
+
+    `keep` drops fact rows dated on or before their platform's horizon, with
+    a warning: the day only exists inside a coarser bucket now.
+    """
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.through: Dict[int, int] = dict(conn.execute(f"SELECT platform_key, through_day FROM {RETENTION_HORIZONS}"))
+
+    def keep(self, facts: List[tuple]) -> List[tuple]:
+        if not self.through:
+            return facts
+        through = self.through
+        kept = [fact for fact in facts if fact[2] > through.get(fact[0], 0)]
+        if len(kept) < len(facts):
+            logger.warning(
+                "Skipped %d rows dated inside periods the retention policy already compacted", len(facts) - len(kept)
+            )
+        return kept
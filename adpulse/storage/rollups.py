@@ -0,0 +1,244 @@
+"""
+Pre-aggregated daily rollups for the API and CLI summaries.
+
+`platform_day_rollup` holds the metric sums of `ad_facts` per (platform_key,
+day); `row_count` is the number of facts behind each row. The fact table
+itself is already at campaign-day grain, so campaign-level queries read it
+directly. `ad_facts_compacted` holds the facts that retention compaction
+(see `adpulse.storage.retention`) folded into weekly or monthly buckets, each
+dated on its first day and counting the daily rows behind it. Two views
+present both levels and all grains with names and ISO dates, as the ORM and
+the routers expect: `daily_platform_rollup` and `daily_campaign_rollup`.
+
+Triggers on both fact tables apply every insert, update and delete to the
+platform rollup, so it changes in the same transaction as the facts whichever
+path wrote them (chunked upserts, the watcher, compaction, ORM sessions
+through the ad_performance view). Large bulk merges drop the triggers and
+call `refresh_rollups` instead, and `rebuild_rollups` recomputes the table
+from scratch with one reader per platform.
+"""
+from __future__ import annotations
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from adpulse.storage.dimensions import ISO_DATE_SQL
+
+METRIC_COLUMNS = ("impressions", "clicks", "spend", "conversions", "revenue")
+
+PLATFORM_DAY_ROLLUP = "platform_day_rollup"
+COMPACTED_FACTS = "ad_facts_compacted"
+CAMPAIGN_ROLLUP = "daily_campaign_rollup"
+PLATFORM_ROLLUP = "daily_platform_rollup"
+
+# (table, key columns, extra columns copied from the latest source row)
+RollupSpec = Tuple[str, Sequence[str], Sequence[str]]
+
+_METRICS = ", ".join(METRIC_COLUMNS)
+_SUMS = ", ".join(f"SUM({column})" for column in METRIC_COLUMNS)
+
+
+def _campaign_rows(table: str, row_count: str) -> str:
+    # Each branch joins the dimensions itself, so filters on the view reach both tables' primary keys.
+    return f"""SELECT p.name AS platform, c.campaign_id, {ISO_DATE_SQL.format("f.day")} AS event_date, f.day, c.campaign_name,
+       {row_count} AS row_count, {", ".join(f"f.{column}" for column in METRIC_COLUMNS)}
+FROM {table} f
+JOIN dim_campaigns c ON c.platform_key = f.platform_key AND c.campaign_key = f.campaign_key
+JOIN dim_platforms p ON p.platform_key = f.platform_key"""
+
+
+ROLLUP_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {PLATFORM_DAY_ROLLUP} (
+    platform_key INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (platform_key, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS {COMPACTED_FACTS} (
+    platform_key INTEGER NOT NULL,
+    campaign_key INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    grain TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    impressions INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    spend REAL NOT NULL,
+    conversions INTEGER NOT NULL,
+    revenue REAL NOT NULL,
+    PRIMARY KEY (platform_key, campaign_key, day)
+) WITHOUT ROWID;
+
+CREATE VIEW IF NOT EXISTS {PLATFORM_ROLLUP} AS
+SELECT p.name AS platform, {ISO_DATE_SQL.format("r.day")} AS event_date, r.day, r.row_count,
+       {", ".join(f"r.{column}" for column in METRIC_COLUMNS)}
+FROM {PLATFORM_DAY_ROLLUP} r
+JOIN dim_platforms p ON p.platform_key = r.platform_key;
+
+CREATE VIEW IF NOT EXISTS {CAMPAIGN_ROLLUP} AS
+{_campaign_rows("ad_facts", "1")}
+UNION ALL
+{_campaign_rows(COMPACTED_FACTS, "f.row_count")}
+"""
+
+
+def _add(table: str, keys: Sequence[str], extra: Sequence[str], row_count: Optional[str] = None) -> str:
+    columns = (*keys, *extra, "row_count", *METRIC_COLUMNS)
+    count = f"NEW.{row_count}" if row_count else "1"
+    values = (*(f"NEW.{column}" for column in (*keys, *extra)), count, *(f"NEW.{column}" for column in METRIC_COLUMNS))
+    assignments = [f"{column} = excluded.{column}" for column in extra]
+    assignments += [f"{column} = {column} + excluded.{column}" for column in ("row_count", *METRIC_COLUMNS)]
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)})\n"
+        f"    ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {', '.join(assignments)};"
+    )
+
+
+def _subtract(table: str, keys: Sequence[str], row_count: Optional[str] = None) -> str:
+    count = f"OLD.{row_count}" if row_count else "1"
+    assignments = [f"row_count = row_count - {count}"] + [
+        f"{column} = {column} - OLD.{column}" for column in METRIC_COLUMNS
+    ]
+    return f"UPDATE {table} SET {', '.join(assignments)} WHERE {_match_old(keys)};"
+
+
+def _prune(table: str, keys: Sequence[str]) -> str:
+    return f"DELETE FROM {table} WHERE {_match_old(keys)} AND row_count <= 0;"
+
+
+def _match_old(keys: Sequence[str]) -> str:
+    return " AND ".join(f"{column} = OLD.{column}" for column in keys)
+
+
+def _trigger(name: str, event: str, source: str, statements: Sequence[str]) -> str:
+    body = "\n    ".join(statements)
+    return f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {source}\nBEGIN\n    {body}\nEND"
+
+
+def rollup_triggers(
+    source: str, rollups: Sequence[RollupSpec], prefix: str, row_count: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Insert, update and delete triggers on `source` that keep `rollups` in step.
+
+    Rollup key and extra columns must be named as in `source`. Each source
+    row counts once, or as many times as its `row_count` column says. An update
+    subtracts the old row and adds the new one before pruning emptied keys, so
+    an in-place replace never deletes and re-inserts the rollup row.
+    """
+    watched = dict.fromkeys(column for _, keys, extra in rollups for column in (*keys, *extra))
+    counted = (row_count,) if row_count else ()
+    return {
+        f"{prefix}_insert": _trigger(
+            f"{prefix}_insert", "INSERT", source, [_add(*rollup, row_count) for rollup in rollups]
+        ),
+        f"{prefix}_update": _trigger(
+            f"{prefix}_update",
+            f"UPDATE OF {', '.join((*watched, *counted, *METRIC_COLUMNS))}",
+            source,
+            [_subtract(table, keys, row_count) for table, keys, _ in rollups]
+            + [_add(*rollup, row_count) for rollup in rollups]
+            + [_prune(table, keys) for table, keys, _ in rollups],
+        ),
+        f"{prefix}_delete": _trigger(
+            f"{prefix}_delete",
+            "DELETE",
+            source,
+            [_subtract(table, keys, row_count) for table, keys, _ in rollups]
+            + [_prune(table, keys) for table, keys, _ in rollups],
+        ),
+    }
+
+
+_PLATFORM_DAY_SPEC: RollupSpec = (PLATFORM_DAY_ROLLUP, ("platform_key", "day"), ())
+ROLLUP_TRIGGERS = {
+    **rollup_triggers("ad_facts", [_PLATFORM_DAY_SPEC], "trg_ad_facts_rollup"),
+    **rollup_triggers(COMPACTED_FACTS, [_PLATFORM_DAY_SPEC], "trg_ad_facts_compacted_rollup", row_count="row_count"),
+}
+
+# Both fact tables at platform-day level; `{where}` filters on platform_key and day.
+_AGGREGATE_FACTS = f"""
+SELECT platform_key, day, SUM(row_count), {_SUMS}
+FROM (
+    SELECT platform_key, day, 1 AS row_count, {_METRICS} FROM ad_facts
+    UNION ALL
+    SELECT platform_key, day, row_count, {_METRICS} FROM {COMPACTED_FACTS}
+)
+{{where}}
+GROUP BY platform_key, day"""
+_ROLLUP_INSERT = f"INSERT INTO {PLATFORM_DAY_ROLLUP} (platform_key, day, row_count, {_METRICS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+
+
+def create_rollups(conn: sqlite3.Connection) -> None:
+    """Create the rollup table, its views and the triggers that maintain it."""
+    for statement in ROLLUP_SCHEMA.split(";"):
+        if statement.strip():
+            conn.execute(statement)
+    for sql in ROLLUP_TRIGGERS.values():
+        conn.execute(sql)
+
+
+def drop_rollup_triggers(conn: sqlite3.Connection) -> None:
+    for name in ROLLUP_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def refresh_rollups(
+    conn: sqlite3.Connection, platform_key: Optional[int] = None, days: Optional[Tuple[int, int]] = None
+) -> None:
+    """
+    Recompute the rollup from the facts on `conn`, inside its current transaction.
+
+    With `platform_key` and an inclusive (first, last) day range only that slice is recomputed.
+    """
+    where, params = "", ()
+    if platform_key is not None:
+        where, params = "WHERE platform_key = ? AND day BETWEEN ? AND ?", (platform_key, *days)
+    conn.execute(f"DELETE FROM {PLATFORM_DAY_ROLLUP} {where}", params)
+    conn.execute(
+        f"INSERT INTO {PLATFORM_DAY_ROLLUP} (platform_key, day, row_count, {_METRICS}) "
+        f"{_AGGREGATE_FACTS.format(where=where)}",
+        params,
+    )
+
+
+def _aggregate_platform(db_path: Path, platform_key: int) -> List[Tuple]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(_AGGREGATE_FACTS.format(where="WHERE platform_key = ?"), (platform_key,)).fetchall()
+    finally:
+        conn.close()
+
+
+def rebuild_rollups(db_path: Path, workers: Optional[int] = None) -> int:
+    """
+    Recompute the rollup from the facts and return its row count.
+
+    Each platform's facts (a contiguous range of the fact table's primary key)
+    are aggregated on their own connection in a thread pool; SQLite releases
+    the GIL while it runs a query. The write lock is taken first, so the
+    readers see one consistent table and the swap is a single commit.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        platform_keys = [row[0] for row in conn.execute("SELECT platform_key FROM dim_platforms")]
+        with ThreadPoolExecutor(max_workers=workers or max(len(platform_keys), 1)) as pool:
+            partitions = list(pool.map(lambda key: _aggregate_platform(db_path, key), platform_keys))
+        conn.execute(f"DELETE FROM {PLATFORM_DAY_ROLLUP}")
+        for rows in partitions:
+            conn.executemany(_ROLLUP_INSERT, rows)
+        conn.commit()
+        return sum(len(rows) for rows in partitions)
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
@@ -0,0 +1,26 @@
+"""
+Data versions: a counter that every transaction changing the facts bumps.
+
+The counter is the single row of `data_version` (migration 7). Writers bump it
+inside their own transaction with `bump_data_version`, so it commits
+atomically with what they wrote. A reader that reads it first in a read
+transaction therefore learns which committed state all of its queries see.
+The API returns it with every read and pins it for reports (see
+`adpulse.api.snapshots`).
+"""
+from __future__ import annotations
+
+import sqlite3
+
+DATA_VERSION = "data_version"
+DATA_VERSION_SQL = f"SELECT version FROM {DATA_VERSION}"
+_BUMP_SQL = f"UPDATE {DATA_VERSION} SET version = version + 1"
+
+
+def bump_data_version(conn: sqlite3.Connection) -> None:
+    """Advance the version inside the caller's write transaction."""
+    conn.execute(_BUMP_SQL)
+
+
+def data_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute(DATA_VERSION_SQL).fetchone()[0])
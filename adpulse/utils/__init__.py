@@ -1,5 +1,19 @@
 """Utility helpers for the AdPulse package."""
 
-from .identifiers import build_campaign_id, slugify_name
+from .batching import chunked
+from .identifiers import (
+    CampaignIdentityResolver,
+    build_campaign_id,
+    default_campaign_resolver,
+    slugify_name,
+)
+from .optional import require_optional
 
-__all__ = ["build_campaign_id", "slugify_name"]
+__all__ = [
+    "CampaignIdentityResolver",
+    "build_campaign_id",
+    "chunked",
+    "default_campaign_resolver",
+    "require_optional",
+    "slugify_name",
+]
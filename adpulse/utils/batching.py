@@ -0,0 +1,23 @@
+"""
+Helpers for consuming large iterables in fixed-size pieces.
+"""
+from __future__ import annotations
+
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Yield lists of at most `size` items without materializing the whole iterable.
+    """
+    if size <= 0:
+        raise ValueError("Chunk size must be a positive integer")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
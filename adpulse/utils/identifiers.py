@@ -4,6 +4,9 @@ Identifier helpers for normalized campaign data.
 from __future__ import annotations
 
 import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
 
 
 def slugify_name(value: str) -> str:
@@ -24,3 +27,73 @@ def build_campaign_id(platform_slug: str, campaign_name: str, explicit_id: str |
         return explicit_id.strip()
     slug = slugify_name(campaign_name)
     return f"{platform_slug}-{slug}"
+
+
+DEFAULT_RESOLVER_SIZE = 10_000
+
+
+class CampaignIdentityResolver:
+    """
+    Bounded LRU cache in front of `build_campaign_id`.
+
+    Exports repeat a few dozen campaign names over thousands of rows, so the
+    slug regex only needs to run once per (platform, name). Every derived id
+    handed out is remembered until `drain_resolved` so callers can persist it
+    (the resolver outlives any one database), and `preload` seeds the cache
+    from a previously persisted mapping. Safe to share across threads.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_RESOLVER_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._resolved: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, platform_slug: str, campaign_name: str, explicit_id: str | None = None) -> str:
+        """Same contract as `build_campaign_id`, memoized for derived ids."""
+        if explicit_id:
+            return explicit_id.strip()
+        key = (platform_slug, campaign_name)
+        with self._lock:
+            campaign_id = self._cache.get(key)
+            if campaign_id is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+            else:
+                self.misses += 1
+                campaign_id = build_campaign_id(platform_slug, campaign_name)
+                self._store(key, campaign_id)
+            self._resolved[key] = campaign_id
+        return campaign_id
+
+    def preload(self, mappings: Iterable[Tuple[str, str, str]]) -> None:
+        """Seed the cache with (platform_slug, campaign_name, campaign_id) triples."""
+        with self._lock:
+            for platform_slug, campaign_name, campaign_id in mappings:
+                self._store((platform_slug, campaign_name), campaign_id)
+
+    def drain_resolved(self) -> List[Tuple[str, str, str]]:
+        """Return and forget the derived ids handed out since the last drain."""
+        with self._lock:
+            drained = [(slug, name, campaign_id) for (slug, name), campaign_id in self._resolved.items()]
+            self._resolved.clear()
+        return drained
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "maxsize": self.maxsize}
+
+    def _store(self, key: Tuple[str, str], campaign_id: str) -> None:
+        self._cache[key] = campaign_id
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+
+_default_resolver = CampaignIdentityResolver()
+
+
+def default_campaign_resolver() -> CampaignIdentityResolver:
+    """Process-wide resolver shared by every connector."""
+    return _default_resolver
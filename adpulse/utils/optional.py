@@ -0,0 +1,26 @@
+"""
+Imports of optional dependencies, deferred until a feature needs them.
+"""
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+from typing import Tuple, Union
+
+
+def require_optional(*modules: str, feature: str, install: str) -> Union[ModuleType, Tuple[ModuleType, ...]]:
+    """
+    Import `modules` for `feature`; one name returns the module, several return a tuple.
+
+    A missing module raises RuntimeError naming the packages and the
+    `pip install` argument (`install`) that provides them.
+    """
+    try:
+        imported = tuple(importlib.import_module(name) for name in modules)
+    except ImportError as exc:
+        packages = list(dict.fromkeys(name.split(".")[0] for name in modules))
+        raise RuntimeError(
+            f"{feature} requires {' and '.join(packages)}. "
+            f"Install {'it' if len(packages) == 1 else 'them'} with `pip install {install}`."
+        ) from exc
+    return imported[0] if len(imported) == 1 else imported
@@ -0,0 +1,111 @@
+"""
+Compare the API's aggregate queries on the SQLite and DuckDB storage backends.
+
+Loads N synthetic rows into a fresh SQLite database (bulk-load mode), copies
+them into DuckDB with `DuckDBBackend.copy_from_sqlite`, then times every
+`MetricsReader` query the routers issue, on the ORM reader over the pooled
+read-only engine and on the DuckDB backend. Each query reports the median of
+`--repeat` runs.
+
+    python scripts/benchmark_backends.py --rows 1000000 5000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_bulk_load import synthetic_rows  # noqa: E402
+
+from adpulse.api.metrics import OrmMetricsReader  # noqa: E402
+from adpulse.database import create_sqlite_engine  # noqa: E402
+from adpulse.storage.backend import DEFAULT_BATCH_SIZE, MetricsReader  # noqa: E402
+from adpulse.storage.database import DatabaseManager  # noqa: E402
+from adpulse.storage.duckdb_backend import DuckDBBackend  # noqa: E402
+from adpulse.utils import chunked  # noqa: E402
+
+QUERIES: Dict[str, Callable[[MetricsReader], object]] = {
+    "summary/platforms": lambda reader: reader.platform_totals(None, None),
+    "summary/platforms?range": lambda reader: reader.platform_totals(date(2020, 3, 1), date(2020, 6, 30)),
+    "campaigns/summary": lambda reader: reader.campaign_totals(None, None, None),
+    "campaigns/summary?platform": lambda reader: reader.campaign_totals("Meta Ads", date(2020, 2, 1), None),
+    "campaigns/{id}/detail": lambda reader: (
+        reader.campaign("google-campaign-7", None, None),
+        reader.campaign_days("google-campaign-7", None, None),
+    ),
+    "timeseries/daily": lambda reader: reader.daily_totals(None, None, None, None),
+    "timeseries/daily?platform": lambda reader: reader.daily_totals("TikTok Ads", None, date(2020, 6, 30), None),
+}
+
+
+def _time(reader: MetricsReader, repeat: int) -> Dict[str, float]:
+    timings = {}
+    for name, query in QUERIES.items():
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            query(reader)
+            samples.append(time.perf_counter() - started)
+        timings[name] = round(statistics.median(samples) * 1000, 2)
+    return timings
+
+
+def run(rows: int, repeat: int, workdir: Path) -> dict:
+    sqlite_db = DatabaseManager(workdir / f"bench_{rows}.db", bulk_load=True)
+    sqlite_db.initialize()
+    sqlite_db.insert_row_chunks(list(chunk) for chunk in chunked(synthetic_rows(rows), DEFAULT_BATCH_SIZE))
+
+    duck = DuckDBBackend(workdir / f"bench_{rows}.duckdb")
+    try:
+        started = time.perf_counter()
+        copied = duck.copy_from_sqlite(sqlite_db)
+        copy_seconds = time.perf_counter() - started
+        assert copied == rows
+
+        engine = create_sqlite_engine(sqlite_db.db_path, read_only=True)
+        try:
+            with sessionmaker(bind=engine)() as session:
+                sqlite_ms = _time(OrmMetricsReader(session), repeat)
+        finally:
+            engine.dispose()
+        duckdb_ms = _time(duck, repeat)
+    finally:
+        duck.close()
+    return {"rows": rows, "copy_seconds": round(copy_seconds, 2), "sqlite_ms": sqlite_ms, "duckdb_ms": duckdb_ms}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put the databases (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or Path(tmp)
+        results = []
+        for rows in args.rows:
+            result = run(rows, args.repeat, workdir)
+            results.append(result)
+            print(f"{rows:>12,} rows  copied to DuckDB in {result['copy_seconds']:.2f}s", flush=True)
+            for name in QUERIES:
+                print(
+                    f"    {name:<28} sqlite {result['sqlite_ms'][name]:>9.2f} ms   "
+                    f"duckdb {result['duckdb_ms'][name]:>9.2f} ms",
+                    flush=True,
+                )
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compare SQLite write throughput of the chunked upsert path and the bulk-load mode.
+
+Each run loads N synthetic rows into a fresh, fully migrated database (so
+with the rollup triggers), first with the default ChunkWriter (one
+upsert executemany + commit per chunk) and then with
+`DatabaseManager(bulk_load=True)` (tuned pragmas, staging table, one
+set-based merge).
+
+    python scripts/benchmark_bulk_load.py --rows 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, List
+
+from adpulse.ingestion.schema import DbRow
+from adpulse.storage.database import DEFAULT_BATCH_SIZE, DatabaseManager
+from adpulse.utils import chunked
+
+PLATFORMS = ("Google Ads", "Meta Ads", "TikTok Ads")
+CAMPAIGNS_PER_PLATFORM = 1_000
+
+
+def synthetic_rows(count: int) -> Iterator[DbRow]:
+    """Distinct (platform, campaign, day) keys with plausible metrics."""
+    start = date(2020, 1, 1)
+    per_day = len(PLATFORMS) * CAMPAIGNS_PER_PLATFORM
+    for index in range(count):
+        platform = PLATFORMS[index % len(PLATFORMS)]
+        campaign = (index // len(PLATFORMS)) % CAMPAIGNS_PER_PLATFORM
+        day = (start + timedelta(days=index // per_day)).isoformat()
+        impressions = 500 + index % 4_500
+        clicks = impressions // 25
+        conversions = clicks // 10
+        yield (
+            platform,
+            f"{platform.split()[0].lower()}-campaign-{campaign}",
+            f"Campaign {campaign}",
+            day,
+            impressions,
+            clicks,
+            round(clicks * 0.37, 2),
+            conversions,
+            conversions * 25.0,
+        )
+
+
+def _prepare(db_path: Path, bulk_load: bool) -> DatabaseManager:
+    database = DatabaseManager(db_path, bulk_load=bulk_load)
+    database.initialize()
+    return database
+
+
+def run(rows: int, bulk_load: bool, batch_size: int, workdir: Path) -> dict:
+    db_path = workdir / f"bench_{rows}_{'bulk' if bulk_load else 'chunked'}.db"
+    database = _prepare(db_path, bulk_load)
+    started = time.perf_counter()
+    written = database.insert_row_chunks(
+        (list(chunk) for chunk in chunked(synthetic_rows(rows), batch_size))
+    )
+    elapsed = time.perf_counter() - started
+    assert database.row_count() == written == rows
+    return {
+        "rows": rows,
+        "mode": "bulk" if bulk_load else "chunked",
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / elapsed),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put the databases (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or Path(tmp)
+        results = []
+        for rows in args.rows:
+            for bulk_load in (False, True):
+                result = run(rows, bulk_load, args.batch_size, workdir)
+                results.append(result)
+                print(
+                    f"{result['rows']:>12,} rows  {result['mode']:<8} "
+                    f"{result['seconds']:>8.2f}s  {result['rows_per_second']:>10,} rows/sec",
+                    flush=True,
+                )
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
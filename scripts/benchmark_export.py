@@ -0,0 +1,94 @@
+"""
+Measure the bulk export: time to first row, throughput and peak memory.
+
+Loads N synthetic rows (one row per campaign and day from 2020-01-01) into a
+fresh SQLite database and streams the raw export in every format through
+`export_rows` and `encode`, as `GET /export` does, discarding the bytes. A
+second pass runs under tracemalloc for the peak Python allocation, which
+should not grow with N.
+
+    python scripts/benchmark_export.py --rows 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_bulk_load import synthetic_rows  # noqa: E402
+
+from adpulse.api.export import EXPORT_CHUNK_ROWS, EXPORT_COLUMNS, EXPORT_FORMATS, encode, export_rows  # noqa: E402
+from adpulse.database import create_sqlite_engine  # noqa: E402
+from adpulse.storage.backend import DEFAULT_BATCH_SIZE  # noqa: E402
+from adpulse.storage.database import DatabaseManager  # noqa: E402
+from adpulse.utils import chunked  # noqa: E402
+
+
+def _stream(session_factory, fmt: str, chunk_rows: int) -> dict:
+    with session_factory() as session:
+        started = time.perf_counter()
+        body = encode(export_rows(session, "raw", chunk_rows=chunk_rows), EXPORT_COLUMNS["raw"], fmt)
+        # CSV sends its header before any row is read; time the first chunk of rows.
+        size = len(next(body)) if fmt == "csv" else 0
+        size += len(next(body))
+        first_chunk = time.perf_counter() - started
+        size += sum(len(piece) for piece in body)
+        seconds = time.perf_counter() - started
+    return {"first_chunk_ms": round(first_chunk * 1000, 1), "seconds": round(seconds, 2), "mb": round(size / 2**20, 1)}
+
+
+def _peak_mb(session_factory, fmt: str, chunk_rows: int) -> float:
+    tracemalloc.start()
+    try:
+        with session_factory() as session:
+            for _ in encode(export_rows(session, "raw", chunk_rows=chunk_rows), EXPORT_COLUMNS["raw"], fmt):
+                pass
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows: int, chunk_rows: int, workdir: Path) -> dict:
+    database = DatabaseManager(workdir / f"export_{rows}.db", bulk_load=True)
+    database.initialize()
+    database.insert_row_chunks(list(chunk) for chunk in chunked(synthetic_rows(rows), DEFAULT_BATCH_SIZE))
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    session_factory = sessionmaker(bind=engine)
+    results = {}
+    try:
+        for fmt in EXPORT_FORMATS:
+            result = _stream(session_factory, fmt, chunk_rows)
+            result["rows_per_second"] = round(rows / result["seconds"])
+            result["peak_python_mb"] = _peak_mb(session_factory, fmt, chunk_rows)
+            results[fmt] = result
+    finally:
+        engine.dispose()
+    return {"rows": rows, "chunk_rows": chunk_rows, "formats": results}
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put the databases (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        print(json.dumps([run(rows, args.chunk_rows, args.workdir) for rows in args.rows], indent=2))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps([run(rows, args.chunk_rows, Path(tmp)) for rows in args.rows], indent=2))
+
+
+if __name__ == "__main__":
+    main()
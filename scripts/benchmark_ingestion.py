@@ -0,0 +1,306 @@
+"""
+Benchmark each ingestion stage on synthetic exports and write the results as JSON.
+
+Every platform's file is generated once (see generate_synthetic_data.py). Each
+stage then runs in a fresh process, so its peak memory is measured on its own:
+
+    parse               CSV rows decoded into lists (csv.reader)
+    parse_columnar      CSV decoded into pandas chunks (read_csv_chunks)
+    normalize           the connector's compiled row normalizer only, on already-parsed rows
+    normalize_columnar  normalize_frame only, on already-read chunks
+    insert              ChunkWriter upserts of already-normalized rows
+    insert_bulk         the same through DatabaseManager(bulk_load=True)
+    end_to_end          DataIngestor.ingest_file, row by row
+    end_to_end_columnar DataIngestor.ingest_file with columnar=True
+
+Only the named step is timed. Producing its input is not, so the stage timings
+can be compared with each other. Results include the package version and git
+commit, so runs of different versions can be diffed with `--compare`:
+
+    python scripts/benchmark_ingestion.py --rows 1000000 --output before.json
+    python scripts/benchmark_ingestion.py --rows 1000000 --compare before.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Run as a script, so the sibling generator module is importable.
+from generate_synthetic_data import DEFAULT_SEED, PLATFORMS, generate
+
+ROOT = Path(__file__).resolve().parents[1]
+RESULTS_SCHEMA = 1
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Stopwatch:
+    """Accumulates only the time spent inside `with stopwatch:` blocks."""
+
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+    def __enter__(self) -> "Stopwatch":
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.seconds += time.perf_counter() - self._started
+
+
+def _connector(slug: str):
+    from adpulse.connectors.registry import build_default_registry
+
+    return build_default_registry().get(slug)
+
+
+def _csv_rows(path: Path):
+    import csv
+
+    handle = path.open(newline="", encoding="utf-8")
+    reader = csv.reader(handle)
+    return handle, next(reader), reader
+
+
+def stage_parse(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    rows, watch = 0, Stopwatch()
+    handle, _, reader = _csv_rows(path)
+    with handle, watch:
+        for _ in reader:
+            rows += 1
+    return rows, watch.seconds
+
+
+def stage_parse_columnar(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    from adpulse.ingestion.columnar import read_csv_chunks
+
+    rows, watch = 0, Stopwatch()
+    with watch:
+        for frame in read_csv_chunks(path, chunk_size=batch_size):
+            rows += len(frame)
+    return rows, watch.seconds
+
+
+def stage_normalize(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    from adpulse.ingestion.schema import DateParser
+    from adpulse.utils import chunked
+
+    handle, header, reader = _csv_rows(path)
+    normalize, date_parser = _connector(slug).compile_normalizer(header), DateParser()
+    rows, watch = 0, Stopwatch()
+    with handle:
+        for chunk in chunked(reader, batch_size):
+            with watch:
+                for row in chunk:
+                    normalize(row, date_parser)
+            rows += len(chunk)
+    return rows, watch.seconds
+
+
+def stage_normalize_columnar(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    from adpulse.ingestion.columnar import normalize_frame, read_csv_chunks
+
+    connector = _connector(slug)
+    rows, watch = 0, Stopwatch()
+    for frame in read_csv_chunks(path, chunk_size=batch_size):
+        with watch:
+            rows += len(normalize_frame(frame, connector))
+    return rows, watch.seconds
+
+
+def _insert(slug: str, path: Path, batch_size: int, workdir: Path, bulk_load: bool) -> Tuple[int, float]:
+    from adpulse.storage.database import DatabaseManager, new_batch_id
+
+    database = DatabaseManager(workdir / f"{slug}_{'bulk' if bulk_load else 'insert'}.db", bulk_load=bulk_load)
+    database.initialize()
+    batch_id = new_batch_id()
+    rows, watch = 0, Stopwatch()
+    with database.open_writer() as writer:
+        for batch in _connector(slug).iter_record_batches(path, batch_size):
+            with watch:
+                writer.write(batch, batch_id)
+            rows += len(batch)
+        closing = time.perf_counter()
+    # Leaving `open_writer` commits (and, in bulk mode, runs the merge).
+    watch.seconds += time.perf_counter() - closing
+    return rows, watch.seconds
+
+
+def stage_insert(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    return _insert(slug, path, batch_size, workdir, bulk_load=False)
+
+
+def stage_insert_bulk(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    return _insert(slug, path, batch_size, workdir, bulk_load=True)
+
+
+def _end_to_end(slug: str, path: Path, batch_size: int, workdir: Path, columnar: bool) -> Tuple[int, float]:
+    from adpulse.connectors.registry import build_default_registry
+    from adpulse.ingestion.data_ingestor import DataIngestor
+    from adpulse.storage.database import DatabaseManager
+
+    database = DatabaseManager(workdir / f"{slug}_e2e{'_columnar' if columnar else ''}.db")
+    ingestor = DataIngestor(
+        build_default_registry(), database, batch_size=batch_size, columnar=columnar, track_manifest=False
+    )
+    watch = Stopwatch()
+    with watch:
+        report = ingestor.ingest_file(slug, path)
+    return report.rows_ingested, watch.seconds
+
+
+def stage_end_to_end(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    return _end_to_end(slug, path, batch_size, workdir, columnar=False)
+
+
+def stage_end_to_end_columnar(slug: str, path: Path, batch_size: int, workdir: Path) -> Tuple[int, float]:
+    return _end_to_end(slug, path, batch_size, workdir, columnar=True)
+
+
+STAGES: Dict[str, Callable[[str, Path, int, Path], Tuple[int, float]]] = {
+    "parse": stage_parse,
+    "parse_columnar": stage_parse_columnar,
+    "normalize": stage_normalize,
+    "normalize_columnar": stage_normalize_columnar,
+    "insert": stage_insert,
+    "insert_bulk": stage_insert_bulk,
+    "end_to_end": stage_end_to_end,
+    "end_to_end_columnar": stage_end_to_end_columnar,
+}
+
+
+def _run_stage(stage: str, slug: str, path: Path, batch_size: int, workdir: Path) -> dict:
+    """Entry point of the per-stage child process."""
+    baseline = _peak_rss_mb()
+    rows, seconds = STAGES[stage](slug, path, batch_size, workdir)
+    return {
+        "platform": slug,
+        "stage": stage,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "baseline_rss_mb": baseline,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def run_isolated(stage: str, slug: str, path: Path, batch_size: int, workdir: Path) -> dict:
+    # A spawned interpreter per stage keeps peak RSS from leaking across stages.
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_run_stage, (stage, slug, path, batch_size, workdir))
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _environment() -> dict:
+    import adpulse
+
+    return {
+        "adpulse_version": adpulse.__version__,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(current: List[dict], baseline_path: Path) -> List[str]:
+    """Lines with the rows/sec ratio of every (platform, stage) present in both runs."""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(row["platform"], row["stage"]): row for row in baseline["results"]}
+    lines = []
+    for row in current:
+        before = previous.get((row["platform"], row["stage"]))
+        if not before or not before.get("rows_per_second") or not row.get("rows_per_second"):
+            continue
+        ratio = row["rows_per_second"] / before["rows_per_second"]
+        lines.append(
+            f"{row['platform']:<8} {row['stage']:<20} {before['rows_per_second']:>12,} -> "
+            f"{row['rows_per_second']:>12,} rows/sec  x{ratio:.2f}"
+        )
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per platform")
+    parser.add_argument("--platforms", nargs="+", default=list(PLATFORMS), choices=list(PLATFORMS))
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put data and databases (default: temp dir)")
+    parser.add_argument("--output", type=Path, default=None, help="Write the JSON results to this file")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or Path(tmp)
+        data_dir = workdir / "data"
+        files = dict(
+            zip(
+                args.platforms,
+                (path for path, _ in generate(args.platforms, rows=args.rows, seed=args.seed, output_dir=data_dir)),
+            )
+        )
+        results = []
+        for slug, path in files.items():
+            for stage in args.stages:
+                result = run_isolated(stage, slug, path, args.batch_size, workdir)
+                results.append(result)
+                print(
+                    f"{slug:<8} {stage:<20} {result['rows']:>12,} rows {result['seconds']:>9.2f}s "
+                    f"{result['rows_per_second'] or 0:>12,} rows/sec  peak {result['peak_rss_mb']} MiB",
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+    report = {
+        "schema": RESULTS_SCHEMA,
+        "environment": _environment(),
+        "config": {
+            "rows": args.rows,
+            "batch_size": args.batch_size,
+            "seed": args.seed,
+            "platforms": args.platforms,
+        },
+        "results": results,
+    }
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(payload + "\n", encoding="utf-8")
+    else:
+        print(payload)
+    if args.compare:
+        for line in compare(results, args.compare):
+            print(line, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Measure what a retention policy saves: database size and API query latency.
+
+Loads N synthetic rows (one row per campaign and day from 2020-01-01) into a
+fresh SQLite database, times every `MetricsReader` query the routers issue,
+compacts it with `--policy` as of the day after the last row, and times them
+again. Each query reports the median of `--repeat` runs.
+
+    python scripts/benchmark_retention.py --rows 1000000 --policy daily:400,weekly:730,monthly
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List
+
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_backends import _time  # noqa: E402
+from benchmark_bulk_load import synthetic_rows  # noqa: E402
+
+from adpulse.api.metrics import OrmMetricsReader  # noqa: E402
+from adpulse.config import DEFAULT_RETENTION_POLICY  # noqa: E402
+from adpulse.database import create_sqlite_engine  # noqa: E402
+from adpulse.storage.backend import DEFAULT_BATCH_SIZE  # noqa: E402
+from adpulse.storage.database import DatabaseManager  # noqa: E402
+from adpulse.storage.retention import RetentionPolicy  # noqa: E402
+from adpulse.storage.rollups import COMPACTED_FACTS, PLATFORM_ROLLUP  # noqa: E402
+from adpulse.utils import chunked  # noqa: E402
+
+
+def _snapshot(database: DatabaseManager, repeat: int) -> dict:
+    with sqlite3.connect(database.db_path) as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        facts = conn.execute(f"SELECT (SELECT COUNT(*) FROM ad_facts) + (SELECT COUNT(*) FROM {COMPACTED_FACTS})").fetchone()[0]
+    conn.close()
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    try:
+        with sessionmaker(bind=engine)() as session:
+            timings = _time(OrmMetricsReader(session), repeat)
+    finally:
+        engine.dispose()
+    return {"fact_rows": facts, "file_mb": round(database.db_path.stat().st_size / 2**20, 1), "query_ms": timings}
+
+
+def run(rows: int, policy: RetentionPolicy, repeat: int, workdir: Path) -> dict:
+    database = DatabaseManager(workdir / f"retention_{rows}.db", bulk_load=True)
+    database.initialize()
+    database.insert_row_chunks(list(chunk) for chunk in chunked(synthetic_rows(rows), DEFAULT_BATCH_SIZE))
+    with sqlite3.connect(database.db_path) as conn:
+        last_day = date.fromisoformat(conn.execute(f"SELECT MAX(event_date) FROM {PLATFORM_ROLLUP}").fetchone()[0])
+    conn.close()
+    before = _snapshot(database, repeat)
+
+    started = time.perf_counter()
+    report = database.compact(policy, today=last_day + timedelta(days=1))
+    compact_seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "policy": str(policy),
+        "compact_seconds": round(compact_seconds, 2),
+        "transactions": report.transactions,
+        "before": before,
+        "after": _snapshot(database, repeat),
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--policy", default=DEFAULT_RETENTION_POLICY)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workdir", type=Path, default=None, help="Where to put the database (default: temp dir)")
+    args = parser.parse_args(argv)
+
+    policy = RetentionPolicy.parse(args.policy)
+    if args.workdir:
+        args.workdir.mkdir(parents=True, exist_ok=True)
+        print(json.dumps(run(args.rows, policy, args.repeat, args.workdir), indent=2))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        print(json.dumps(run(args.rows, policy, args.repeat, Path(tmp)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,275 @@
 """
-Generate synthetic CSV exports for Google, Meta and TikTok so we can test the pipeline
-with ~500 rows per platform.
+Generate synthetic CSV exports for Google, Meta and TikTok.
+
+Rows are streamed straight to disk, so a file can hold tens of millions of
+rows without holding them in memory. Output is deterministic for a given
+`--seed`, row count and shard count. Each platform keeps the quirks of its
+real export: its own header and date format, `$1,234.56` cost strings in
+some Google rows, and a few blank conversion cells. Campaign cardinality
+grows with the row count by default, and campaign popularity is skewed
+towards a few heavy campaigns, as in real accounts. Rows are spread evenly
+over the date span, in date order.
+
+    python scripts/generate_synthetic_data.py                       # ~500 rows per platform
+    python scripts/generate_synthetic_data.py --rows 10000000 --shards 8 --workers 8
+
+With `--shards N` each platform is split into N part files that cover
+consecutive date ranges. The parts are written in parallel by `--workers`
+processes and load with `adpulse load-dir`.
 """
 from __future__ import annotations
 
+import argparse
 import csv
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import date, timedelta
 from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
 
 ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = ROOT / "sample_data" / "synthetic"
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+DEFAULT_ROWS = 500
+DEFAULT_SEED = 42
+DEFAULT_START = date(2024, 1, 1)
+DEFAULT_DAYS = 120
+# Default campaign cardinality: one campaign per this many rows, within the bounds below.
+ROWS_PER_CAMPAIGN = 500
+MIN_CAMPAIGNS = 24
+MAX_CAMPAIGNS = 50_000
+REGIONS = ("US", "UK", "DE", "FR", "BR", "JP", "AU", "CA")
+WRITE_BUFFER_ROWS = 10_000
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """How one platform's export looks and what its metrics typically range over."""
+
+    slug: str
+    header: Tuple[str, ...]
+    date_format: str
+    campaigns: Tuple[str, ...]
+    impressions: Tuple[int, int]
+    ctr: Tuple[float, float]
+    cost_per_click: Tuple[float, float]
+    conversion_rate: Tuple[float, float]
+    # Share of rows whose cost is written as a currency string ("$1,234.56").
+    currency_rate: float = 0.0
+    # Share of rows with an empty conversions cell.
+    blank_conversion_rate: float = 0.0
+
+    @property
+    def file_stem(self) -> str:
+        return f"{self.slug}_ads_synth"
+
+
+PLATFORMS = {
+    spec.slug: spec
+    for spec in (
+        PlatformSpec(
+            slug="google",
+            header=("Campaign", "Date", "Impressions", "Clicks", "Cost", "Conversions"),
+            date_format="%Y-%m-%d",
+            campaigns=("Brand", "Retargeting", "Prospecting", "DSA", "Shopping", "App Installs"),
+            impressions=(500, 5000),
+            ctr=(0.01, 0.08),
+            cost_per_click=(0.2, 3.0),
+            conversion_rate=(0.02, 0.25),
+            currency_rate=0.1,
+            blank_conversion_rate=0.01,
+        ),
+        PlatformSpec(
+            slug="meta",
+            header=("campaign_name", "reporting_starts", "impressions", "link_clicks", "spend", "purchases"),
+            date_format="%m/%d/%Y",
+            campaigns=("Lookalike", "Retention", "Conversion", "Awareness", "Video"),
+            impressions=(400, 4000),
+            ctr=(0.015, 0.1),
+            cost_per_click=(0.1, 2.5),
+            conversion_rate=(0.03, 0.3),
+            blank_conversion_rate=0.02,
+        ),
+        PlatformSpec(
+            slug="tiktok",
+            header=("CampaignName", "StatDate", "Impressions", "Clicks", "Cost", "Conversions"),
+            date_format="%Y/%m/%d",
+            campaigns=("Spark Ads", "Creator Collab", "GenZ Push", "In-Feed"),
+            impressions=(300, 3500),
+            ctr=(0.02, 0.12),
+            cost_per_click=(0.05, 1.5),
+            conversion_rate=(0.01, 0.2),
+            blank_conversion_rate=0.01,
+        ),
+    )
+}
+
+
+def default_campaign_count(rows: int) -> int:
+    return min(MAX_CAMPAIGNS, max(MIN_CAMPAIGNS, rows // ROWS_PER_CAMPAIGN))
 
 
-def random_date(start: date, days: int) -> date:
-    return start + timedelta(days=random.randint(0, days))
+def campaign_names(spec: PlatformSpec, count: int) -> List[str]:
+    """`count` distinct campaign names such as "Brand US 0007"."""
+    width = len(str(count))
+    return [
+        f"{spec.campaigns[index % len(spec.campaigns)]} "
+        f"{REGIONS[(index // len(spec.campaigns)) % len(REGIONS)]} {index:0{width}d}"
+        for index in range(count)
+    ]
 
 
-def write_csv(path: Path, header: list[str], rows: list[list]) -> None:
+def generate_rows(
+    spec: PlatformSpec,
+    first: int,
+    stop: int,
+    total: int,
+    campaigns: Sequence[str],
+    start: date,
+    days: int,
+    seed: str,
+) -> Iterator[list]:
+    """
+    Yield rows `first` to `stop` of a `total`-row export, one at a time.
+
+    The date of a row depends only on its index, so shards of one export cover
+    consecutive date ranges and line up exactly.
+    """
+    rng = random.Random(seed)
+    rand, uniform, randint = rng.random, rng.uniform, rng.randint
+    dates: dict = {}
+    campaign_count = len(campaigns)
+    for index in range(first, stop):
+        offset = index * days // total
+        day = dates.get(offset)
+        if day is None:
+            day = dates[offset] = (start + timedelta(days=offset)).strftime(spec.date_format)
+        # Squaring a uniform draw skews traffic towards the first campaigns.
+        campaign = campaigns[int(rand() * rand() * campaign_count)]
+        impressions = randint(*spec.impressions)
+        clicks = max(1, int(impressions * uniform(*spec.ctr)))
+        spend = round(clicks * uniform(*spec.cost_per_click), 2)
+        cost = f"${spend:,.2f}" if spec.currency_rate and rand() < spec.currency_rate else spend
+        conversions = max(0, int(clicks * uniform(*spec.conversion_rate)))
+        if spec.blank_conversion_rate and rand() < spec.blank_conversion_rate:
+            conversions = ""
+        yield [campaign, day, impressions, clicks, cost, conversions]
+
+
+def write_csv(path: Path, header: Sequence[str], rows) -> int:
+    """Stream `rows` into `path`, buffering a few thousand rows per write."""
+    written = 0
     with path.open("w", newline="", encoding="utf-8") as fh:
         writer = csv.writer(fh)
         writer.writerow(header)
-        writer.writerows(rows)
-
-
-def generate_google(num_rows: int = 500) -> None:
-    campaigns = ["Brand", "Retargeting", "Prospecting", "DSA", "Shopping", "App Installs"]
-    start = date(2024, 1, 1)
-    rows = []
-    for _ in range(num_rows):
-        campaign = random.choice(campaigns)
-        impressions = random.randint(500, 5000)
-        clicks = max(1, int(impressions * random.uniform(0.01, 0.08)))
-        spend = round(random.uniform(20, 600), 2)
-        conversions = max(0, int(clicks * random.uniform(0.02, 0.25)))
-        rows.append(
-            [
-                f"{campaign} {random.randint(1,4)}",
-                random_date(start, 120).isoformat(),
-                impressions,
-                clicks,
-                spend,
-                conversions,
-            ]
-        )
-    write_csv(
-        OUTPUT_DIR / "google_ads_synth.csv",
-        ["Campaign", "Date", "Impressions", "Clicks", "Cost", "Conversions"],
-        rows,
-    )
+        buffer: list = []
+        for row in rows:
+            buffer.append(row)
+            if len(buffer) >= WRITE_BUFFER_ROWS:
+                writer.writerows(buffer)
+                written += len(buffer)
+                buffer.clear()
+        writer.writerows(buffer)
+        written += len(buffer)
+    return written
 
 
-def generate_meta(num_rows: int = 500) -> None:
-    campaigns = ["Lookalike", "Retention", "Conversion", "Awareness", "Video"]
-    start = date(2024, 1, 1)
-    rows = []
-    for _ in range(num_rows):
-        campaign = random.choice(campaigns)
-        impressions = random.randint(400, 4000)
-        clicks = max(1, int(impressions * random.uniform(0.015, 0.1)))
-        spend = round(random.uniform(15, 450), 2)
-        purchases = max(0, int(clicks * random.uniform(0.03, 0.3)))
-        rows.append(
-            [
-                f"{campaign} {random.randint(1,5)}",
-                random_date(start, 120).strftime("%m/%d/%Y"),
-                impressions,
-                clicks,
-                spend,
-                purchases,
-            ]
-        )
-    write_csv(
-        OUTPUT_DIR / "meta_ads_synth.csv",
-        ["campaign_name", "reporting_starts", "impressions", "link_clicks", "spend", "purchases"],
-        rows,
-    )
+def shard_path(output_dir: Path, spec: PlatformSpec, shard: int, shards: int) -> Path:
+    if shards == 1:
+        return output_dir / f"{spec.file_stem}.csv"
+    return output_dir / f"{spec.file_stem}.part-{shard:04d}.csv"
 
 
-def generate_tiktok(num_rows: int = 500) -> None:
-    campaigns = ["Spark Ads", "Creator Collab", "GenZ Push", "In-Feed"]
-    start = date(2024, 1, 1)
-    rows = []
-    for _ in range(num_rows):
-        campaign = random.choice(campaigns)
-        impressions = random.randint(300, 3500)
-        clicks = max(1, int(impressions * random.uniform(0.02, 0.12)))
-        spend = round(random.uniform(10, 380), 2)
-        conversions = max(0, int(clicks * random.uniform(0.01, 0.2)))
-        rows.append(
-            [
-                f"{campaign} {random.randint(1,6)}",
-                random_date(start, 120).strftime("%Y/%m/%d"),
-                impressions,
-                clicks,
-                spend,
-                conversions,
-            ]
-        )
-    write_csv(
-        OUTPUT_DIR / "tiktok_ads_synth.csv",
-        ["CampaignName", "StatDate", "Impressions", "Clicks", "Cost", "Conversions"],
+def write_shard(
+    slug: str,
+    shard: int,
+    shards: int,
+    rows: int,
+    campaigns: int,
+    start: date,
+    days: int,
+    seed: int,
+    output_dir: Path,
+) -> Tuple[Path, int]:
+    """Write one shard of one platform's export; runs in a worker process."""
+    spec = PLATFORMS[slug]
+    first, stop = rows * shard // shards, rows * (shard + 1) // shards
+    path = shard_path(output_dir, spec, shard, shards)
+    generated = generate_rows(
+        spec,
+        first,
+        stop,
         rows,
+        campaign_names(spec, campaigns),
+        start,
+        days,
+        seed=f"{seed}:{slug}:{shard}/{shards}",
     )
+    return path, write_csv(path, spec.header, generated)
+
+
+def generate(
+    platforms: Sequence[str] = tuple(PLATFORMS),
+    rows: int = DEFAULT_ROWS,
+    campaigns: Optional[int] = None,
+    start: date = DEFAULT_START,
+    days: int = DEFAULT_DAYS,
+    seed: int = DEFAULT_SEED,
+    shards: int = 1,
+    workers: int = 1,
+    output_dir: Path = OUTPUT_DIR,
+) -> List[Tuple[Path, int]]:
+    """Write `rows` rows per platform and return (path, rows) for every file written."""
+    unknown = sorted(set(platforms) - set(PLATFORMS))
+    if unknown:
+        raise ValueError(f"Unknown platforms: {', '.join(unknown)}. Known: {', '.join(PLATFORMS)}")
+    if rows < 1 or days < 1 or shards < 1:
+        raise ValueError("rows, days and shards must be positive")
+    output_dir.mkdir(parents=True, exist_ok=True)
+    campaigns = campaigns or default_campaign_count(rows)
+    jobs = [
+        (slug, shard, shards, rows, campaigns, start, days, seed, output_dir)
+        for slug in platforms
+        for shard in range(shards)
+    ]
+    if workers <= 1 or len(jobs) == 1:
+        return [write_shard(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(write_shard, *zip(*jobs)))
 
 
-def main() -> None:
-    random.seed(42)
-    generate_google()
-    generate_meta()
-    generate_tiktok()
-    print(f"Synthetic CSVs created under {OUTPUT_DIR}")
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows per platform")
+    parser.add_argument("--platforms", nargs="+", default=list(PLATFORMS), choices=list(PLATFORMS))
+    parser.add_argument(
+        "--campaigns", type=int, default=None, help="Distinct campaigns per platform (default: scales with --rows)"
+    )
+    parser.add_argument("--start", type=date.fromisoformat, default=DEFAULT_START, help="First day (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS, help="Number of days the rows are spread over")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--shards", type=int, default=1, help="Part files per platform")
+    parser.add_argument("--workers", type=int, default=1, help="Processes writing shards in parallel")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    written = generate(
+        platforms=args.platforms,
+        rows=args.rows,
+        campaigns=args.campaigns,
+        start=args.start,
+        days=args.days,
+        seed=args.seed,
+        shards=args.shards,
+        workers=args.workers,
+        output_dir=args.output_dir,
+    )
+    elapsed = time.perf_counter() - started
+    total = sum(count for _, count in written)
+    print(f"Wrote {total:,} rows in {len(written)} file(s) under {args.output_dir} in {elapsed:.1f}s")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,124 @@
+import atexit
+import csv
+import os
+import shutil
 import sys
+import tempfile
+from datetime import date, timedelta
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+# `adpulse.api.main` migrates the configured database at import; keep it off data/adpulse.db.
+_DB_DIR = tempfile.mkdtemp(prefix="adpulse-tests-")
+atexit.register(shutil.rmtree, _DB_DIR, ignore_errors=True)
+os.environ.setdefault("ADPULSE_DB_PATH", str(Path(_DB_DIR) / "adpulse.db"))
+os.environ.setdefault("ADPULSE_DUCKDB_PATH", str(Path(_DB_DIR) / "adpulse.duckdb"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from adpulse.api.dependencies import get_db, get_snapshots  # noqa: E402
+from adpulse.api.main import app  # noqa: E402
+from adpulse.api.snapshots import SnapshotRegistry  # noqa: E402
+from adpulse.database import create_sqlite_engine  # noqa: E402
+from adpulse.ingestion.schema import NormalizedRecord  # noqa: E402
+from adpulse.storage.database import DatabaseManager  # noqa: E402
+
+GOOGLE_EXPORT_HEADER = ["Campaign", "Date", "Impressions", "Clicks", "Cost", "Conversions"]
+
+
+@pytest.fixture
+def make_records():
+    """Factory: one record per day from `start` for campaigns 0-2 (ids `google-0`, `meta-2`, ...) on two platforms."""
+
+    def make(start: date, days: int, spend: float = 2.5, name: str = "Campaign {}"):
+        return [
+            NormalizedRecord(
+                platform, f"{slug}-{campaign}", name.format(campaign), start + timedelta(days=day),
+                100 + day, campaign + day % 5, spend, 1, 12.25,
+            )
+            for platform, slug in (("Google Ads", "google"), ("Meta Ads", "meta"))
+            for campaign in range(3)
+            for day in range(days)
+        ]
+
+    return make
+
+
+@pytest.fixture
+def seeded_database(tmp_path, make_records):
+    """Factory: an initialized database in tmp_path holding `make_records(start, days, ...)`."""
+
+    def seed(start: date, days: int, filename: str = "adpulse.db", **record_options) -> DatabaseManager:
+        database = DatabaseManager(tmp_path / filename)
+        database.initialize()
+        database.insert_records(make_records(start, days, **record_options))
+        return database
+
+    return seed
+
+
+@pytest.fixture
+def api_responses():
+    """Factory: the JSON body of each url, as (url, body) pairs, with the API reading `database`."""
+
+    def fetch(database: DatabaseManager, urls) -> list:
+        engine = create_sqlite_engine(database.db_path, read_only=True)
+        TestingSessionLocal = sessionmaker(bind=engine)
+
+        def override_get_db():
+            db = TestingSessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            client = TestClient(app)
+            return [(url, client.get(url).json()) for url in urls]
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    return fetch
+
+
+@pytest.fixture
+def snapshot_client():
+    """Factory: a client and snapshot registry reading `database`, at most two snapshots open at once."""
+    opened = []
+
+    def connect(database: DatabaseManager):
+        engine = create_sqlite_engine(database.db_path, read_only=True)
+        registry = SnapshotRegistry(sessionmaker(bind=engine), ttl_seconds=60, max_open=2)
+        opened.append((engine, registry))
+        app.dependency_overrides[get_snapshots] = lambda: registry
+        return TestClient(app), registry
+
+    try:
+        yield connect
+    finally:
+        app.dependency_overrides.clear()
+        for engine, registry in opened:
+            registry.close_all()
+            engine.dispose()
+
+
+@pytest.fixture
+def write_export():
+    """Factory: write `rows` to a CSV export at `path`; appending (`mode="a"`) skips the header."""
+
+    def write(path: Path, rows, header=GOOGLE_EXPORT_HEADER, mode: str = "w") -> None:
+        with path.open(mode, encoding="utf-8", newline="") as handle:
+            writer = csv.writer(handle)
+            if mode == "w":
+                writer.writerow(header)
+            writer.writerows(rows)
+
+    return write
@@ -0,0 +1,67 @@
+import gzip
+import time
+
+from fastapi.testclient import TestClient
+
+from adpulse.api.dependencies import get_ingest_jobs
+from adpulse.api.main import app
+from adpulse.connectors.registry import build_default_registry
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.ingestion.jobs import IngestJobManager
+from adpulse.storage.database import DatabaseManager
+
+CSV = (
+    "Campaign,Date,Impressions,Clicks,Cost,Conversions\n"
+    "Brand,2024-05-01,100,10,$1.50,2\n"
+    "Brand,2024-05-02,200,20,$3.00,4\n"
+    "Prospecting,2024-05-02,50,5,$0.75,1\n"
+)
+
+
+def _wait(client: TestClient, location: str) -> dict:
+    deadline = time.monotonic() + 10
+    while True:
+        status = client.get(location).json()
+        if status["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+            return status
+        time.sleep(0.02)
+
+
+def test_upload_is_ingested_by_a_background_job(tmp_path):
+    database = DatabaseManager(tmp_path / "api_ingest.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=2, track_manifest=False)
+    jobs = IngestJobManager(ingestor, tmp_path / "spool", max_workers=1)
+    app.dependency_overrides[get_ingest_jobs] = lambda: jobs
+    client = TestClient(app)
+    try:
+        response = client.post(
+            "/ingest/google?filename=google.csv.gz",
+            content=gzip.compress(CSV.encode("utf-8")),
+            headers={"Content-Type": "application/octet-stream"},
+        )
+        assert response.status_code == 202
+        submitted = response.json()
+        assert submitted["filename"] == "google.csv.gz"
+        assert submitted["bytes_received"] > 0
+        status = _wait(client, response.headers["Location"])
+        assert status["status"] == "succeeded", status
+        assert status["rows_processed"] == 3
+        assert database.row_count() == 3
+
+        multipart = client.post("/ingest/google", files={"file": ("export.csv", CSV.encode("utf-8"), "text/csv")})
+        assert multipart.status_code == 202
+        assert multipart.json()["filename"] == "export.csv"
+        assert _wait(client, multipart.headers["Location"])["status"] == "succeeded"
+
+        broken = client.post("/ingest/google", content=b"Campaign,Date\nBrand,not-a-date\n")
+        failed = _wait(client, broken.headers["Location"])
+        assert failed["status"] == "failed"
+        assert failed["error"]
+
+        assert client.post("/ingest/myspace", content=CSV.encode("utf-8")).status_code == 404
+        assert client.post("/ingest/google", content=b"").status_code == 400
+        assert client.get("/ingest/jobs/does-not-exist").status_code == 404
+        assert list((tmp_path / "spool").iterdir()) == []
+    finally:
+        app.dependency_overrides.clear()
+        jobs.shutdown()
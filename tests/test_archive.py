@@ -0,0 +1,78 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from adpulse.storage.database import DatabaseManager
+
+pytest.importorskip("pyarrow")
+
+URLS = [
+    "/summary/platforms",
+    "/summary/platforms?start_date=2024-05-10&end_date=2024-06-05",
+    "/summary/platforms?start_date=2024-06-01",
+    "/campaigns/summary",
+    "/campaigns/summary?platform=Meta Ads&end_date=2024-05-20",
+    "/campaigns/google-1/detail",
+    "/campaigns/google-1/detail?start_date=2024-04-20&end_date=2024-05-03",
+    "/timeseries/daily",
+    "/timeseries/daily?platform=Google Ads&start_date=2024-05-28",
+    "/timeseries/daily?campaign_id=meta-2&end_date=2024-06-02",
+]
+
+
+@pytest.fixture
+def seeded(seeded_database):
+    """Factory: a database holding April through mid-June 2024."""
+    return lambda filename="adpulse.db": seeded_database(date(2024, 4, 1), 76, filename)
+
+
+def _hot_days(database: DatabaseManager) -> tuple:
+    with sqlite3.connect(database.db_path) as conn:
+        return conn.execute("SELECT MIN(day), COUNT(*) FROM ad_facts").fetchone()
+
+
+def test_closed_months_move_to_parquet_and_reads_union_both_tiers(tmp_path, seeded, api_responses):
+    database = seeded()
+    expected = api_responses(database, URLS)
+    summary = [dict(row) for row in database.fetch_summary()]
+
+    partitions = database.archive_months(tmp_path / "archive", date(2024, 6, 15))
+
+    assert sorted((partition.platform, partition.month) for partition in partitions) == [
+        ("Google Ads", 202404), ("Google Ads", 202405), ("Meta Ads", 202404), ("Meta Ads", 202405),
+    ]
+    assert all(partition.path.exists() for partition in partitions)
+    assert (tmp_path / "archive" / "platform=meta-ads" / "month=2024-05").is_dir()
+    assert _hot_days(database) == (20240601, 2 * 3 * 15)
+    assert api_responses(database, URLS) == expected
+    assert [dict(row) for row in database.fetch_summary()] == summary
+
+    # Queries that do not reach April never open its partitions.
+    for partition in partitions:
+        if partition.month == 202404:
+            partition.path.unlink()
+    later = [url for url in URLS if "start_date=2024-05" in url or "start_date=2024-06" in url]
+    assert api_responses(database, later) == [response for response in expected if response[0] in later]
+
+
+def test_writes_to_an_archived_month_restore_it_until_the_next_archive_run(
+    tmp_path, seeded, make_records, api_responses
+):
+    plain = seeded("plain.db")
+    tiered = seeded("tiered.db")
+    tiered.archive_months(tmp_path / "archive", date(2024, 6, 15))
+
+    for database in (plain, tiered):
+        # A replacement export for mid-May, and an accumulated delta for April.
+        database.insert_records(make_records(date(2024, 5, 10), 3, spend=4.0))
+        database.insert_records(make_records(date(2024, 4, 2), 1), mode="accumulate")
+    assert api_responses(tiered, URLS) == api_responses(plain, URLS)
+    with sqlite3.connect(tiered.db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM archive_partitions").fetchone()[0] == 0
+    conn.close()
+
+    tiered.archive_months(tmp_path / "archive", date(2024, 6, 15))
+    assert api_responses(tiered, URLS) == api_responses(plain, URLS)
+    # The restored partitions' old files are swept once their months are archived again.
+    assert len(list((tmp_path / "archive").rglob("*.parquet"))) == 4
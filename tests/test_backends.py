@@ -0,0 +1,157 @@
+import sys
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from typer.testing import CliRunner
+
+from adpulse.api.dependencies import get_metrics
+from adpulse.api.main import app
+from adpulse.api.metrics import OrmMetricsReader
+from adpulse.cli import app as cli
+from adpulse.config import load_settings
+from adpulse.connectors.registry import build_default_registry
+from adpulse.database import create_sqlite_engine
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.storage.backend import open_backend
+from adpulse.storage.database import DatabaseManager
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pandas")
+
+from adpulse.storage.duckdb_backend import DuckDBBackend  # noqa: E402
+
+URLS = [
+    "/summary/platforms",
+    "/summary/platforms?start_date=2024-05-03&end_date=2024-05-10",
+    "/campaigns/summary",
+    "/campaigns/summary?platform=Google Ads&start_date=2024-05-05",
+    "/campaigns/google-campaign-1/detail",
+    "/campaigns/google-campaign-2/detail?start_date=2024-05-03&end_date=2024-05-08",
+    "/campaigns/missing/detail",
+    "/timeseries/daily",
+    "/timeseries/daily?platform=Meta Ads&end_date=2024-05-09",
+    "/timeseries/daily?campaign_id=meta-campaign-3&start_date=2024-05-02",
+]
+
+
+HEADERS = {
+    "google": ["Campaign", "Date", "Impressions", "Clicks", "Cost", "Conversions"],
+    "meta": ["campaign_name", "date", "impressions", "clicks", "spend", "purchases", "purchase_value"],
+}
+
+
+def _export_rows(rows: int, cost: str, header) -> list:
+    return [
+        [f"Campaign {index % 4}", f"2024-05-{index % 12 + 1:02d}", "100", str(index % 7), cost, "2", "10.5"][: len(header)]
+        for index in range(rows)
+    ]
+
+
+@pytest.fixture
+def load(write_export):
+    """Factory: replace and accumulate loads of Google and Meta exports under `directory` into `database`."""
+
+    def run(database, directory: Path) -> None:
+        directory.mkdir(exist_ok=True)
+        registry = build_default_registry()
+        google, meta = directory / "google.csv", directory / "meta.csv"
+        ingestor = DataIngestor(registry, database, batch_size=5)
+        write_export(google, _export_rows(60, "2.50", HEADERS["google"]), header=HEADERS["google"])
+        write_export(meta, _export_rows(30, "1.25", HEADERS["meta"]), header=HEADERS["meta"])
+        ingestor.ingest_file("google", google)
+        ingestor.ingest_file("meta", meta)
+        write_export(google, _export_rows(40, "3.75", HEADERS["google"]), header=HEADERS["google"])
+        ingestor.ingest_file("google", google)
+        DataIngestor(registry, database, batch_size=7, mode="accumulate").ingest_file("meta", meta, force=True)
+
+    return run
+
+
+def _responses(reader) -> list:
+    app.dependency_overrides[get_metrics] = lambda: reader
+    try:
+        client = TestClient(app)
+        return [(url, client.get(url).status_code, client.get(url).json()) for url in URLS]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _sqlite_responses(database: DatabaseManager) -> list:
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    try:
+        with sessionmaker(bind=engine)() as session:
+            return _responses(OrmMetricsReader(session))
+    finally:
+        engine.dispose()
+
+
+def test_duckdb_backend_answers_every_route_like_sqlite(tmp_path, load):
+    sqlite_db = DatabaseManager(tmp_path / "adpulse.db")
+    duck = DuckDBBackend(tmp_path / "adpulse.duckdb")
+    try:
+        load(sqlite_db, tmp_path / "sqlite")
+        load(duck, tmp_path / "duckdb")
+        expected = _sqlite_responses(sqlite_db)
+        assert _responses(duck) == expected
+        assert [dict(row) for row in duck.fetch_summary()] == [dict(row) for row in sqlite_db.fetch_summary()]
+        assert duck.row_count() == sqlite_db.row_count()
+    finally:
+        duck.close()
+    assert [url for url, status, body in expected if status != 200 or not body] == ["/campaigns/missing/detail"]
+
+
+def test_sqlite_database_copies_into_duckdb(tmp_path, load):
+    sqlite_db = DatabaseManager(tmp_path / "adpulse.db")
+    load(sqlite_db, tmp_path)
+    duck = DuckDBBackend(tmp_path / "copy.duckdb")
+    try:
+        duck.copy_from_sqlite(sqlite_db)
+        assert duck.copy_from_sqlite(sqlite_db) == sqlite_db.row_count()
+        assert _responses(duck) == _sqlite_responses(sqlite_db)
+        # The manifest came along, so an unchanged file is skipped rather than reloaded.
+        report = DataIngestor(build_default_registry(), duck).ingest_file("google", tmp_path / "google.csv")
+        assert report.action == "skip"
+    finally:
+        duck.close()
+
+
+def test_archived_months_are_copied_into_duckdb(tmp_path, load):
+    pytest.importorskip("pyarrow")
+    sqlite_db = DatabaseManager(tmp_path / "adpulse.db")
+    load(sqlite_db, tmp_path)
+    summary = [dict(row) for row in sqlite_db.fetch_summary()]
+    rows = sqlite_db.row_count()
+
+    assert sqlite_db.archive_months(tmp_path / "archive", date(2024, 6, 1))
+    assert sqlite_db.row_count() == rows == sqlite_db.fetch_totals()["rows_ingested"]
+    duck = DuckDBBackend(tmp_path / "copy.duckdb")
+    try:
+        assert duck.copy_from_sqlite(sqlite_db) == rows
+        assert [dict(row) for row in duck.fetch_summary()] == summary
+        assert dict(duck.fetch_totals()) == dict(sqlite_db.fetch_totals())
+        assert duck.row_count() == rows
+    finally:
+        duck.close()
+
+
+def test_opening_the_duckdb_backend_without_duckdb_names_the_extra(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "duckdb", None)
+    settings = replace(load_settings(), storage_backend="duckdb", duckdb_path=tmp_path / "adpulse.duckdb")
+    with pytest.raises(RuntimeError, match=r"pip install 'adpulse\[duckdb\]'"):
+        open_backend(settings)
+
+
+@pytest.mark.parametrize("command", [["dedupe"], ["rebuild-rollups"], ["archive"], ["compact", "--policy", "daily:30"]])
+def test_sqlite_only_commands_refuse_the_duckdb_backend(tmp_path, monkeypatch, command):
+    monkeypatch.setenv("ADPULSE_STORAGE_BACKEND", "duckdb")
+    monkeypatch.setenv("ADPULSE_DB_PATH", str(tmp_path / "adpulse.db"))
+
+    result = CliRunner().invoke(cli, command)
+
+    assert result.exit_code == 2
+    assert f"`adpulse {command[0]}` requires the SQLite backend" in result.output
+    assert not (tmp_path / "adpulse.db").exists()
@@ -0,0 +1,90 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from adpulse.api.dependencies import get_db
+from adpulse.api.main import app
+from adpulse.connectors.registry import build_default_registry
+from adpulse.database import create_sqlite_engine
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.storage.database import DatabaseManager
+
+READ_URLS = ["/summary/platforms", "/campaigns/summary", "/timeseries/daily", "/campaigns/google-campaign-3/detail"]
+# Generous for a shared CI box; a reader stuck behind the load's write lock would wait seconds.
+P99_BUDGET_SECONDS = 1.0
+
+
+def test_api_reads_stay_fast_during_a_bulk_ingest(tmp_path, write_export):
+    csv_path = tmp_path / "google.csv"
+    write_export(
+        csv_path,
+        (
+            [f"Campaign {index % 50}", f"2024-{index // 50 % 12 + 1:02d}-{index % 28 + 1:02d}", "100", "10", "2.50", "2"]
+            for index in range(40_000)
+        ),
+    )
+    database = DatabaseManager(tmp_path / "concurrent.db", bulk_load=True)
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=2_000)
+    ingestor.ingest_file("google", csv_path)
+
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    ReadSession = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    def override_get_db():
+        db = ReadSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    failures = []
+
+    def reload():
+        try:
+            ingestor.ingest_file("google", csv_path, force=True)
+        except Exception as exc:  # surfaced by the assertion below
+            failures.append(exc)
+
+    latencies = []
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        loader = threading.Thread(target=reload)
+        loader.start()
+        while loader.is_alive():
+            for url in READ_URLS:
+                started = time.perf_counter()
+                response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, (url, response.text)
+        loader.join()
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    assert not failures
+    assert len(latencies) >= 2 * len(READ_URLS)
+    latencies.sort()
+    assert latencies[int(len(latencies) * 0.99)] < P99_BUDGET_SECONDS
+    with sqlite3.connect(database.db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_read_only_engine_rejects_writes(tmp_path):
+    database = DatabaseManager(tmp_path / "read_only.db")
+    database.initialize()
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    try:
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM ad_performance")).scalar() == 0
+            with pytest.raises(OperationalError, match="readonly"):
+                conn.execute(text("DELETE FROM ad_facts"))
+    finally:
+        engine.dispose()
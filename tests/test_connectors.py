@@ -1,8 +1,20 @@
+import bz2
+import gzip
+import io
+import lzma
+import zipfile
+from datetime import date
 from pathlib import Path
 
+import pytest
+
+from adpulse.connectors.base import CSVConnector
 from adpulse.connectors.google_ads import GoogleAdsCSVConnector
 from adpulse.connectors.meta_ads import MetaAdsCSVConnector
+from adpulse.connectors.registry import build_default_registry
+from adpulse.connectors.spec import ConnectorSpec
 from adpulse.connectors.tiktok_ads import TikTokAdsCSVConnector
+from adpulse.ingestion.schema import NormalizedRecord, parse_date
 
 
 def _write_csv(path: Path, header: list[str], rows: list[list[str]]) -> None:
@@ -81,3 +93,160 @@ def test_tiktok_connector_normalizes(tmp_path):
     assert record.clicks == 9
     assert record.spend == 3.5
     assert record.revenue == record.conversions * 25.0
+
+
+def test_columnar_normalization_matches_row_path(tmp_path):
+    cases = [
+        (
+            GoogleAdsCSVConnector(),
+            ["Campaign", "Campaign ID", "Date", "Impressions", "Clicks", "Cost", "Conversions", "Revenue"],
+            [
+                ["Brand", "", "2024-01-01", "1000", "25", "$1,234.56", "5", ""],
+                [" Spaced Name ", " G-1 ", "2024-01-02", "12.9", "oops", " 7 ", "", "99.5"],
+                ["", "", "2024-01-03", "", "3", "", "2.5", "n/a"],
+                ["", "", "", "", "", "", "", ""],
+            ],
+        ),
+        (
+            MetaAdsCSVConnector(),
+            ["campaign_name", "reporting_starts", "impressions", "link_clicks", "clicks", "spend", "purchases", "value"],
+            [
+                ["Prospecting", "01/02/2024", "500", "", "10", "5.123456789012345", "2", ""],
+                ["Retention", "01/03/2024", "200", "4", "9", "", "", "42"],
+            ],
+        ),
+        (
+            TikTokAdsCSVConnector(),
+            ["CampaignName", "StatDate", "Impressions", "Clicks", "Spend", "Leads"],
+            [
+                ["Launch", "2024/03/01", "250", "9", "3.5", "1"],
+                ["Launch", "2024/03/02", "1e3", "1", "0.1", ""],
+            ],
+        ),
+    ]
+    for connector, header, rows in cases:
+        csv_path = tmp_path / f"{connector.platform_slug}.csv"
+        _write_csv(csv_path, header, rows)
+        expected = [record.as_db_tuple() for record in connector.load_file(csv_path)]
+        actual = [row for batch in connector.iter_column_batches(csv_path) for row in batch.iter_db_tuples()]
+        assert actual == expected
+
+
+def test_compressed_exports_stream_through_the_connector(tmp_path):
+    connector = GoogleAdsCSVConnector()
+    header = "Campaign,Date,Impressions,Clicks,Cost,Conversions\n"
+    first = header + "Brand,2024-05-01,100,10,$1.50,2\n"
+    second = header + "Prospecting,2024-05-02,200,20,$3.00,4\n"
+    plain = tmp_path / "plain.csv"
+    plain.write_text(first, encoding="utf-8")
+    expected = connector.load_file(plain)
+
+    for name, opener in (("export.csv.gz", gzip.open), ("export.bz2", bz2.open), ("export", lzma.open)):
+        with opener(tmp_path / name, "wt", encoding="utf-8") as handle:
+            handle.write(first)
+        assert connector.load_file(tmp_path / name) == expected
+
+    archive = tmp_path / "exports.zip"
+    with zipfile.ZipFile(archive, "w") as bundle:
+        bundle.writestr("a.csv", first)
+        bundle.writestr("notes.txt", "ignored")
+        bundle.writestr("nested/b.csv", second)
+    records = connector.load_file(archive)
+    assert [record.campaign_name for record in records] == ["Brand", "Prospecting"]
+    assert [batch.campaign_name.tolist() for batch in connector.iter_column_batches(archive)] == [
+        ["Brand"],
+        ["Prospecting"],
+    ]
+
+    upload = io.BytesIO(gzip.compress(first.encode("utf-8")))
+    assert connector.read_header(upload)[0] == "Campaign"
+    assert connector.load_file(upload) == expected
+
+
+def test_parquet_and_arrow_connectors_match_the_csv_rows(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    header = ["Campaign", "Campaign ID", "Date", "Impressions", "Clicks", "Cost", "Conversions", "Revenue"]
+    rows = [
+        ["Brand", "", "2024-01-01", "1000", "25", "1234.56", "5", ""],
+        ["Prospecting", "G-1", "2024-01-02", "12", "3", "7.25", "", "99.5"],
+    ]
+    csv_path = tmp_path / "google.csv"
+    _write_csv(csv_path, header, rows)
+    expected = [record.as_db_tuple() for record in GoogleAdsCSVConnector().load_file(csv_path)]
+
+    table = pa.table(
+        {
+            "Campaign": ["Brand", "Prospecting"],
+            "Campaign ID": [None, "G-1"],
+            "Date": pa.array([date(2024, 1, 1), date(2024, 1, 2)], pa.date32()),
+            "Impressions": pa.array([1000, 12], pa.int64()),
+            "Clicks": pa.array([25, 3], pa.int32()),
+            "Cost": [1234.56, 7.25],
+            "Conversions": pa.array([5, None], pa.int64()),
+            "Revenue": [None, 99.5],
+            "Unmapped": ["x", "y"],
+        }
+    )
+    parquet_path = tmp_path / "google.parquet"
+    pq.write_table(table, parquet_path, row_group_size=1)
+    arrow_path = tmp_path / "google.arrow"
+    with pa.ipc.new_file(arrow_path, table.schema) as writer:
+        writer.write_table(table)
+
+    registry = build_default_registry()
+    for path in (parquet_path, arrow_path):
+        connector = registry.detect(path)
+        assert connector is registry.get("google", source=path)
+        batches = list(connector.iter_column_batches(path))
+        assert [row for batch in batches for row in batch.iter_db_tuples()] == expected
+    assert len(list(registry.get("google", source=parquet_path).iter_column_batches(parquet_path, chunk_size=1))) == 2
+
+
+def test_spec_connector_compiles_the_file_header_into_positions(tmp_path):
+    spec = ConnectorSpec(
+        platform_slug="bing",
+        platform_name="Microsoft Ads",
+        columns={
+            "campaign_name": ("CampaignName", "Campaign"),
+            "campaign_id": ("CampaignId",),
+            "event_date": ("Day",),
+            "impressions": ("Impr.",),
+            "clicks": ("Clicks",),
+            "spend": ("Spend",),
+            "conversions": ("Conv.",),
+        },
+        revenue_columns=("Revenue", "Value"),
+        money_fields=("spend",),
+    )
+    connector = CSVConnector(spec)
+    csv_path = tmp_path / "bing.csv"
+    _write_csv(
+        csv_path,
+        ["Day", "Campaign", "CampaignName", "Impr.", "Clicks", "Spend", "Conv.", "Value"],
+        [
+            ["2024-02-01", "Fallback", "", "10", "2", "$1,000.50", "3", ""],
+            ["", "", "", "", "", "", "", ""],
+            ["2024-02-02", "Fallback", "Search", "20", "4", "2.5", "1", "40"],
+            ["2024-02-03", "Short"],
+        ],
+    )
+
+    records = list(connector.iter_records(csv_path))
+
+    assert [(r.campaign_name, r.impressions, r.spend, r.revenue) for r in records] == [
+        ("Fallback", 10, 1000.5, 75.0),
+        ("Search", 20, 2.5, 40.0),
+        ("Short", 0, 0.0, 0.0),
+    ]
+    assert records[0].platform == "Microsoft Ads"
+    # The dict API goes through the same compiled rules.
+    assert connector.normalize_rows(connector.iter_rows(csv_path)) == records
+    # Columns are read by position, so only the header order matters; without revenue columns revenue is derived.
+    reordered = connector.compile_normalizer(["Conv.", "Spend", "Clicks", "Impr.", "Campaign", "Day"])
+    assert reordered(["1", "2.5", "4", "20", "Search", "2024-02-02"], parse_date) == NormalizedRecord(
+        "Microsoft Ads", records[1].campaign_id, "Search", date(2024, 2, 2), 20, 4, 2.5, 1, 25.0
+    )
+    with pytest.raises(ValueError):
+        ConnectorSpec(platform_slug="broken", platform_name="Broken", columns={"campaign_name": ("Name",)})
@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import sys
+from datetime import date
+
+import pytest
+
+from adpulse.api.export import EXPORT_COLUMNS, encode, export_rows
+from adpulse.api.headers import DATA_VERSION_HEADER, SNAPSHOT_HEADER
+
+
+@pytest.fixture
+def api(seeded_database, snapshot_client):
+    """A client reading April through mid-June 2024; campaign names hold a comma to exercise CSV quoting."""
+    database = seeded_database(date(2024, 4, 1), 76, name="Campaign, {}")
+    client, registry = snapshot_client(database)
+    return client, database, registry
+
+
+_CSV_TYPES = {"impressions": int, "clicks": int, "conversions": int, "row_count": int, "spend": float, "revenue": float}
+
+
+def _rows(response) -> list:
+    """The exported rows as dicts, whatever the format."""
+    assert response.status_code == 200, response.text
+    media_type = response.headers["content-type"]
+    if media_type.startswith("text/csv"):
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        return [{key: _CSV_TYPES.get(key, str)(value) for key, value in row.items()} for row in rows]
+    if media_type == "application/x-ndjson":
+        return [json.loads(line) for line in response.text.splitlines()]
+    pa = pytest.importorskip("pyarrow")
+    table = pa.ipc.open_stream(response.content).read_all()
+    return [{**row, "date": row["date"].isoformat()} if "date" in row else row for row in table.to_pylist()]
+
+
+def _spend(rows) -> float:
+    return sum(row["spend"] for row in rows)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson", "arrow"])
+def test_every_format_round_trips_the_facts(api, fmt):
+    client, _, _ = api
+    if fmt == "arrow":
+        pytest.importorskip("pyarrow")
+    response = client.get("/export", params={"format": fmt})
+    rows = _rows(response)
+
+    assert response.headers["content-disposition"].startswith('attachment; filename="adpulse_raw.')
+    assert response.headers[DATA_VERSION_HEADER]
+    assert len(rows) == 2 * 3 * 76
+    assert list(rows[0]) == list(EXPORT_COLUMNS["raw"])
+    assert {row["row_count"] for row in rows} == {1}
+    assert rows[0]["campaign_name"].startswith("Campaign, ")
+    totals = client.get("/summary/platforms").json()
+    assert _spend(rows) == pytest.approx(sum(row["total_spend"] for row in totals))
+
+
+def test_filters_and_grains_match_the_json_routes(api):
+    client, _, _ = api
+    params = {"platform": "Meta Ads", "start_date": "2024-05-10", "end_date": "2024-06-05"}
+    raw = _rows(client.get("/export", params={**params, "format": "ndjson"}))
+    assert len(raw) == 3 * 27
+    assert {row["platform"] for row in raw} == {"Meta Ads"}
+    assert min(row["date"] for row in raw) == "2024-05-10" and max(row["date"] for row in raw) == "2024-06-05"
+
+    daily = _rows(client.get("/export", params={**params, "grain": "daily", "format": "ndjson"}))
+    timeseries = client.get("/timeseries/daily", params=params).json()
+    assert [(row["date"], row["spend"]) for row in daily] == [(point["date"], point["spend"]) for point in timeseries]
+
+    campaigns = _rows(client.get("/export", params={**params, "grain": "campaign"}))
+    summary = client.get("/campaigns/summary", params=params).json()
+    assert [(row["campaign_id"], row["clicks"]) for row in campaigns] == [
+        (row["campaign_id"], row["total_clicks"]) for row in summary
+    ]
+
+    one = _rows(client.get("/export", params={"campaign_id": "google-1", "grain": "campaign"}))
+    assert [row["campaign_id"] for row in one] == ["google-1"]
+    assert client.get("/export", params={"grain": "hourly"}).status_code == 422
+    assert client.get("/export", params={"format": "xml"}).status_code == 422
+
+
+def test_archived_months_are_exported_after_the_hot_tier(api, tmp_path):
+    pytest.importorskip("pyarrow")
+    client, database, _ = api
+    expected = {
+        grain: _rows(client.get("/export", params={"grain": grain, "format": "ndjson"}))
+        for grain in ("raw", "daily", "campaign")
+    }
+    database.archive_months(tmp_path / "archive", before=date(2024, 6, 1))
+
+    raw = _rows(client.get("/export", params={"format": "arrow"}))
+    assert sorted(raw, key=lambda row: (row["platform"], row["campaign_id"], row["date"])) == sorted(
+        expected["raw"], key=lambda row: (row["platform"], row["campaign_id"], row["date"])
+    )
+    # June is still hot, so it comes first.
+    assert raw[0]["date"] >= "2024-06-01" and raw[-1]["date"] < "2024-06-01"
+    for grain in ("daily", "campaign"):
+        assert _rows(client.get("/export", params={"grain": grain, "format": "ndjson"})) == expected[grain]
+
+    april = _rows(client.get("/export", params={"campaign_id": "meta-2", "end_date": "2024-04-10", "format": "csv"}))
+    assert [row["date"] for row in april] == [f"2024-04-{day:02d}" for day in range(1, 11)]
+
+
+def _hide_pyarrow(monkeypatch) -> None:
+    for name in ("pyarrow", "pyarrow.compute", "pyarrow.parquet"):
+        monkeypatch.setitem(sys.modules, name, None)
+
+
+def test_a_missing_pyarrow_is_reported_before_streaming(api, tmp_path, monkeypatch):
+    client, database, _ = api
+    with monkeypatch.context() as patch:
+        _hide_pyarrow(patch)
+        response = client.get("/export", params={"format": "arrow"})
+        assert response.status_code == 501
+        assert response.json()["detail"].startswith("Arrow export requires pyarrow")
+        assert client.get("/export").status_code == 200
+
+    pytest.importorskip("pyarrow")
+    database.archive_months(tmp_path / "archive", before=date(2024, 6, 1))
+    _hide_pyarrow(monkeypatch)
+    for grain in ("raw", "daily"):
+        response = client.get("/export", params={"grain": grain})
+        assert response.status_code == 501, grain
+        assert "pip install 'adpulse[arrow]'" in response.json()["detail"], grain
+
+
+def test_a_snapshot_exports_its_pinned_version(api, make_records):
+    client, database, _ = api
+    snapshot = client.post("/snapshots").json()
+    pinned = {SNAPSHOT_HEADER: snapshot["snapshot_id"]}
+    database.insert_records(make_records(date(2024, 6, 16), 5, name="Campaign, {}"))
+
+    response = client.get("/export", headers=pinned)
+    assert len(_rows(response)) == 2 * 3 * 76
+    assert response.headers[DATA_VERSION_HEADER] == str(snapshot["data_version"])
+    assert len(_rows(client.get("/export"))) == 2 * 3 * 81
+    # The snapshot was released once the body was sent.
+    assert client.delete(f"/snapshots/{snapshot['snapshot_id']}").status_code == 204
+    assert client.get("/export", headers=pinned).status_code == 404
+
+
+def test_the_body_is_produced_one_chunk_at_a_time(api):
+    _, _, registry = api
+    with registry.session_factory() as session:
+        chunks = export_rows(session, "raw", platform="Google Ads", chunk_rows=50)
+        body = encode(chunks, EXPORT_COLUMNS["raw"], "csv")
+        header = next(body)
+        assert header.decode() == ",".join(EXPORT_COLUMNS["raw"]) + "\n"
+        first = next(body)
+        assert first.decode().count("\n") == 50
+        rest = list(body)
+    # 228 rows: four full chunks and a partial one.
+    assert [piece.decode().count("\n") for piece in rest] == [50, 50, 50, 28]
@@ -0,0 +1,339 @@
+import csv
+import sqlite3
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from adpulse.cli import app as cli
+from adpulse.connectors.google_ads import GoogleAdsCSVConnector
+from adpulse.connectors.registry import build_default_registry
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.ingestion.schema import DateParser, NormalizedRecord, RecordBatch, batch_records, parse_date
+from adpulse.storage.database import SCHEMA, DatabaseManager
+from adpulse.utils import CampaignIdentityResolver, build_campaign_id
+
+
+def _write_google_csv(path: Path, rows: int) -> None:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["Campaign", "Date", "Impressions", "Clicks", "Cost", "Conversions"])
+        for index in range(rows):
+            writer.writerow([f"Campaign {index % 7}", f"2024-05-{index % 28 + 1:02d}", "100", "10", "$1,000.50", "2"])
+
+
+def test_iter_records_streams_lazily(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 3)
+    records = GoogleAdsCSVConnector().iter_records(csv_path)
+    first = next(records)
+    assert first.campaign_name == "Campaign 0"
+    assert first.spend == 1000.5
+    assert len(list(records)) == 2
+
+
+def test_ingest_file_chunks_inserts_and_reports_throughput(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 25)
+    database = DatabaseManager(tmp_path / "ingest.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=4, commit_per_batch=False)
+
+    report = ingestor.ingest_file("google", csv_path)
+
+    assert report.rows_ingested == 25
+    assert database.row_count() == 25
+    assert report.elapsed_seconds > 0
+    assert report.rows_per_second > 0
+
+
+def test_ingest_many_detects_platforms_and_reports_per_file(tmp_path):
+    google_path = tmp_path / "account_a.csv"
+    _write_google_csv(google_path, 12)
+    tiktok_path = tmp_path / "account_b.csv"
+    with tiktok_path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(["CampaignName", "StatDate", "Impressions", "Clicks", "Cost", "Conversions"])
+        writer.writerow(["Launch", "2024/03/01", "250", "9", "3.5", "1"])
+    unknown_path = tmp_path / "mystery.csv"
+    unknown_path.write_text("foo,bar\n1,2\n", encoding="utf-8")
+
+    database = DatabaseManager(tmp_path / "many.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=5)
+    result = ingestor.ingest_many([google_path, tiktok_path, unknown_path], workers=2)
+
+    by_name = {report.source_file.name: report for report in result.reports}
+    assert by_name["account_a.csv"].platform == "Google Ads"
+    assert by_name["account_a.csv"].rows_ingested == 12
+    assert by_name["account_b.csv"].platform == "TikTok Ads"
+    assert by_name["account_b.csv"].rows_ingested == 1
+    assert by_name["mystery.csv"].error
+    assert [report.source_file for report in result.failures] == [unknown_path]
+    assert result.rows_ingested == database.row_count() == 13
+    assert result.elapsed_seconds > 0
+
+
+def test_reingesting_a_file_is_idempotent_in_replace_mode(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    # 40 rows over 7 campaigns x 28 days -> some keys repeat inside the file.
+    _write_google_csv(csv_path, 40)
+    database = DatabaseManager(tmp_path / "upsert.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=3)
+
+    ingestor.ingest_file("google", csv_path)
+    first_count, first_totals = database.row_count(), tuple(database.fetch_totals())
+    ingestor.ingest_file("google", csv_path, force=True)
+
+    assert database.row_count() == first_count < 40
+    assert tuple(database.fetch_totals()) == first_totals
+    assert first_totals[1] == 40 * 100  # impressions of duplicate keys add up within a load
+
+
+def test_accumulate_mode_adds_metrics_to_existing_keys(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 5)
+    database = DatabaseManager(tmp_path / "accumulate.db")
+    ingestor = DataIngestor(build_default_registry(), database, mode="accumulate")
+
+    ingestor.ingest_file("google", csv_path)
+    ingestor.ingest_file("google", csv_path, force=True)
+
+    assert database.row_count() == 5
+    assert database.fetch_totals()["impressions"] == 2 * 5 * 100
+
+
+def test_cli_rejects_unknown_write_modes_before_loading(tmp_path, monkeypatch):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 1)
+    monkeypatch.setenv("ADPULSE_DB_PATH", str(tmp_path / "cli.db"))
+    for command in (["load", "google", str(csv_path)], ["load-dir", str(tmp_path)], ["watch", str(tmp_path), "--once"]):
+        result = CliRunner().invoke(cli, [*command, "--mode", "bogus"])
+        assert result.exit_code == 2, command
+        assert "'bogus' is not one of 'replace', 'accumulate'" in result.output
+    assert not (tmp_path / "cli.db").exists()
+
+
+def test_deduplicate_compacts_legacy_duplicates(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA.replace("    load_batch_id TEXT\n", "    legacy_flag TEXT\n"))
+    conn.executemany(
+        "INSERT INTO ad_performance (platform, campaign_id, campaign_name, event_date, impressions, clicks, "
+        "spend, conversions, revenue) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [("Google Ads", "google-brand", "Brand", "2024-05-01", 10, 1, 2.0, 1, 25.0)] * 3,
+    )
+    conn.commit()
+    conn.close()
+    database = DatabaseManager(db_path)
+
+    database.initialize()
+    with pytest.raises(RuntimeError, match="adpulse dedupe"):
+        database.insert_records([])
+
+    assert database.deduplicate(strategy="sum") == (3, 1)
+    assert database.fetch_totals()["impressions"] == 30
+    assert database.insert_records([]) == 0
+
+
+def test_date_parser_locks_format_and_falls_back_on_mismatch():
+    parser = DateParser(sample_size=3, max_cache_size=0)
+    values = ["05/01/2024", "05/02/2024", "05/03/2024", "12/31/2024"]
+    assert [parser(value) for value in values] == [parse_date(value) for value in values]
+    assert parser.format == "%m/%d/%Y"
+    assert parser.fallbacks == 0
+
+    assert parser("2024-06-01") == date(2024, 6, 1)
+    assert parser("5/4/2024") == date(2024, 5, 4)
+    assert parser.fallbacks == 2
+    with pytest.raises(ValueError):
+        parser("13/45/2024")
+
+
+def test_campaign_identity_resolver_memoizes_and_evicts():
+    resolver = CampaignIdentityResolver(maxsize=2)
+    assert resolver.resolve("google", "Spring Sale") == build_campaign_id("google", "Spring Sale")
+    resolver.resolve("google", "Spring Sale")
+    assert resolver.resolve("google", "Spring Sale", " 123 ") == "123"
+    resolver.resolve("meta", "Spring Sale")
+    resolver.resolve("tiktok", "Spring Sale")
+
+    assert resolver.stats() == {"hits": 1, "misses": 3, "size": 2, "maxsize": 2}
+    assert len(resolver.drain_resolved()) == 3  # the explicit id is not derived
+    assert resolver.drain_resolved() == []
+
+
+def test_ingest_persists_campaign_ids_for_later_runs(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 14)
+    database = DatabaseManager(tmp_path / "ingest.db")
+    DataIngestor(build_default_registry(), database).ingest_file("google", csv_path)
+
+    persisted = database.load_campaign_ids()
+    assert ("google", "Campaign 3", build_campaign_id("google", "Campaign 3")) in persisted
+    assert len(persisted) >= 7
+
+    resolver = CampaignIdentityResolver()
+    resolver.preload(persisted)
+    resolver.resolve("google", "Campaign 3")
+    assert resolver.stats()["misses"] == 0
+
+
+def test_manifest_skips_unchanged_files_and_loads_only_the_appended_tail(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 10)
+    database = DatabaseManager(tmp_path / "manifest.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=4)
+
+    assert ingestor.ingest_file("google", csv_path).action == "full"
+    skipped = ingestor.ingest_file("google", csv_path)
+    assert (skipped.action, skipped.rows_ingested) == ("skip", 0)
+
+    with csv_path.open("a", encoding="utf-8", newline="") as handle:
+        csv.writer(handle).writerow(["Campaign 1", "2024-06-01", "100", "10", "$5.00", "1"])
+    tail = ingestor.ingest_file("google", csv_path)
+
+    assert (tail.action, tail.rows_ingested) == ("tail", 1)
+    assert database.row_count() == 11
+    entry = database.get_manifest_entry(str(csv_path.resolve()))
+    assert (entry.status, entry.rows_committed, entry.bytes_committed) == ("complete", 11, csv_path.stat().st_size)
+
+
+def test_rows_appended_during_a_columnar_load_are_left_for_the_next_tail(tmp_path):
+    pytest.importorskip("pandas")
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 10)
+    size = csv_path.stat().st_size
+    database = DatabaseManager(tmp_path / "manifest.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=4, columnar=True)
+
+    def append_once(rows: int) -> None:
+        if csv_path.stat().st_size == size:
+            with csv_path.open("a", encoding="utf-8", newline="") as handle:
+                csv.writer(handle).writerow(["Campaign 1", "2024-06-01", "100", "10", "$5.00", "1"])
+
+    loaded = ingestor.ingest_file("google", csv_path, progress=append_once)
+    assert (loaded.action, loaded.rows_ingested) == ("full", 10)
+    entry = database.get_manifest_entry(str(csv_path.resolve()))
+    assert (entry.size, entry.bytes_committed, entry.rows_committed) == (size, size, 10)
+
+    tail = ingestor.ingest_file("google", csv_path)
+    assert (tail.action, tail.rows_ingested) == ("tail", 1)
+    assert database.row_count() == 11
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_a_last_line_still_being_written_waits_for_its_newline(tmp_path, columnar):
+    if columnar:
+        pytest.importorskip("pandas")
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 10)
+    complete = csv_path.stat().st_size
+    database = DatabaseManager(tmp_path / "partial.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=4, columnar=columnar)
+
+    def append(text: str) -> None:
+        with csv_path.open("a", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+
+    append("Campaign 9,2024-06-03,1")
+    assert ingestor.ingest_file("google", csv_path).rows_ingested == 10
+    entry = database.get_manifest_entry(str(csv_path.resolve()))
+    assert (entry.bytes_committed, entry.rows_committed) == (complete, 10)
+    assert ingestor.ingest_file("google", csv_path).action == "skip"
+
+    append("00,10,$5.00,1\r\nCampaign 8,2024-06-04,2")
+    assert (ingestor.ingest_file("google", csv_path).action, database.row_count()) == ("tail", 11)
+    append("00,20,$5.00,1\r\n")
+    assert (ingestor.ingest_file("google", csv_path).action, database.row_count()) == ("tail", 12)
+
+    with sqlite3.connect(database.db_path) as conn:
+        rows = conn.execute(
+            "SELECT campaign_name, impressions, clicks FROM ad_performance WHERE event_date >= '2024-06-01' "
+            "ORDER BY event_date"
+        ).fetchall()
+    conn.close()
+    assert rows == [("Campaign 9", 100, 10), ("Campaign 8", 200, 20)]
+    entry = database.get_manifest_entry(str(csv_path.resolve()))
+    assert (entry.bytes_committed, entry.rows_committed) == (csv_path.stat().st_size, 12)
+
+
+def test_manifest_resumes_an_interrupted_load_from_the_last_checkpoint(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 16)
+    good = csv_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    broken = good[:11] + ["Campaign 3,not-a-date,100,10,$1.00,2\r\n"] + good[11:]
+    csv_path.write_text("".join(broken), encoding="utf-8", newline="")
+    database = DatabaseManager(tmp_path / "resume.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=4)
+
+    with pytest.raises(ValueError):
+        ingestor.ingest_file("google", csv_path)
+    entry = database.get_manifest_entry(str(csv_path.resolve()))
+    assert (entry.status, entry.rows_committed) == ("partial", 8)
+
+    csv_path.write_text("".join(good), encoding="utf-8", newline="")
+    resumed = ingestor.ingest_file("google", csv_path)
+
+    assert (resumed.action, resumed.rows_ingested) == ("resume", 8)
+    assert database.row_count() == 16
+    assert database.get_manifest_entry(str(csv_path.resolve())).batch_id == entry.batch_id
+
+
+def test_bulk_load_matches_chunked_upserts_and_keeps_indexes(tmp_path):
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 40)
+    results = []
+    for bulk_load in (False, True):
+        database = DatabaseManager(tmp_path / f"bulk_{bulk_load}.db", bulk_load=bulk_load)
+        ingestor = DataIngestor(build_default_registry(), database, batch_size=6)
+        with sqlite3.connect(database.db_path) as conn:
+            conn.execute("CREATE INDEX idx_ad_facts_day ON ad_facts (day)")
+        ingestor.ingest_file("google", csv_path)
+        ingestor.ingest_file("google", csv_path, force=True)
+        with sqlite3.connect(database.db_path) as conn:
+            rows = conn.execute(
+                "SELECT platform, campaign_id, campaign_name, event_date, impressions, clicks, spend, "
+                "conversions, revenue FROM ad_performance ORDER BY campaign_id, event_date"
+            ).fetchall()
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        results.append(rows)
+        assert "idx_ad_facts_day" in indexes
+        assert database.get_manifest_entry(str(csv_path.resolve())).status == "complete"
+
+    assert results[0] == results[1]
+    assert sum(row[4] for row in results[1]) == 40 * 100
+
+
+def test_record_batches_pack_records_into_typed_columns(tmp_path):
+    records = [
+        NormalizedRecord("Google Ads", "google-brand", "Brand", date(2024, 5, 1), 100, 10, 1.5, 2, 50.0),
+        NormalizedRecord("Google Ads", "google-brand", "Brand", date(2024, 5, 2), 200, 20, 3.0, 4, 100.0),
+        NormalizedRecord("Meta Ads", "meta-brand", "Brand", date(2024, 5, 1), 50, 5, 0.5, 1, 25.0),
+    ]
+    batches = list(batch_records(records, batch_size=10))
+    # A platform change closes the batch, so every batch carries a single platform.
+    assert [(batch.platform, len(batch)) for batch in batches] == [("Google Ads", 2), ("Meta Ads", 1)]
+    assert isinstance(batches[0].impressions, array) and isinstance(batches[0].spend, array)
+    assert batches[0].campaign_id[0] is batches[0].campaign_id[1]
+    assert [row for batch in batches for row in batch.iter_db_tuples()] == [r.as_db_tuple() for r in records]
+    assert [record for batch in batches for record in batch] == records
+    if sys.version_info >= (3, 10):
+        assert not hasattr(records[0], "__dict__")
+
+    csv_path = tmp_path / "google.csv"
+    _write_google_csv(csv_path, 3)
+    connector = GoogleAdsCSVConnector()
+    row_batches = list(connector.iter_record_batches(csv_path, batch_size=2))
+    column_batches = list(connector.iter_record_batches(csv_path, batch_size=2, columnar=True))
+    assert [len(batch) for batch in row_batches] == [2, 1]
+    assert all(isinstance(batch, RecordBatch) for batch in row_batches + column_batches)
+    assert [row for b in row_batches for row in b.iter_db_tuples()] == [
+        row for b in column_batches for row in b.iter_db_tuples()
+    ]
+
+    database = DatabaseManager(tmp_path / "batches.db")
+    database.initialize()
+    assert database.insert_record_batches(row_batches) == 3
+    assert database.row_count() == 3
@@ -0,0 +1,296 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from typer.testing import CliRunner
+
+from adpulse.api.dependencies import get_db
+from adpulse.api.headers import DATA_VERSION_HEADER
+from adpulse.api.main import app
+from adpulse.cli import app as cli
+from adpulse.ingestion.schema import NormalizedRecord
+from adpulse.storage.database import SCHEMA, DatabaseManager
+from adpulse.storage.migrations import (
+    COVERING_INDEXES,
+    MIGRATIONS,
+    NATURAL_KEY_INDEX,
+    SCHEMA_VERSION,
+    STAR_SCHEMA_VERSION,
+    migrate,
+    query_plan,
+)
+from adpulse.storage.rollups import CAMPAIGN_ROLLUP
+
+API_QUERIES = [
+    "/summary/platforms",
+    "/summary/platforms?start_date=2024-05-03&end_date=2024-05-10",
+    "/campaigns/summary",
+    "/campaigns/summary?platform=Google Ads&start_date=2024-05-03",
+    "/campaigns/google-0/detail?start_date=2024-05-03&end_date=2024-05-10",
+    "/timeseries/daily",
+    "/timeseries/daily?platform=Meta Ads&start_date=2024-05-03",
+    "/timeseries/daily?campaign_id=google-1&end_date=2024-05-10",
+]
+
+
+def _legacy_rows(conn: sqlite3.Connection, rows) -> None:
+    conn.executemany(
+        "INSERT INTO ad_performance (platform, campaign_id, campaign_name, event_date, impressions, clicks, "
+        "spend, conversions, revenue) VALUES (?, ?, ?, ?, ?, 1, ?, 0, 0)",
+        rows,
+    )
+
+
+@pytest.fixture
+def postponed(tmp_path, snapshot_client):
+    """A client on a legacy database with duplicate keys, left at the last migration before the star schema."""
+    db_path = tmp_path / "postponed.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        _legacy_rows(
+            conn,
+            [
+                (platform, f"{slug}-brand", "Brand", f"2024-05-{day:02d}", 10 * day, 1.0)
+                for platform, slug in (("Google Ads", "google"), ("Meta Ads", "meta"))
+                for day in range(1, 11)
+            ]
+            # The duplicate that postpones migration 4.
+            + [("Google Ads", "google-brand", "Brand", "2024-05-01", 5, 1.0)],
+        )
+    conn.close()
+    database = DatabaseManager(db_path)
+    database.initialize()
+    client, _ = snapshot_client(database)
+    return client, database
+
+
+def _seed(database: DatabaseManager) -> None:
+    records = [
+        NormalizedRecord(platform, f"{slug}-{campaign}", f"Campaign {campaign}", date(2024, 5, day), 100, 10, 5.0, 1, 25.0)
+        for platform, slug in (("Google Ads", "google"), ("Meta Ads", "meta"))
+        for campaign in range(5)
+        for day in range(1, 29)
+    ]
+    database.insert_records(records)
+
+
+def test_api_queries_read_indexed_rollups_on_a_cli_created_database(tmp_path):
+    db_path = tmp_path / "cli.db"
+    database = DatabaseManager(db_path)
+    database.initialize()
+    _seed(database)
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        for url in API_QUERIES:
+            assert client.get(url).status_code == 200, url
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+    assert len(captured) >= len(API_QUERIES)
+    with sqlite3.connect(db_path) as conn:
+        for statement, parameters in captured:
+            for step in query_plan(conn, statement, parameters):
+                # Raw rows are never aggregated per request; the daily rollups answer instead.
+                assert "ad_performance" not in step, (step, statement)
+                # The campaign view is a UNION ALL co-routine; scanning its already-filtered output is fine.
+                if "campaign_id = ?" in statement and step.startswith(("SCAN", "SEARCH")):
+                    assert step.startswith("SEARCH") or step == f"SCAN {CAMPAIGN_ROLLUP}", (step, statement)
+    conn.close()
+
+
+# The raw query shapes the API ran before migration 3 moved it onto rollups.
+_RAW_API_QUERIES = [
+    ("SELECT platform, SUM(spend), SUM(revenue) FROM ad_performance GROUP BY platform", ()),
+    (
+        "SELECT platform, SUM(spend), SUM(revenue) FROM ad_performance "
+        "WHERE event_date >= ? AND event_date <= ? GROUP BY platform",
+        ("2024-05-03", "2024-05-10"),
+    ),
+    (
+        "SELECT campaign_id, campaign_name, platform, SUM(spend), SUM(conversions) FROM ad_performance "
+        "WHERE platform = ? AND event_date >= ? GROUP BY platform, campaign_name, campaign_id",
+        ("Google Ads", "2024-05-03"),
+    ),
+    (
+        "SELECT platform, SUM(impressions), SUM(clicks) FROM ad_performance "
+        "WHERE campaign_id = ? AND event_date >= ? AND event_date <= ? GROUP BY platform",
+        ("google-0", "2024-05-03", "2024-05-10"),
+    ),
+    (
+        "SELECT event_date, SUM(spend) FROM ad_performance WHERE platform = ? AND event_date >= ? GROUP BY event_date",
+        ("Meta Ads", "2024-05-03"),
+    ),
+    (
+        "SELECT event_date, SUM(spend) FROM ad_performance "
+        "WHERE campaign_id = ? AND event_date <= ? GROUP BY event_date",
+        ("google-1", "2024-05-10"),
+    ),
+]
+
+
+def test_migration_2_serves_the_raw_api_queries_from_covering_indexes(tmp_path):
+    db_path = tmp_path / "v2.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.execute("CREATE INDEX ix_ad_performance_platform ON ad_performance (platform)")
+        _legacy_rows(
+            conn,
+            [
+                (platform, f"{slug}-{campaign}", f"Campaign {campaign}", f"2024-05-{day:02d}", 100, 5.0)
+                for platform, slug in (("Google Ads", "google"), ("Meta Ads", "meta"))
+                for campaign in range(5)
+                for day in range(1, 29)
+            ],
+        )
+        conn.commit()
+
+        assert migrate(conn, MIGRATIONS[:2]) == (0, 2)
+
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(ad_performance)")}
+        assert indexes == {NATURAL_KEY_INDEX, *COVERING_INDEXES}
+        assert conn.execute("SELECT COUNT(*) FROM sqlite_stat1 WHERE tbl = 'ad_performance'").fetchone()[0]
+        for sql, parameters in _RAW_API_QUERIES:
+            steps = [step for step in query_plan(conn, sql, parameters) if "ad_performance" in step]
+            assert steps, sql
+            for step in steps:
+                assert "USING COVERING INDEX" in step and any(name in step for name in COVERING_INDEXES), (step, sql)
+    finally:
+        conn.close()
+
+
+def test_legacy_database_is_migrated_in_place(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        conn.execute("CREATE INDEX ix_ad_performance_platform ON ad_performance (platform)")
+        conn.executemany(
+            "INSERT INTO ad_performance (platform, campaign_id, campaign_name, event_date, impressions, clicks, "
+            "spend, conversions, revenue, load_batch_id) VALUES (?, ?, ?, ?, 10, 1, 2.5, 0, 0, 'b1')",
+            [
+                ("Google Ads", "google-brand", "Brand", "2024-05-01"),
+                ("Google Ads", "google-brand", "Brand (renamed)", "2024-05-02"),
+                ("Meta Ads", "meta-brand", "Brand", "2024-05-01"),
+            ],
+        )
+    conn.close()
+
+    DatabaseManager(db_path).initialize()
+    DatabaseManager(db_path).initialize()
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        kinds = dict(conn.execute("SELECT name, type FROM sqlite_master WHERE name IN ('ad_performance', 'ad_facts')"))
+        rows = conn.execute(
+            "SELECT platform, campaign_id, campaign_name, event_date, day, spend, load_batch_id "
+            "FROM ad_performance ORDER BY platform, event_date"
+        ).fetchall()
+    conn.close()
+    assert kinds == {"ad_performance": "view", "ad_facts": "table"}
+    # Campaign names live in the dimension now, so the latest one applies to every day.
+    assert rows == [
+        ("Google Ads", "google-brand", "Brand (renamed)", "2024-05-01", 20240501, 2.5, "b1"),
+        ("Google Ads", "google-brand", "Brand (renamed)", "2024-05-02", 20240502, 2.5, "b1"),
+        ("Meta Ads", "meta-brand", "Brand", "2024-05-01", 20240501, 2.5, "b1"),
+    ]
+
+
+def test_daily_rollups_replace_the_covering_indexes(tmp_path):
+    db_path = tmp_path / "v2.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        migrate(conn, MIGRATIONS[:2])
+    finally:
+        conn.close()
+
+    DatabaseManager(db_path).initialize()
+
+    with sqlite3.connect(db_path) as conn:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert not names & set(COVERING_INDEXES)
+
+
+def test_duplicate_rows_postpone_the_star_schema_until_dedupe(tmp_path):
+    db_path = tmp_path / "duplicates.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO ad_performance (platform, campaign_id, campaign_name, event_date, impressions, clicks, "
+            "spend, conversions, revenue) VALUES ('Google Ads', 'google-brand', 'Brand', '2024-05-01', ?, 1, 1.0, 0, 0)",
+            [(10,), (20,)],
+        )
+    conn.close()
+
+    database = DatabaseManager(db_path)
+    database.initialize()
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == STAR_SCHEMA_VERSION - 1
+    conn.close()
+
+    assert database.deduplicate(vacuum=False) == (2, 1)
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("SELECT impressions FROM ad_performance").fetchall() == [(20,)]
+    conn.close()
+
+
+def test_a_postponed_database_is_still_served(postponed, monkeypatch):
+    client, database = postponed
+    with sqlite3.connect(database.db_path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == STAR_SCHEMA_VERSION - 1
+    conn.close()
+
+    health = client.get("/health")
+    assert health.json() == {"status": "ok", "db_connection": "ok"}
+    # No data version counter before migration 7; nothing can be written until then either.
+    assert health.headers[DATA_VERSION_HEADER] == "0"
+    snapshot = client.post("/snapshots")
+    assert snapshot.status_code == 201 and snapshot.json()["data_version"] == 0
+
+    # The archive manifest's migration has not run either, so only the hot rollups are read.
+    platforms = client.get("/summary/platforms").json()
+    assert [(row["platform"], row["total_impressions"]) for row in platforms] == [("Google Ads", 555), ("Meta Ads", 550)]
+    for url in ("/campaigns/summary", "/campaigns/meta-brand/detail", "/timeseries/daily", "/export"):
+        assert client.get(url).status_code == 200, url
+    assert len(client.get("/timeseries/daily", params={"platform": "Meta Ads"}).json()) == 10
+
+    # Without the star schema's day keys, date filters compare the rollups' ISO dates.
+    week = {"start_date": "2024-05-01", "end_date": "2024-05-07"}
+    daily = client.get("/timeseries/daily", params={**week, "platform": "Google Ads"}).json()
+    assert [point["impressions"] for point in daily] == [15, 20, 30, 40, 50, 60, 70]
+    campaigns = client.get("/campaigns/summary", params={**week, "platform": "Meta Ads"}).json()
+    assert [(row["campaign_id"], row["total_impressions"]) for row in campaigns] == [("meta-brand", 280)]
+    assert sum(row["total_impressions"] for row in client.get("/summary/platforms", params=week).json()) == 565
+    detail = client.get("/campaigns/google-brand/detail", params={"start_date": "2024-05-09"}).json()
+    assert detail["total_impressions"] == 190
+    export = client.get("/export", params={**week, "format": "ndjson"})
+    assert export.status_code == 200 and len(export.text.splitlines()) == 14
+
+    monkeypatch.setenv("ADPULSE_DB_PATH", str(database.db_path))
+    result = CliRunner().invoke(cli, ["summary"])
+    assert result.exit_code == 0, result.output
+    assert "Google Ads" in result.output and "555" in result.output
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from adpulse.connectors import registry as registry_module
+from adpulse.connectors.registry import ConnectorDescriptor, ConnectorRegistry, build_default_registry
+from adpulse.connectors.spec import ConnectorSpec
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# Cumulative `-X importtime` budget for `adpulse.cli`; today it takes about a quarter of this.
+CLI_IMPORT_BUDGET_SECONDS = 1.0
+# Nothing `adpulse verify` needs; each of these would add noticeably to every CLI call.
+HEAVY_MODULES = {
+    "adpulse.connectors.google_ads",
+    "adpulse.connectors.meta_ads",
+    "adpulse.connectors.tiktok_ads",
+    "adpulse.connectors.arrow",
+    "adpulse.reporting",
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "reportlab",
+    "fastapi",
+}
+
+PLUGIN_SPEC = ConnectorSpec(
+    platform_slug="bing",
+    platform_name="Microsoft Ads",
+    columns={
+        "campaign_name": ("CampaignName",),
+        "event_date": ("Day",),
+        "impressions": ("Impressions",),
+        "clicks": ("Clicks",),
+        "spend": ("Spend",),
+        "conversions": ("Conversions",),
+    },
+)
+
+
+def test_registry_imports_connectors_on_first_use_and_discovers_plugins(monkeypatch, caplog):
+    scans = []
+
+    def fake_discover(group):
+        scans.append(group)
+        return [
+            ConnectorDescriptor("bing", f"{__name__}:PLUGIN_SPEC", origin="adpulse-bing"),
+            ConnectorDescriptor("google", f"{__name__}:PLUGIN_SPEC", origin="shadowing-plugin"),
+        ]
+
+    monkeypatch.setattr(registry_module, "discover_connectors", fake_discover)
+    registry = build_default_registry()
+
+    assert "google" in registry and not scans
+    assert registry.get("google").platform_name == "Google Ads"
+    assert not scans
+
+    assert registry.get("bing").platform_name == "Microsoft Ads"
+    assert scans == ["adpulse.connectors"]
+    assert "shadowing-plugin" in caplog.text
+    assert registry.get("google").platform_name == "Google Ads"
+    assert list(registry.supported_platforms()) == ["bing", "google", "meta", "tiktok"]
+    assert scans == ["adpulse.connectors"]
+
+    broken = ConnectorRegistry()
+    broken.register_lazy(ConnectorDescriptor("meta", f"{__name__}:PLUGIN_SPEC"))
+    with pytest.raises(ValueError, match="slug is 'bing'"):
+        broken.get("meta")
+
+
+def test_verify_starts_within_the_import_budget(tmp_path):
+    env = {**os.environ, "ADPULSE_DB_PATH": str(tmp_path / "startup.db"), "PYTHONPATH": str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "from adpulse.cli import app; app(['verify'])"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "ad_performance rows: 0" in result.stdout
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, total, name = line.split("|")
+            if total.strip().isdigit():
+                cumulative[name.strip()] = int(total) / 1e6
+    assert not HEAVY_MODULES & set(cumulative)
+    assert cumulative["adpulse.cli"] < CLI_IMPORT_BUDGET_SECONDS
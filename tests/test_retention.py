@@ -0,0 +1,125 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from adpulse.storage.database import DatabaseManager
+from adpulse.storage.retention import RetentionPolicy, bucket_start
+
+TODAY = date(2024, 12, 31)
+POLICY = RetentionPolicy.parse("daily:30,weekly:90,monthly")
+
+# Month-aligned ranges (and open ones) sum whole buckets, so they survive compaction exactly.
+URLS = [
+    "/summary/platforms",
+    "/summary/platforms?start_date=2024-03-01&end_date=2024-05-31",
+    "/summary/platforms?start_date=2024-10-01",
+    "/campaigns/summary",
+    "/campaigns/summary?platform=Meta Ads&end_date=2024-09-30",
+    "/campaigns/google-1/detail",
+    "/campaigns/google-1/detail?start_date=2024-02-01&end_date=2024-11-30",
+    "/timeseries/daily?start_date=2024-12-01",
+]
+
+
+@pytest.fixture
+def database(seeded_database) -> DatabaseManager:
+    """A database holding every day of 2024."""
+    return seeded_database(date(2024, 1, 1), 366)
+
+
+@pytest.fixture
+def responses(api_responses):
+    """Factory: `api_responses` for `urls` without campaign detail timeseries, which turn coarse by design."""
+
+    def fetch(database: DatabaseManager, urls=URLS) -> list:
+        bodies = api_responses(database, urls)
+        for _, body in bodies:
+            if isinstance(body, dict):
+                body.pop("timeseries", None)
+        return bodies
+
+    return fetch
+
+
+def _grains(database: DatabaseManager) -> dict:
+    with sqlite3.connect(database.db_path) as conn:
+        grains = dict(conn.execute("SELECT grain, COUNT(*) FROM ad_facts_compacted GROUP BY grain"))
+        grains["daily"] = conn.execute("SELECT COUNT(*) FROM ad_facts").fetchone()[0]
+    conn.close()
+    return grains
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("weekly:30,monthly", "starts with a daily tier"),
+        ("daily:30,hourly", "Unsupported retention grain"),
+        ("daily:30,monthly:90,weekly", "finer to coarser"),
+        ("daily,weekly", "needs an age"),
+        ("daily:90,weekly:30,monthly", "increase"),
+        ("daily:ninety", "expected grain[:days]"),
+    ],
+)
+def test_policy_specs_are_validated(spec, message):
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        RetentionPolicy.parse(spec)
+
+
+def test_policy_round_trips_and_weekly_buckets_stop_at_month_boundaries():
+    assert str(RetentionPolicy.parse(" daily:400, Weekly:730 ,monthly")) == "daily:400,weekly:730,monthly"
+    # Thursday 2024-08-01 starts its own bucket although its ISO week began in July.
+    assert bucket_start(date(2024, 8, 1), "weekly") == date(2024, 8, 1)
+    assert bucket_start(date(2024, 8, 7), "weekly") == date(2024, 8, 5)
+    assert bucket_start(date(2024, 8, 7), "monthly") == date(2024, 8, 1)
+
+
+def test_compaction_combines_grains_and_keeps_totals(database, responses):
+    expected = responses(database)
+    summary = [dict(row) for row in database.fetch_summary()]
+
+    report = database.compact(POLICY, today=TODAY)
+
+    # Jan-Sep monthly, Oct-Nov weekly, December daily.
+    assert _grains(database) == {"monthly": 2 * 3 * 9, "weekly": 2 * 3 * 10, "daily": 2 * 3 * 31}
+    assert report.rows_folded == 2 * 3 * (366 - 31)
+    assert report.transactions == 2 * 11
+    assert responses(database) == expected
+    # rows_ingested still counts the daily rows behind each bucket.
+    assert [dict(row) for row in database.fetch_summary()] == summary
+
+    points = responses(database, ["/timeseries/daily?platform=Google Ads&end_date=2024-03-31"])[0][1]
+    assert [point["date"] for point in points] == ["2024-01-01", "2024-02-01", "2024-03-01"]
+
+    # Nothing left to fold: a rerun is a no-op.
+    assert database.compact(POLICY, today=TODAY).transactions == 0
+    assert responses(database) == expected
+
+    with sqlite3.connect(database.db_path) as conn:
+        # Incremental auto-vacuum handed the folded rows' pages back to the filesystem.
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        assert conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    conn.close()
+
+
+def test_writes_into_compacted_periods_are_skipped(database, responses, make_records):
+    database.compact(POLICY, today=TODAY)
+    expected = responses(database)
+
+    database.insert_records(make_records(date(2024, 2, 10), 3, spend=4.0))
+    assert responses(database) == expected
+
+    database.insert_records(make_records(date(2024, 12, 20), 1, spend=4.0))
+    changed = responses(database, ["/timeseries/daily?platform=Meta Ads&start_date=2024-12-20&end_date=2024-12-20"])
+    assert changed[0][1][0]["spend"] == pytest.approx(3 * 4.0)
+
+
+def test_a_bounded_last_tier_deletes_older_facts(database):
+    report = database.compact(RetentionPolicy.parse("daily:30,weekly:90,monthly:200"), today=TODAY)
+
+    # 200 days before 2024-12-31 is mid-June, so January through May is dropped.
+    assert report.rows_deleted == 2 * 3 * (31 + 29 + 31 + 30 + 31)
+    with sqlite3.connect(database.db_path) as conn:
+        assert conn.execute("SELECT MIN(day) FROM daily_campaign_rollup").fetchone()[0] == 20240601
+        assert conn.execute("SELECT MIN(day) FROM platform_day_rollup").fetchone()[0] == 20240601
+    conn.close()
@@ -0,0 +1,86 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from adpulse.connectors.registry import build_default_registry
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.storage.database import DatabaseManager
+from adpulse.storage.migrations import AD_PERFORMANCE_VIEW_TRIGGERS, DATA_VERSION_TRIGGERS
+from adpulse.storage.rollups import ROLLUP_TRIGGERS
+
+CAMPAIGN_ROLLUP_FROM_RAW = """
+SELECT platform, campaign_id, event_date, COUNT(*), SUM(impressions), SUM(clicks), SUM(spend),
+       SUM(conversions), SUM(revenue)
+FROM ad_performance GROUP BY platform, campaign_id, event_date ORDER BY 1, 2, 3
+"""
+CAMPAIGN_ROLLUP = """
+SELECT platform, campaign_id, event_date, row_count, impressions, clicks, spend, conversions, revenue
+FROM daily_campaign_rollup ORDER BY 1, 2, 3
+"""
+PLATFORM_ROLLUP_FROM_RAW = """
+SELECT platform, event_date, COUNT(*), SUM(impressions), SUM(clicks), SUM(spend), SUM(conversions), SUM(revenue)
+FROM ad_performance GROUP BY platform, event_date ORDER BY 1, 2
+"""
+PLATFORM_ROLLUP = """
+SELECT platform, event_date, row_count, impressions, clicks, spend, conversions, revenue
+FROM daily_platform_rollup ORDER BY 1, 2
+"""
+
+
+def _export_rows(rows: int, cost: str = "2.50") -> list:
+    return [[f"Campaign {index % 5}", f"2024-05-{index % 20 + 1:02d}", "100", "10", cost, "2"] for index in range(rows)]
+
+
+def _assert_rollups_match_raw(db_path: Path) -> None:
+    with sqlite3.connect(db_path) as conn:
+        for raw_sql, rollup_sql in ((CAMPAIGN_ROLLUP_FROM_RAW, CAMPAIGN_ROLLUP), (PLATFORM_ROLLUP_FROM_RAW, PLATFORM_ROLLUP)):
+            raw = conn.execute(raw_sql).fetchall()
+            rollup = conn.execute(rollup_sql).fetchall()
+            assert [row[:-3] for row in rollup] == [row[:-3] for row in raw]
+            for rollup_row, raw_row in zip(rollup, raw):
+                assert rollup_row[-3:] == pytest.approx(raw_row[-3:])
+    conn.close()
+
+
+def test_triggers_keep_rollups_in_step_with_every_write_path(tmp_path, write_export):
+    csv_path = tmp_path / "google.csv"
+    write_export(csv_path, _export_rows(60))
+    database = DatabaseManager(tmp_path / "rollups.db")
+    ingestor = DataIngestor(build_default_registry(), database, batch_size=7)
+
+    ingestor.ingest_file("google", csv_path)
+    write_export(csv_path, _export_rows(80, cost="3.75"))
+    ingestor.ingest_file("google", csv_path)
+    DataIngestor(build_default_registry(), database, mode="accumulate").ingest_file("google", csv_path, force=True)
+    with sqlite3.connect(database.db_path) as conn:
+        conn.execute("UPDATE ad_performance SET event_date = '2024-06-01' WHERE event_date = '2024-05-01'")
+        conn.execute("DELETE FROM ad_performance WHERE event_date = '2024-05-02'")
+    conn.close()
+
+    _assert_rollups_match_raw(database.db_path)
+    summary = {row["platform"]: row for row in database.fetch_summary()}
+    assert summary["Google Ads"]["rows_ingested"] == database.row_count()
+
+
+def test_bulk_loads_and_parallel_rebuilds_recompute_the_rollups(tmp_path, write_export):
+    csv_path = tmp_path / "google.csv"
+    write_export(csv_path, _export_rows(60))
+    database = DatabaseManager(tmp_path / "bulk.db", bulk_load=True)
+    DataIngestor(build_default_registry(), database, batch_size=7).ingest_file("google", csv_path)
+
+    _assert_rollups_match_raw(database.db_path)
+    with sqlite3.connect(database.db_path) as conn:
+        triggers = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        conn.execute(
+            "INSERT INTO ad_performance (platform, campaign_id, campaign_name, event_date, impressions, clicks, "
+            "spend, conversions, revenue) VALUES ('Meta Ads', 'meta-brand', 'Brand', '2024-05-01', 5, 1, 1.0, 0, 0)"
+        )
+        conn.execute("DELETE FROM platform_day_rollup WHERE day = 20240501")
+        conn.execute("UPDATE platform_day_rollup SET spend = 0")
+    conn.close()
+    assert triggers == {*ROLLUP_TRIGGERS, *AD_PERFORMANCE_VIEW_TRIGGERS, *DATA_VERSION_TRIGGERS}
+
+    # Day is index % 20, so the Google rows cover 20 platform-days; Meta adds one.
+    assert database.rebuild_rollups(workers=2) == 21
+    _assert_rollups_match_raw(database.db_path)
@@ -0,0 +1,178 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from adpulse.ai import insights_service
+from adpulse.api.headers import DATA_VERSION_HEADER, SNAPSHOT_HEADER
+from adpulse.api.snapshots import SnapshotLimitReached, read_data_version
+from adpulse.database import create_sqlite_engine
+from adpulse.reporting import report_service
+from adpulse.storage.database import DatabaseManager
+
+
+@pytest.fixture
+def api(seeded_database, snapshot_client):
+    """A client whose reads and snapshots use a database holding May 1-7, 2024."""
+    database = seeded_database(date(2024, 5, 1), 7)
+    client, registry = snapshot_client(database)
+    return client, database, registry
+
+
+def _spend(response) -> float:
+    return sum(row["total_spend"] for row in response.json())
+
+
+def test_responses_carry_the_data_version_they_read(api, make_records):
+    client, database, _ = api
+    first = client.get("/summary/platforms")
+    database.insert_records(make_records(date(2024, 5, 8), 1))
+    second = client.get("/summary/platforms")
+
+    assert int(second.headers[DATA_VERSION_HEADER]) > int(first.headers[DATA_VERSION_HEADER])
+    assert _spend(second) == pytest.approx(_spend(first) + 6 * 2.5)
+
+
+def test_a_read_only_session_is_one_read_transaction(seeded_database, make_records):
+    database = seeded_database(date(2024, 5, 1), 2)
+    engine = create_sqlite_engine(database.db_path, read_only=True)
+    try:
+        with sessionmaker(bind=engine)() as session:
+            version = read_data_version(session)
+            database.insert_records(make_records(date(2024, 5, 3), 2))
+            assert session.execute(text("SELECT COUNT(*) FROM ad_facts")).scalar_one() == 12
+            assert read_data_version(session) == version
+        with sessionmaker(bind=engine)() as session:
+            assert session.execute(text("SELECT COUNT(*) FROM ad_facts")).scalar_one() == 24
+            assert read_data_version(session) > version
+    finally:
+        engine.dispose()
+
+
+def test_a_snapshot_pins_one_version_while_loads_commit(api, make_records):
+    client, database, _ = api
+    opened = client.post("/snapshots")
+    assert opened.status_code == 201
+    snapshot = opened.json()
+    pinned = {SNAPSHOT_HEADER: snapshot["snapshot_id"]}
+    before = client.get("/campaigns/summary", headers=pinned)
+
+    # The loader commits straight away although the snapshot's read transaction stays open.
+    started = time.perf_counter()
+    database.insert_records(make_records(date(2024, 5, 8), 3))
+    database.insert_records(make_records(date(2024, 5, 1), 1, spend=9.0))
+    assert time.perf_counter() - started < 5
+
+    after = client.get("/campaigns/summary", headers=pinned)
+    assert after.json() == before.json()
+    assert _spend(client.get("/summary/platforms", headers=pinned)) == pytest.approx(_spend(before))
+    assert after.headers[DATA_VERSION_HEADER] == str(snapshot["data_version"])
+    latest = client.get("/campaigns/summary")
+    assert int(latest.headers[DATA_VERSION_HEADER]) > snapshot["data_version"]
+    assert _spend(latest) > _spend(before)
+
+    assert client.get(f"/snapshots/{snapshot['snapshot_id']}").json()["data_version"] == snapshot["data_version"]
+    assert client.delete(f"/snapshots/{snapshot['snapshot_id']}").status_code == 204
+    assert client.get("/summary/platforms", headers=pinned).status_code == 404
+    assert client.delete(f"/snapshots/{snapshot['snapshot_id']}").status_code == 404
+
+
+def test_snapshots_are_bounded_and_expire(api):
+    client, _, registry = api
+    assert client.post("/snapshots").status_code == 201
+    assert client.post("/snapshots").status_code == 201
+    refused = client.post("/snapshots")
+    assert refused.status_code == 503
+    assert refused.headers["Retry-After"]
+
+    registry.close_all()
+    registry.ttl_seconds = 0.05
+    snapshot = registry.open()
+    time.sleep(0.1)
+    assert client.get("/summary/platforms", headers={SNAPSHOT_HEADER: snapshot.snapshot_id}).status_code == 404
+    assert len(registry) == 0
+    registry.ttl_seconds = 60
+    registry.open()
+    registry.open()
+    with pytest.raises(SnapshotLimitReached):
+        registry.open()
+
+
+class _Api:
+    """Routes the report's and insights' HTTP calls to the test client, loading `late_records` after the first read."""
+
+    RequestException = requests.RequestException
+
+    def __init__(self, client: TestClient, database: DatabaseManager, late_records) -> None:
+        self.client = client
+        self.database = database
+        self.late_records = late_records
+        self.snapshot_ids = []
+
+    def _send(self, method, url, params=None, headers=None, timeout=None):
+        response = self.client.request(method, url.replace(report_service.API_BASE_URL, ""), params=params, headers=headers)
+        if method == "GET":
+            self.snapshot_ids.append((headers or {}).get(SNAPSHOT_HEADER))
+            if len(self.snapshot_ids) == 1:
+                self.database.insert_records(self.late_records)
+        if response.status_code >= 400:
+            response.raise_for_status = lambda: (_ for _ in ()).throw(requests.HTTPError(response.text))
+        return response
+
+    def get(self, url, **kwargs):
+        return self._send("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._send("POST", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._send("DELETE", url, **kwargs)
+
+
+def test_weekly_report_reads_one_version_even_when_a_load_lands_midway(api, make_records, monkeypatch, tmp_path):
+    client, database, registry = api
+    fake = _Api(client, database, make_records(date(2024, 5, 1), 7, spend=5.0))
+    captured = {}
+    monkeypatch.setattr(report_service, "requests", fake)
+    monkeypatch.setattr(insights_service, "requests", fake)
+    monkeypatch.setattr(insights_service, "generate_completion", lambda prompt, **_: "fine")
+    monkeypatch.setattr(report_service, "generate_performance_report", lambda path, data: captured.update(data))
+    version = int(client.get("/summary/platforms").headers[DATA_VERSION_HEADER])
+
+    report_service.build_weekly_report(date(2024, 5, 1), date(2024, 5, 7), output_dir=str(tmp_path))
+
+    # Platform and campaign sections agree although the load committed between them.
+    platform_spend = sum(row["total_spend"] for row in captured["platform_summaries"])
+    assert platform_spend == pytest.approx(6 * 7 * 2.5)
+    assert sum(row["total_spend"] for row in captured["top_campaigns"]) == pytest.approx(platform_spend)
+    assert captured["data_version"] == version
+    assert captured["ai_account_health"] == "fine"
+    # Every read, the insights' own API calls included, went through the one snapshot, closed afterwards.
+    assert len(set(fake.snapshot_ids)) == 1 and None not in fake.snapshot_ids
+    assert len(registry) == 0
+
+
+def test_api_clients_name_the_snapshot_header_without_loading_the_database(tmp_path):
+    env = {**os.environ, "ADPULSE_DB_PATH": str(tmp_path / "clients.db")}
+    code = (
+        "import sys, adpulse.reporting.report_service, adpulse.ai.insights_service; "
+        "print(sorted(name for name in ('sqlalchemy', 'adpulse.database', 'adpulse.api.snapshots') if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
+    assert not (tmp_path / "clients.db").exists()
@@ -0,0 +1,87 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from adpulse.connectors.registry import build_default_registry
+from adpulse.ingestion.data_ingestor import DataIngestor
+from adpulse.ingestion.watcher import FolderWatcher, _Inotify
+from adpulse.storage.database import DatabaseManager
+
+def _export_rows(campaign: str, days: int, bad_date: bool = False) -> list:
+    rows = [[campaign, f"2024-06-{day:02d}", "100", "10", "2.50", "1"] for day in range(1, days + 1)]
+    if bad_date:
+        rows.append([campaign, "not-a-date", "100", "10", "2.50", "1"])
+    return rows
+
+
+def _ingestor(tmp_path: Path) -> DataIngestor:
+    return DataIngestor(build_default_registry(), DatabaseManager(tmp_path / "watch.db"), batch_size=2)
+
+
+def test_ready_files_share_one_transaction_and_bad_files_roll_back_alone(tmp_path, write_export):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    for index in range(3):
+        write_export(inbox / f"export_{index}.csv", _export_rows(f"Campaign {index}", 3))
+    # Its first chunk is written before the bad row fails, so only the savepoint can undo it.
+    write_export(inbox / "broken.csv", _export_rows("Broken", 3, bad_date=True))
+    write_export(inbox / "upload.csv.part", _export_rows("Half Copied", 3))
+    ingestor = _ingestor(tmp_path)
+    status_file = tmp_path / "status.json"
+    watcher = FolderWatcher(ingestor, inbox, settle_seconds=0, use_inotify=False, status_file=status_file)
+
+    reports = watcher.poll()
+
+    assert sorted(report.source_file.name for report in reports) == [
+        "broken.csv", "export_0.csv", "export_1.csv", "export_2.csv"
+    ]
+    assert [report.source_file.name for report in reports if report.error] == ["broken.csv"]
+    assert ingestor.database.row_count() == 9
+    status = json.loads(status_file.read_text(encoding="utf-8"))
+    assert status["batches"] == 1
+    assert status["files_ingested"] == 3 and status["failures"] == 1
+    assert status["queue_depth"] == 0
+    assert status["last_lag_seconds"] is not None
+
+    assert watcher.poll() == []
+    write_export(inbox / "export_0.csv", _export_rows("Campaign 0", 5), mode="a")
+    (tail,) = watcher.poll()
+    assert (tail.action, tail.rows_ingested) == ("tail", 5)
+    # Days 1-3 are upserted again; days 4 and 5 are new.
+    assert ingestor.database.row_count() == 11
+
+
+def test_polling_waits_for_files_to_settle(tmp_path, write_export):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    write_export(inbox / "export.csv", _export_rows("Campaign", 2))
+    watcher = FolderWatcher(_ingestor(tmp_path), inbox, settle_seconds=60, use_inotify=False)
+
+    assert watcher.poll() == []
+    assert watcher.stats.queue_depth == 1
+    assert [report.rows_ingested for report in watcher.poll(flush=True)] == [2]
+    assert watcher.stats.queue_depth == 0
+
+
+@pytest.mark.skipif(_Inotify.open(Path(".")) is None, reason="inotify is not available")
+def test_inotify_picks_up_closed_files_without_settling(tmp_path, write_export):
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    watcher = FolderWatcher(_ingestor(tmp_path), inbox, settle_seconds=60, poll_interval=0.05, use_inotify=True)
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, kwargs={"stop_event": stop})
+    thread.start()
+    try:
+        time.sleep(0.2)
+        write_export(inbox / "export.csv", _export_rows("Campaign", 4))
+        deadline = time.monotonic() + 10
+        while watcher.stats.files_ingested < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+    assert watcher.stats.mode == "inotify"
+    assert watcher.stats.rows_ingested == 4